@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 import re
 from typing import Optional
 
+from django.test import override_settings
 from django.utils import timezone
 from freezegun import freeze_time
 
@@ -11,7 +12,11 @@ from posthog.hogql.hogql import HogQLContext
 from posthog.models.action import Action
 from posthog.models.cohort import Cohort, get_and_update_pending_version
 from posthog.models.cohort.sql import GET_COHORTPEOPLE_BY_COHORT_ID
-from posthog.models.cohort.util import format_filter_query
+from posthog.models.cohort.util import (
+    can_recalculate_cohortpeople_in_batch,
+    format_filter_query,
+    recalculate_cohortpeople_batch,
+)
 from posthog.models.filters import Filter
 from posthog.models.organization import Organization
 from posthog.models.person import Person
@@ -814,6 +819,94 @@ class TestCohort(ClickhouseTestMixin, BaseTest):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0][0], p1.uuid)
 
+    @override_settings(
+        COHORT_INCREMENTAL_CALCULATION_ENABLED=True,
+        COHORT_INCREMENTAL_CALCULATION_LOOKBACK_MINUTES=0,
+        COHORT_FULL_CALCULATION_EVERY_N_VERSIONS=0,
+    )
+    def test_cohortpeople_incremental_recalculation(self):
+        with freeze_time(datetime.now() - timedelta(days=3)):
+            p1 = Person.objects.create(team_id=self.team.pk, distinct_ids=["1"], properties={"$some_prop": "something"})
+            p2 = Person.objects.create(team_id=self.team.pk, distinct_ids=["2"], properties={"$some_prop": "something"})
+            p3 = Person.objects.create(team_id=self.team.pk, distinct_ids=["3"], properties={"$some_prop": "another"})
+            p4 = Person.objects.create(team_id=self.team.pk, distinct_ids=["4"], properties={"$some_prop": "something"})
+
+            cohort1 = Cohort.objects.create(
+                team=self.team,
+                groups=[{"properties": [{"key": "$some_prop", "value": "something", "type": "person"}]}],
+                name="cohort1",
+            )
+            cohort1.calculate_people_ch(get_and_update_pending_version(cohort1))
+
+        self.assertEqual({row[0] for row in self._get_cohortpeople(cohort1)}, {p1.uuid, p2.uuid, p4.uuid})
+
+        with freeze_time(datetime.now() - timedelta(days=2)):
+            p2.version = 1
+            p2.properties = {"$some_prop": "another"}
+            p2.save()
+            p3.version = 1
+            p3.properties = {"$some_prop": "something"}
+            p3.save()
+            p4.delete()
+
+        with self.capture_queries_startswith(("INSERT", "insert")) as queries:
+            cohort1.calculate_people_ch(get_and_update_pending_version(cohort1))
+
+        # Only persons updated since the last calculation were re-evaluated
+        self.assertTrue(any("_timestamp >" in query for query in queries))
+        self.assertEqual({row[0] for row in self._get_cohortpeople(cohort1)}, {p1.uuid, p3.uuid})
+        self.assertEqual(cohort1.count, 2)
+
+    def test_recalculate_cohortpeople_batch(self):
+        p1 = Person.objects.create(
+            team_id=self.team.pk, distinct_ids=["1"], properties={"$some_prop": "something", "$another_prop": "a"}
+        )
+        p2 = Person.objects.create(team_id=self.team.pk, distinct_ids=["2"], properties={"$some_prop": "something"})
+        p3 = Person.objects.create(team_id=self.team.pk, distinct_ids=["3"], properties={"$another_prop": "a"})
+        Person.objects.create(team_id=self.team.pk, distinct_ids=["4"], properties={"$some_prop": "another"})
+
+        cohort1 = Cohort.objects.create(
+            team=self.team,
+            groups=[{"properties": [{"key": "$some_prop", "value": "something", "type": "person"}]}],
+            name="cohort1",
+        )
+        cohort2 = Cohort.objects.create(
+            team=self.team,
+            filters={
+                "properties": {
+                    "type": "OR",
+                    "values": [
+                        {"type": "AND", "values": [{"key": "$another_prop", "value": "a", "type": "person"}]},
+                        {"type": "AND", "values": [{"key": "$some_prop", "value": "another", "type": "person"}]},
+                    ],
+                }
+            },
+            name="cohort2",
+        )
+        cohort3 = Cohort.objects.create(
+            team=self.team,
+            groups=[{"properties": [{"key": "$some_prop", "value": "nothing", "type": "person"}]}],
+            name="cohort3",
+        )
+        self.assertTrue(all(can_recalculate_cohortpeople_in_batch(cohort) for cohort in (cohort1, cohort2, cohort3)))
+
+        cohorts = [(cohort, get_and_update_pending_version(cohort)) for cohort in (cohort1, cohort2, cohort3)]
+        counts = recalculate_cohortpeople_batch(cohorts)
+        for cohort, pending_version in cohorts:
+            cohort.calculate_people_ch(pending_version, precalculated_count=counts[cohort.pk])
+
+        self.assertEqual(counts, {cohort1.pk: 2, cohort2.pk: 3, cohort3.pk: 0})
+        self.assertEqual({row[0] for row in self._get_cohortpeople(cohort1)}, {p1.uuid, p2.uuid})
+        self.assertEqual(len(self._get_cohortpeople(cohort2)), 3)
+        self.assertIn(p3.uuid, {row[0] for row in self._get_cohortpeople(cohort2)})
+        self.assertEqual(self._get_cohortpeople(cohort3), [])
+
+        # Matches calculating each cohort on its own
+        for cohort, _ in cohorts:
+            batch_people = {row[0] for row in self._get_cohortpeople(cohort)}
+            cohort.calculate_people_ch(get_and_update_pending_version(cohort))
+            self.assertEqual({row[0] for row in self._get_cohortpeople(cohort)}, batch_people)
+
     def test_cohort_change(self):
         p1 = Person.objects.create(
             team_id=self.team.pk,
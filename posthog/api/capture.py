@@ -1,12 +1,14 @@
+import concurrent.futures
 import dataclasses
 import json
 import re
 from random import random
 
+import orjson
 import sentry_sdk
 import structlog
 import time
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator, Sequence
 from datetime import datetime, timedelta
 from dateutil import parser
 from django.conf import settings
@@ -28,7 +30,12 @@ from posthog.api.utils import get_data, get_token, safe_clickhouse_string
 from posthog.cache_utils import cache_for
 from posthog.exceptions import generate_exception_response
 from posthog.exceptions_capture import capture_exception
-from posthog.kafka_client.client import KafkaProducer, session_recording_kafka_producer
+from posthog.kafka_client.client import (
+    KafkaMessage,
+    KafkaProducer,
+    batch_kafka_producer,
+    session_recording_kafka_producer,
+)
 from posthog.kafka_client.topics import (
     KAFKA_EVENTS_PLUGIN_INGESTION_HISTORICAL,
     KAFKA_SESSION_RECORDING_EVENTS,
@@ -190,6 +197,7 @@ def build_kafka_event_data(
     sent_at: Optional[datetime],
     event_uuid: UUIDT,
     token: str,
+    serialize_data: Callable[[dict], str] = json.dumps,
 ) -> dict:
     logger.debug("build_kafka_event_data", token=token)
     return {
@@ -197,7 +205,7 @@ def build_kafka_event_data(
         "distinct_id": safe_clickhouse_string(distinct_id),
         "ip": safe_clickhouse_string(ip) if ip else ip,
         "site_url": safe_clickhouse_string(site_url),
-        "data": json.dumps(data),
+        "data": serialize_data(data),
         "now": now.isoformat(),
         "sent_at": sent_at.isoformat() if sent_at else "",
         "token": token,
@@ -901,6 +909,14 @@ def capture_internal(
             overflowing=overflowing,
         )
 
+    kafka_partition_key = _get_partition_key(event, distinct_id, ip, token, historical)
+
+    return log_event(
+        parsed_event, event["event"], partition_key=kafka_partition_key, historical=historical, headers=headers
+    )
+
+
+def _get_partition_key(event: dict, distinct_id: str, ip: Optional[str], token: str, historical: bool) -> Optional[str]:
     # We aim to always partition by {team_id}:{distinct_id} but allow
     # overriding this to deal with hot partitions in specific cases.
     # Setting the partition key to None means using random partitioning.
@@ -915,13 +931,75 @@ def capture_internal(
         and settings.CAPTURE_ALLOW_RANDOM_PARTITIONING
         and (distinct_id.lower() in LIKELY_ANONYMOUS_IDS or is_randomly_partitioned(candidate_partition_key))
     ):
-        kafka_partition_key = None
-    else:
-        kafka_partition_key = candidate_partition_key
+        return None
 
-    return log_event(
-        parsed_event, event["event"], partition_key=kafka_partition_key, historical=historical, headers=headers
-    )
+    return candidate_partition_key
+
+
+def _orjson_dumps(data: Any) -> bytes:
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+def capture_batch_internal(
+    events: Sequence[dict],
+    ip,
+    site_url,
+    now,
+    sent_at,
+    token,
+    historical=False,
+    extra_headers: list[tuple[str, str]] | None = None,
+) -> concurrent.futures.Future:
+    """Capture a batch of events, like `capture_internal` does for one, without blocking on each of them.
+
+    Each event must have a "distinct_id", and may have a "uuid". All events are serialized at once
+    with orjson and then produced by a producer that lingers to send them in larger requests, leaving
+    at most `KAFKA_BATCH_PRODUCER_MAX_IN_FLIGHT_MESSAGES` of them unacknowledged at a time.
+
+    Session recording events aren't supported, as they're partitioned and produced differently.
+
+    Returns:
+        A single future, resolved once all events are acknowledged by Kafka.
+    """
+    if extra_headers is None:
+        extra_headers = []
+
+    messages = []
+    for event in events:
+        if event["event"] in SESSION_RECORDING_EVENT_NAMES:
+            raise ValueError(f"Session recording events can't be captured in a batch, got '{event['event']}'")
+
+        distinct_id = event["distinct_id"]
+        parsed_event = build_kafka_event_data(
+            distinct_id=distinct_id,
+            ip=ip,
+            site_url=site_url,
+            data=event,
+            now=now,
+            sent_at=sent_at,
+            event_uuid=event.get("uuid") or UUIDT(),
+            token=token,
+            serialize_data=lambda data: _orjson_dumps(data).decode("utf-8"),
+        )
+        messages.append(
+            KafkaMessage(
+                topic=_kafka_topic(event["event"], historical=historical),
+                value=_orjson_dumps(parsed_event),
+                key=_get_partition_key(event, distinct_id, ip, token, historical),
+                headers=[("token", token), ("distinct_id", distinct_id), *extra_headers],
+            )
+        )
+
+    try:
+        future = batch_kafka_producer().produce_batch(
+            messages, max_in_flight=settings.KAFKA_BATCH_PRODUCER_MAX_IN_FLIGHT_MESSAGES
+        )
+        statsd.incr("posthog_cloud_plugin_server_ingestion", count=len(messages))
+        return future
+    except Exception:
+        statsd.incr("capture_endpoint_log_event_error")
+        logger.exception("Failed to produce batch of %s events to Kafka", len(messages))
+        raise
 
 
 def is_randomly_partitioned(candidate_partition_key: str) -> bool:
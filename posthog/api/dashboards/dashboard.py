@@ -1,7 +1,11 @@
+import contextvars
 import json
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Any, Optional, cast
 
 import structlog
+from django.conf import settings
+from django.db import connections
 from django.db.models import Prefetch
 from django.utils.timezone import now
 from rest_framework import exceptions, serializers, viewsets
@@ -23,10 +27,13 @@ from posthog.api.routing import TeamAndOrgViewSetMixin
 from posthog.api.shared import UserBasicSerializer
 from posthog.api.tagged_item import TaggedItemSerializerMixin, TaggedItemViewSetMixin
 from posthog.api.utils import action
+from posthog.clickhouse.client.limit import ConcurrencyLimitExceeded, get_dashboard_tiles_rate_limiter
+from posthog.clickhouse.query_tagging import get_query_tags, reset_query_tags, tag_queries
 from posthog.event_usage import report_user_action
 from posthog.helpers import create_dashboard_from_template
 from posthog.helpers.dashboard_templates import create_from_template
-from posthog.models import Dashboard, DashboardTile, Insight, Text
+from posthog.hogql_queries.query_cache import QueryCacheManager
+from posthog.models import Dashboard, DashboardTile, Insight, Team, Text
 from posthog.models.dashboard_templates import DashboardTemplate
 from posthog.models.tagged_item import TaggedItem
 from posthog.models.user import User
@@ -445,6 +452,12 @@ class DashboardSerializer(DashboardBasicSerializer):
         large_dashboard = len(sorted_tiles) > 5
 
         with task_chain_context() if chained_tile_refresh_enabled and large_dashboard else nullcontext():
+            if settings.DASHBOARD_TILES_BATCH_LOADING_ENABLED:
+                # Chained tiles are calculated one after the other anyway
+                return self._serialize_tiles_in_batch(
+                    sorted_tiles, team, concurrent=not (chained_tile_refresh_enabled and large_dashboard)
+                )
+
             for tile in sorted_tiles:
                 self.context.update({"dashboard_tile": tile})
 
@@ -456,6 +469,99 @@ class DashboardSerializer(DashboardBasicSerializer):
 
         return serialized_tiles
 
+    def _serialize_tile(self, tile: DashboardTile, **context: Any) -> ReturnDict:
+        if isinstance(tile.layouts, str):
+            tile.layouts = json.loads(tile.layouts)
+
+        return DashboardTileSerializer(
+            tile, many=False, context={**self.context, "dashboard_tile": tile, **context}
+        ).data
+
+    def _calculate_tile(self, tile: DashboardTile, team: Team, query_tags: dict) -> Optional[ReturnDict]:
+        """Serialize a tile in a thread of the executor, returns None when the team has no calculations to spare."""
+        rate_limiter = get_dashboard_tiles_rate_limiter()
+        try:
+            running_task_key, task_id = rate_limiter.use(team_id=team.pk)
+        except ConcurrencyLimitExceeded:
+            return None
+
+        reset_query_tags()
+        tag_queries(**query_tags)
+        try:
+            return self._serialize_tile(tile)
+        finally:
+            rate_limiter.release(running_task_key, task_id)
+            reset_query_tags()
+            # Threads of the executor don't go through the request cycle, which closes database connections
+            connections.close_all()
+
+    def _serialize_tiles_in_batch(
+        self, tiles: list[DashboardTile], team: Team, *, concurrent: bool
+    ) -> list[ReturnDict]:
+        """
+        Serialize tiles with the cached results of all of them fetched in a single round trip.
+
+        Tiles missing from the cache are calculated concurrently, up to DASHBOARD_TILES_MAX_CONCURRENT_CALCULATIONS
+        per request and DASHBOARD_TILES_MAX_CONCURRENT_CALCULATIONS_PER_TEAM per team. Tiles over the team's limit
+        are calculated one by one, and tiles not calculated in time are returned without results.
+        """
+        from posthog.caching.calculate_results import calculate_cache_key_for_query_based_insight
+
+        request = self.context["request"]
+        filters_override = filters_override_requested_by_client(request)
+        variables_override = variables_override_requested_by_client(request)
+
+        cache_keys: dict[int, Optional[str]] = {
+            tile.pk: calculate_cache_key_for_query_based_insight(
+                tile.insight,
+                team=team,
+                dashboard=self.context.get("dashboard"),
+                filters_override=filters_override,
+                variables_override=variables_override,
+            )
+            for tile in tiles
+            if tile.insight is not None
+        }
+
+        with QueryCacheManager.prefetch_cache_data([key for key in cache_keys.values() if key]) as cached_keys:
+            tiles_to_calculate: dict[int, DashboardTile] = {
+                index: tile
+                for index, tile in enumerate(tiles)
+                if concurrent and tile.insight is not None and cache_keys[tile.pk] not in cached_keys
+            }
+
+            futures: dict[Future, int] = {}
+            max_workers = min(len(tiles_to_calculate), settings.DASHBOARD_TILES_MAX_CONCURRENT_CALCULATIONS)
+            if max_workers > 1:
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dashboard-tiles")
+                query_tags = get_query_tags().copy()
+                for index, tile in tiles_to_calculate.items():
+                    # Copy the context, so that tiles see the prefetched cache data
+                    context = contextvars.copy_context()
+                    futures[executor.submit(context.run, self._calculate_tile, tile, team, query_tags)] = index
+                # Calculations still running when timing out are left to finish in the background, filling the cache
+                executor.shutdown(wait=False)
+
+            serialized_tiles: dict[int, ReturnDict] = {
+                index: self._serialize_tile(tile) for index, tile in enumerate(tiles) if index not in tiles_to_calculate
+            }
+
+            if futures:
+                done, not_done = wait(futures, timeout=settings.DASHBOARD_TILES_CALCULATION_TIMEOUT_SECONDS)
+                for future in done:
+                    serialized_tile = future.result()
+                    if serialized_tile is not None:
+                        serialized_tiles[futures[future]] = serialized_tile
+                for future in not_done:
+                    index = futures[future]
+                    serialized_tiles[index] = self._serialize_tile(tiles_to_calculate[index], cache_only=True)
+
+            for index, tile in tiles_to_calculate.items():
+                if index not in serialized_tiles:
+                    serialized_tiles[index] = self._serialize_tile(tile)
+
+        return [serialized_tiles[index] for index in range(len(tiles))]
+
     def get_filters(self, dashboard: Dashboard) -> dict:
         request = self.context.get("request")
         if request:
@@ -662,8 +662,18 @@ class InsightSerializer(InsightBasicSerializer):
 
         return representation
 
-    @lru_cache(maxsize=1)
     def insight_result(self, insight: Insight) -> InsightResult:
+        # Memoized on the serializer instance rather than with a class-wide `lru_cache`, as dashboard tiles are
+        # serialized concurrently by separate instances, which would otherwise evict each other's result
+        memoized = getattr(self, "_insight_result", None)
+        if memoized is not None and memoized[0] == insight:
+            return memoized[1]
+
+        result = self._calculate_insight_result(insight)
+        self._insight_result = (insight, result)
+        return result
+
+    def _calculate_insight_result(self, insight: Insight) -> InsightResult:
         from posthog.caching.calculate_results import calculate_for_query_based_insight
 
         dashboard: Optional[Dashboard] = self.context.get("dashboard")
@@ -677,6 +687,9 @@ class InsightSerializer(InsightBasicSerializer):
 
                 if self.context.get("is_shared", False):
                     execution_mode = shared_insights_execution_mode(execution_mode)
+                if self.context.get("cache_only", False):
+                    # e.g. a dashboard tile whose calculation is still running in the background
+                    execution_mode = ExecutionMode.CACHE_ONLY_NEVER_CALCULATE
 
                 return calculate_for_query_based_insight(
                     insight,
@@ -690,8 +703,17 @@ class InsightSerializer(InsightBasicSerializer):
             except ExposedHogQLError as e:
                 raise ValidationError(str(e))
 
-    @lru_cache(maxsize=1)  # each serializer instance should only deal with one insight/tile combo
     def dashboard_tile_from_context(self, insight: Insight, dashboard: Optional[Dashboard]) -> Optional[DashboardTile]:
+        # each serializer instance should only deal with one insight/tile combo, memoized like `insight_result`
+        memoized = getattr(self, "_dashboard_tile", None)
+        if memoized is not None and memoized[0] == (insight, dashboard):
+            return memoized[1]
+
+        dashboard_tile = self._find_dashboard_tile(insight, dashboard)
+        self._dashboard_tile = ((insight, dashboard), dashboard_tile)
+        return dashboard_tile
+
+    def _find_dashboard_tile(self, insight: Insight, dashboard: Optional[Dashboard]) -> Optional[DashboardTile]:
         dashboard_tile: Optional[DashboardTile] = self.context.get("dashboard_tile", None)
 
         if dashboard_tile and dashboard_tile.deleted:
@@ -3,6 +3,7 @@ import uuid
 import json
 import time
 import asyncio
+import orjson
 from django.http import JsonResponse, StreamingHttpResponse
 from drf_spectacular.utils import OpenApiResponse
 from pydantic import BaseModel
@@ -10,6 +11,7 @@ from rest_framework import status, viewsets
 from rest_framework.exceptions import NotAuthenticated, ValidationError, Throttled
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from sentry_sdk import set_tag
 from asgiref.sync import sync_to_async
 from concurrent.futures import ThreadPoolExecutor
@@ -20,7 +22,7 @@ from posthog.api.documentation import extend_schema
 from posthog.api.mixins import PydanticModelMixin
 from posthog.api.monitoring import Feature, monitor
 from posthog.api.routing import TeamAndOrgViewSetMixin
-from posthog.api.services.query import process_query_model
+from posthog.api.services.query import process_query_model, process_query_model_streaming
 from posthog.models.team import Team
 from django.contrib.auth.models import AnonymousUser
 
@@ -29,6 +31,7 @@ from posthog.clickhouse.client.execute_async import (
     cancel_query,
     get_query_status,
     QueryStatusManager,
+    QueryStatusSubscription,
 )
 from posthog.clickhouse.query_tagging import tag_queries
 from posthog.errors import ExposedCHQueryError
@@ -95,7 +98,7 @@ class QueryViewSet(TeamAndOrgViewSetMixin, PydanticModelMixin, viewsets.ViewSet)
     # NOTE: Do we need to override the scopes for the "create"
     scope_object = "query"
     # Special case for query - these are all essentially read actions
-    scope_object_read_actions = ["retrieve", "create", "list", "destroy"]
+    scope_object_read_actions = ["retrieve", "create", "list", "destroy", "stream"]
     scope_object_write_actions: list[str] = []
     sharing_enabled_actions = ["retrieve"]
 
@@ -182,6 +185,44 @@ class QueryViewSet(TeamAndOrgViewSetMixin, PydanticModelMixin, viewsets.ViewSet)
 
         return JsonResponse(query_status_response.model_dump(), safe=False, status=http_code)
 
+    @extend_schema(
+        request=QueryRequest,
+        description="(Experimental) Stream all rows of a HogQL or events query as newline-delimited JSON. "
+        "The first line holds the columns and their types, every following line is a row.",
+        responses={200: OpenApiResponse(description="Newline-delimited JSON")},
+    )
+    @action(methods=["POST"], detail=False)
+    @monitor(feature=Feature.QUERY, endpoint="query_stream", method="POST")
+    def stream(self, request: Request, *args, **kwargs) -> StreamingHttpResponse:
+        data = self.get_model(request.data, QueryRequest)
+
+        try:
+            query, client_query_id, _ = _process_query_request(data, self.team, data.client_query_id, request.user)
+            self._tag_client_query_id(client_query_id)
+            response = process_query_model_streaming(self.team, query, query_id=client_query_id, is_query_service=True)
+        except (ExposedHogQLError, ExposedCHQueryError) as e:
+            raise ValidationError(str(e), getattr(e, "code_name", None))
+        except ConcurrencyLimitExceeded as c:
+            raise Throttled(detail=str(c))
+
+        encoder = JSONEncoder()
+
+        def ndjson_lines():
+            try:
+                yield orjson.dumps(
+                    {"columns": response.columns, "types": response.types}, option=orjson.OPT_APPEND_NEWLINE
+                )
+                for block in response.blocks:
+                    yield b"".join(
+                        orjson.dumps(row, default=encoder.default, option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+                        for row in block
+                    )
+            finally:
+                # Release the ClickHouse connection and concurrency limits right away if the client disconnects midway
+                response.blocks.close()
+
+        return StreamingHttpResponse(ndjson_lines(), content_type="application/x-ndjson")
+
     @action(methods=["POST"], detail=False)
     def check_auth_for_async(self, request: Request, *args, **kwargs):
         return JsonResponse({"user": "ok"}, status=status.HTTP_200_OK)
@@ -236,6 +277,94 @@ class QueryViewSet(TeamAndOrgViewSetMixin, PydanticModelMixin, viewsets.ViewSet)
 MAX_QUERY_TIMEOUT = 600
 
 
+async def query_awaited_event_stream(manager: QueryStatusManager, query_task: asyncio.Future):
+    """Server-sent events of the progress of an awaited query, and finally of its result or error."""
+    start_time = time.time()
+    last_update_time: float = start_time
+
+    # For things to feel snappy we want to frequently check initially, then back off so we don't overload redis
+    FAST_POLL_DURATION = 3.0  # First 3 seconds
+    MEDIUM_POLL_DURATION = 15.0  # Until 15 seconds
+    FAST_POLL_INTERVAL = 0.05
+    MEDIUM_POLL_INTERVAL = 0.1
+    SLOW_POLL_INTERVAL = 1.0
+    UPDATE_INTERVAL = 1.0  # How often to send updates to client
+
+    # Progress is only read once notified of an update, when notifications are available
+    subscription = await QueryStatusSubscription.subscribe(manager)
+    progress_updated = True
+
+    try:
+        while time.time() - start_time < MAX_QUERY_TIMEOUT:
+            # Check if the query task has completed
+            if query_task.done():
+                if query_task.cancelled():
+                    # Explicitly check for cancellation first
+                    yield f"data: {json.dumps({'error': 'Query was cancelled', 'status_code': 499})}\n\n".encode()
+                    break
+                try:
+                    result = query_task.result()
+                except asyncio.CancelledError as e:
+                    # Handle the cancellation as an SSE event
+                    yield f"data: {json.dumps({'error': 'Query was cancelled', 'status_code': 499})}\n\n".encode()
+                    capture_exception(e)
+                    break
+                except (ExposedHogQLError, ExposedCHQueryError) as e:
+                    yield f"data: {json.dumps({'error': str(e), 'status_code': 400})}\n\n".encode()
+                    break
+                except Exception as e:
+                    # Include error details for better debugging
+                    error_message = str(e)
+                    yield f"data: {json.dumps({'error': f'Server error: {error_message}'})}\n\n".encode()
+                    capture_exception(e)
+                    break
+
+                if isinstance(result, BaseModel):
+                    yield f"data: {result.model_dump_json(by_alias=True)}\n\n".encode()
+                else:
+                    yield f"data: {json.dumps(result)}\n\n".encode()
+                break
+
+            try:
+                # Try to get a status updates while waiting
+                current_time = time.time()
+                if current_time - last_update_time >= UPDATE_INTERVAL and progress_updated:
+                    status = await sync_to_async(manager.get_clickhouse_progresses)()
+                    progress_updated = subscription is None
+
+                    if isinstance(status, BaseModel):
+                        status_update = {"complete": False, **status.model_dump(by_alias=True)}
+                        yield f"data: {json.dumps(status_update)}\n\n".encode()
+                        last_update_time = current_time
+            # Just ignore errors when getting progress, shouldn't impact users
+            except Exception as e:
+                capture_exception(e)
+
+            if subscription is not None:
+                try:
+                    # Wake up as soon as the query is done or its progress is updated
+                    if await subscription.wait(query_task, timeout=UPDATE_INTERVAL):
+                        progress_updated = True
+                    continue
+                except Exception as e:
+                    # Fall back to polling
+                    capture_exception(e)
+                    await subscription.close()
+                    subscription = None
+                    progress_updated = True
+
+            elapsed_time = time.time() - start_time
+            if elapsed_time < FAST_POLL_DURATION:
+                await asyncio.sleep(FAST_POLL_INTERVAL)
+            elif elapsed_time < MEDIUM_POLL_DURATION:
+                await asyncio.sleep(MEDIUM_POLL_INTERVAL)
+            else:
+                await asyncio.sleep(SLOW_POLL_INTERVAL)
+    finally:
+        if subscription is not None:
+            await subscription.close()
+
+
 async def query_awaited(request: Request, *args, **kwargs) -> StreamingHttpResponse:
     """Async endpoint for handling event source queries using Server-Sent Events (SSE)."""
 
@@ -296,74 +425,11 @@ async def query_awaited(request: Request, *args, **kwargs) -> StreamingHttpRespo
         # YOLO give the task a moment to materialize (otherwise the task looks like it's been cancelled)
         await asyncio.sleep(0.01)
 
-        async def event_stream():
-            assert kwargs.get("team_id") is not None
-            manager = QueryStatusManager(client_query_id, cast(int, kwargs["team_id"]))
-            start_time = time.time()
-            last_update_time: float = start_time
-
-            # For things to feel snappy we want to frequently check initially, then back off so we don't overload redis
-            FAST_POLL_DURATION = 3.0  # First 3 seconds
-            MEDIUM_POLL_DURATION = 15.0  # Until 15 seconds
-            FAST_POLL_INTERVAL = 0.05
-            MEDIUM_POLL_INTERVAL = 0.1
-            SLOW_POLL_INTERVAL = 1.0
-            UPDATE_INTERVAL = 1.0  # How often to send updates to client
-
-            while time.time() - start_time < MAX_QUERY_TIMEOUT:
-                # Check if the query task has completed
-                if query_task.done():
-                    if query_task.cancelled():
-                        # Explicitly check for cancellation first
-                        yield f"data: {json.dumps({'error': 'Query was cancelled', 'status_code': 499})}\n\n".encode()
-                        break
-                    try:
-                        result = query_task.result()
-                    except asyncio.CancelledError as e:
-                        # Handle the cancellation as an SSE event
-                        yield f"data: {json.dumps({'error': 'Query was cancelled', 'status_code': 499})}\n\n".encode()
-                        capture_exception(e)
-                        break
-                    except (ExposedHogQLError, ExposedCHQueryError) as e:
-                        yield f"data: {json.dumps({'error': str(e), 'status_code': 400})}\n\n".encode()
-                        break
-                    except Exception as e:
-                        # Include error details for better debugging
-                        error_message = str(e)
-                        yield f"data: {json.dumps({'error': f'Server error: {error_message}'})}\n\n".encode()
-                        capture_exception(e)
-                        break
-
-                    if isinstance(result, BaseModel):
-                        yield f"data: {result.model_dump_json(by_alias=True)}\n\n".encode()
-                    else:
-                        yield f"data: {json.dumps(result)}\n\n".encode()
-                    break
-
-                try:
-                    # Try to get a status updates while waiting
-                    current_time = time.time()
-                    if current_time - last_update_time >= UPDATE_INTERVAL:
-                        status = await sync_to_async(manager.get_clickhouse_progresses)()
-
-                        if isinstance(status, BaseModel):
-                            status_update = {"complete": False, **status.model_dump(by_alias=True)}
-                            yield f"data: {json.dumps(status_update)}\n\n".encode()
-                            last_update_time = current_time
-                # Just ignore errors when getting progress, shouldn't impact users
-                except Exception as e:
-                    capture_exception(e)
-
-                elapsed_time = time.time() - start_time
-                if elapsed_time < FAST_POLL_DURATION:
-                    await asyncio.sleep(FAST_POLL_INTERVAL)
-                elif elapsed_time < MEDIUM_POLL_DURATION:
-                    await asyncio.sleep(MEDIUM_POLL_INTERVAL)
-                else:
-                    await asyncio.sleep(SLOW_POLL_INTERVAL)
+        assert kwargs.get("team_id") is not None
+        manager = QueryStatusManager(client_query_id, cast(int, kwargs["team_id"]))
 
         return StreamingHttpResponse(
-            event_stream(),
+            query_awaited_event_stream(manager, query_task),
             content_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
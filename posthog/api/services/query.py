@@ -1,10 +1,13 @@
 import structlog
+from collections.abc import Generator
+from contextlib import ExitStack
 from typing import Optional
 
 from pydantic import BaseModel
 from rest_framework.exceptions import ValidationError
 
 from common.hogvm.python.debugger import color_bytecode
+from posthog.clickhouse.client.limit import get_api_personal_rate_limiter, get_query_stream_rate_limiter
 from posthog.clickhouse.query_tagging import tag_queries
 from posthog.cloud_utils import is_cloud
 from posthog.hogql.compiler.bytecode import execute_hog
@@ -14,6 +17,7 @@ from posthog.hogql.database.database import create_hogql_database, serialize_dat
 from posthog.hogql.autocomplete import get_hogql_autocomplete
 from posthog.hogql.metadata import get_hogql_metadata
 from posthog.hogql.modifiers import create_default_modifiers_for_team
+from posthog.hogql.query import HogQLQueryExecutor, HogQLStreamingResponse
 from posthog.hogql_queries.query_runner import CacheMissResponse, ExecutionMode, get_query_runner
 from posthog.models import Team, User
 from posthog.schema import (
@@ -25,6 +29,8 @@ from posthog.schema import (
     HogQLMetadata,
     QuerySchemaRoot,
     DatabaseSchemaQuery,
+    EventsQuery,
+    HogQLQuery,
     HogQueryResponse,
 )
 
@@ -143,3 +149,64 @@ def process_query_model(
         )
 
     return result
+
+
+STREAMABLE_QUERY_KINDS = (HogQLQuery, EventsQuery)
+
+
+def process_query_model_streaming(
+    team: Team,
+    query: BaseModel,
+    *,
+    block_size: int = 10_000,
+    query_id: Optional[str] = None,
+    is_query_service: bool = False,
+) -> HogQLStreamingResponse:
+    """
+    Run a tabular query without caching, streaming its rows instead of materializing them all in memory.
+
+    Meant for large result sets (exports, API consumers paging through everything), so the export limit applies.
+    Concurrency limits are held until the stream is exhausted or closed.
+
+    Raises:
+        ConcurrencyLimitExceeded: If the team is already streaming as many queries as it's allowed to.
+    """
+    if not isinstance(query, STREAMABLE_QUERY_KINDS):
+        raise ValidationError(f"Streaming is not supported for query kind: {query.__class__.__name__}")
+
+    query_runner = get_query_runner(query, team, limit_context=LimitContext.EXPORT)
+    query_runner.is_query_service = is_query_service
+
+    with ExitStack() as limits:
+        limits.enter_context(
+            get_api_personal_rate_limiter().run(
+                is_api=query_runner.query_endpoint_with_personal_key(), team_id=team.pk, task_id=query_id
+            )
+        )
+        stream_rate_limiter = get_query_stream_rate_limiter()
+        limits.callback(stream_rate_limiter.release, *stream_rate_limiter.use(team_id=team.pk, task_id=query_id))
+
+        response = HogQLQueryExecutor(
+            query_type=query.kind,
+            query=query_runner.to_query(),
+            team=team,
+            filters=query.filters if isinstance(query, HogQLQuery) else None,
+            variables=query.variables if isinstance(query, HogQLQuery) else None,
+            modifiers=query_runner.modifiers,
+            timings=query_runner.timings,
+            limit_context=LimitContext.EXPORT,
+        ).execute_streaming(block_size=block_size)
+        # From now on, limits are released by the stream
+        response.blocks = _release_when_closed(response.blocks, limits.pop_all())
+        # Started right away, so that closing the stream before reading any block releases the limits too
+        next(response.blocks)
+
+    return response
+
+
+def _release_when_closed(
+    blocks: Generator[list[tuple], None, None], limits: ExitStack
+) -> Generator[list[tuple], None, None]:
+    with limits:
+        yield []
+        yield from blocks
@@ -1,3 +1,4 @@
+import threading
 from unittest import mock
 from unittest.mock import ANY, MagicMock, patch
 
@@ -9,7 +10,9 @@ from freezegun import freeze_time
 from rest_framework import status
 
 from posthog.api.dashboards.dashboard import DashboardSerializer
+from posthog.api.insight import InsightSerializer
 from posthog.api.test.dashboards import DashboardAPI
+from posthog.clickhouse.client.limit import ConcurrencyLimitExceeded
 from posthog.constants import AvailableFeature
 from posthog.hogql_queries.legacy_compatibility.filter_to_query import filter_to_query
 from posthog.models import Dashboard, DashboardTile, Filter, Insight, Team, User
@@ -255,6 +258,107 @@ class TestDashboard(APIBaseTest, QueryMatchingTest):
         )
         self.assertEqual(response["tiles"][0]["insight"]["result"][0]["count"], 0)
 
+    @override_settings(DASHBOARD_TILES_BATCH_LOADING_ENABLED=True)
+    def test_return_cached_results_fetched_in_batch(self):
+        dashboard = Dashboard.objects.create(team=self.team, name="dashboard")
+
+        insights = []
+        for browser in ["Mac OS X", "Windows"]:
+            filter_dict = {"events": [{"id": "$pageview"}], "properties": [{"key": "$browser", "value": browser}]}
+            insight = Insight.objects.create(filters=Filter(data=filter_dict).to_dict(), team=self.team)
+            DashboardTile.objects.create(dashboard=dashboard, insight=insight)
+            insights.append(insight)
+
+        response = self.dashboard_api.get_dashboard(dashboard.pk, query_params={"refresh": False})
+        self.assertEqual([tile["insight"]["result"] for tile in response["tiles"]], [None, None])
+
+        # cache results
+        for insight in insights:
+            self.client.get(f"/api/projects/{self.team.id}/insights/{insight.pk}?refresh=true")
+
+        with patch("posthog.hogql_queries.query_cache.get_safe_cache") as mock_get_safe_cache:
+            response = self.dashboard_api.get_dashboard(dashboard.pk, query_params={"refresh": False})
+
+        # All cached results were read with a single round trip
+        mock_get_safe_cache.assert_not_called()
+        self.assertEqual([tile["insight"]["result"][0]["count"] for tile in response["tiles"]], [0, 0])
+
+    @override_settings(
+        DASHBOARD_TILES_BATCH_LOADING_ENABLED=True,
+        DASHBOARD_TILES_MAX_CONCURRENT_CALCULATIONS=4,
+        DASHBOARD_TILES_CALCULATION_TIMEOUT_SECONDS=1,
+    )
+    def test_calculates_uncached_tiles_concurrently(self):
+        dashboard = Dashboard.objects.create(team=self.team, name="dashboard")
+        tiles = []
+        for index in range(4):
+            insight = Insight.objects.create(filters={"events": [{"id": f"event_{index}"}]}, team=self.team)
+            tile = DashboardTile.objects.create(dashboard=dashboard, insight=insight, layouts={"xs": {"y": index}})
+            tiles.append(tile)
+
+        lock = threading.Lock()
+        release_slow_tile = threading.Event()
+        limiter_calls: list[int] = []
+        calculations: list[tuple[int, bool, bool]] = []
+        slow_tile_ids: list[int] = []
+
+        def use(team_id):
+            with lock:
+                limiter_calls.append(team_id)
+                if len(limiter_calls) == 1:
+                    raise ConcurrencyLimitExceeded()
+                return "running_tasks_key", f"task_{len(limiter_calls)}"
+
+        def serialize_tile(_serializer, tile, **context):
+            in_worker = threading.current_thread().name.startswith("dashboard-tiles")
+            with lock:
+                calculations.append((tile.pk, in_worker, context.get("cache_only", False)))
+                is_slow_tile = in_worker and not slow_tile_ids
+                if is_slow_tile:
+                    slow_tile_ids.append(tile.pk)
+            if is_slow_tile:
+                # Still calculating when the request stops waiting for it
+                release_slow_tile.wait(timeout=10)
+            return {"id": tile.pk, "cache_only": context.get("cache_only", False)}
+
+        rate_limiter = MagicMock()
+        rate_limiter.use.side_effect = use
+        try:
+            with (
+                patch("posthog.api.dashboards.dashboard.get_dashboard_tiles_rate_limiter", return_value=rate_limiter),
+                patch.object(DashboardSerializer, "_serialize_tile", autospec=True, side_effect=serialize_tile),
+            ):
+                response = self.dashboard_api.get_dashboard(dashboard.pk, query_params={"refresh": False})
+        finally:
+            release_slow_tile.set()
+
+        # Tiles keep the order of the dashboard layout, whichever finished first
+        self.assertEqual([tile["id"] for tile in response["tiles"]], [tile.pk for tile in tiles])
+        self.assertEqual(limiter_calls, [self.team.pk] * 4)
+
+        # The tile over the team's limit was calculated in the request thread instead
+        calculated_in_request = [tile_id for tile_id, in_worker, cache_only in calculations if not in_worker]
+        self.assertEqual(len(calculated_in_request), 2)
+        self.assertIn(slow_tile_ids[0], calculated_in_request)
+
+        # The tile not calculated in time was returned from the cache only
+        self.assertEqual([tile["id"] for tile in response["tiles"] if tile["cache_only"]], slow_tile_ids)
+        self.assertEqual(len([tile_id for tile_id, in_worker, _ in calculations if in_worker]), 3)
+
+    def test_insight_result_is_memoized_per_serializer_instance(self):
+        insight = Insight.objects.create(filters={"events": [{"id": "$pageview"}]}, team=self.team)
+        serializers = [InsightSerializer(context={}), InsightSerializer(context={})]
+
+        with patch.object(
+            InsightSerializer, "_calculate_insight_result", autospec=True, side_effect=lambda serializer, _: serializer
+        ) as mock_calculate:
+            # Alternating between instances, as tiles serialized concurrently do, doesn't evict results
+            for _ in range(2):
+                for serializer in serializers:
+                    self.assertIs(serializer.insight_result(insight), serializer)
+
+        self.assertEqual(mock_calculate.call_count, 2)
+
     # :KLUDGE: avoid making extra queries that are explicitly not cached in tests. Avoids false N+1-s.
     @override_settings(PERSON_ON_EVENTS_OVERRIDE=False, PERSON_ON_EVENTS_V2_OVERRIDE=False)
     @snapshot_postgres_queries
@@ -37,13 +37,14 @@ from ee.billing.quota_limiting import QuotaLimitingCaches
 from posthog.api import capture
 from posthog.api.capture import (
     LIKELY_ANONYMOUS_IDS,
+    capture_batch_internal,
     get_distinct_id,
     is_randomly_partitioned,
     sample_replay_data_to_object_storage,
 )
 from posthog.api.test.mock_sentry import mock_sentry_context_for_tagging
 from posthog.api.test.openapi_validation import validate_response
-from posthog.kafka_client.client import KafkaProducer, session_recording_kafka_producer
+from posthog.kafka_client.client import KafkaProducer, KafkaProducerForTests, session_recording_kafka_producer
 from posthog.kafka_client.topics import (
     KAFKA_EVENTS_PLUGIN_INGESTION_HISTORICAL,
     KAFKA_SESSION_RECORDING_SNAPSHOT_ITEM_EVENTS,
@@ -389,6 +390,45 @@ class TestCapture(BaseTest):
         with override_settings(CAPTURE_ALLOW_RANDOM_PARTITIONING=False):
             self._do_test_capture_with_likely_anonymous_ids(expect_random_partitioning=False)
 
+    def test_capture_batch_internal(self):
+        events = [
+            {"event": "$pageview", "distinct_id": f"user-{i}", "properties": {"$current_url": "https://example.com"}}
+            for i in range(3)
+        ]
+
+        with patch.object(
+            KafkaProducerForTests, "send", autospec=True, side_effect=KafkaProducerForTests.send
+        ) as kafka_send:
+            future = capture_batch_internal(
+                events,
+                ip=None,
+                site_url="http://testserver",
+                now=datetime.now(UTC),
+                sent_at=None,
+                token=self.team.api_token,
+            )
+            future.result(timeout=1)
+
+        assert kafka_send.call_count == len(events)
+        for send_call, event in zip(kafka_send.call_args_list, events):
+            assert send_call.args[1] == KAFKA_EVENTS_PLUGIN_INGESTION_TOPIC
+            assert send_call.kwargs["key"] == f"{self.team.api_token}:{event['distinct_id']}".encode()
+            kafka_event = json.loads(send_call.kwargs["value"])
+            assert kafka_event["distinct_id"] == event["distinct_id"]
+            assert kafka_event["token"] == self.team.api_token
+            assert json.loads(kafka_event["data"]) == event
+
+    def test_capture_batch_internal_rejects_session_recording_events(self):
+        with self.assertRaises(ValueError):
+            capture_batch_internal(
+                [{"event": "$snapshot_items", "distinct_id": "user", "properties": {"$session_id": "session"}}],
+                ip=None,
+                site_url="http://testserver",
+                now=datetime.now(UTC),
+                sent_at=None,
+                token=self.team.api_token,
+            )
+
     def test_cached_is_randomly_partitioned(self):
         """Assert the behavior of is_randomly_partitioned under certain cache settings.
 
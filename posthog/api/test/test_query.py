@@ -1,16 +1,25 @@
+import asyncio
 import json
 from unittest import mock
 from unittest.mock import patch
 
+from asgiref.sync import sync_to_async
+from clickhouse_driver import Client
+from django.test import SimpleTestCase, override_settings
 from freezegun import freeze_time
 from rest_framework import status
 
+from posthog.api.query import query_awaited_event_stream
 from posthog.api.services.query import process_query_dict
+from posthog.clickhouse.client import sync_execute
+from posthog.clickhouse.client.execute_async import QueryStatusManager, QueryStatusSubscription
+from posthog.clickhouse.client.limit import get_query_stream_rate_limiter
 
 
 from posthog.models.insight_variable import InsightVariable
 from posthog.models.property_definition import PropertyDefinition, PropertyType
 from posthog.models.utils import UUIDT
+from posthog.redis import get_client
 from posthog.hogql.constants import LimitContext
 from posthog.schema import (
     CachedEventsQueryResponse,
@@ -1049,6 +1058,49 @@ class TestQuery(ClickhouseTestMixin, APIBaseTest):
         response = CachedHogQLQueryResponse.model_validate(api_response)
         assert response.results[0][0] == variable_override_value
 
+    def test_stream_closed_midway_disconnects_clickhouse_client(self):
+        query = HogQLQuery(query="select number from numbers(1000000)")
+        original_disconnect = Client.disconnect
+
+        with patch.object(Client, "disconnect", autospec=True, side_effect=original_disconnect) as mock_disconnect:
+            response = self.client.post(f"/api/environments/{self.team.id}/query/stream/", {"query": query.dict()})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            streaming_content = iter(response.streaming_content)  # type: ignore[attr-defined]
+            header = json.loads(next(streaming_content))
+            self.assertEqual(header["columns"], ["number"])
+            next(streaming_content)
+            # As when the client disconnects before reading all rows
+            response.close()
+
+            mock_disconnect.assert_called_once()
+
+        # The connection returned to the pool can still be used
+        self.assertEqual(sync_execute("SELECT 1"), [(1,)])
+
+    def test_stream_is_refused_when_concurrency_limit_is_exhausted(self):
+        query = HogQLQuery(query="select number from numbers(10)")
+        rate_limiter = get_query_stream_rate_limiter()
+        running_streams = [
+            rate_limiter.use(team_id=self.team.id, task_id=f"running_stream_{index}")
+            for index in range(rate_limiter.max_concurrent_tasks)
+        ]
+
+        response = self.client.post(f"/api/environments/{self.team.id}/query/stream/", {"query": query.dict()})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        for running_stream in running_streams:
+            rate_limiter.release(*running_stream)
+
+        response = self.client.post(f"/api/environments/{self.team.id}/query/stream/", {"query": query.dict()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b"".join(response.streaming_content).splitlines()  # type: ignore[attr-defined]
+        self.assertEqual(len(lines), 11)
+
+        # The stream released its slot once fully read
+        running_streams_key, _ = running_streams[0]
+        self.assertEqual(rate_limiter.redis_client.zcard(running_streams_key), 0)
+
 
 class TestQueryAwaited(ClickhouseTestMixin, APIBaseTest):
     def test_async_query_invalid_json(self):
@@ -1080,6 +1132,74 @@ class TestQueryAwaited(ClickhouseTestMixin, APIBaseTest):
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
 
+class TestQueryAwaitedEventStream(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        get_client().flushall()
+        self.query_id = "550e8400-e29b-41d4-a716-446655440000"
+        self.team_id = 12345
+        self.manager = QueryStatusManager(self.query_id, self.team_id)
+
+    def _event(self, data: bytes) -> dict:
+        return json.loads(data.decode().removeprefix("data: "))
+
+    @override_settings(QUERY_STATUS_NOTIFICATIONS_ENABLED=True)
+    async def test_wakes_up_on_notifications_and_ends_once_the_query_is_done(self):
+        query_task = asyncio.get_running_loop().create_future()
+        stream = query_awaited_event_stream(self.manager, query_task)
+
+        with patch.object(
+            self.manager, "get_clickhouse_progresses", wraps=self.manager.get_clickhouse_progresses
+        ) as get_clickhouse_progresses:
+            first_update = self._event(await asyncio.wait_for(anext(stream), timeout=5))
+            self.assertEqual(first_update["bytes_read"], 0)
+
+            await sync_to_async(self.manager.update_clickhouse_query_progresses)(
+                [
+                    {
+                        "query_id": f"{self.team_id}_{self.query_id}_1",
+                        "bytes_read": 1,
+                        "rows_read": 1,
+                        "estimated_rows_total": 2,
+                        "time_elapsed": 1,
+                        "active_cpu_time": 1,
+                    }
+                ]
+            )
+            second_update = self._event(await asyncio.wait_for(anext(stream), timeout=5))
+            self.assertEqual(second_update["bytes_read"], 1)
+
+            query_task.set_result({"results": [[1]]})
+            # The stream is waiting on the query too, so it responds as soon as it's done
+            result = self._event(await asyncio.wait_for(anext(stream), timeout=0.5))
+            self.assertEqual(result, {"results": [[1]]})
+
+            with self.assertRaises(StopAsyncIteration):
+                await anext(stream)
+
+        # Progress was only read once initially, and once notified of its update
+        self.assertEqual(get_clickhouse_progresses.call_count, 2)
+
+    async def test_polls_when_notifications_are_disabled(self):
+        query_task = asyncio.get_running_loop().create_future()
+        asyncio.get_running_loop().call_later(0.2, query_task.set_result, {"results": []})
+
+        events = [self._event(event) async for event in query_awaited_event_stream(self.manager, query_task)]
+
+        self.assertEqual(events, [{"results": []}])
+
+    @override_settings(QUERY_STATUS_NOTIFICATIONS_ENABLED=True)
+    async def test_falls_back_to_polling_when_notifications_fail(self):
+        query_task = asyncio.get_running_loop().create_future()
+        asyncio.get_running_loop().call_later(0.2, query_task.set_result, {"results": []})
+
+        with patch.object(QueryStatusSubscription, "wait", side_effect=ConnectionError) as wait:
+            events = [self._event(event) async for event in query_awaited_event_stream(self.manager, query_task)]
+
+        self.assertEqual(events, [{"results": []}])
+        wait.assert_called_once()
+
+
 class TestQueryRetrieve(APIBaseTest):
     def setUp(self):
         super().setUp()
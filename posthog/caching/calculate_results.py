@@ -7,7 +7,7 @@ from pydantic import BaseModel
 from posthog.api.services.query import ExecutionMode, process_query_dict
 from posthog.clickhouse.query_tagging import tag_queries
 from posthog.hogql_queries.legacy_compatibility.flagged_conversion_manager import conversion_to_query_based
-from posthog.hogql_queries.query_runner import get_query_runner_or_none
+from posthog.hogql_queries.query_runner import get_query_runner, get_query_runner_or_none
 from posthog.models import (
     Dashboard,
     DashboardTile,
@@ -16,7 +16,7 @@ from posthog.models import (
     User,
 )
 from posthog.models.insight import generate_insight_filters_hash
-from posthog.schema import CacheMissResponse, DashboardFilter
+from posthog.schema import CacheMissResponse, DashboardFilter, HogQLVariable, QuerySchemaRoot
 
 if TYPE_CHECKING:
     from posthog.caching.fetch_from_cache import InsightResult
@@ -45,6 +45,53 @@ def calculate_cache_key(target: Union[DashboardTile, Insight]) -> Optional[str]:
     return None
 
 
+def calculate_cache_key_for_query_based_insight(
+    insight: Insight,
+    *,
+    team: Team,
+    dashboard: Optional[Dashboard] = None,
+    filters_override: Optional[dict] = None,
+    variables_override: Optional[dict] = None,
+) -> Optional[str]:
+    """
+    The cache key `calculate_for_query_based_insight` looks the results of the insight up by, without running it.
+    Best-effort: returns None when the key can't be determined.
+    """
+    dashboard_filters_json = (
+        filters_override if filters_override is not None else dashboard.filters if dashboard is not None else None
+    )
+    variables_override_json = (
+        variables_override if variables_override is not None else dashboard.variables if dashboard is not None else None
+    )
+
+    try:
+        with conversion_to_query_based(insight):
+            if not insight.query:
+                return None
+            query = QuerySchemaRoot.model_validate(insight.query).root
+
+        # Mirrors how `process_query_model` finds the query runner
+        while True:
+            try:
+                query_runner = get_query_runner(query, team)
+                break
+            except ValueError:
+                if not isinstance(getattr(query, "source", None), BaseModel):
+                    return None
+                query = query.source
+
+        if dashboard_filters_json:
+            query_runner.apply_dashboard_filters(DashboardFilter.model_validate(dashboard_filters_json))
+        if variables_override_json:
+            query_runner.apply_variable_overrides(
+                [HogQLVariable.model_validate(variable) for variable in variables_override_json.values()]
+            )
+        return query_runner.get_cache_key()
+    except Exception:
+        logger.warning("calculate_cache_key_for_query_based_insight_failed", insight_id=insight.pk, exc_info=True)
+        return None
+
+
 def calculate_for_query_based_insight(
     insight: Insight,
     *,
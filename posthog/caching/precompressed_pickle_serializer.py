@@ -0,0 +1,26 @@
+from typing import Any
+
+from django_redis.serializers.pickle import PickleSerializer
+
+from posthog.caching.tolerant_zlib_compressor import PRECOMPRESSED_VALUE_PREFIX
+
+
+class PrecompressedPickleSerializer(PickleSerializer):
+    """
+    Pickles values like the default serializer, except for values that were already compressed before being written
+    to the cache (e.g. by the query cache codec), which are written as-is.
+
+    Pickled values start with the PROTO opcode, so they can't be mistaken for precompressed ones when read.
+    Left pickled, precompressed values wouldn't start with the prefix by the time they reach the compressor,
+    which would compress them again.
+    """
+
+    def dumps(self, value: Any) -> bytes:
+        if isinstance(value, bytes) and value.startswith(PRECOMPRESSED_VALUE_PREFIX):
+            return value
+        return super().dumps(value)
+
+    def loads(self, value: bytes) -> Any:
+        if value.startswith(PRECOMPRESSED_VALUE_PREFIX):
+            return value
+        return super().loads(value)
@@ -1,7 +1,7 @@
 from django.test import TestCase
 from parameterized import parameterized
 
-from posthog.caching.tolerant_zlib_compressor import TolerantZlibCompressor
+from posthog.caching.tolerant_zlib_compressor import PRECOMPRESSED_VALUE_PREFIX, TolerantZlibCompressor
 
 
 class TestTolerantZlibCompressor(TestCase):
@@ -34,6 +34,12 @@ class TestTolerantZlibCompressor(TestCase):
                 short_uncompressed_bytes,
                 short_uncompressed_bytes,
             ),
+            (
+                "test_when_enabled_does_not_compress_precompressed_values",
+                True,
+                PRECOMPRESSED_VALUE_PREFIX + uncompressed_bytes,
+                PRECOMPRESSED_VALUE_PREFIX + uncompressed_bytes,
+            ),
         ]
     )
     def test_the_zlib_compressor_compression(self, _, setting: bool, input: bytes, output: bytes) -> None:
@@ -67,6 +73,12 @@ class TestTolerantZlibCompressor(TestCase):
                 zlib_compressed_bytes,
                 uncompressed_bytes,
             ),
+            (
+                "test_when_enabled_does_not_decompress_precompressed_values",
+                True,
+                PRECOMPRESSED_VALUE_PREFIX + zstd_compressed_bytes,
+                PRECOMPRESSED_VALUE_PREFIX + zstd_compressed_bytes,
+            ),
         ]
     )
     def test_the_zlib_compressor_decompression(self, _, setting: bool, input: bytes, output: bytes) -> None:
@@ -1,9 +1,22 @@
-from posthog.caching.warming import insights_to_keep_fresh, schedule_warming_for_teams_task
+from posthog import redis
+from posthog.caching.warming import (
+    TOO_MANY_SIMULTANEOUS_QUERIES_KEY,
+    WarmingCandidate,
+    get_warming_candidates,
+    insights_to_keep_fresh,
+    record_too_many_simultaneous_queries,
+    record_warming_cost,
+    schedule_warming_for_teams_task,
+    select_insights_to_warm,
+    warming_budget_factor,
+)
 from posthog.models import Insight, DashboardTile, InsightViewed, Dashboard
 
 from datetime import datetime, timedelta, UTC
 from unittest.mock import patch
 
+from django.test import override_settings
+
 from posthog.test.base import APIBaseTest
 
 
@@ -115,6 +128,86 @@ class TestWarming(APIBaseTest):
         ]
         self.assertEqual(insights, expected_results)
 
+    def test_get_warming_candidates(self):
+        record_warming_cost(self.team.pk, 2345, None, 12.5)
+
+        candidates = get_warming_candidates(self.team, [(2345, None), (3456, 7890)])
+
+        self.assertEqual(
+            [(c.insight_id, c.dashboard_id, c.recent_views, c.cost_seconds) for c in candidates],
+            [(2345, None, 1, 12.5), (3456, 7890, 0, 5)],
+        )
+        self.assertEqual(candidates[1].last_viewed_at, self.dashboard2.last_accessed_at)
+
+
+class TestSelectInsightsToWarm(APIBaseTest):
+    def _candidate(
+        self,
+        insight_id: int,
+        *,
+        team_id: int = 1,
+        recent_views: int = 0,
+        cost_seconds: float = 10,
+        target_age: timedelta = timedelta(hours=-1),
+    ):
+        return WarmingCandidate(
+            team_id=team_id,
+            insight_id=insight_id,
+            dashboard_id=None,
+            recent_views=recent_views,
+            last_viewed_at=datetime.now(UTC) - timedelta(days=1),
+            target_age=datetime.now(UTC) + target_age,
+            cost_seconds=cost_seconds,
+        )
+
+    def test_selects_most_valuable_insights_first(self):
+        candidates = [
+            self._candidate(1, recent_views=1),
+            self._candidate(2, recent_views=10),
+            self._candidate(3, recent_views=1, cost_seconds=100),
+        ]
+
+        selected = select_insights_to_warm(candidates, team_budget_seconds=1000, global_budget_seconds=1000)
+
+        self.assertEqual([candidate.insight_id for candidate in selected], [2, 1, 3])
+
+    def test_respects_team_and_global_budgets(self):
+        candidates = [
+            self._candidate(1, team_id=1, recent_views=3),
+            self._candidate(2, team_id=1, recent_views=2),
+            self._candidate(3, team_id=2, recent_views=1),
+            self._candidate(4, team_id=2, recent_views=0, cost_seconds=1),
+            self._candidate(5, team_id=3, recent_views=0),
+        ]
+
+        selected = select_insights_to_warm(candidates, team_budget_seconds=15, global_budget_seconds=25)
+
+        # Insight 2 doesn't fit in the team budget, insight 5 doesn't fit in the global budget
+        self.assertEqual({candidate.insight_id for candidate in selected}, {1, 3, 4})
+
+    def test_does_not_spend_budget_on_insights_that_are_not_stale_yet(self):
+        candidates = [
+            self._candidate(1, recent_views=10, target_age=timedelta(hours=1)),
+            self._candidate(2, recent_views=10, target_age=timedelta(minutes=5)),
+            self._candidate(3, recent_views=1),
+            self._candidate(4, recent_views=0),
+        ]
+
+        selected = select_insights_to_warm(candidates, team_budget_seconds=20, global_budget_seconds=20)
+
+        # Fresh insights 1 and 2 would have used up the whole budget, but warming wouldn't recalculate them
+        self.assertEqual([candidate.insight_id for candidate in selected], [3, 4])
+
+    def test_backs_off_when_clickhouse_rejects_queries(self):
+        redis.get_client().delete(TOO_MANY_SIMULTANEOUS_QUERIES_KEY)
+        self.assertEqual(warming_budget_factor(), 1)
+
+        for _ in range(20):
+            record_too_many_simultaneous_queries()
+
+        self.assertEqual(warming_budget_factor(), 0.25)
+        redis.get_client().delete(TOO_MANY_SIMULTANEOUS_QUERIES_KEY)
+
 
 class TestScheduleWarmingForTeamsTask(APIBaseTest):
     def setUp(self) -> None:
@@ -153,3 +246,21 @@ class TestScheduleWarmingForTeamsTask(APIBaseTest):
         self.assertEqual(mock_warm_insight_cache_task_si.call_args_list[0][0][0], "1234")
         self.assertEqual(mock_warm_insight_cache_task_si.call_args_list[0][0][1], "5678")
         self.assertEqual(mock_warm_insight_cache_task_si.call_args_list[1][0][0], "2345")
+
+    @override_settings(
+        CACHE_WARMING_PRIORITIZATION_ENABLED=True,
+        CACHE_WARMING_TEAM_BUDGET_SECONDS=10,
+        CACHE_WARMING_DEFAULT_COST_SECONDS=5,
+    )
+    @patch("posthog.caching.warming.largest_teams")
+    @patch("posthog.caching.warming.insights_to_keep_fresh")
+    @patch("posthog.caching.warming.warm_insight_cache_task.si")
+    def test_schedule_warming_for_teams_task_within_budget(
+        self, mock_warm_insight_cache_task_si, mock_insights_to_keep_fresh, mock_largest_teams
+    ):
+        mock_largest_teams.return_value = [self.team1.pk]
+        mock_insights_to_keep_fresh.return_value = iter([(1234, None), (2345, None), (3456, None)])
+
+        schedule_warming_for_teams_task()
+
+        self.assertEqual(mock_warm_insight_cache_task_si.call_count, 2)
@@ -28,6 +28,11 @@ USING_ZLIB_VALUE_COUNTER = Counter(
 )
 
 
+# Values starting with this prefix were already compressed before being written to the cache (e.g. by the
+# query cache codec), so there's nothing to gain from compressing them again
+PRECOMPRESSED_VALUE_PREFIX = b"\x00PHC"
+
+
 class TolerantZlibCompressor(BaseCompressor):
     """
     If the compressor is turned on then values written to the cache will be compressed using zlib.
@@ -44,11 +49,15 @@ class TolerantZlibCompressor(BaseCompressor):
     zlib_preset = 6
 
     def compress(self, value: bytes) -> bytes:
+        if value.startswith(PRECOMPRESSED_VALUE_PREFIX):
+            return value
         if settings.USE_REDIS_COMPRESSION and len(value) > self.min_length:
             return zstd.compress(value, self.zstd_preset, self.zstd_threads)
         return value
 
     def decompress(self, value: bytes) -> bytes:
+        if value.startswith(PRECOMPRESSED_VALUE_PREFIX):
+            return value
         try:
             try:
                 return zstd.decompress(value)
@@ -1,4 +1,8 @@
 import itertools
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import timedelta, UTC, datetime
 from collections.abc import Generator
 from typing import Optional
@@ -6,10 +10,12 @@ from typing import Optional
 import structlog
 from celery import shared_task
 from celery.canvas import chain
-from django.db.models import Q
+from django.conf import settings
+from django.db.models import Count, Max, Q
 from prometheus_client import Counter, Gauge
 from posthog.exceptions_capture import capture_exception
 
+from posthog import redis
 from posthog.api.services.query import process_query_dict
 from posthog.caching.utils import largest_teams
 from posthog.clickhouse.query_tagging import tag_queries
@@ -18,7 +24,7 @@ from posthog.hogql.constants import LimitContext
 from posthog.hogql_queries.query_cache import QueryCacheManager
 from posthog.hogql_queries.legacy_compatibility.flagged_conversion_manager import conversion_to_query_based
 from posthog.hogql_queries.query_runner import ExecutionMode
-from posthog.models import Team, Insight, DashboardTile
+from posthog.models import Team, Insight, DashboardTile, Dashboard, InsightViewed
 from posthog.tasks.utils import CeleryQueue
 from posthog.ph_client import ph_us_client
 import posthoganalytics
@@ -37,9 +43,25 @@ PRIORITY_INSIGHTS_COUNTER = Counter(
     ["team_id", "dashboard", "is_cached"],
 )
 
+WARMING_BUDGET_GAUGE = Gauge(
+    "posthog_cache_warming_budget_seconds",
+    "ClickHouse seconds cache warming may spend in the current cycle, after backing off",
+)
+DEPRIORITIZED_INSIGHTS_GAUGE = Gauge(
+    "posthog_cache_warming_deprioritized_insights_gauge",
+    "Number of stale insights not warmed in the current cycle for lack of budget",
+    ["team_id"],
+)
+
 LAST_VIEWED_THRESHOLD = timedelta(days=7)
 SHARED_INSIGHTS_LAST_VIEWED_THRESHOLD = timedelta(days=3)
 
+WARMING_COSTS_KEY_PREFIX = "cache_warming_costs"
+TOO_MANY_SIMULTANEOUS_QUERIES_KEY = "cache_warming_too_many_simultaneous_queries"
+TOO_MANY_SIMULTANEOUS_QUERIES_WINDOW = timedelta(hours=1)
+# Halve the warming budget for every this many queries rejected by ClickHouse in the window
+TOO_MANY_SIMULTANEOUS_QUERIES_PER_HALVING = 10
+
 
 def teams_enabled_for_cache_warming() -> list[int]:
     enabled_team_ids = []
@@ -128,6 +150,174 @@ def insights_to_keep_fresh(team: Team, shared_only: bool = False) -> Generator[t
     yield from dashboard_tiles
 
 
+@dataclass(frozen=True)
+class WarmingCandidate:
+    team_id: int
+    insight_id: int
+    dashboard_id: Optional[int]
+    recent_views: int
+    last_viewed_at: Optional[datetime]
+    target_age: Optional[datetime]
+    cost_seconds: float
+
+    def priority(self, now: datetime) -> float:
+        """Value of keeping this insight fresh, per ClickHouse second spent on it."""
+        days_since_viewed = (now - self.last_viewed_at).total_seconds() / 86400 if self.last_viewed_at else 7
+        hours_stale = max((now - self.target_age).total_seconds() / 3600, 0) if self.target_age else 0
+        value = (1 + self.recent_views) / (1 + max(days_since_viewed, 0)) * (1 + math.log1p(hours_stale))
+        return value / max(self.cost_seconds, 0.1)
+
+    def is_fresh(self, now: datetime) -> bool:
+        """Whether the cached result isn't stale yet, in which case warming won't recalculate it."""
+        return self.target_age is not None and self.target_age > now
+
+
+def _warming_identifier(insight_id: int, dashboard_id: Optional[int]) -> str:
+    return f"{insight_id}:{dashboard_id or ''}"
+
+
+def record_warming_cost(team_id: int, insight_id: int, dashboard_id: Optional[int], seconds: float) -> None:
+    key = f"{WARMING_COSTS_KEY_PREFIX}:{team_id}"
+    pipeline = redis.get_client().pipeline(transaction=False)
+    pipeline.hset(key, _warming_identifier(insight_id, dashboard_id), seconds)
+    pipeline.expire(key, LAST_VIEWED_THRESHOLD)
+    pipeline.execute()
+
+
+def get_warming_costs(team_id: int) -> dict[str, float]:
+    costs = redis.get_client().hgetall(f"{WARMING_COSTS_KEY_PREFIX}:{team_id}")
+    return {identifier.decode("utf-8"): float(seconds) for identifier, seconds in costs.items()}
+
+
+def record_too_many_simultaneous_queries() -> None:
+    client = redis.get_client()
+    if client.incr(TOO_MANY_SIMULTANEOUS_QUERIES_KEY) == 1:
+        client.expire(TOO_MANY_SIMULTANEOUS_QUERIES_KEY, TOO_MANY_SIMULTANEOUS_QUERIES_WINDOW)
+
+
+def warming_budget_factor() -> float:
+    """Back off warming as ClickHouse rejects queries for being too busy, to leave room for interactive queries."""
+    rejected_count = int(redis.get_client().get(TOO_MANY_SIMULTANEOUS_QUERIES_KEY) or 0)
+    return 0.5 ** (rejected_count // TOO_MANY_SIMULTANEOUS_QUERIES_PER_HALVING)
+
+
+def get_warming_candidates(
+    team: Team, insight_tuples: list[tuple[int, Optional[int]]], shared_only: bool = False
+) -> list[WarmingCandidate]:
+    if not insight_tuples:
+        return []
+
+    threshold = datetime.now(UTC) - (
+        LAST_VIEWED_THRESHOLD if not shared_only else SHARED_INSIGHTS_LAST_VIEWED_THRESHOLD
+    )
+    insight_ids = {insight_id for insight_id, _ in insight_tuples}
+    dashboard_ids = {dashboard_id for _, dashboard_id in insight_tuples if dashboard_id}
+
+    views_by_insight_id = {
+        row["insight_id"]: (row["views"], row["last_viewed_at"])
+        for row in InsightViewed.objects.filter(insight_id__in=insight_ids, last_viewed_at__gte=threshold)
+        .values("insight_id")
+        .annotate(views=Count("id"), last_viewed_at=Max("last_viewed_at"))
+    }
+    last_accessed_at_by_dashboard_id = dict(
+        Dashboard.objects.filter(pk__in=dashboard_ids).values_list("id", "last_accessed_at")
+    )
+    target_ages = QueryCacheManager.get_target_ages(
+        team_id=team.pk,
+        identifiers=[_warming_identifier(insight_id, dashboard_id) for insight_id, dashboard_id in insight_tuples],
+    )
+    costs = get_warming_costs(team.pk)
+
+    candidates = []
+    for insight_id, dashboard_id in insight_tuples:
+        identifier = _warming_identifier(insight_id, dashboard_id)
+        recent_views, last_viewed_at = views_by_insight_id.get(insight_id, (0, None))
+        # Dashboards don't track views per user, but being opened counts as a view of all their insights
+        dashboard_last_accessed_at = last_accessed_at_by_dashboard_id.get(dashboard_id) if dashboard_id else None
+        if dashboard_last_accessed_at and (last_viewed_at is None or dashboard_last_accessed_at > last_viewed_at):
+            last_viewed_at = dashboard_last_accessed_at
+
+        candidates.append(
+            WarmingCandidate(
+                team_id=team.pk,
+                insight_id=insight_id,
+                dashboard_id=dashboard_id,
+                recent_views=recent_views,
+                last_viewed_at=last_viewed_at,
+                target_age=target_ages.get(identifier),
+                cost_seconds=costs.get(identifier, settings.CACHE_WARMING_DEFAULT_COST_SECONDS),
+            )
+        )
+
+    return candidates
+
+
+def select_insights_to_warm(
+    candidates: list[WarmingCandidate], *, team_budget_seconds: float, global_budget_seconds: float
+) -> list[WarmingCandidate]:
+    """
+    Pick the most valuable insights to warm that fit within the budgets, ordered by priority.
+
+    Insights that don't fit are skipped for this cycle, while cheaper ones further down may still fit.
+    Insights that aren't stale yet are dropped, as warming them wouldn't run any query.
+    """
+    now = datetime.now(UTC)
+    spent_by_team_id: dict[int, float] = defaultdict(float)
+    spent = 0.0
+    selected = []
+
+    for candidate in sorted(candidates, key=lambda candidate: candidate.priority(now), reverse=True):
+        if candidate.is_fresh(now):
+            continue
+        if spent + candidate.cost_seconds > global_budget_seconds:
+            continue
+        if spent_by_team_id[candidate.team_id] + candidate.cost_seconds > team_budget_seconds:
+            continue
+
+        spent += candidate.cost_seconds
+        spent_by_team_id[candidate.team_id] += candidate.cost_seconds
+        selected.append(candidate)
+
+    return selected
+
+
+def prioritize_insights_to_warm(
+    teams_insight_tuples: list[tuple[Team, bool, list[tuple[int, Optional[int]]]]],
+) -> dict[int, list[tuple[int, Optional[int]]]]:
+    budget_factor = warming_budget_factor()
+    global_budget_seconds = settings.CACHE_WARMING_GLOBAL_BUDGET_SECONDS * budget_factor
+    WARMING_BUDGET_GAUGE.set(global_budget_seconds)
+
+    candidates = [
+        candidate
+        for team, shared_only, insight_tuples in teams_insight_tuples
+        for candidate in get_warming_candidates(team, insight_tuples, shared_only=shared_only)
+    ]
+    selected = select_insights_to_warm(
+        candidates,
+        team_budget_seconds=settings.CACHE_WARMING_TEAM_BUDGET_SECONDS * budget_factor,
+        global_budget_seconds=global_budget_seconds,
+    )
+
+    insight_tuples_by_team_id: dict[int, list[tuple[int, Optional[int]]]] = {
+        team.pk: [] for team, _, _ in teams_insight_tuples
+    }
+    for candidate in selected:
+        insight_tuples_by_team_id[candidate.team_id].append((candidate.insight_id, candidate.dashboard_id))
+
+    now = datetime.now(UTC)
+    stale_count_by_team_id: dict[int, int] = defaultdict(int)
+    for candidate in candidates:
+        if not candidate.is_fresh(now):
+            stale_count_by_team_id[candidate.team_id] += 1
+    for team, _, _ in teams_insight_tuples:
+        DEPRIORITIZED_INSIGHTS_GAUGE.labels(team_id=team.pk).set(
+            max(stale_count_by_team_id[team.pk] - len(insight_tuples_by_team_id[team.pk]), 0)
+        )
+
+    return insight_tuples_by_team_id
+
+
 @shared_task(ignore_result=True, expires=60 * 15)
 def schedule_warming_for_teams_task():
     """
@@ -137,6 +327,9 @@ def schedule_warming_for_teams_task():
     We trigger recalculation using ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE
     so even though we might pick all insights for a team to recalculate,
     only the stale ones (determined by `staleness_threshold_map`) get recalculated.
+
+    With `CACHE_WARMING_PRIORITIZATION_ENABLED`, only the most valuable insights fitting in the
+    ClickHouse time budget of the cycle are warmed, most valuable first.
     """
     team_ids = largest_teams(limit=10)
     threshold = datetime.now(UTC) - LAST_VIEWED_THRESHOLD
@@ -162,9 +355,12 @@ def schedule_warming_for_teams_task():
     # Use a fixed expiration time since tasks in the chain are executed sequentially
     expire_after = datetime.now(UTC) + timedelta(minutes=50)
 
+    teams_insight_tuples: list[tuple[Team, bool, list[tuple[int, Optional[int]]]]] = []
+
     with ph_us_client() as capture_ph_event:
         for team, shared_only in all_teams:
             insight_tuples = list(insights_to_keep_fresh(team, shared_only=shared_only))
+            teams_insight_tuples.append((team, shared_only, insight_tuples))
 
             capture_ph_event(
                 str(team.uuid),
@@ -177,13 +373,17 @@ def schedule_warming_for_teams_task():
                 },
             )
 
-            # We chain the task execution to prevent queries *for a single team* running at the same time
-            chain(
-                *(
-                    warm_insight_cache_task.si(*insight_tuple).set(expires=expire_after)
-                    for insight_tuple in insight_tuples
-                )
-            )()
+    if settings.CACHE_WARMING_PRIORITIZATION_ENABLED:
+        insight_tuples_by_team_id = prioritize_insights_to_warm(teams_insight_tuples)
+        teams_insight_tuples = [
+            (team, shared_only, insight_tuples_by_team_id[team.pk]) for team, shared_only, _ in teams_insight_tuples
+        ]
+
+    for _, _, insight_tuples in teams_insight_tuples:
+        # We chain the task execution to prevent queries *for a single team* running at the same time
+        chain(
+            *(warm_insight_cache_task.si(*insight_tuple).set(expires=expire_after) for insight_tuple in insight_tuples)
+        )()
 
 
 @shared_task(
@@ -213,6 +413,7 @@ def warm_insight_cache_task(insight_id: int, dashboard_id: Optional[int]):
         logger.info(f"Warming insight cache: {insight.pk} for team {insight.team_id} and dashboard {dashboard_id}")
 
         try:
+            start_time = time.monotonic()
             results = process_query_dict(
                 insight.team,
                 insight.query,
@@ -227,6 +428,8 @@ def warm_insight_cache_task(insight_id: int, dashboard_id: Optional[int]):
             )
 
             is_cached = getattr(results, "is_cached", False)
+            if not is_cached:
+                record_warming_cost(insight.team_id, insight_id, dashboard_id, time.monotonic() - start_time)
 
             PRIORITY_INSIGHTS_COUNTER.labels(
                 team_id=insight.team_id,
@@ -248,6 +451,7 @@ def warm_insight_cache_task(insight_id: int, dashboard_id: Optional[int]):
                 )
 
         except CHQueryErrorTooManySimultaneousQueries:
+            record_too_many_simultaneous_queries()
             raise
         except Exception as e:
             capture_exception(e)
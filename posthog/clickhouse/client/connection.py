@@ -58,6 +58,28 @@ class ProxyClient:
             return result.result_set, column_types_driver_format
         return result.result_set
 
+    def execute_iter(
+        self,
+        query,
+        params=None,
+        with_column_types=False,
+        external_tables=None,
+        query_id=None,
+        settings=None,
+        types_check=False,
+    ):
+        if query_id:
+            settings["query_id"] = query_id
+        with self._client.query_row_block_stream(query=query, parameters=params, settings=settings) as stream:
+            if with_column_types:
+                yield [(a, b.name) for (a, b) in zip(stream.source.column_names, stream.source.column_types)]
+            for block in stream:
+                yield from block
+
+    def disconnect(self):
+        # Connections are managed by the pool manager, and the ones of streams closed midway are discarded with them
+        pass
+
     # Implement methods for session managment: https://peps.python.org/pep-0343/ so ProxyClient can be used in all places a clickhouse_driver.Client is.
     def __enter__(self):
         return self
@@ -1,7 +1,7 @@
 import json
 import threading
 import types
-from collections.abc import Sequence
+from collections.abc import Generator, Sequence
 from contextlib import contextmanager
 from functools import lru_cache
 from time import perf_counter
@@ -108,36 +108,13 @@ def sync_execute(
         except ModuleNotFoundError:  # when we run plugin server tests it tries to run above, ignore
             pass
 
-    if workload == Workload.DEFAULT and (
-        # When someone uses an API key, always put their query to the offline cluster
-        get_query_tag_value("access_method") == "personal_api_key"
-        or
-        # Execute all celery tasks not directly set to be online on the offline cluster
-        get_query_tag_value("kind") == "celery"
-    ):
-        workload = Workload.OFFLINE
-
-    # Make sure we always have process_query_task on the online cluster
-    if get_query_tag_value("id") == "posthog.tasks.tasks.process_query_task":
-        workload = Workload.ONLINE
+    workload = _resolve_workload(workload)
 
     start_time = perf_counter()
 
-    prepared_sql, prepared_args, tags = _prepare_query(query=query, args=args, workload=workload)
-    query_id = validated_client_query_id()
-    core_settings = {**default_settings(), **(settings or {})}
-    tags["query_settings"] = core_settings
-
-    query_type = tags.get("query_type", "Other")
-    set_tag("query_type", query_type)
-    if team_id is not None:
-        set_tag("team_id", team_id)
-
-    settings = {
-        **core_settings,
-        "log_comment": json.dumps(tags, separators=(",", ":")),
-        "query_id": query_id,
-    }
+    prepared_sql, prepared_args, settings, query_id, query_type = _prepare_execution(
+        query=query, args=args, settings=settings, workload=workload, team_id=team_id
+    )
 
     try:
         with sync_client or get_client_from_pool(workload, team_id, readonly) as client:
@@ -168,6 +145,121 @@ def sync_execute(
     return result
 
 
+def sync_execute_iter(
+    query,
+    args=None,
+    settings=None,
+    with_column_types=False,
+    block_size: int = 10_000,
+    *,
+    workload: Workload = Workload.DEFAULT,
+    team_id: Optional[int] = None,
+    readonly=False,
+) -> Generator[Any, None, None]:
+    """
+    Like `sync_execute`, but streams the results instead of materializing all of them in memory.
+
+    Yields lists of up to `block_size` rows. If `with_column_types` is set, the column types are yielded first.
+    The connection is held until the generator is exhausted or closed.
+    """
+    if TEST:
+        try:
+            from posthog.test.base import flush_persons_and_events
+
+            flush_persons_and_events()
+        except ModuleNotFoundError:
+            pass
+
+    workload = _resolve_workload(workload)
+
+    start_time = perf_counter()
+
+    prepared_sql, prepared_args, settings, query_id, query_type = _prepare_execution(
+        query=query, args=args, settings=settings, workload=workload, team_id=team_id
+    )
+
+    try:
+        with get_client_from_pool(workload, team_id, readonly) as client:
+            rows = client.execute_iter(
+                prepared_sql,
+                params=prepared_args,
+                settings=settings,
+                with_column_types=with_column_types,
+                query_id=query_id,
+            )
+            try:
+                if with_column_types:
+                    yield next(rows)
+
+                block: list[Any] = []
+                for row in rows:
+                    block.append(row)
+                    if len(block) >= block_size:
+                        yield block
+                        block = []
+                if block:
+                    yield block
+            except BaseException:
+                # Including `GeneratorExit` when the consumer stops midway (e.g. a client disconnecting from a streamed
+                # response). Unread packets would be left on the connection, so it can't go back to the pool as is.
+                rows.close()
+                client.disconnect()
+                raise
+    except Exception as e:
+        err = wrap_query_error(e)
+        exception_type = type(err).__name__
+        set_tag("clickhouse_exception_type", exception_type)
+        QUERY_ERROR_COUNTER.labels(exception_type=exception_type, query_type=query_type).inc()
+
+        raise err from e
+    finally:
+        execution_time = perf_counter() - start_time
+
+        QUERY_EXECUTION_TIME_GAUGE.labels(query_type=query_type).set(execution_time * 1000.0)
+
+
+def _resolve_workload(workload: Workload) -> Workload:
+    if workload == Workload.DEFAULT and (
+        # When someone uses an API key, always put their query to the offline cluster
+        get_query_tag_value("access_method") == "personal_api_key"
+        or
+        # Execute all celery tasks not directly set to be online on the offline cluster
+        get_query_tag_value("kind") == "celery"
+    ):
+        workload = Workload.OFFLINE
+
+    # Make sure we always have process_query_task on the online cluster
+    if get_query_tag_value("id") == "posthog.tasks.tasks.process_query_task":
+        workload = Workload.ONLINE
+
+    return workload
+
+
+def _prepare_execution(
+    query: str,
+    args: QueryArgs,
+    settings: Optional[dict],
+    workload: Workload,
+    team_id: Optional[int],
+) -> tuple[str, Any, dict, Optional[str], str]:
+    prepared_sql, prepared_args, tags = _prepare_query(query=query, args=args, workload=workload)
+    query_id = validated_client_query_id()
+    core_settings = {**default_settings(), **(settings or {})}
+    tags["query_settings"] = core_settings
+
+    query_type = tags.get("query_type", "Other")
+    set_tag("query_type", query_type)
+    if team_id is not None:
+        set_tag("team_id", team_id)
+
+    settings = {
+        **core_settings,
+        "log_comment": json.dumps(tags, separators=(",", ":")),
+        "query_id": query_id,
+    }
+    return prepared_sql, prepared_args, settings, query_id, query_type
+
+
 def query_with_columns(
     query: str,
     args: Optional[QueryArgs] = None,
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import uuid
 from typing import TYPE_CHECKING, Optional
@@ -5,8 +6,10 @@ from typing import TYPE_CHECKING, Optional
 import orjson as json
 import sentry_sdk
 import structlog
+from django.conf import settings
 from prometheus_client import Histogram
 from pydantic import BaseModel
+from redis.asyncio.client import PubSub
 from rest_framework.exceptions import APIException, NotFound
 
 from posthog import celery, redis
@@ -56,16 +59,32 @@ class QueryStatusManager:
     def clickhouse_query_status_key(self) -> str:
         return f"{self.KEY_PREFIX_ASYNC_RESULTS}:{self.team_id}:{self.query_id}:status"
 
+    @property
+    def notifications_channel(self) -> str:
+        return f"{self.KEY_PREFIX_ASYNC_RESULTS}:{self.team_id}:{self.query_id}:notifications"
+
+    def _notify(self) -> None:
+        if not settings.QUERY_STATUS_NOTIFICATIONS_ENABLED:
+            return
+
+        try:
+            self.redis_client.publish(self.notifications_channel, b"updated")
+        except Exception:
+            # Subscribers still check the status regularly, so they just find out later
+            logger.warning("Failed to publish query status notification", query_id=self.query_id, exc_info=True)
+
     def store_query_status(self, query_status: QueryStatus):
         value = SafeJSONRenderer().render(query_status.model_dump(exclude={"clickhouse_query_progress"}))
         query_status.expiration_time = datetime.datetime.now(datetime.UTC) + datetime.timedelta(
             seconds=self.STATUS_TTL_SECONDS
         )
         self.redis_client.set(self.results_key, value, exat=int(query_status.expiration_time.timestamp()))
+        self._notify()
 
     def _store_clickhouse_query_progress_dict(self, query_progress_dict):
         value = json.dumps(query_progress_dict)
         self.redis_client.set(self.clickhouse_query_status_key, value, ex=self.STATUS_TTL_SECONDS)
+        self._notify()
 
     def _get_results(self):
         try:
@@ -133,6 +152,69 @@ class QueryStatusManager:
         self.redis_client.delete(self.clickhouse_query_status_key)
 
 
+class QueryStatusSubscription:
+    """
+    Notifications of the status or progress of a query being updated, as published by `QueryStatusManager`.
+    Lets async code wait for updates of a query instead of polling its status.
+    """
+
+    def __init__(self, pubsub: PubSub):
+        self._pubsub = pubsub
+        self._next_notification: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def subscribe(cls, manager: QueryStatusManager) -> Optional["QueryStatusSubscription"]:
+        """Returns None when notifications are disabled or unavailable, in which case callers fall back to polling."""
+        if not settings.QUERY_STATUS_NOTIFICATIONS_ENABLED:
+            return None
+
+        pubsub: Optional[PubSub] = None
+        try:
+            # The client is shared within the process, each subscription only holds a connection of its pool
+            pubsub = redis.get_async_client().pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(manager.notifications_channel)
+        except Exception:
+            logger.warning(
+                "Failed to subscribe to query status notifications", query_id=manager.query_id, exc_info=True
+            )
+            if pubsub is not None:
+                await pubsub.close()
+            return None
+
+        return cls(pubsub)
+
+    async def _receive_notification(self) -> None:
+        # Subscribe confirmations are ignored, and returned as None
+        while await self._pubsub.get_message(timeout=None) is None:
+            pass
+
+    async def wait(self, *others: asyncio.Future, timeout: float) -> bool:
+        """
+        Wait for a notification, for any of `others` to be done, or for `timeout` seconds, whichever comes first.
+        Returns whether a notification was received, and raises errors of the subscription's connection.
+        """
+        if self._next_notification is None:
+            self._next_notification = asyncio.ensure_future(self._receive_notification())
+
+        done, _ = await asyncio.wait(
+            {self._next_notification, *others}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        if self._next_notification not in done:
+            return False
+
+        notification, self._next_notification = self._next_notification, None
+        notification.result()
+        return True
+
+    async def close(self) -> None:
+        if self._next_notification is not None:
+            self._next_notification.cancel()
+        try:
+            await self._pubsub.close()
+        except Exception:
+            logger.warning("Failed to close query status notifications", exc_info=True)
+
+
 def execute_process_query(
     team_id: int,
     user_id: Optional[int],
@@ -9,7 +9,11 @@ from celery import current_task
 from prometheus_client import Counter, Gauge
 
 from posthog import redis
-from posthog.settings import TEST
+from posthog.settings import (
+    DASHBOARD_TILES_MAX_CONCURRENT_CALCULATIONS_PER_TEAM,
+    QUERY_STREAM_MAX_CONCURRENT_PER_TEAM,
+    TEST,
+)
 from posthog.utils import generate_short_id
 
 RUNNING_CLICKHOUSE_QUERIES = Gauge(
@@ -166,6 +170,46 @@ def get_api_personal_rate_limiter():
     return __API_CONCURRENT_QUERY_PER_TEAM
 
 
+__DASHBOARD_TILES_CONCURRENT_CALCULATIONS_PER_TEAM: Optional[RateLimit] = None
+
+
+def get_dashboard_tiles_rate_limiter():
+    """
+    Limits the dashboard tiles calculated concurrently for a team, across all dashboard loads.
+    Acquired with `use` and `release`, as tiles over the limit are calculated one by one instead of failing.
+    """
+    global __DASHBOARD_TILES_CONCURRENT_CALCULATIONS_PER_TEAM
+    if __DASHBOARD_TILES_CONCURRENT_CALCULATIONS_PER_TEAM is None:
+        __DASHBOARD_TILES_CONCURRENT_CALCULATIONS_PER_TEAM = RateLimit(
+            max_concurrent_tasks=DASHBOARD_TILES_MAX_CONCURRENT_CALCULATIONS_PER_TEAM,
+            limit_name="dashboard_tiles_per_team",
+            get_task_name=lambda *args, **kwargs: f"dashboard:tiles:per-team:{kwargs.get('team_id')}",
+            get_task_id=lambda *args, **kwargs: kwargs.get("task_id") or generate_short_id(),
+            ttl=600,
+        )
+    return __DASHBOARD_TILES_CONCURRENT_CALCULATIONS_PER_TEAM
+
+
+__QUERY_STREAMS_PER_TEAM: Optional[RateLimit] = None
+
+
+def get_query_stream_rate_limiter():
+    """
+    Limits the queries streamed concurrently for a team, which hold a ClickHouse connection until fully read.
+    Acquired with `use` and released once the stream is exhausted or closed.
+    """
+    global __QUERY_STREAMS_PER_TEAM
+    if __QUERY_STREAMS_PER_TEAM is None:
+        __QUERY_STREAMS_PER_TEAM = RateLimit(
+            max_concurrent_tasks=QUERY_STREAM_MAX_CONCURRENT_PER_TEAM,
+            limit_name="query_stream_per_team",
+            get_task_name=lambda *args, **kwargs: f"api:query:stream:per-team:{kwargs.get('team_id')}",
+            get_task_id=lambda *args, **kwargs: kwargs.get("task_id") or generate_short_id(),
+            ttl=600,
+        )
+    return __QUERY_STREAMS_PER_TEAM
+
+
 class ConcurrencyLimitExceeded(Exception):
     pass
 
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from typing import Any
 
@@ -5,7 +6,8 @@ from posthog.clickhouse.client.async_task_chain import task_chain_context
 from posthog.clickhouse.client.connection import Workload
 import uuid
 
-from django.test import TestCase, SimpleTestCase
+from asgiref.sync import sync_to_async
+from django.test import TestCase, SimpleTestCase, override_settings
 from django.db import transaction
 
 from posthog.clickhouse.client import execute_async as client
@@ -19,6 +21,7 @@ from posthog.test.base import ClickhouseTestMixin, snapshot_clickhouse_queries
 from unittest.mock import patch, MagicMock
 from posthog.clickhouse.client.execute_async import (
     QueryStatusManager,
+    QueryStatusSubscription,
     execute_process_query,
     QueryNotFoundError,
 )
@@ -99,6 +102,68 @@ class TestQueryStatusManager(SimpleTestCase):
         self.query_status.expiration_time = None  # We don't care about expiration time in this test
         self.assertEqual(self.manager.get_query_status(show_progress=True), self.query_status)
 
+    @override_settings(QUERY_STATUS_NOTIFICATIONS_ENABLED=True)
+    def test_status_and_progress_updates_are_published(self):
+        pubsub = get_client().pubsub()
+        pubsub.subscribe(self.manager.notifications_channel)
+
+        self.manager.store_query_status(self.query_status)
+        self.manager.update_clickhouse_query_progresses(
+            [{**ZERO_PROGRESS, "query_id": f"{self.team_id}_{self.query_id}_1", "bytes_read": 1}]
+        )
+
+        messages = [pubsub.get_message(timeout=1) for _ in range(3)]
+        self.assertEqual([message["type"] for message in messages], ["subscribe", "message", "message"])
+        pubsub.close()
+
+
+class TestQueryStatusSubscription(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        get_client().flushall()
+        self.query_id = "550e8400-e29b-41d4-a716-446655440000"
+        self.team_id = 12345
+        self.manager = QueryStatusManager(self.query_id, self.team_id)
+
+    async def test_subscribe_returns_none_when_notifications_are_disabled(self):
+        self.assertIsNone(await QueryStatusSubscription.subscribe(self.manager))
+
+    @override_settings(QUERY_STATUS_NOTIFICATIONS_ENABLED=True)
+    async def test_subscribe_returns_none_when_redis_is_unavailable(self):
+        with patch("posthog.clickhouse.client.execute_async.redis.get_async_client", side_effect=ConnectionError):
+            self.assertIsNone(await QueryStatusSubscription.subscribe(self.manager))
+
+    @override_settings(QUERY_STATUS_NOTIFICATIONS_ENABLED=True)
+    async def test_wait_returns_on_notification(self):
+        subscription = await QueryStatusSubscription.subscribe(self.manager)
+        assert subscription is not None
+
+        try:
+            self.assertFalse(await subscription.wait(timeout=0.1))
+
+            await sync_to_async(self.manager.update_clickhouse_query_progresses)(
+                [{**ZERO_PROGRESS, "query_id": f"{self.team_id}_{self.query_id}_1", "bytes_read": 1}]
+            )
+
+            self.assertTrue(await subscription.wait(timeout=5))
+            # The notification was consumed
+            self.assertFalse(await subscription.wait(timeout=0.1))
+        finally:
+            await subscription.close()
+
+    @override_settings(QUERY_STATUS_NOTIFICATIONS_ENABLED=True)
+    async def test_wait_returns_when_others_are_done(self):
+        subscription = await QueryStatusSubscription.subscribe(self.manager)
+        assert subscription is not None
+
+        done = asyncio.get_running_loop().create_future()
+        done.set_result(None)
+
+        try:
+            self.assertFalse(await asyncio.wait_for(subscription.wait(done, timeout=5), timeout=1))
+        finally:
+            await subscription.close()
+
 
 class TestExecuteProcessQuery(TestCase):
     def setUp(self):
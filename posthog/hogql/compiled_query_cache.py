@@ -0,0 +1,55 @@
+import dataclasses
+import threading
+from typing import Any, Optional
+
+from cachetools import TTLCache
+from django.conf import settings
+from prometheus_client import Counter
+
+COMPILED_QUERY_CACHE_COUNTER = Counter(
+    "posthog_hogql_compiled_query_cache",
+    "Lookups of HogQL queries already compiled to ClickHouse SQL in this process",
+    ["result"],
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class CompiledHogQLQuery:
+    """Everything the HogQL executor needs to run a query without parsing, resolving and printing it again."""
+
+    hogql: str
+    clickhouse_sql: str
+    values: dict[str, Any]
+    columns: list[str]
+
+
+class CompiledQueryCache:
+    """
+    Bounded, per-process LRU cache of compiled HogQL queries.
+
+    Entries also expire after a TTL, as printing depends on a few things we don't version
+    (e.g. property definition types used for property swapping).
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache: TTLCache[str, CompiledHogQLQuery] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CompiledHogQLQuery]:
+        with self._lock:
+            compiled = self._cache.get(key)
+        COMPILED_QUERY_CACHE_COUNTER.labels(result="hit" if compiled else "miss").inc()
+        return compiled
+
+    def set(self, key: str, compiled: CompiledHogQLQuery) -> None:
+        with self._lock:
+            self._cache[key] = compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+compiled_query_cache = CompiledQueryCache(
+    maxsize=settings.HOGQL_COMPILED_QUERY_CACHE_SIZE, ttl=settings.HOGQL_COMPILED_QUERY_CACHE_TTL_SECONDS
+)
@@ -1,9 +1,13 @@
 import dataclasses
+import threading
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any, ClassVar, Literal, Optional, TypeAlias, Union, cast
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+from cachetools import TTLCache
+from django.conf import settings
 from django.db.models import Prefetch, Q
+from prometheus_client import Counter
 from pydantic import BaseModel, ConfigDict
 
 from posthog.exceptions_capture import capture_exception
@@ -79,6 +83,8 @@ from posthog.hogql.parser import parse_expr
 from posthog.hogql.timings import HogQLTimings
 from posthog.models.group_type_mapping import GroupTypeMapping
 from posthog.models.team.team import WeekStartDay
+from posthog.schema_helpers import to_dict, to_json
+from posthog.utils import generate_cache_key
 from posthog.schema import (
     DatabaseSchemaDataWarehouseTable,
     DatabaseSchemaField,
@@ -101,6 +107,12 @@ from posthog.warehouse.models.table import (
 if TYPE_CHECKING:
     from posthog.models import Team
 
+HOGQL_DATABASE_CACHE_COUNTER = Counter(
+    "posthog_hogql_database_cache",
+    "Lookups of already built HogQL databases in this process",
+    ["result"],
+)
+
 
 class Database(BaseModel):
     model_config = ConfigDict(extra="allow")
@@ -166,6 +178,9 @@ class Database(BaseModel):
     _timezone: Optional[str]
     _week_start_day: Optional[WeekStartDay]
 
+    # Whether the tables are shared with the database this one was copied from, see `_copy_on_write`
+    _tables_shared: bool = False
+
     def __init__(self, timezone: Optional[str] = None, week_start_day: Optional[WeekStartDay] = None):
         super().__init__()
         try:
@@ -174,6 +189,36 @@ class Database(BaseModel):
             raise ValueError(f"Unknown timezone: '{str(timezone)}'")
         self._week_start_day = week_start_day
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if not name.startswith("_"):
+            self._copy_shared_tables()
+        super().__setattr__(name, value)
+
+    def _copy_on_write(self) -> "Database":
+        """
+        A copy sharing the tables of this database, which only copies the mapping of table names to tables once
+        tables are added or replaced in it. The tables themselves are never copied, so don't mutate them.
+        """
+        database = self.__class__.__new__(self.__class__)
+        object.__setattr__(database, "__dict__", self.__dict__)
+        object.__setattr__(database, "__pydantic_extra__", self.__pydantic_extra__)
+        object.__setattr__(database, "__pydantic_fields_set__", self.__pydantic_fields_set__)
+        object.__setattr__(
+            database, "__pydantic_private__", {**(self.__pydantic_private__ or {}), "_tables_shared": True}
+        )
+        return database
+
+    def _copy_shared_tables(self) -> None:
+        if not self._tables_shared:
+            return
+        object.__setattr__(self, "__dict__", dict(self.__dict__))
+        object.__setattr__(self, "__pydantic_fields_set__", set(self.__pydantic_fields_set__))
+        if self.__pydantic_extra__ is not None:
+            object.__setattr__(self, "__pydantic_extra__", dict(self.__pydantic_extra__))
+        self._warehouse_table_names = list(self._warehouse_table_names)
+        self._view_table_names = list(self._view_table_names)
+        self._tables_shared = False
+
     def get_timezone(self) -> str:
         return self._timezone or "UTC"
 
@@ -254,25 +299,96 @@ def _use_error_tracking_issue_id_from_error_tracking_issue_overrides(database: D
     )
 
 
+class DatabaseCache:
+    """
+    Bounded, per-process cache of built databases, keyed by team, modifiers and the team's schema version.
+
+    Cached databases are never handed out directly - callers get their own copy, in which they're free to add or
+    replace tables. Tables are shared between copies though, so they must not be mutated.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache: TTLCache[str, Database] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Database]:
+        with self._lock:
+            database = self._cache.get(key)
+        HOGQL_DATABASE_CACHE_COUNTER.labels(result="hit" if database else "miss").inc()
+        return database
+
+    def set(self, key: str, database: Database) -> None:
+        with self._lock:
+            self._cache[key] = database
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+database_cache = DatabaseCache(
+    maxsize=settings.HOGQL_DATABASE_CACHE_SIZE, ttl=settings.HOGQL_DATABASE_CACHE_TTL_SECONDS
+)
+
+
 def create_hogql_database(
     team_id: int,
     modifiers: Optional[HogQLQueryModifiers] = None,
     team_arg: Optional["Team"] = None,
     timings: Optional[HogQLTimings] = None,
 ) -> Database:
-    from posthog.hogql.database.s3_table import S3Table
+    from posthog.hogql.database.schema_version import get_database_schema_version
     from posthog.hogql.query import create_default_modifiers_for_team
     from posthog.models import Team
+
+    if timings is None:
+        timings = HogQLTimings()
+
+    team = team_arg or Team.objects.get(pk=team_id)
+
+    if not settings.HOGQL_DATABASE_CACHE_ENABLED:
+        return _build_hogql_database(team=team, modifiers=modifiers, timings=timings)
+
+    with timings.measure("database_cache"):
+        cache_key = generate_cache_key(
+            "hogql_database_"
+            + bytes.decode(
+                to_json(
+                    {
+                        "team_id": team.pk,
+                        "schema_version": get_database_schema_version(team.pk),
+                        "modifiers": to_dict(create_default_modifiers_for_team(team, modifiers)),
+                        "timezone": team.timezone,
+                        "week_start_day": team.week_start_day,
+                    }
+                )
+            )
+        )
+        cached_database = database_cache.get(cache_key)
+
+    if cached_database is None:
+        cached_database = _build_hogql_database(team=team, modifiers=modifiers, timings=timings)
+        database_cache.set(cache_key, cached_database)
+
+    with timings.measure("database_copy"):
+        return cached_database._copy_on_write()
+
+
+def _build_hogql_database(
+    *,
+    team: "Team",
+    modifiers: Optional[HogQLQueryModifiers],
+    timings: HogQLTimings,
+) -> Database:
+    from posthog.hogql.database.s3_table import S3Table
+    from posthog.hogql.query import create_default_modifiers_for_team
     from posthog.warehouse.models import (
         DataWarehouseJoin,
         DataWarehouseSavedQuery,
         DataWarehouseTable,
     )
 
-    if timings is None:
-        timings = HogQLTimings()
-
-    team = team_arg or Team.objects.get(pk=team_id)
+    team_id = team.pk
 
     with timings.measure("modifiers"):
         modifiers = create_default_modifiers_for_team(team, modifiers)
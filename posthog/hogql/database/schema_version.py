@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from posthog.models.action.action import Action
+from posthog.models.group_type_mapping import GroupTypeMapping
+from posthog.models.signals import mutable_receiver
+from posthog.models.team import Team
+from posthog.warehouse.models.credential import DataWarehouseCredential
+from posthog.warehouse.models.datawarehouse_saved_query import DataWarehouseSavedQuery
+from posthog.warehouse.models.external_data_schema import ExternalDataSchema
+from posthog.warehouse.models.external_data_source import ExternalDataSource
+from posthog.warehouse.models.join import DataWarehouseJoin
+from posthog.warehouse.models.table import DataWarehouseTable
+
+SCHEMA_VERSION_CACHE_TIMEOUT = 60 * 60 * 24 * 7  # 7 days
+
+
+def _schema_version_cache_key(team_id: int) -> str:
+    return f"hogql_database_schema_version:{team_id}"
+
+
+def get_database_schema_version(team_id: int) -> int:
+    """
+    Version of everything the HogQL database of a team is built from (warehouse tables, joins, saved queries, ...).
+
+    Anything caching a built `Database`, or SQL printed against it, should include this in its cache key.
+    """
+    return cache.get(_schema_version_cache_key(team_id), 0)
+
+
+def bump_database_schema_version(team_id: int) -> None:
+    key = _schema_version_cache_key(team_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key doesn't exist yet (or has expired)
+        cache.set(key, 1, SCHEMA_VERSION_CACHE_TIMEOUT)
+
+
+@mutable_receiver([post_save, post_delete], sender=Team)
+def team_saved(sender, instance: Team, **kwargs):
+    bump_database_schema_version(instance.pk)
+
+
+@mutable_receiver([post_save, post_delete], sender=DataWarehouseTable)
+@mutable_receiver([post_save, post_delete], sender=DataWarehouseJoin)
+@mutable_receiver([post_save, post_delete], sender=DataWarehouseSavedQuery)
+@mutable_receiver([post_save, post_delete], sender=DataWarehouseCredential)
+@mutable_receiver([post_save, post_delete], sender=ExternalDataSource)
+@mutable_receiver([post_save, post_delete], sender=ExternalDataSchema)
+@mutable_receiver([post_save, post_delete], sender=Action)
+def team_schema_object_saved(sender, instance, **kwargs):
+    bump_database_schema_version(instance.team_id)
+
+
+@mutable_receiver([post_save, post_delete], sender=GroupTypeMapping)
+def group_type_mapping_saved(sender, instance: GroupTypeMapping, **kwargs):
+    # Group types are shared by all environments of a project
+    for team_id in Team.objects.filter(project_id=instance.project_id).values_list("id", flat=True):
+        bump_database_schema_version(team_id)
@@ -7,8 +7,10 @@ from django.test import override_settings
 from parameterized import parameterized
 
 from posthog.hogql.constants import MAX_SELECT_RETURNED_ROWS
-from posthog.hogql.database.database import create_hogql_database, serialize_database
+from posthog.hogql.database.database import create_hogql_database, database_cache, serialize_database
 from posthog.hogql.database.models import FieldTraverser, LazyJoin, StringDatabaseField, ExpressionField, Table
+from posthog.hogql.database.schema.events import EventsTable
+from posthog.hogql.database.schema_version import get_database_schema_version
 from posthog.hogql.errors import ExposedHogQLError
 from posthog.hogql.modifiers import create_default_modifiers_for_team
 from posthog.hogql.parser import parse_expr, parse_select
@@ -333,6 +335,58 @@ class TestDatabase(BaseTest, QueryMatchingTest):
             f"SELECT whatever.id AS id FROM s3(%(hogql_val_0_sensitive)s, %(hogql_val_3_sensitive)s, %(hogql_val_4_sensitive)s, %(hogql_val_1)s, %(hogql_val_2)s) AS whatever LIMIT 100 SETTINGS readonly=2, max_execution_time=60, allow_experimental_object_type=1, format_csv_allow_double_quotes=0, max_ast_elements=4000000, max_expanded_ast_elements=4000000, max_bytes_before_external_group_by=0",
         )
 
+    @override_settings(HOGQL_DATABASE_CACHE_ENABLED=True)
+    def test_database_cache(self):
+        database_cache.clear()
+        credential = DataWarehouseCredential.objects.create(
+            team=self.team, access_key="_accesskey", access_secret="_secret"
+        )
+        DataWarehouseTable.objects.create(
+            name="whatever", team=self.team, columns={"id": "String"}, credential=credential, url_pattern=""
+        )
+
+        first_database = create_hogql_database(team_id=self.team.pk, team_arg=self.team)
+        first_database.add_warehouse_tables(added=first_database.get_table("whatever"))
+        first_database.events = EventsTable()
+
+        # Served from the cache without rebuilding, and unaffected by tables added to or replaced in other copies
+        with patch("posthog.hogql.database.database._build_hogql_database") as mock_build:
+            second_database = create_hogql_database(team_id=self.team.pk, team_arg=self.team)
+            mock_build.assert_not_called()
+        assert second_database is not first_database
+        assert not second_database.has_table("added")
+        assert "added" not in second_database.get_warehouse_tables()
+        assert second_database.events is not first_database.events
+        assert second_database.has_table("whatever")
+        # Tables themselves aren't copied
+        assert second_database.get_table("whatever") is first_database.get_table("whatever")
+
+        # Adding a warehouse table bumps the schema version, so the database gets rebuilt
+        DataWarehouseTable.objects.create(
+            name="whatever_else", team=self.team, columns={"id": "String"}, credential=credential, url_pattern=""
+        )
+        third_database = create_hogql_database(team_id=self.team.pk, team_arg=self.team)
+        assert third_database.has_table("whatever_else")
+
+    def test_external_data_sources_and_schemas_bump_schema_version(self):
+        version = get_database_schema_version(self.team.pk)
+        source = ExternalDataSource.objects.create(
+            team=self.team,
+            source_id="source_id",
+            connection_id="connection_id",
+            status=ExternalDataSource.Status.COMPLETED,
+            source_type=ExternalDataSource.Type.STRIPE,
+        )
+        assert get_database_schema_version(self.team.pk) > version
+
+        version = get_database_schema_version(self.team.pk)
+        schema = ExternalDataSchema.objects.create(name="Customer", team=self.team, source=source)
+        assert get_database_schema_version(self.team.pk) > version
+
+        version = get_database_schema_version(self.team.pk)
+        schema.delete()
+        assert get_database_schema_version(self.team.pk) > version
+
     def test_database_group_type_mappings(self):
         GroupTypeMapping.objects.create(
             team=self.team, project_id=self.team.project_id, group_type="test", group_type_index=0
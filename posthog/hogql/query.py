@@ -1,11 +1,16 @@
 import dataclasses
+import re
+from collections.abc import Generator
 from typing import Optional, Union, cast, ClassVar
 
+from django.conf import settings as app_settings
+
 from posthog.clickhouse.client.connection import Workload
 from posthog.errors import ExposedCHQueryError
 from posthog.hogql import ast
+from posthog.hogql.compiled_query_cache import CompiledHogQLQuery, compiled_query_cache
 from posthog.hogql.constants import HogQLGlobalSettings, LimitContext, get_default_limit_for_context
-from posthog.hogql.errors import ExposedHogQLError
+from posthog.hogql.errors import ExposedHogQLError, QueryError
 from posthog.hogql.hogql import HogQLContext
 from posthog.hogql.modifiers import create_default_modifiers_for_team
 from posthog.hogql.parser import parse_select
@@ -22,7 +27,9 @@ from posthog.hogql.visitor import clone_expr
 from posthog.hogql.resolver_utils import extract_select_queries
 from posthog.models.team import Team
 from posthog.clickhouse.query_tagging import tag_queries
-from posthog.clickhouse.client import sync_execute
+from posthog.clickhouse.client import sync_execute, sync_execute_iter
+from posthog.schema_helpers import to_dict, to_json
+from posthog.utils import generate_cache_key
 from posthog.schema import (
     HogQLQueryResponse,
     HogQLFilters,
@@ -34,6 +41,20 @@ from posthog.schema import (
 )
 from posthog.settings import HOGQL_INCREASED_MAX_EXECUTION_TIME
 
+# ClickHouse table of dynamic cohort memberships, queried by the version each cohort was last calculated at
+COHORT_TABLE_REGEX = re.compile(r"\b(cohortpeople|person_static_cohort)\b")
+
+
+@dataclasses.dataclass
+class HogQLStreamingResponse:
+    """Result of a streamed HogQL query. Rows arrive in blocks, and only while `blocks` is being consumed."""
+
+    hogql: Optional[str]
+    clickhouse: Optional[str]
+    columns: list[str]
+    types: list[tuple[str, str]]
+    blocks: Generator[list[tuple], None, None]
+
 
 @dataclasses.dataclass
 class HogQLQueryExecutor:
@@ -56,7 +77,8 @@ class HogQLQueryExecutor:
     __uninitialized_context: ClassVar[HogQLContext] = HogQLContext()
 
     def __post_init__(self):
-        if self.context is self.__uninitialized_context:
+        self.has_default_context = self.context is self.__uninitialized_context
+        if self.has_default_context:
             self.context = HogQLContext(team_id=self.team.pk)
 
         self.query_modifiers = create_default_modifiers_for_team(self.team, self.modifiers)
@@ -269,8 +291,112 @@ class HogQLQueryExecutor:
             self._generate_clickhouse_sql()
         return self.clickhouse_sql, self.clickhouse_context
 
-    def execute(self) -> HogQLQueryResponse:
+    def _compiled_query_cache_key(self) -> Optional[str]:
+        from posthog.hogql.database.schema_version import get_database_schema_version
+
+        # Only plain HogQL strings have a cheap cache key. Filters and placeholders may resolve to different
+        # constants every time (e.g. relative dates), and a custom context may change how the query is printed.
+        if (
+            not app_settings.HOGQL_COMPILED_QUERY_CACHE_ENABLED
+            or not isinstance(self.query, str)
+            or not self.has_default_context
+            or self.filters is not None
+            or self.placeholders
+            or self.debug
+        ):
+            return None
+
+        payload = {
+            "query": self.query.strip(),
+            "team_id": self.team.pk,
+            "timezone": self.team.timezone,
+            "week_start_day": self.team.week_start_day,
+            "schema_version": get_database_schema_version(self.team.pk),
+            "modifiers": to_dict(self.query_modifiers),
+            "variables": {key: to_dict(variable) for key, variable in (self.variables or {}).items()},
+            "settings": to_dict(self.settings) if self.settings else None,
+            "limit_context": self.limit_context,
+            "pretty": self.pretty,
+        }
+        return generate_cache_key(f"hogql_compiled_{bytes.decode(to_json(payload))}")
+
+    def _is_compiled_query_cacheable(self) -> bool:
+        if not self.clickhouse_sql or self.error is not None:
+            return False
+        # Dynamic cohorts are printed with the version they were last calculated at, and which table a cohort is read
+        # from depends on whether it's static. Both change without bumping the schema version, as cohorts are saved
+        # far too often for it, so queries of cohorts aren't cached.
+        return COHORT_TABLE_REGEX.search(self.clickhouse_sql) is None
+
+    def _use_compiled_query(self, compiled: CompiledHogQLQuery):
+        self.hogql = compiled.hogql
+        self.clickhouse_sql = compiled.clickhouse_sql
+        self.print_columns = list(compiled.columns)
+        self.clickhouse_context = dataclasses.replace(
+            self.context,
+            team_id=self.team.pk,
+            team=self.team,
+            enable_select_queries=True,
+            timings=self.timings,
+            modifiers=self.query_modifiers,
+            values=dict(compiled.values),
+        )
+
+    def execute_streaming(self, block_size: int = 10_000) -> HogQLStreamingResponse:
+        """
+        Execute the query, streaming results from ClickHouse in blocks instead of materializing them in memory.
+
+        The query starts running right away, so that errors surface here and not midway through consuming the rows.
+        """
         self.generate_clickhouse_sql()
+        if self.error is not None:
+            raise QueryError(self.error)
+
+        tag_queries(
+            team_id=self.team.pk,
+            query_type=self.query_type,
+            has_joins="JOIN" in self.clickhouse_sql,
+            has_json_operations="JSONExtract" in self.clickhouse_sql or "JSONHas" in self.clickhouse_sql,
+            timings=self.timings.to_dict(),
+        )
+        rows = sync_execute_iter(
+            self.clickhouse_sql,
+            self.clickhouse_context.values,
+            with_column_types=True,
+            block_size=block_size,
+            workload=self.workload,
+            team_id=self.team.pk,
+            readonly=True,
+        )
+        types = next(rows)
+
+        return HogQLStreamingResponse(
+            hogql=self.hogql,
+            clickhouse=self.clickhouse_sql,
+            columns=self.print_columns,
+            types=types,
+            blocks=rows,
+        )
+
+    def execute(self) -> HogQLQueryResponse:
+        cache_key = self._compiled_query_cache_key()
+        compiled = compiled_query_cache.get(cache_key) if cache_key else None
+        if compiled is not None:
+            with self.timings.measure("compiled_query_cache"):
+                self._use_compiled_query(compiled)
+        else:
+            self.generate_clickhouse_sql()
+            if cache_key and self._is_compiled_query_cacheable():
+                compiled_query_cache.set(
+                    cache_key,
+                    CompiledHogQLQuery(
+                        hogql=self.hogql,
+                        clickhouse_sql=self.clickhouse_sql,
+                        values=dict(self.clickhouse_context.values),
+                        columns=list(self.print_columns),
+                    ),
+                )
+
         if self.clickhouse_sql is not None:
             self._execute_clickhouse_query()
 
@@ -10,9 +10,12 @@ from freezegun import freeze_time
 
 from posthog.errors import InternalCHQueryError
 from posthog.hogql import ast
+from posthog.hogql.compiled_query_cache import compiled_query_cache
+from posthog.hogql.database.schema_version import bump_database_schema_version
 from posthog.hogql.errors import QueryError
+from posthog.hogql.parser import parse_select
 from posthog.hogql.property import property_to_expr
-from posthog.hogql.query import execute_hogql_query
+from posthog.hogql.query import HogQLQueryExecutor, execute_hogql_query
 from posthog.hogql.test.utils import pretty_print_in_tests, pretty_print_response_in_tests
 from posthog.models import Cohort
 from posthog.models.exchange_rate.currencies import SUPPORTED_CURRENCY_CODES
@@ -146,6 +149,110 @@ class TestQuery(ClickhouseTestMixin, APIBaseTest):
             assert isinstance(response.timings[0], QueryTiming)
             self.assertEqual(response.timings[-1].k, ".")
 
+    @override_settings(HOGQL_COMPILED_QUERY_CACHE_ENABLED=True)
+    def test_query_compiled_query_cache(self):
+        compiled_query_cache.clear()
+        with freeze_time("2020-01-10"):
+            self._create_random_events()
+            query = "select count(), event from events where event = 'random event' group by event"
+
+            first_response = execute_hogql_query(query, team=self.team)
+            with patch("posthog.hogql.query.parse_select") as mock_parse_select:
+                second_response = execute_hogql_query(query, team=self.team)
+                mock_parse_select.assert_not_called()
+
+            self.assertEqual(first_response.clickhouse, second_response.clickhouse)
+            self.assertEqual(first_response.columns, second_response.columns)
+            self.assertEqual(second_response.results, [(2, "random event")])
+            assert second_response.timings is not None
+            self.assertIn("./compiled_query_cache", [timing.k for timing in second_response.timings])
+
+            # Changing the warehouse schema of the team invalidates the compiled query
+            bump_database_schema_version(self.team.pk)
+            with patch("posthog.hogql.query.parse_select", wraps=parse_select) as mock_parse_select:
+                execute_hogql_query(query, team=self.team)
+                mock_parse_select.assert_called_once()
+
+    @override_settings(HOGQL_COMPILED_QUERY_CACHE_ENABLED=True, PERSON_ON_EVENTS_V2_OVERRIDE=False)
+    def test_query_compiled_query_cache_recalculated_cohort(self):
+        compiled_query_cache.clear()
+        with freeze_time("2020-01-10"):
+            for distinct_id, properties in [
+                ("some_id", {"$some_prop": "something", "$another_prop": "something"}),
+                ("some_other_id", {"$some_prop": "something"}),
+            ]:
+                _create_person(distinct_ids=[distinct_id], team_id=self.team.pk, properties=properties)
+                _create_event(event="$pageview", team=self.team, distinct_id=distinct_id)
+            flush_persons_and_events()
+
+            cohort = Cohort.objects.create(
+                team=self.team,
+                groups=[{"properties": [{"key": "$some_prop", "value": "something", "type": "person"}]}],
+                name="cohort",
+            )
+            cohort.calculate_people_ch(pending_version=0)
+            query = f"select count() from events where person_id in cohort {cohort.pk}"
+
+            first_response = execute_hogql_query(query, team=self.team)
+            self.assertEqual(first_response.results, [(2,)])
+
+            cohort.groups = [{"properties": [{"key": "$another_prop", "value": "something", "type": "person"}]}]
+            cohort.save()
+            cohort.calculate_people_ch(pending_version=1)
+
+            # The version of the cohort is part of the printed query, so it is compiled again
+            second_response = execute_hogql_query(query, team=self.team)
+            self.assertNotEqual(first_response.clickhouse, second_response.clickhouse)
+            self.assertEqual(second_response.results, [(1,)])
+
+    @override_settings(HOGQL_COMPILED_QUERY_CACHE_ENABLED=True, PERSON_ON_EVENTS_V2_OVERRIDE=False)
+    def test_query_compiled_query_cache_static_cohort_made_dynamic(self):
+        compiled_query_cache.clear()
+        with freeze_time("2020-01-10"):
+            for distinct_id, properties in [
+                ("some_id", {"$some_prop": "something"}),
+                ("some_other_id", {"$some_prop": "something"}),
+            ]:
+                _create_person(distinct_ids=[distinct_id], team_id=self.team.pk, properties=properties)
+                _create_event(event="$pageview", team=self.team, distinct_id=distinct_id)
+            flush_persons_and_events()
+
+            cohort = Cohort.objects.create(team=self.team, groups=[], is_static=True, name="cohort")
+            cohort.insert_users_by_list(["some_id"])
+            query = f"select count() from events where person_id in cohort {cohort.pk}"
+
+            first_response = execute_hogql_query(query, team=self.team)
+            self.assertEqual(first_response.results, [(1,)])
+
+            cohort.is_static = False
+            cohort.groups = [{"properties": [{"key": "$some_prop", "value": "something", "type": "person"}]}]
+            cohort.save()
+            cohort.calculate_people_ch(pending_version=0)
+
+            # Queries of cohorts aren't cached, so the cohort is now read from the dynamic cohort table
+            with patch("posthog.hogql.query.parse_select", wraps=parse_select) as mock_parse_select:
+                second_response = execute_hogql_query(query, team=self.team)
+                mock_parse_select.assert_called_once()
+            self.assertEqual(second_response.results, [(2,)])
+
+    def test_query_execute_streaming(self):
+        with freeze_time("2020-01-10"):
+            self._create_random_events()
+            executor = HogQLQueryExecutor(
+                query="select event, distinct_id from events where event = 'random event' order by distinct_id",
+                team=self.team,
+            )
+            response = executor.execute_streaming(block_size=1)
+
+            self.assertEqual(response.columns, ["event", "distinct_id"])
+            self.assertEqual([name for name, _ in response.types], ["event", "distinct_id"])
+            rows = [row for block in response.blocks for row in block]
+            self.assertEqual(rows, [("random event", "bla"), ("random event", "bla")])
+
+    def test_query_execute_streaming_error(self):
+        with self.assertRaises(QueryError):
+            HogQLQueryExecutor(query="select nope from events", team=self.team).execute_streaming()
+
     @pytest.mark.usefixtures("unittest_snapshot")
     def test_query_joins_simple(self):
         with freeze_time("2020-01-10"):
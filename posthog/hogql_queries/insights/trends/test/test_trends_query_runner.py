@@ -25,6 +25,7 @@ from posthog.hogql_queries.insights.trends.trends_query_runner import (
     BREAKDOWN_OTHER_DISPLAY,
     TrendsQueryRunner,
 )
+from posthog.hogql_queries.query_runner import ExecutionMode
 from posthog.models import GroupTypeMapping
 from posthog.models.action.action import Action
 from posthog.models.cohort.cohort import Cohort
@@ -399,6 +400,44 @@ class TestTrendsQueryRunner(ClickhouseTestMixin, APIBaseTest):
             limit_context=limit_context,
         ).calculate()
 
+    @override_settings(TRENDS_INCREMENTAL_CALCULATION_ENABLED=True)
+    def test_trends_incremental_calculation_matches_full_calculation(self):
+        self._create_test_events()
+
+        with freeze_time("2020-01-15T13:00:00Z"):
+            cached_response = self._create_query_runner("-7d", None, IntervalType.DAY, None).run(
+                execution_mode=ExecutionMode.CALCULATE_BLOCKING_ALWAYS
+            )
+
+        with freeze_time("2020-01-17T13:00:00Z"):
+            full_response = self._create_query_runner("-7d", None, IntervalType.DAY, None).calculate()
+
+            runner = self._create_query_runner("-7d", None, IntervalType.DAY, None)
+            runner.stale_cached_response = cached_response
+            tail_date_range = runner._incremental_tail_date_range()
+            assert tail_date_range is not None
+            # One hour of lookback before the last refresh, aligned to the start of the day
+            self.assertEqual(tail_date_range.date_from(), datetime(2020, 1, 15, tzinfo=zoneinfo.ZoneInfo("UTC")))
+
+            incremental_response = runner.calculate()
+
+        self.assertEqual(full_response.results[0]["days"], incremental_response.results[0]["days"])
+        self.assertEqual(full_response.results[0]["labels"], incremental_response.results[0]["labels"])
+        self.assertEqual(full_response.results[0]["data"], incremental_response.results[0]["data"])
+        self.assertEqual(full_response.results[0]["count"], incremental_response.results[0]["count"])
+
+    @override_settings(TRENDS_INCREMENTAL_CALCULATION_ENABLED=True)
+    def test_trends_incremental_calculation_not_used_for_breakdowns(self):
+        self._create_test_events()
+
+        with freeze_time("2020-01-15T13:00:00Z"):
+            runner = self._create_query_runner(
+                "-7d", None, IntervalType.DAY, None, breakdown=BreakdownFilter(breakdown="$browser")
+            )
+            runner.stale_cached_response = runner.run(execution_mode=ExecutionMode.CALCULATE_BLOCKING_ALWAYS)
+
+            self.assertIsNone(runner._incremental_tail_date_range())
+
     def test_trends_label(self):
         self._create_test_events()
 
@@ -14,6 +14,7 @@ from posthog.caching.insights_api import (
     REAL_TIME_INSIGHT_REFRESH_INTERVAL,
     REDUCED_MINIMUM_INSIGHT_REFRESH_INTERVAL,
 )
+from posthog.caching.utils import last_refresh_from_cached_result
 from posthog.clickhouse import query_tagging
 from posthog.hogql import ast
 from posthog.hogql.constants import MAX_SELECT_RETURNED_ROWS, LimitContext
@@ -38,6 +39,7 @@ from posthog.hogql_queries.utils.query_date_range import QueryDateRange
 from posthog.hogql_queries.utils.query_previous_period_date_range import (
     QueryPreviousPeriodDateRange,
 )
+from posthog.hogql_queries.utils.query_tail_date_range import QueryTailDateRange
 from posthog.models import Team
 from posthog.models.action.action import Action
 from posthog.models.cohort.cohort import Cohort
@@ -46,6 +48,7 @@ from posthog.models.property_definition import PropertyDefinition
 from posthog.queries.util import correct_result_for_sampling
 from posthog.schema import (
     ActionsNode,
+    BaseMathType,
     BreakdownItem,
     BreakdownType,
     CachedTrendsQueryResponse,
@@ -72,6 +75,14 @@ from posthog.schema import (
 from posthog.utils import format_label_date, multisort
 from posthog.warehouse.models.util import get_view_or_table_by_name
 
+# Math types whose value for a bucket depends on events outside of that bucket
+INCREMENTAL_UNSUPPORTED_MATH_TYPES = (
+    BaseMathType.WEEKLY_ACTIVE,
+    BaseMathType.MONTHLY_ACTIVE,
+    BaseMathType.FIRST_TIME_FOR_USER,
+    BaseMathType.FIRST_MATCHING_EVENT_FOR_USER,
+)
+
 
 class TrendsQueryRunner(QueryRunner):
     query: TrendsQuery
@@ -113,12 +124,14 @@ class TrendsQueryRunner(QueryRunner):
     def to_query(self) -> ast.SelectSetQuery:
         return ast.SelectSetQuery.create_from_queries(self.to_queries(), "UNION ALL")
 
-    def to_queries(self) -> list[ast.SelectQuery | ast.SelectSetQuery]:
+    def to_queries(
+        self, current_date_range: Optional[QueryDateRange] = None
+    ) -> list[ast.SelectQuery | ast.SelectSetQuery]:
         queries = []
         with self.timings.measure("trends_to_query"):
             for series in self.series:
                 if not series.is_previous_period_series:
-                    query_date_range = self.query_date_range
+                    query_date_range = current_date_range or self.query_date_range
                 else:
                     query_date_range = self.query_previous_date_range
 
@@ -304,7 +317,106 @@ class TrendsQueryRunner(QueryRunner):
         )
 
     def calculate(self):
-        queries = self.to_queries()
+        tail_date_range = self._incremental_tail_date_range()
+        if tail_date_range is not None:
+            with self.timings.measure("incremental_calculation"):
+                tail_response = self._calculate(tail_date_range)
+                merged_results = self._merge_incremental_results(tail_response.results)
+            if merged_results is not None:
+                tail_response.results = merged_results
+                return tail_response
+
+        return self._calculate()
+
+    def _incremental_tail_date_range(self) -> Optional[QueryTailDateRange]:
+        """
+        Only the buckets after a safe watermark can change between refreshes. If the stale cached result
+        lets us, only query those buckets and take the rest from the cache.
+        """
+        if not settings.TRENDS_INCREMENTAL_CALCULATION_ENABLED or self.stale_cached_response is None:
+            return None
+
+        last_refresh = last_refresh_from_cached_result(self.stale_cached_response)
+        if last_refresh is None or not self._supports_incremental_calculation():
+            return None
+
+        return QueryTailDateRange(
+            date_range=self.query.dateRange,
+            team=self.team,
+            interval=self.query.interval,
+            now=self.query_date_range.now_with_timezone,
+            # Events can arrive late, so recalculate everything that was in flight recently before the last refresh
+            tail_from=last_refresh - timedelta(minutes=settings.TRENDS_INCREMENTAL_LOOKBACK_MINUTES),
+        )
+
+    def _supports_incremental_calculation(self) -> bool:
+        # Every bucket of the series must be calculated independently of all others
+        if self.breakdown_enabled or self._trends_display.is_total_value():
+            return False
+        if self._trends_display.display_type == ChartDisplayType.ACTIONS_LINE_GRAPH_CUMULATIVE:
+            return False
+        if self.query.compareFilter is not None and self.query.compareFilter.compare:
+            return False
+        if self.query.trendsFilter is not None and (
+            self.query.trendsFilter.formula
+            or self.query.trendsFilter.formulas
+            or (self.query.trendsFilter.smoothingIntervals or 1) > 1
+        ):
+            return False
+        return all(
+            isinstance(series.series, EventsNode | ActionsNode)
+            and series.series.math not in INCREMENTAL_UNSUPPORTED_MATH_TYPES
+            for series in self.series
+        )
+
+    def _merge_incremental_results(self, tail_results: list[dict[str, Any]]) -> Optional[list[dict[str, Any]]]:
+        """Prepend the cached buckets before the tail to each freshly calculated tail series."""
+        assert self.stale_cached_response is not None
+
+        cached_results = self.stale_cached_response.results
+        cached_series_by_order = {series.get("action", {}).get("order"): series for series in cached_results}
+        if len(tail_results) == 0 or len(tail_results) != len(cached_results):
+            return None
+        if len(cached_series_by_order) != len(cached_results):
+            return None
+
+        merged_results = []
+        for tail_series in tail_results:
+            cached_series = cached_series_by_order.get(tail_series["action"]["order"])
+            if cached_series is None or len(tail_series["days"]) == 0:
+                return None
+
+            cached_data = dict(zip(cached_series["days"], cached_series["data"]))
+            cached_labels = dict(zip(cached_series["days"], cached_series["labels"]))
+            head_days = [
+                day
+                for day in (self._format_day(value) for value in self.query_date_range.all_values())
+                if day < tail_series["days"][0]
+            ]
+            if any(day not in cached_data for day in head_days):
+                # The cached result doesn't cover the beginning of the current date range
+                return None
+
+            data = [cached_data[day] for day in head_days] + tail_series["data"]
+            merged_results.append(
+                {
+                    **tail_series,
+                    "data": data,
+                    "labels": [cached_labels[day] for day in head_days] + tail_series["labels"],
+                    "days": head_days + tail_series["days"],
+                    "count": float(sum(data)),
+                }
+            )
+
+        return merged_results
+
+    def _format_day(self, value: datetime) -> str:
+        return value.strftime(
+            "%Y-%m-%d{}".format(" %H:%M:%S" if self.query_date_range.interval_name in ("hour", "minute") else "")
+        )
+
+    def _calculate(self, current_date_range: Optional[QueryDateRange] = None) -> TrendsQueryResponse:
+        queries = self.to_queries(current_date_range)
 
         if len(queries) == 0:
             response_hogql = ""
@@ -487,14 +599,7 @@ class TrendsQueryRunner(QueryRunner):
                 series_object = {
                     "data": [],
                     "days": (
-                        [
-                            item.strftime(
-                                "%Y-%m-%d{}".format(
-                                    " %H:%M:%S" if self.query_date_range.interval_name in ("hour", "minute") else ""
-                                )
-                            )
-                            for item in get_value("date", val)
-                        ]
+                        [self._format_day(item) for item in get_value("date", val)]
                         if response.columns and "date" in response.columns
                         else []
                     ),
@@ -527,14 +632,7 @@ class TrendsQueryRunner(QueryRunner):
                     "labels": [
                         format_label_date(item, self.query_date_range.interval_name) for item in get_value("date", val)
                     ],
-                    "days": [
-                        item.strftime(
-                            "%Y-%m-%d{}".format(
-                                " %H:%M:%S" if self.query_date_range.interval_name in ("hour", "minute") else ""
-                            )
-                        )
-                        for item in get_value("date", val)
-                    ],
+                    "days": [self._format_day(item) for item in get_value("date", val)],
                     "count": count,
                     "label": "All events" if series_label is None else series_label,
                     "filter": self._query_to_filter(),
@@ -1,3 +1,6 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, UTC
 from typing import Optional
 
@@ -5,9 +8,12 @@ from django.conf import settings
 from django.core.cache import cache
 
 from posthog import redis
-from posthog.cache_utils import OrjsonJsonSerializer
+from posthog.hogql_queries.query_cache_codec import decode_query_cache_value, encode_query_cache_value
 from posthog.utils import get_safe_cache
 
+# Cached responses fetched ahead of their use, e.g. for all tiles of a dashboard, see `prefetch_cache_data`
+prefetched_cache_data: ContextVar[Optional[dict[str, bytes]]] = ContextVar("prefetched_cache_data", default=None)
+
 
 class QueryCacheManager:
     """
@@ -66,6 +72,21 @@ class QueryCacheManager:
         )
         return [insight.decode("utf-8") for insight in insights]
 
+    @staticmethod
+    def get_target_ages(*, team_id: int, identifiers: list[str]) -> dict[str, datetime]:
+        """
+        Get the target age (when cached results become stale) of the given '{insight_id}:{dashboard_id}' combinations.
+        """
+        pipeline = redis.get_client().pipeline(transaction=False)
+        for identifier in identifiers:
+            pipeline.zscore(f"cache_timestamps:{team_id}", identifier)
+
+        return {
+            identifier: datetime.fromtimestamp(score, UTC)
+            for identifier, score in zip(identifiers, pipeline.execute())
+            if score is not None
+        }
+
     @staticmethod
     def clean_up_stale_insights(*, team_id: int, threshold: datetime) -> None:
         """
@@ -77,6 +98,26 @@ class QueryCacheManager:
             threshold.timestamp(),
         )
 
+    @staticmethod
+    @contextmanager
+    def prefetch_cache_data(cache_keys: list[str]) -> Iterator[set[str]]:
+        """
+        Fetch the cached responses of several queries with a single round trip, yielding the keys that were found.
+
+        Within the context, each prefetched response is returned by the first `get_cache_data` of its key only,
+        later reads go to the cache again, so that responses written in the meantime aren't missed.
+        """
+        try:
+            prefetched = cache.get_many(list(set(cache_keys)))
+        except Exception:  # The cache is probably corrupted, keys are read one by one instead
+            prefetched = {}
+
+        token = prefetched_cache_data.set(prefetched)
+        try:
+            yield set(prefetched)
+        finally:
+            prefetched_cache_data.reset(token)
+
     def update_target_age(self, target_age: datetime) -> None:
         if not self.insight_id:
             return
@@ -93,8 +134,12 @@ class QueryCacheManager:
         self.redis_client.zrem(f"cache_timestamps:{self.team_id}", self.identifier)
 
     def set_cache_data(self, *, response: dict, target_age: Optional[datetime]) -> None:
-        fresh_response_serialized = OrjsonJsonSerializer({}).dumps(response)
-        cache.set(self.cache_key, fresh_response_serialized, settings.CACHED_RESULTS_TTL)
+        fresh_response_encoded = encode_query_cache_value(response)
+        cache.set(self.cache_key, fresh_response_encoded, settings.CACHED_RESULTS_TTL)
+
+        prefetched = prefetched_cache_data.get()
+        if prefetched is not None:
+            prefetched.pop(self.cache_key, None)
 
         if target_age:
             self.update_target_age(target_age)
@@ -102,8 +147,13 @@ class QueryCacheManager:
             self.remove_last_refresh()
 
     def get_cache_data(self) -> Optional[dict]:
-        cached_response_bytes: Optional[bytes] = get_safe_cache(self.cache_key)
+        prefetched = prefetched_cache_data.get()
+        cached_response_bytes: Optional[bytes] = None
+        if prefetched is not None:
+            cached_response_bytes = prefetched.pop(self.cache_key, None)
+        if cached_response_bytes is None:
+            cached_response_bytes = get_safe_cache(self.cache_key)
         if not cached_response_bytes:
             return None
 
-        return OrjsonJsonSerializer({}).loads(cached_response_bytes)
+        return decode_query_cache_value(cached_response_bytes)
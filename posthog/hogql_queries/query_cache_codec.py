@@ -0,0 +1,233 @@
+import abc
+import random
+import threading
+from typing import Any, Optional
+
+import zstandard
+from cachetools import TTLCache
+from django.conf import settings
+from prometheus_client import Counter, Histogram
+
+from posthog import redis
+from posthog.cache_utils import OrjsonJsonSerializer
+from posthog.caching.tolerant_zlib_compressor import PRECOMPRESSED_VALUE_PREFIX
+
+QUERY_CACHE_CODEC_BYTES = Histogram(
+    "posthog_query_cache_codec_bytes",
+    "Size of query results written to the query cache, before and after encoding",
+    labelnames=["codec", "stage"],
+    buckets=(1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000, float("inf")),
+)
+QUERY_CACHE_CODEC_RATIO = Histogram(
+    "posthog_query_cache_codec_compression_ratio",
+    "Ratio of the serialized to the encoded size of query results written to the query cache",
+    labelnames=["codec"],
+    buckets=(1, 1.5, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64, float("inf")),
+)
+QUERY_CACHE_CODEC_DECODE_ERRORS_COUNTER = Counter(
+    "posthog_query_cache_codec_decode_errors",
+    "Query cache values that couldn't be decoded, and were treated as cache misses",
+    labelnames=["codec"],
+)
+
+DICTIONARY_SAMPLES_KEY = "query_cache_codec:dictionary_samples"
+DICTIONARY_SAMPLES_COUNT = 2000
+# Samples only need to contain the shape of results, which is in the beginning of the serialized JSON
+DICTIONARY_SAMPLE_MAX_BYTES = 64 * 1024
+DICTIONARY_SIZE = 112 * 1024
+DICTIONARY_KEY_PREFIX = "query_cache_codec:dictionary"
+CURRENT_DICTIONARY_ID_KEY = "query_cache_codec:current_dictionary_id"
+# Dictionaries must outlive every cached result compressed with them
+DICTIONARY_TTL_SECONDS = settings.CACHED_RESULTS_TTL + 24 * 60 * 60
+CURRENT_DICTIONARY_REFRESH_SECONDS = 5 * 60
+
+
+class QueryCacheCodecError(Exception):
+    pass
+
+
+class QueryCacheCodec(abc.ABC):
+    """
+    Encodes serialized query results before they're written to the query cache.
+
+    Encoded values are framed with a codec ID, so that whatever codec is configured for writing,
+    values written with any other codec can still be read.
+    """
+
+    name: str
+    codec_id: int
+
+    @abc.abstractmethod
+    def encode(self, serialized: bytes) -> bytes:
+        """Encode serialized query results, without the framing."""
+
+    @abc.abstractmethod
+    def decode(self, encoded: bytes) -> bytes:
+        """Decode a value written by `encode` back to the serialized query results."""
+
+
+class ZstdQueryCacheCodec(QueryCacheCodec):
+    """zstd compression, optionally with a dictionary trained on sampled query results."""
+
+    name = "zstd"
+    codec_id = 1
+
+    def __init__(self):
+        # zstd (de)compressors aren't thread-safe, and preparing dictionaries is costly
+        self._local = threading.local()
+
+    def _compressor(self, dictionary: Optional[zstandard.ZstdCompressionDict]) -> zstandard.ZstdCompressor:
+        key = (settings.QUERY_CACHE_CODEC_ZSTD_LEVEL, dictionary.dict_id() if dictionary else 0)
+        compressors = getattr(self._local, "compressors", None)
+        if compressors is None:
+            compressors = self._local.compressors = {}
+        if key not in compressors:
+            compressors[key] = zstandard.ZstdCompressor(level=key[0], dict_data=dictionary)
+        return compressors[key]
+
+    def _decompressor(self, dict_id: int) -> zstandard.ZstdDecompressor:
+        decompressors = getattr(self._local, "decompressors", None)
+        if decompressors is None:
+            decompressors = self._local.decompressors = {}
+        if dict_id not in decompressors:
+            decompressors[dict_id] = zstandard.ZstdDecompressor(
+                dict_data=query_cache_dictionaries.get(dict_id) if dict_id else None
+            )
+        return decompressors[dict_id]
+
+    def encode(self, serialized: bytes) -> bytes:
+        dictionary = query_cache_dictionaries.get_current() if settings.QUERY_CACHE_CODEC_DICTIONARY_ENABLED else None
+        return self._compressor(dictionary).compress(serialized)
+
+    def decode(self, encoded: bytes) -> bytes:
+        dict_id = zstandard.get_frame_parameters(encoded).dict_id
+        return self._decompressor(dict_id).decompress(encoded)
+
+
+QUERY_CACHE_CODECS: dict[str, QueryCacheCodec] = {codec.name: codec for codec in (ZstdQueryCacheCodec(),)}
+QUERY_CACHE_CODECS_BY_ID: dict[int, QueryCacheCodec] = {codec.codec_id: codec for codec in QUERY_CACHE_CODECS.values()}
+
+
+class QueryCacheDictionaries:
+    """
+    Per-process cache of zstd dictionaries, which are stored in Redis by dictionary ID.
+
+    Dictionaries never change once stored, so they're cached for as long as the process lives.
+    """
+
+    def __init__(self):
+        self._dictionaries: dict[int, zstandard.ZstdCompressionDict] = {}
+        self._current_id: TTLCache[str, int] = TTLCache(maxsize=1, ttl=CURRENT_DICTIONARY_REFRESH_SECONDS)
+        self._lock = threading.Lock()
+
+    def get(self, dict_id: int) -> zstandard.ZstdCompressionDict:
+        with self._lock:
+            dictionary = self._dictionaries.get(dict_id)
+        if dictionary is not None:
+            return dictionary
+
+        dictionary_bytes = redis.get_client().get(f"{DICTIONARY_KEY_PREFIX}:{dict_id}")
+        if dictionary_bytes is None:
+            raise QueryCacheCodecError(f"zstd dictionary {dict_id} not found")
+
+        dictionary = zstandard.ZstdCompressionDict(dictionary_bytes)
+        with self._lock:
+            self._dictionaries[dict_id] = dictionary
+        return dictionary
+
+    def get_current(self) -> Optional[zstandard.ZstdCompressionDict]:
+        with self._lock:
+            dict_id = self._current_id.get("current")
+
+        if dict_id is None:
+            client = redis.get_client()
+            dict_id = int(client.get(CURRENT_DICTIONARY_ID_KEY) or 0)
+            if dict_id:
+                # Keep the dictionary around for as long as it's used to compress new results
+                client.expire(f"{DICTIONARY_KEY_PREFIX}:{dict_id}", DICTIONARY_TTL_SECONDS)
+            with self._lock:
+                self._current_id["current"] = dict_id
+
+        if not dict_id:
+            return None
+
+        try:
+            return self.get(dict_id)
+        except QueryCacheCodecError:
+            return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dictionaries.clear()
+            self._current_id.clear()
+
+
+query_cache_dictionaries = QueryCacheDictionaries()
+
+
+def encode_query_cache_value(response: dict[str, Any]) -> bytes:
+    serialized = OrjsonJsonSerializer({}).dumps(response)
+    codec = QUERY_CACHE_CODECS.get(settings.QUERY_CACHE_CODEC)
+    if codec is None:
+        # Plain JSON, which is also how values were written before codecs existed
+        QUERY_CACHE_CODEC_BYTES.labels(codec="json", stage="serialized").observe(len(serialized))
+        return serialized
+
+    if settings.QUERY_CACHE_CODEC_DICTIONARY_ENABLED:
+        sample_for_dictionary_training(serialized)
+
+    encoded = PRECOMPRESSED_VALUE_PREFIX + bytes([codec.codec_id]) + codec.encode(serialized)
+    QUERY_CACHE_CODEC_BYTES.labels(codec=codec.name, stage="serialized").observe(len(serialized))
+    QUERY_CACHE_CODEC_BYTES.labels(codec=codec.name, stage="encoded").observe(len(encoded))
+    QUERY_CACHE_CODEC_RATIO.labels(codec=codec.name).observe(len(serialized) / len(encoded))
+    return encoded
+
+
+def decode_query_cache_value(value: bytes) -> Optional[dict[str, Any]]:
+    """Decode a value written by `encode_query_cache_value` with any codec, or `None` if it can't be decoded."""
+    if not value.startswith(PRECOMPRESSED_VALUE_PREFIX):
+        return OrjsonJsonSerializer({}).loads(value)
+
+    header_length = len(PRECOMPRESSED_VALUE_PREFIX) + 1
+    codec = QUERY_CACHE_CODECS_BY_ID.get(value[header_length - 1])
+    if codec is None:
+        QUERY_CACHE_CODEC_DECODE_ERRORS_COUNTER.labels(codec="unknown").inc()
+        return None
+
+    try:
+        serialized = codec.decode(value[header_length:])
+    except (QueryCacheCodecError, zstandard.ZstdError):
+        QUERY_CACHE_CODEC_DECODE_ERRORS_COUNTER.labels(codec=codec.name).inc()
+        return None
+
+    return OrjsonJsonSerializer({}).loads(serialized)
+
+
+def sample_for_dictionary_training(serialized: bytes) -> None:
+    if random.random() >= settings.QUERY_CACHE_CODEC_DICTIONARY_SAMPLE_RATE:
+        return
+
+    pipeline = redis.get_client().pipeline(transaction=False)
+    pipeline.lpush(DICTIONARY_SAMPLES_KEY, serialized[:DICTIONARY_SAMPLE_MAX_BYTES])
+    pipeline.ltrim(DICTIONARY_SAMPLES_KEY, 0, DICTIONARY_SAMPLES_COUNT - 1)
+    pipeline.execute()
+
+
+def train_query_cache_dictionary(min_samples: int = 100) -> Optional[int]:
+    """
+    Train a zstd dictionary on sampled query results, and start compressing new results with it.
+
+    Returns the ID of the new dictionary, or `None` if there aren't enough samples yet.
+    """
+    client = redis.get_client()
+    samples = client.lrange(DICTIONARY_SAMPLES_KEY, 0, -1)
+    if len(samples) < min_samples:
+        return None
+
+    # zstd recommends training on about 100 times the size of the dictionary
+    dict_size = min(max(sum(len(sample) for sample in samples) // 100, 1024), DICTIONARY_SIZE)
+    dictionary = zstandard.train_dictionary(dict_size, samples, level=settings.QUERY_CACHE_CODEC_ZSTD_LEVEL)
+    dict_id = dictionary.dict_id()
+    client.set(f"{DICTIONARY_KEY_PREFIX}:{dict_id}", dictionary.as_bytes(), ex=DICTIONARY_TTL_SECONDS)
+    client.set(CURRENT_DICTIONARY_ID_KEY, dict_id)
+    return dict_id
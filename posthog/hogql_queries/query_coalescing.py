@@ -0,0 +1,121 @@
+import time
+from typing import Optional
+
+import structlog
+from django.conf import settings
+from prometheus_client import Counter
+
+from posthog import redis
+from posthog.utils import generate_short_id
+
+logger = structlog.get_logger(__name__)
+
+QUERY_COALESCING_COUNTER = Counter(
+    "posthog_query_coalescing_total",
+    "Outcome of single-flight coalescing for query calculations",
+    ["outcome"],
+)
+
+# Only delete the lock if we still own it, then notify everyone waiting on it - atomically
+release_lua_script = """
+local lock_key = KEYS[1]
+local channel = KEYS[2]
+local token = ARGV[1]
+
+if redis.call('GET', lock_key) == token then
+    redis.call('DEL', lock_key)
+end
+redis.call('PUBLISH', channel, token)
+return 1
+"""
+
+
+class QueryCoalescer:
+    """
+    Single-flight for query calculations, shared across processes through Redis.
+
+    The first caller to acquire the lock for a cache key is the leader and calculates the query.
+    Everyone else arriving while the lock is held waits for the leader's notification and then
+    reads the freshly written result from the query cache instead of running the same query again.
+
+    'query_coalescing:lock:{cache_key}' -> token of the leader (expires after `lock_timeout` seconds)
+    'query_coalescing:done:{cache_key}' -> pub/sub channel the leader publishes to once it's done
+    """
+
+    def __init__(
+        self,
+        *,
+        cache_key: str,
+        lock_timeout: Optional[int] = None,
+        wait_timeout: Optional[float] = None,
+    ):
+        self.redis_client = redis.get_client()
+        self.cache_key = cache_key
+        self.lock_timeout = lock_timeout or settings.QUERY_COALESCING_LOCK_TIMEOUT_SECONDS
+        self.wait_timeout = wait_timeout if wait_timeout is not None else settings.QUERY_COALESCING_WAIT_SECONDS
+        self.token = generate_short_id()
+        self.is_leader = False
+
+    @property
+    def lock_key(self) -> str:
+        return f"query_coalescing:lock:{self.cache_key}"
+
+    @property
+    def channel(self) -> str:
+        return f"query_coalescing:done:{self.cache_key}"
+
+    def acquire(self) -> bool:
+        """Try to become the leader for this cache key. Never blocks."""
+        self.is_leader = bool(self.redis_client.set(self.lock_key, self.token, nx=True, ex=self.lock_timeout))
+        QUERY_COALESCING_COUNTER.labels(outcome="leader" if self.is_leader else "follower").inc()
+        return self.is_leader
+
+    def release(self) -> None:
+        """Release the lock (if still ours) and wake up all followers."""
+        if not self.is_leader:
+            return
+        try:
+            self.redis_client.eval(release_lua_script, 2, self.lock_key, self.channel, self.token)
+        except Exception as e:
+            # The lock will expire on its own, followers fall back to calculating after `wait_timeout`
+            logger.warning("query_coalescing_release_failed", cache_key=self.cache_key, error=str(e))
+        finally:
+            self.is_leader = False
+
+    def wait(self) -> bool:
+        """
+        Block until the leader is done, or until `wait_timeout` elapses.
+
+        Returns True if the leader finished (the result may or may not have been cached),
+        False if we timed out and the caller should calculate the query itself.
+        """
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(self.channel)
+            # The leader might have finished between our failed `acquire` and `subscribe`
+            if not self.redis_client.exists(self.lock_key):
+                QUERY_COALESCING_COUNTER.labels(outcome="notified").inc()
+                return True
+
+            deadline = time.monotonic() + self.wait_timeout
+            while (remaining := deadline - time.monotonic()) > 0:
+                message = pubsub.get_message(timeout=min(remaining, 1.0))
+                if message is not None and message.get("type") == "message":
+                    QUERY_COALESCING_COUNTER.labels(outcome="notified").inc()
+                    return True
+                # Lock expired without a notification, e.g. the leader's process died
+                if message is None and not self.redis_client.exists(self.lock_key):
+                    QUERY_COALESCING_COUNTER.labels(outcome="lock_expired").inc()
+                    return True
+        except Exception as e:
+            logger.warning("query_coalescing_wait_failed", cache_key=self.cache_key, error=str(e))
+            QUERY_COALESCING_COUNTER.labels(outcome="error").inc()
+            return False
+        finally:
+            try:
+                pubsub.close()
+            except Exception:
+                pass
+
+        QUERY_COALESCING_COUNTER.labels(outcome="timeout").inc()
+        return False
@@ -5,6 +5,7 @@ from types import UnionType
 from typing import Any, Generic, Optional, TypeGuard, TypeVar, Union, cast, get_args
 
 import structlog
+from django.conf import settings
 from prometheus_client import Counter
 from pydantic import BaseModel, ConfigDict
 from sentry_sdk import get_traceparent, push_scope, set_tag
@@ -22,6 +23,7 @@ from posthog.hogql.printer import print_ast
 from posthog.hogql.query import create_default_modifiers_for_team
 from posthog.hogql.timings import HogQLTimings
 from posthog.hogql_queries.query_cache import QueryCacheManager
+from posthog.hogql_queries.query_coalescing import QueryCoalescer
 from posthog.metrics import LABEL_TEAM_ID
 from posthog.models import Team, User
 from posthog.schema import (
@@ -550,6 +552,7 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
     response: R
     cached_response: CR
     query_id: Optional[str]
+    stale_cached_response: Optional[CR]
 
     team: Team
     timings: HogQLTimings
@@ -572,6 +575,7 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
         _modifiers = modifiers or (query.modifiers if hasattr(query, "modifiers") else None)
         self.modifiers = create_default_modifiers_for_team(team, _modifiers)
         self.query_id = query_id
+        self.stale_cached_response = None
 
         if not self.is_query_node(query):
             if isinstance(self.query_type, UnionType):
@@ -680,6 +684,8 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
                 return cached_response
 
             self.count_query_cache_hit(hit="stale", trigger=cached_response.calculation_trigger or "")
+            # Keep the stale result around, runners that support incremental calculation can build on it
+            self.stale_cached_response = cached_response
             # We have a stale result. If we aren't allowed to calculate, let's still return it
             # – otherwise let's proceed to calculation
             if execution_mode == ExecutionMode.CACHE_ONLY_NEVER_CALCULATE:
@@ -746,7 +752,6 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
             set_tag("dashboard_id", str(dashboard_id))
 
         self.query_id = query_id or self.query_id
-        CachedResponse: type[CR] = self.cached_response_type
         cache_manager = QueryCacheManager(
             team_id=self.team.pk,
             cache_key=cache_key,
@@ -769,6 +774,46 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
             if results:
                 return results
 
+        coalescer = self._get_query_coalescer(execution_mode=execution_mode, cache_key=cache_key)
+        if coalescer is not None and not coalescer.acquire():
+            # An identical calculation is already in flight elsewhere - wait for it and reuse its cached result
+            if coalescer.wait():
+                coalesced_response = self._get_coalesced_response(cache_manager=cache_manager)
+                if coalesced_response is not None:
+                    return coalesced_response
+            coalescer = None
+
+        try:
+            return self._calculate_and_cache(cache_manager=cache_manager, user=user)
+        finally:
+            if coalescer is not None:
+                coalescer.release()
+
+    def _get_query_coalescer(self, *, execution_mode: ExecutionMode, cache_key: str) -> Optional[QueryCoalescer]:
+        if not settings.QUERY_COALESCING_ENABLED:
+            return None
+        # Explicit refreshes must not be served a result calculated before they were requested,
+        # and exports never make it into the cache for followers to pick up
+        if execution_mode == ExecutionMode.CALCULATE_BLOCKING_ALWAYS or self.limit_context == LimitContext.EXPORT:
+            return None
+        return QueryCoalescer(cache_key=cache_key)
+
+    def _get_coalesced_response(self, *, cache_manager: QueryCacheManager) -> Optional[CR]:
+        cached_response_candidate = cache_manager.get_cache_data()
+        if not self.is_cached_response(cached_response_candidate):
+            return None
+
+        cached_response_candidate["is_cached"] = True
+        cached_response = self.cached_response_type(**cached_response_candidate)
+        if self._is_stale(last_refresh=last_refresh_from_cached_result(cached_response)):
+            return None
+
+        self.count_query_cache_hit(hit="coalesced", trigger=cached_response.calculation_trigger or "")
+        return cached_response
+
+    def _calculate_and_cache(self, *, cache_manager: QueryCacheManager, user: Optional[User] = None) -> CR:
+        cache_key = cache_manager.cache_key
+        CachedResponse: type[CR] = self.cached_response_type
         last_refresh = datetime.now(UTC)
         target_age = self.cache_target_age(last_refresh=last_refresh)
 
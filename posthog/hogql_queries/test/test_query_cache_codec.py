@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.test import override_settings
+from django_redis.cache import RedisCache
+
+from posthog import redis
+from posthog.cache_utils import OrjsonJsonSerializer
+from posthog.caching.tolerant_zlib_compressor import PRECOMPRESSED_VALUE_PREFIX
+from posthog.hogql_queries.query_cache import QueryCacheManager
+from posthog.hogql_queries.query_cache_codec import (
+    CURRENT_DICTIONARY_ID_KEY,
+    DICTIONARY_SAMPLES_KEY,
+    decode_query_cache_value,
+    encode_query_cache_value,
+    query_cache_dictionaries,
+    train_query_cache_dictionary,
+)
+from posthog.test.base import BaseTest
+
+
+def _response(index: int = 0) -> dict:
+    return {
+        "results": [
+            {
+                "label": f"$pageview - {breakdown}",
+                "data": [index + day for day in range(30)],
+                "breakdown_value": breakdown,
+            }
+            for breakdown in ("Chrome", "Firefox", "Safari", "Edge")
+        ],
+        "is_cached": False,
+        "cache_key": f"cache_{index}",
+        "timezone": "UTC",
+    }
+
+
+class TestQueryCacheCodec(BaseTest):
+    def tearDown(self):
+        redis.get_client().delete(DICTIONARY_SAMPLES_KEY, CURRENT_DICTIONARY_ID_KEY)
+        query_cache_dictionaries.clear()
+        super().tearDown()
+
+    @override_settings(QUERY_CACHE_CODEC="json")
+    def test_json_codec_writes_plain_json(self):
+        encoded = encode_query_cache_value(_response())
+
+        self.assertEqual(OrjsonJsonSerializer({}).loads(encoded), _response())
+        self.assertEqual(decode_query_cache_value(encoded), _response())
+
+    @override_settings(QUERY_CACHE_CODEC="zstd")
+    def test_zstd_codec_roundtrip(self):
+        encoded = encode_query_cache_value(_response())
+
+        self.assertTrue(encoded.startswith(PRECOMPRESSED_VALUE_PREFIX))
+        self.assertLess(len(encoded), len(OrjsonJsonSerializer({}).dumps(_response())))
+        self.assertEqual(decode_query_cache_value(encoded), _response())
+
+    def test_reads_values_written_with_any_codec(self):
+        with override_settings(QUERY_CACHE_CODEC="zstd"):
+            cache_manager = QueryCacheManager(team_id=self.team.pk, cache_key="codec_test_zstd")
+            cache_manager.set_cache_data(response=_response(1), target_age=None)
+        with override_settings(QUERY_CACHE_CODEC="json"):
+            self.assertEqual(cache_manager.get_cache_data(), _response(1))
+
+            cache_manager = QueryCacheManager(team_id=self.team.pk, cache_key="codec_test_json")
+            cache_manager.set_cache_data(response=_response(2), target_age=None)
+        with override_settings(QUERY_CACHE_CODEC="zstd"):
+            self.assertEqual(cache_manager.get_cache_data(), _response(2))
+
+    @override_settings(
+        QUERY_CACHE_CODEC="zstd", QUERY_CACHE_CODEC_DICTIONARY_ENABLED=True, QUERY_CACHE_CODEC_DICTIONARY_SAMPLE_RATE=1
+    )
+    def test_zstd_codec_with_trained_dictionary(self):
+        self.assertIsNone(train_query_cache_dictionary())
+
+        encoded_without_dictionary = [encode_query_cache_value(_response(index)) for index in range(200)]
+        dict_id = train_query_cache_dictionary()
+        self.assertIsNotNone(dict_id)
+
+        query_cache_dictionaries.clear()
+        encoded = encode_query_cache_value(_response(1000))
+
+        self.assertLess(len(encoded), len(encoded_without_dictionary[0]))
+        self.assertEqual(decode_query_cache_value(encoded), _response(1000))
+        # Values compressed before the dictionary was trained are still readable
+        self.assertEqual(decode_query_cache_value(encoded_without_dictionary[0]), _response(0))
+
+    @override_settings(QUERY_CACHE_CODEC="zstd")
+    def test_undecodable_values_are_cache_misses(self):
+        encoded = encode_query_cache_value(_response())
+
+        self.assertIsNone(decode_query_cache_value(encoded[:-10]))
+
+    @override_settings(QUERY_CACHE_CODEC="zstd", USE_REDIS_COMPRESSION=True)
+    def test_zstd_codec_values_are_written_to_redis_as_is(self):
+        # The test settings use a local memory cache, while values only go through the compressor with Redis
+        redis_cache = RedisCache(settings.REDIS_URL, {"OPTIONS": settings.REDIS_CACHE_OPTIONS})
+        cache_key = "codec_test_redis"
+        encoded = encode_query_cache_value(_response())
+        self.addCleanup(redis_cache.delete, cache_key)
+
+        redis_cache.set(cache_key, encoded)
+
+        self.assertEqual(redis_cache.client.get_client().get(redis_cache.make_key(cache_key)), encoded)
+        self.assertEqual(redis_cache.get(cache_key), encoded)
+        self.assertEqual(decode_query_cache_value(redis_cache.get(cache_key)), _response())
+
+        # Any other value is still pickled
+        redis_cache.set(cache_key, _response())
+        self.assertEqual(redis_cache.get(cache_key), _response())
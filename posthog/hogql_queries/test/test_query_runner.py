@@ -7,6 +7,7 @@ from django.core.cache import cache
 from freezegun import freeze_time
 from pydantic import BaseModel
 
+from posthog.hogql_queries.query_coalescing import QueryCoalescer
 from posthog.hogql_queries.query_runner import ExecutionMode, QueryRunner
 from posthog.models.team.team import Team
 from posthog.schema import (
@@ -246,6 +247,62 @@ class TestQueryRunner(BaseTest):
             self.assertEqual(response.last_refresh.isoformat(), "2023-02-04T13:37:42+00:00")
             mock_on_commit.assert_called_once()
 
+    def test_coalescer_only_allows_one_leader(self):
+        leader = QueryCoalescer(cache_key="cache_abc")
+        follower = QueryCoalescer(cache_key="cache_abc")
+
+        self.assertTrue(leader.acquire())
+        self.assertFalse(follower.acquire())
+
+        leader.release()
+        # Lock is gone, so waiting returns immediately
+        self.assertTrue(follower.wait())
+        self.assertTrue(follower.acquire())
+        follower.release()
+
+    def test_coalesced_run_reuses_leader_result(self):
+        TestQueryRunner = self.setup_test_query_runner_class()
+
+        runner = TestQueryRunner(query={"some_attr": "bla"}, team=self.team)
+        other_runner = TestQueryRunner(query={"some_attr": "bla"}, team=self.team)
+        leader = QueryCoalescer(cache_key=runner.get_cache_key())
+        self.assertTrue(leader.acquire())
+
+        def leader_finishes():
+            other_runner.run(execution_mode=ExecutionMode.CALCULATE_BLOCKING_ALWAYS)
+            leader.release()
+            return True
+
+        with (
+            freeze_time(datetime(2023, 2, 4, 13, 37, 42)),
+            mock.patch.object(QueryCoalescer, "wait", side_effect=leader_finishes) as mock_wait,
+            mock.patch.object(runner, "calculate", wraps=runner.calculate) as mock_calculate,
+        ):
+            response = runner.run(execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE)
+
+            self.assertIsInstance(response, TestCachedBasicQueryResponse)
+            self.assertEqual(response.is_cached, True)
+            mock_wait.assert_called_once()
+            mock_calculate.assert_not_called()
+
+    def test_coalesced_run_calculates_itself_on_timeout(self):
+        TestQueryRunner = self.setup_test_query_runner_class()
+
+        runner = TestQueryRunner(query={"some_attr": "bla"}, team=self.team)
+        leader = QueryCoalescer(cache_key=runner.get_cache_key())
+        self.assertTrue(leader.acquire())
+
+        with (
+            freeze_time(datetime(2023, 2, 4, 13, 37, 42)),
+            mock.patch.object(QueryCoalescer, "wait", return_value=False),
+        ):
+            response = runner.run(execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE)
+
+            self.assertIsInstance(response, TestCachedBasicQueryResponse)
+            self.assertEqual(response.is_cached, False)
+
+        leader.release()
+
     def test_modifier_passthrough(self):
         try:
             from ee.clickhouse.materialized_columns.analyze import materialize
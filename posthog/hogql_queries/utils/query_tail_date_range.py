@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Optional
+
+from posthog.hogql_queries.utils.query_date_range import QueryDateRange
+from posthog.models.team import Team
+from posthog.schema import DateRange, IntervalType
+
+
+class QueryTailDateRange(QueryDateRange):
+    """Keeps the end of a date range, but moves its start forward to the interval containing tail_from"""
+
+    _team: Team
+    _date_range: Optional[DateRange]
+    _interval: Optional[IntervalType]
+    _now_without_timezone: datetime
+    _tail_from: datetime
+
+    def __init__(
+        self,
+        date_range: Optional[DateRange],
+        team: Team,
+        interval: Optional[IntervalType],
+        now: datetime,
+        tail_from: datetime,
+    ) -> None:
+        super().__init__(date_range, team, interval, now)
+        self._tail_from = tail_from
+
+    def date_from(self) -> datetime:
+        original_date_from = super().date_from()
+        tail_from = self.align_with_interval(self._tail_from.astimezone(self._team.timezone_info))
+        return max(original_date_from, tail_from)
@@ -1,11 +1,14 @@
+import concurrent.futures
 import json
+import threading
 from enum import StrEnum
-from typing import Any, Optional
-from collections.abc import Callable
+from typing import Any, NamedTuple, Optional
+from collections.abc import Callable, Iterable
 
 from django.conf import settings
 from kafka import KafkaConsumer as KC
 from kafka import KafkaProducer as KP
+from kafka.errors import KafkaError
 from kafka.producer.future import (
     FutureProduceResult,
     FutureRecordMetadata,
@@ -103,6 +106,45 @@ def _sasl_params():
     return {}
 
 
+class KafkaMessage(NamedTuple):
+    """A message to produce as part of a batch, with its value already serialized."""
+
+    topic: str
+    value: bytes
+    key: Optional[str] = None
+    headers: Optional[list[tuple[str, str]]] = None
+
+
+def _combine_futures(futures: list[FutureRecordMetadata]) -> concurrent.futures.Future:
+    """Combine the futures of produced messages into one, failing with the first error of any of them."""
+    combined: concurrent.futures.Future = concurrent.futures.Future()
+    results: list[Optional[RecordMetadata]] = [None] * len(futures)
+    remaining = len(futures)
+    lock = threading.Lock()
+
+    if not futures:
+        combined.set_result(results)
+        return combined
+
+    def on_success(index: int, record_metadata: RecordMetadata) -> None:
+        nonlocal remaining
+        with lock:
+            results[index] = record_metadata
+            remaining -= 1
+            if remaining == 0 and not combined.done():
+                combined.set_result(results)
+
+    def on_failure(exc: Exception) -> None:
+        with lock:
+            if not combined.done():
+                combined.set_exception(exc)
+
+    for index, future in enumerate(futures):
+        future.add_callback(on_success, index).add_errback(on_failure)
+
+    return combined
+
+
 class _KafkaProducer:
     def __init__(
         self,
@@ -114,6 +156,7 @@ class _KafkaProducer:
         kafka_security_protocol=None,
         max_request_size=None,
         compression_type=None,
+        producer_settings=None,
     ):
         if settings.TEST:
             test = True  # Set at runtime so that overriden settings.TEST is supported
@@ -123,11 +166,15 @@ class _KafkaProducer:
             kafka_hosts = settings.KAFKA_HOSTS
         if kafka_base64_keys is None:
             kafka_base64_keys = settings.KAFKA_BASE64_KEYS
+        if producer_settings is None:
+            producer_settings = {}
 
         if test:
             self.producer = KafkaProducerForTests()
         elif kafka_base64_keys:
-            self.producer = helper.get_kafka_producer(retries=KAFKA_PRODUCER_RETRIES, value_serializer=lambda d: d)
+            self.producer = helper.get_kafka_producer(
+                retries=KAFKA_PRODUCER_RETRIES, value_serializer=lambda d: d, **producer_settings
+            )
         else:
             self.producer = KP(
                 retries=KAFKA_PRODUCER_RETRIES,
@@ -138,7 +185,7 @@ class _KafkaProducer:
                 **{"api_version_auto_timeout_ms": 30000}
                 if settings.DEBUG
                 else {},  # Local development connections could be really slow
-                **settings.KAFKA_PRODUCER_SETTINGS,
+                **{**settings.KAFKA_PRODUCER_SETTINGS, **producer_settings},
                 **_sasl_params(),
             )
 
@@ -177,6 +224,40 @@ class _KafkaProducer:
         future.add_callback(self.on_send_success).add_errback(lambda exc: self.on_send_failure(topic=topic, exc=exc))
         return future
 
+    def produce_batch(
+        self, messages: Iterable[KafkaMessage], max_in_flight: Optional[int] = None
+    ) -> concurrent.futures.Future:
+        """Produce a batch of messages, without waiting for each of them to be acknowledged.
+
+        Once `max_in_flight` messages are left unacknowledged, we wait for the oldest of them before
+        sending more, so that a large batch can't grow the producer's buffer without bound.
+
+        Returns:
+            A single future, resolved with the metadata of all messages once they are acknowledged,
+            or failed with the first error of any of them.
+        """
+        futures: list[FutureRecordMetadata] = []
+
+        for message in messages:
+            if max_in_flight is not None and len(futures) >= max_in_flight:
+                try:
+                    futures[len(futures) - max_in_flight].get(timeout=settings.KAFKA_PRODUCE_ACK_TIMEOUT_SECONDS)
+                except KafkaError:
+                    # Errors are raised from the combined future instead
+                    pass
+
+            futures.append(
+                self.produce(
+                    topic=message.topic,
+                    data=message.value,
+                    key=message.key,
+                    value_serializer=lambda b: b,
+                    headers=message.headers,
+                )
+            )
+
+        return _combine_futures(futures)
+
     def flush(self, timeout=None):
         self.producer.flush(timeout)
 
@@ -206,6 +287,7 @@ def can_connect():
 
 KafkaProducer = SingletonDecorator(_KafkaProducer)
 SessionRecordingKafkaProducer = SingletonDecorator(_KafkaProducer)
+BatchKafkaProducer = SingletonDecorator(_KafkaProducer)
 
 
 def session_recording_kafka_producer() -> _KafkaProducer:
@@ -217,6 +299,10 @@ def session_recording_kafka_producer() -> _KafkaProducer:
     )
 
 
+def batch_kafka_producer() -> _KafkaProducer:
+    return BatchKafkaProducer(producer_settings=settings.KAFKA_BATCH_PRODUCER_SETTINGS)
+
+
 def build_kafka_consumer(
     topic: Optional[str],
     value_deserializer=lambda v: json.loads(v.decode("utf-8")),
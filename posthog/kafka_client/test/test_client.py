@@ -2,8 +2,10 @@ from unittest.mock import patch
 
 import kafka
 from django.test import TestCase, override_settings
+from kafka.errors import KafkaError
+from kafka.future import Future
 
-from posthog.kafka_client.client import _KafkaProducer, build_kafka_consumer
+from posthog.kafka_client.client import KafkaMessage, _KafkaProducer, build_kafka_consumer
 
 
 @override_settings(TEST=False)
@@ -33,6 +35,24 @@ class KafkaClientTestCase(TestCase):
         payload = next(consumer)
         self.assertEqual(payload.value, self.payload)
 
+    def test_kafka_produce_batch(self):
+        producer = _KafkaProducer(test=True)
+        future = producer.produce_batch(
+            [KafkaMessage(topic=self.topic, value=b"1"), KafkaMessage(topic=self.topic, value=b"2", key="key")],
+            max_in_flight=1,
+        )
+        self.assertEqual(future.result(timeout=1), [None, None])
+
+    def test_kafka_produce_batch_fails_with_the_first_error(self):
+        producer = _KafkaProducer(test=True)
+        with patch.object(
+            producer.producer, "send", side_effect=[Future().success(None), Future().failure(KafkaError("Failed"))]
+        ):
+            future = producer.produce_batch([KafkaMessage(topic=self.topic, value=b"1")] * 2)
+
+        with self.assertRaises(KafkaError):
+            future.result(timeout=1)
+
     def test_kafka_default_security_protocol(self):
         producer = _KafkaProducer(test=False)
         self.assertEqual(producer.producer.config["security_protocol"], "PLAINTEXT")  # type: ignore
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.18 on 2025-03-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posthog", "0689_survey_enable_partial_responses"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="datawarehousesavedquery",
+            name="sync_type",
+            field=models.CharField(
+                blank=True,
+                choices=[("full_refresh", "full_refresh"), ("incremental", "incremental")],
+                max_length=128,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="datawarehousesavedquery",
+            name="sync_type_config",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
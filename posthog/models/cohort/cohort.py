@@ -194,7 +194,19 @@ class Cohort(models.Model):
             "deleted": self.deleted,
         }
 
-    def calculate_people_ch(self, pending_version: int, *, initiating_user_id: Optional[int] = None):
+    def calculate_people_ch(
+        self,
+        pending_version: int,
+        *,
+        initiating_user_id: Optional[int] = None,
+        precalculated_count: Optional[int] = None,
+    ):
+        """
+        Recalculate cohort people at `pending_version`.
+
+        If `precalculated_count` is given, cohortpeople were already recalculated along other cohorts
+        (see `recalculate_cohortpeople_batch`), and only the cohort itself is updated.
+        """
         from posthog.models.cohort.util import recalculate_cohortpeople
         from posthog.tasks.calculate_cohort import clear_stale_cohort
 
@@ -207,7 +219,10 @@ class Cohort(models.Model):
         start_time = time.monotonic()
 
         try:
-            count = recalculate_cohortpeople(self, pending_version, initiating_user_id=initiating_user_id)
+            if precalculated_count is not None:
+                count = precalculated_count
+            else:
+                count = recalculate_cohortpeople(self, pending_version, initiating_user_id=initiating_user_id)
             self.count = count
 
             self.last_calculation = timezone.now()
@@ -39,6 +39,14 @@ FROM cohortpeople
 WHERE team_id = %(team_id)s AND cohort_id = %(cohort_id)s AND version = %(version)s
 """
 
+GET_COHORT_SIZES_SQL = """
+SELECT cohort_id, count(DISTINCT person_id)
+FROM cohortpeople
+WHERE team_id = %(team_id)s AND cohort_id IN %(cohort_ids)s
+AND version = transform(cohort_id, %(cohort_ids)s, %(versions)s, 0)
+GROUP BY cohort_id
+"""
+
 # Continually ensure that all previous version rows are deleted and insert persons that match the criteria
 # optimize_aggregation_in_order = 1 is necessary to avoid oom'ing for our biggest clients
 RECALCULATE_COHORT_BY_ID = """
@@ -54,6 +62,52 @@ WHERE team_id = %(team_id)s AND cohort_id = %(cohort_id)s AND version < %(new_ve
 SETTINGS optimize_aggregation_in_order = 1, join_algorithm = 'auto'
 """
 
+# Same as above, but only persons updated since `updated_after` are re-evaluated with the cohort filter.
+# Everyone else in the current version is carried over to the new version as is.
+RECALCULATE_COHORT_BY_ID_INCREMENTAL = """
+INSERT INTO cohortpeople
+SELECT id, %(cohort_id)s as cohort_id, %(team_id)s as team_id, 1 AS sign, %(new_version)s AS version
+FROM (
+    {cohort_filter}
+) as person
+UNION ALL
+SELECT DISTINCT person_id, cohort_id, team_id, 1, %(new_version)s
+FROM cohortpeople
+WHERE team_id = %(team_id)s AND cohort_id = %(cohort_id)s AND version = %(version)s AND sign = 1
+AND person_id NOT IN (
+    SELECT id FROM person
+    WHERE team_id = %(team_id)s AND _timestamp > parseDateTimeBestEffort(%(updated_after)s)
+)
+UNION ALL
+SELECT person_id, cohort_id, team_id, -1, version
+FROM cohortpeople
+WHERE team_id = %(team_id)s AND cohort_id = %(cohort_id)s AND version < %(new_version)s AND sign = 1
+SETTINGS optimize_aggregation_in_order = 1, join_algorithm = 'auto'
+"""
+
+# Same as above, but for many cohorts filtering only on person properties at once, with a single scan of persons.
+# Each person is matched against the filters of all cohorts, emitting a row for each (person, cohort) that matches.
+# `cohort_conditions` is a list of (cohort_id, new_version, matches) tuples.
+RECALCULATE_COHORTS_BATCH = """
+INSERT INTO cohortpeople
+SELECT id, cohort.1 AS cohort_id, %(team_id)s AS team_id, 1 AS sign, cohort.2 AS version
+FROM (
+    SELECT id, arrayFilter(cohort -> cohort.3, [{cohort_conditions}]) AS matching_cohorts
+    FROM person
+    WHERE team_id = %(team_id)s
+    {prefiltering_condition}
+    GROUP BY id
+    HAVING max(is_deleted) = 0 AND notEmpty(matching_cohorts)
+) AS person
+ARRAY JOIN matching_cohorts AS cohort
+UNION ALL
+SELECT person_id, cohort_id, team_id, -1, version
+FROM cohortpeople
+WHERE team_id = %(team_id)s AND cohort_id IN %(cohort_ids)s AND sign = 1
+AND version < transform(cohort_id, %(cohort_ids)s, %(new_versions)s, 0)
+SETTINGS optimize_aggregation_in_order = 1, join_algorithm = 'auto'
+"""
+
 # Continually ensure that all previous version rows are deleted and insert persons that match the criteria
 # optimize_aggregation_in_order = 1 is necessary to avoid oom'ing for our biggest clients
 RECALCULATE_COHORT_BY_ID_HOGQL_TEST = """
@@ -1,4 +1,5 @@
 import uuid
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Any, Optional, Union, cast
 
@@ -26,11 +27,14 @@ from posthog.models.cohort.cohort import Cohort, CohortOrEmpty
 from posthog.models.cohort.sql import (
     CALCULATE_COHORT_PEOPLE_SQL,
     GET_COHORT_SIZE_SQL,
+    GET_COHORT_SIZES_SQL,
     GET_COHORTS_BY_PERSON_UUID,
     GET_PERSON_ID_BY_PRECALCULATED_COHORT_ID,
     GET_STATIC_COHORT_SIZE_SQL,
     GET_STATIC_COHORTPEOPLE_BY_PERSON_UUID,
     RECALCULATE_COHORT_BY_ID,
+    RECALCULATE_COHORT_BY_ID_INCREMENTAL,
+    RECALCULATE_COHORTS_BATCH,
     STALE_COHORTPEOPLE,
     RECALCULATE_COHORT_BY_ID_HOGQL_TEST,
 )
@@ -45,10 +49,15 @@ from posthog.schema import HogQLQueryModifiers, PersonsOnEventsMode
 # temporary marker to denote when cohortpeople table started being populated
 TEMP_PRECALCULATED_MARKER = parser.parse("2021-06-07T15:00:00+00:00")
 
+# Relative dates (e.g. "-30d") match different persons as time passes, even if persons don't change
+INCREMENTALLY_UNSUPPORTED_OPERATORS = ("is_date_before", "is_date_after", "is_date_exact")
+
 logger = structlog.get_logger(__name__)
 
 
-def format_person_query(cohort: Cohort, index: int, hogql_context: HogQLContext) -> tuple[str, dict[str, Any]]:
+def format_person_query(
+    cohort: Cohort, index: int, hogql_context: HogQLContext, *, updated_after: Optional[datetime] = None
+) -> tuple[str, dict[str, Any]]:
     if cohort.is_static:
         return format_static_cohort_query(cohort, index, prepend="")
 
@@ -58,9 +67,14 @@ def format_person_query(cohort: Cohort, index: int, hogql_context: HogQLContext)
 
     from posthog.queries.cohort_query import CohortQuery
 
+    data: dict[str, Any] = {"properties": cohort.properties}
+    if updated_after is not None:
+        # Only match persons updated since then
+        data["updated_after"] = updated_after.isoformat()
+
     query_builder = CohortQuery(
         Filter(
-            data={"properties": cohort.properties},
+            data=data,
             team=cohort.team,
             hogql_context=hogql_context,
         ),
@@ -311,20 +325,68 @@ def recalculate_cohortpeople(
     """
     relevant_teams = Team.objects.order_by("id").filter(project_id=cohort.team.project_id)
     count_by_team_id: dict[int, int] = {}
+    updated_after = (
+        None
+        if hogql
+        else get_incremental_calculation_start(cohort, pending_version, initiating_user_id=initiating_user_id)
+    )
     for team in relevant_teams:
-        count_for_team = (_recalculate_cohortpeople_for_team_hogql if hogql else _recalculate_cohortpeople_for_team)(
-            cohort, pending_version, team, initiating_user_id=initiating_user_id
-        )
+        if hogql:
+            count_for_team = _recalculate_cohortpeople_for_team_hogql(
+                cohort, pending_version, team, initiating_user_id=initiating_user_id
+            )
+        else:
+            count_for_team = _recalculate_cohortpeople_for_team(
+                cohort, pending_version, team, initiating_user_id=initiating_user_id, updated_after=updated_after
+            )
         count_by_team_id[team.id] = count_for_team or 0
 
     return count_by_team_id[cohort.team_id]
 
 
+def get_incremental_calculation_start(
+    cohort: Cohort, pending_version: int, *, initiating_user_id: Optional[int]
+) -> Optional[datetime]:
+    """
+    Persons updated after the returned time need to be re-evaluated when recalculating the cohort incrementally.
+
+    Returns None if the cohort must be recalculated from scratch, which is the case for:
+    - Recalculations initiated by users, as the cohort's filters might have just changed.
+    - Cohorts that aren't only filtering on person properties, as their membership also depends on events
+      or other cohorts, and cohorts filtering by dates, as relative dates change as time passes.
+    - Cohorts without a previous successful calculation to build on.
+    - Every `COHORT_FULL_CALCULATION_EVERY_N_VERSIONS` versions, to eventually correct any drift.
+    """
+    if not settings.COHORT_INCREMENTAL_CALCULATION_ENABLED or initiating_user_id is not None:
+        return None
+
+    if cohort.is_static or cohort.version is None or cohort.last_calculation is None or cohort.errors_calculating:
+        return None
+
+    if settings.COHORT_FULL_CALCULATION_EVERY_N_VERSIONS > 0 and (
+        pending_version % settings.COHORT_FULL_CALCULATION_EVERY_N_VERSIONS == 0
+    ):
+        return None
+
+    properties = cohort.properties.flat
+    if not properties or any(
+        prop.type != "person" or prop.operator in INCREMENTALLY_UNSUPPORTED_OPERATORS for prop in properties
+    ):
+        return None
+
+    return cohort.last_calculation - timedelta(minutes=settings.COHORT_INCREMENTAL_CALCULATION_LOOKBACK_MINUTES)
+
+
 def _recalculate_cohortpeople_for_team(
-    cohort: Cohort, pending_version: int, team: Team, *, initiating_user_id: Optional[int]
+    cohort: Cohort,
+    pending_version: int,
+    team: Team,
+    *,
+    initiating_user_id: Optional[int],
+    updated_after: Optional[datetime] = None,
 ) -> Optional[int]:
     hogql_context = HogQLContext(within_non_hogql_query=True, team_id=team.id)
-    cohort_query, cohort_params = format_person_query(cohort, 0, hogql_context)
+    cohort_query, cohort_params = format_person_query(cohort, 0, hogql_context, updated_after=updated_after)
 
     before_count = get_cohort_size(cohort, team_id=team.id)
 
@@ -334,9 +396,15 @@ def _recalculate_cohortpeople_for_team(
             team_id=team.id,
             cohort_id=cohort.pk,
             size_before=before_count,
+            incremental=updated_after is not None,
         )
 
-    recalcluate_cohortpeople_sql = RECALCULATE_COHORT_BY_ID.format(cohort_filter=cohort_query)
+    if updated_after is not None:
+        recalcluate_cohortpeople_sql = RECALCULATE_COHORT_BY_ID_INCREMENTAL.format(cohort_filter=cohort_query)
+        incremental_params = {"version": cohort.version, "updated_after": updated_after.isoformat()}
+    else:
+        recalcluate_cohortpeople_sql = RECALCULATE_COHORT_BY_ID.format(cohort_filter=cohort_query)
+        incremental_params = {}
 
     tag_queries(kind="cohort_calculation", team_id=team.id, query_type="CohortsQuery")
     if initiating_user_id:
@@ -347,6 +415,7 @@ def _recalculate_cohortpeople_for_team(
         {
             **cohort_params,
             **hogql_context.values,
+            **incremental_params,
             "cohort_id": cohort.pk,
             "team_id": team.id,
             "new_version": pending_version,
@@ -374,6 +443,128 @@ def _recalculate_cohortpeople_for_team(
     return count
 
 
+def can_recalculate_cohortpeople_in_batch(cohort: Cohort) -> bool:
+    """Whether the cohort only filters on person properties, so that it can be calculated along others."""
+    if cohort.is_static or cohort.deleted:
+        return False
+
+    properties = cohort.properties.flat
+    return bool(properties) and all(prop.type == "person" for prop in properties)
+
+
+def recalculate_cohortpeople_batch(
+    cohorts: list[tuple[Cohort, int]], *, initiating_user_id: Optional[int] = None
+) -> dict[int, int]:
+    """
+    Recalculate cohort people of many cohorts of the same project, scanning persons once for each environment.
+
+    Cohorts are given with their pending version, and must pass `can_recalculate_cohortpeople_in_batch`.
+    Returns the count of each cohort by cohort ID, for the team where the cohort was created.
+    """
+    project_ids = {cohort.team.project_id for cohort, _ in cohorts}
+    if len(project_ids) != 1:
+        raise ValueError("Cohorts recalculated in a batch must belong to the same project")
+
+    for team in Team.objects.order_by("id").filter(project_id=project_ids.pop()):
+        _recalculate_cohortpeople_batch_for_team(cohorts, team, initiating_user_id=initiating_user_id)
+
+    cohorts_by_team_id: dict[int, list[tuple[Cohort, int]]] = defaultdict(list)
+    for cohort, pending_version in cohorts:
+        cohorts_by_team_id[cohort.team_id].append((cohort, pending_version))
+
+    count_by_cohort_id: dict[int, int] = {}
+    for team_id, team_cohorts in cohorts_by_team_id.items():
+        count_result = sync_execute(
+            GET_COHORT_SIZES_SQL,
+            {
+                "team_id": team_id,
+                "cohort_ids": [cohort.pk for cohort, _ in team_cohorts],
+                "versions": [pending_version for _, pending_version in team_cohorts],
+            },
+            workload=Workload.OFFLINE,
+        )
+        counts = dict(count_result)
+        for cohort, _ in team_cohorts:
+            count_by_cohort_id[cohort.pk] = counts.get(cohort.pk, 0)
+
+    return count_by_cohort_id
+
+
+def _recalculate_cohortpeople_batch_for_team(
+    cohorts: list[tuple[Cohort, int]], team: Team, *, initiating_user_id: Optional[int]
+) -> None:
+    from posthog.models.property.util import parse_prop_grouped_clauses
+
+    hogql_context = HogQLContext(within_non_hogql_query=True, team_id=team.id)
+    params: dict[str, Any] = {
+        "team_id": team.id,
+        "cohort_ids": [cohort.pk for cohort, _ in cohorts],
+        "new_versions": [pending_version for _, pending_version in cohorts],
+    }
+    cohort_conditions: list[str] = []
+    prefiltering_conditions: list[str] = []
+
+    for index, (cohort, pending_version) in enumerate(cohorts):
+        # Same conditions as `PersonQuery` uses for person property filters, after and before aggregating versions
+        condition, condition_params = parse_prop_grouped_clauses(
+            team.id,
+            cohort.properties,
+            has_person_id_joined=False,
+            group_properties_joined=False,
+            person_properties_mode=PersonPropertiesMode.DIRECT,
+            prepend=f"cohort_batch_fin_{index}",
+            hogql_context=hogql_context,
+        )
+        prefiltering_condition, prefiltering_params = parse_prop_grouped_clauses(
+            team.id,
+            cohort.properties,
+            has_person_id_joined=False,
+            group_properties_joined=False,
+            person_properties_mode=PersonPropertiesMode.DIRECT_ON_PERSONS,
+            prepend=f"cohort_batch_pre_{index}",
+            hogql_context=hogql_context,
+        )
+        params.update(
+            {
+                **condition_params,
+                **prefiltering_params,
+                f"cohort_id_{index}": cohort.pk,
+                f"new_version_{index}": pending_version,
+            }
+        )
+        cohort_conditions.append(
+            f"(toInt64(%(cohort_id_{index})s), toUInt64(%(new_version_{index})s), ifNull(1 {condition}, 0))"
+        )
+        prefiltering_conditions.append(f"(1 {prefiltering_condition})" if prefiltering_condition else "")
+
+    # Only aggregate versions of persons that may match any of the cohorts
+    prefiltering = (
+        f"AND id IN (SELECT id FROM person WHERE team_id = %(team_id)s AND ({' OR '.join(prefiltering_conditions)}))"
+        if all(prefiltering_conditions)
+        else ""
+    )
+
+    recalculate_cohortpeople_sql = RECALCULATE_COHORTS_BATCH.format(
+        cohort_conditions=", ".join(cohort_conditions), prefiltering_condition=prefiltering
+    )
+
+    tag_queries(kind="cohort_calculation", team_id=team.id, query_type="CohortsBatchQuery")
+    if initiating_user_id:
+        tag_queries(user_id=initiating_user_id)
+
+    sync_execute(
+        recalculate_cohortpeople_sql,
+        {**params, **hogql_context.values},
+        settings={
+            "max_execution_time": 600,
+            "send_timeout": 600,
+            "receive_timeout": 600,
+            "optimize_on_insert": 0,
+        },
+        workload=Workload.OFFLINE,
+    )
+
+
 def _recalculate_cohortpeople_for_team_hogql(
     cohort: Cohort, pending_version: int, team: Team, *, initiating_user_id: Optional[int]
 ):
@@ -1,6 +1,6 @@
 import secrets
 from datetime import timedelta
-from typing import Optional
+from typing import IO, Optional
 
 import structlog
 from django.conf import settings
@@ -175,7 +175,35 @@ def save_content_to_exported_asset(exported_asset: ExportedAsset, content: bytes
     exported_asset.save(update_fields=["content"])
 
 
-def save_content_to_object_storage(exported_asset: ExportedAsset, content: bytes) -> None:
+def save_content_from_file(exported_asset: ExportedAsset, content_file: IO[bytes], size: int) -> None:
+    """
+    Like `save_content`, for content rendered into a (spooled) temporary file.
+
+    Files larger than a multipart upload part are streamed to object storage, rather than read into memory.
+    """
+    content_file.seek(0)
+    if not settings.OBJECT_STORAGE_ENABLED or size <= object_storage.MULTIPART_CHUNK_SIZE:
+        save_content(exported_asset, content_file.read())
+        return
+
+    try:
+        object_path = _object_storage_path(exported_asset)
+        object_storage.write_fileobj(object_path, content_file)
+        exported_asset.content_location = object_path
+        exported_asset.save(update_fields=["content_location"])
+    except ObjectStorageError as ose:
+        capture_exception(ose)
+        logger.error(
+            "exported_asset.object-storage-error",
+            exported_asset_id=exported_asset.id,
+            exception=ose,
+            exc_info=True,
+        )
+        content_file.seek(0)
+        save_content_to_exported_asset(exported_asset, content_file.read())
+
+
+def _object_storage_path(exported_asset: ExportedAsset) -> str:
     path_parts: list[str] = [
         settings.OBJECT_STORAGE_EXPORTS_FOLDER,
         exported_asset.export_format.split("/")[1],
@@ -183,7 +211,11 @@ def save_content_to_object_storage(exported_asset: ExportedAsset, content: bytes
         f"task-{exported_asset.id}",
         str(UUIDT()),
     ]
-    object_path = "/".join(path_parts)
+    return "/".join(path_parts)
+
+
+def save_content_to_object_storage(exported_asset: ExportedAsset, content: bytes) -> None:
+    object_path = _object_storage_path(exported_asset)
     object_storage.write(object_path, content)
     exported_asset.content_location = object_path
     exported_asset.save(update_fields=["content_location"])
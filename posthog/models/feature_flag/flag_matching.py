@@ -1,9 +1,12 @@
 import hashlib
 from dataclasses import dataclass
+from functools import reduce
+from operator import or_
 from enum import StrEnum
 import time
 import structlog
-from typing import Literal, Optional, Union, cast
+from typing import Literal, Optional, TypeVar, Union, cast
+from collections.abc import Callable
 
 from prometheus_client import Counter
 from django.conf import settings
@@ -39,6 +42,13 @@ from .feature_flag import (
     get_feature_flags_for_team_in_cache,
     set_feature_flags_for_team_in_cache,
 )
+from .local_evaluation import (
+    CompiledCondition,
+    CompiledFeatureFlag,
+    compile_condition,
+    compiled_flags_cache,
+    match_condition_locally,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -68,6 +78,10 @@ FLAG_CACHE_HIT_COUNTER = Counter(
 ENTITY_EXISTS_PREFIX = "flag_entity_exists_"
 PERSON_KEY = "person"
 
+BULK_FLAG_EVALUATION_BATCH_SIZE = 1000
+
+T = TypeVar("T")
+
 
 class FeatureFlagMatchReason(StrEnum):
     SUPER_CONDITION_VALUE = "super_condition_value"
@@ -110,6 +124,16 @@ class FeatureFlagMatch:
     payload: Optional[object] = None
 
 
+@dataclass(frozen=True)
+class PrefetchedFlagEntities:
+    """Person and group properties fetched up front for many distinct IDs, see `get_feature_flags_for_distinct_ids`."""
+
+    # distinct_id -> person properties. Distinct IDs without a person are left out.
+    person_properties: dict[str, dict]
+    # (group_type_index, group_key) -> group properties. Groups that don't exist are left out.
+    group_properties: dict[tuple[GroupTypeIndex, str], dict]
+
+
 @dataclass(frozen=True)
 class FeatureFlagDetails:
     match: FeatureFlagMatch
@@ -159,6 +183,7 @@ class FeatureFlagMatcher:
         group_property_value_overrides: Optional[dict[str, dict[str, Union[str, int]]]] = None,
         skip_database_flags: bool = False,
         cohorts_cache: Optional[dict[int, CohortOrEmpty]] = None,
+        prefetched_entities: Optional[PrefetchedFlagEntities] = None,
     ):
         if group_property_value_overrides is None:
             group_property_value_overrides = {}
@@ -178,6 +203,10 @@ class FeatureFlagMatcher:
         self.property_value_overrides = property_value_overrides
         self.group_property_value_overrides = group_property_value_overrides
         self.skip_database_flags = skip_database_flags
+        self.prefetched_entities = prefetched_entities
+        # Prefetched properties are only useful if we match on them locally
+        self.use_local_evaluation = settings.DECIDE_LOCAL_FLAG_EVALUATION or prefetched_entities is not None
+        self.compiled_flags: dict[int, CompiledFeatureFlag] = {}
 
         if cohorts_cache is None:
             self.cohorts_cache = {}
@@ -416,7 +445,8 @@ class FeatureFlagMatcher:
     ) -> tuple[bool, FeatureFlagMatchReason]:
         rollout_percentage = condition.get("rollout_percentage")
         if len(condition.get("properties", [])) > 0:
-            properties = Filter(data=condition).property_groups.flat
+            compiled_condition = self.get_compiled_condition(feature_flag, condition, condition_index)
+            properties = compiled_condition.properties
             if self.can_compute_locally(properties, feature_flag.aggregation_group_type_index):
                 # :TRICKY: If overrides are enough to determine if a condition is a match,
                 # we can skip checking the query.
@@ -428,6 +458,10 @@ class FeatureFlagMatcher:
                         {},
                     )
                 condition_match = all(match_property(property, target_properties) for property in properties)
+            elif self.use_local_evaluation and compiled_condition.can_evaluate_locally:
+                condition_match = self._condition_matches_locally(
+                    feature_flag, compiled_condition, match_if_entity_doesnt_exist=compiled_condition.is_pure_is_not
+                )
             else:
                 match_if_entity_doesnt_exist = check_pure_is_not_operator_condition(condition)
                 condition_match = self._condition_matches(
@@ -448,11 +482,59 @@ class FeatureFlagMatcher:
         return True, FeatureFlagMatchReason.CONDITION_MATCH
 
     def _super_condition_matches(self, feature_flag: FeatureFlag) -> bool:
+        if self.use_local_evaluation:
+            super_condition = self.get_compiled_flag(feature_flag).super_condition
+            if super_condition is None:
+                return False
+            if super_condition.can_evaluate_locally:
+                return self._condition_matches_locally(feature_flag, super_condition)
         return self._get_query_condition(f"flag_{feature_flag.pk}_super_condition")
 
     def _super_condition_is_set(self, feature_flag: FeatureFlag) -> Optional[bool]:
+        if self.use_local_evaluation:
+            super_condition_is_set = self.get_compiled_flag(feature_flag).super_condition_is_set
+            if super_condition_is_set is None:
+                return False
+            return self._condition_matches_locally(feature_flag, super_condition_is_set)
         return self._get_query_condition(f"flag_{feature_flag.pk}_super_condition_is_set")
 
+    def get_compiled_flag(self, feature_flag: FeatureFlag) -> CompiledFeatureFlag:
+        if feature_flag.pk not in self.compiled_flags:
+            self.compiled_flags[feature_flag.pk] = compiled_flags_cache.get_or_compile(feature_flag)
+        return self.compiled_flags[feature_flag.pk]
+
+    def get_compiled_condition(
+        self, feature_flag: FeatureFlag, condition: dict, condition_index: int
+    ) -> CompiledCondition:
+        conditions = feature_flag.conditions
+        if condition_index < len(conditions) and conditions[condition_index] == condition:
+            return self.get_compiled_flag(feature_flag).conditions[condition_index]
+        # Super and holdout conditions are matched through `is_condition_match` too, but they're rare enough
+        return compile_condition(condition)
+
+    def _condition_matches_locally(
+        self,
+        feature_flag: FeatureFlag,
+        compiled_condition: CompiledCondition,
+        match_if_entity_doesnt_exist: bool = False,
+    ) -> bool:
+        group_type_index = feature_flag.aggregation_group_type_index
+        if group_type_index is None:
+            entity_properties = self.person_properties
+            target_properties = self.property_value_overrides
+        else:
+            entity_properties = self.group_properties.get(group_type_index)
+            group_type_name = self.cache.group_type_index_to_name.get(group_type_index)
+            target_properties = (
+                self.group_property_value_overrides.get(group_type_name, {}) if group_type_name is not None else {}
+            )
+
+        # :TRICKY: Same as when querying, pure is_not conditions match people and groups that haven't been ingested yet
+        if entity_properties is None:
+            return match_if_entity_doesnt_exist
+
+        return match_condition_locally(compiled_condition, entity_properties, target_properties)
+
     def _condition_matches(
         self,
         feature_flag: FeatureFlag,
@@ -483,6 +565,68 @@ class FeatureFlagMatcher:
 
         return self.query_conditions.get(key, False)
 
+    def _fetch_from_database(self, op: str, fetch: Callable[[], T]) -> T:
+        if self.failed_to_fetch_conditions:
+            raise DatabaseError("Failed to fetch conditions for feature flag previously, not trying again.")
+        if self.skip_database_flags:
+            raise DatabaseError("Database healthcheck failed, not fetching flag conditions.")
+
+        try:
+            with execute_with_timeout(FLAG_MATCHING_QUERY_TIMEOUT_MS, DATABASE_FOR_FLAG_MATCHING):
+                with start_span(op=op):
+                    return fetch()
+        except DatabaseError as e:
+            logger.exception(f"{op} database error", error=str(e), exc_info=True)
+            self.failed_to_fetch_conditions = True
+            raise
+
+    @cached_property
+    def person_properties(self) -> Optional[dict]:
+        """Stored properties of the person, or None if they don't exist (yet). Fetched at most once per matcher."""
+        if self.prefetched_entities is not None:
+            return self.prefetched_entities.person_properties.get(self.distinct_id)
+        return self._fetch_from_database(
+            "fetch_person_properties",
+            lambda: Person.objects.db_manager(DATABASE_FOR_FLAG_MATCHING)
+            .filter(
+                team_id=self.team_id,
+                persondistinctid__distinct_id=self.distinct_id,
+                persondistinctid__team_id=self.team_id,
+            )
+            .values_list("properties", flat=True)
+            .first(),
+        )
+
+    @cached_property
+    def group_properties(self) -> dict[GroupTypeIndex, dict]:
+        """Stored properties of all groups passed in, by group type index. Fetched at most once per matcher."""
+        if self.prefetched_entities is not None:
+            return {
+                group_type_index: group_properties
+                for group_type, group_key in self.groups.items()
+                if (group_type_index := self.cache.group_types_to_indexes.get(group_type)) is not None
+                and (group_properties := self.prefetched_entities.group_properties.get((group_type_index, group_key)))
+                is not None
+            }
+
+        group_filters = [
+            Q(group_type_index=self.cache.group_types_to_indexes[group_type], group_key=group_key)
+            for group_type, group_key in self.groups.items()
+            if group_type in self.cache.group_types_to_indexes
+        ]
+        if not group_filters:
+            return {}
+
+        return self._fetch_from_database(
+            "fetch_group_properties",
+            lambda: {
+                cast(GroupTypeIndex, group_type_index): group_properties
+                for group_type_index, group_properties in Group.objects.db_manager(DATABASE_FOR_FLAG_MATCHING)
+                .filter(reduce(or_, group_filters), team_id=self.team_id)
+                .values_list("group_type_index", "group_properties")
+            },
+        )
+
     # Define contiguous sub-domains within [0, 1].
     # By looking up a random hash value, you can find the associated variant key.
     # e.g. the first of two variants with 50% rollout percentage will have value_max: 0.5
@@ -648,6 +792,14 @@ class FeatureFlagMatcher:
                         if feature_flag.super_conditions and len(feature_flag.super_conditions) > 0:
                             condition = feature_flag.super_conditions[0]
                             prop_key = (condition.get("properties") or [{}])[0].get("key")
+                            super_condition = self.get_compiled_flag(feature_flag).super_condition
+                            if (
+                                self.use_local_evaluation
+                                and super_condition is not None
+                                and super_condition.can_evaluate_locally
+                            ):
+                                # Evaluated without this query, see `_super_condition_matches`
+                                prop_key = None
                             if prop_key:
                                 key = f"flag_{feature_flag.pk}_super_condition"
                                 condition_eval(key, condition)
@@ -668,6 +820,12 @@ class FeatureFlagMatcher:
                             description=f"feature_flag={feature_flag.pk} key={feature_flag.key}",
                         ):
                             for index, condition in enumerate(feature_flag.conditions):
+                                if (
+                                    self.use_local_evaluation
+                                    and self.get_compiled_flag(feature_flag).conditions[index].can_evaluate_locally
+                                ):
+                                    # Evaluated without this query, see `_condition_matches_locally`
+                                    continue
                                 key = f"flag_{feature_flag.pk}_condition_{index}"
                                 condition_eval(key, condition)
 
@@ -1054,6 +1212,151 @@ def get_all_feature_flags_with_details(
     )
 
 
+def get_feature_flags_for_distinct_ids(
+    team: Team,
+    distinct_ids: list[str],
+    groups: Optional[dict[str, dict[GroupTypeName, str]]] = None,
+    flag_keys: Optional[list[str]] = None,
+) -> tuple[dict[str, dict[str, Union[str, bool]]], bool]:
+    """
+    Evaluate all flags for many distinct IDs at once, e.g. for backfills or targeting emails.
+
+    `groups` maps distinct IDs to the groups they're in. Persons, groups and hash key overrides are fetched
+    in bulk, one query each per batch of distinct IDs, and conditions are matched against them in Python.
+    Only conditions that can't be matched locally (cohorts, dates) still go to the database per distinct ID.
+
+    Returns the flag values by distinct ID, and whether any of them errored. If fetching a batch fails, its
+    distinct IDs only get the flags that can be evaluated without the database, and errors are reported.
+    """
+    if groups is None:
+        groups = {}
+
+    all_feature_flags = get_feature_flags_for_team_in_cache(team.project_id)
+    if all_feature_flags is None:
+        all_feature_flags = set_feature_flags_for_team_in_cache(team.project_id)
+    if flag_keys is not None:
+        flag_keys_set = set(flag_keys)
+        all_feature_flags = [ff for ff in all_feature_flags if ff.key in flag_keys_set]
+
+    if not all_feature_flags:
+        return {distinct_id: {} for distinct_id in distinct_ids}, False
+
+    cache = FlagsMatcherCache(team.project_id)
+    cohorts_cache: dict[int, CohortOrEmpty] = {}
+    compiled_flags = {
+        feature_flag.pk: compiled_flags_cache.get_or_compile(feature_flag) for feature_flag in all_feature_flags
+    }
+    flags_have_experience_continuity_enabled = any(
+        feature_flag.ensure_experience_continuity for feature_flag in all_feature_flags
+    )
+
+    flags_by_distinct_id: dict[str, dict[str, Union[str, bool]]] = {}
+    faced_error_computing_flags = False
+    for batch_start in range(0, len(distinct_ids), BULK_FLAG_EVALUATION_BATCH_SIZE):
+        batch = distinct_ids[batch_start : batch_start + BULK_FLAG_EVALUATION_BATCH_SIZE]
+        prefetched_entities: Optional[PrefetchedFlagEntities] = None
+        person_ids: dict[str, int] = {}
+        hash_key_overrides_by_person_id: dict[int, dict[str, str]] = {}
+        skip_database_flags = False
+        try:
+            prefetched_entities, person_ids = _prefetch_flag_entities(team, batch, groups, cache)
+            if flags_have_experience_continuity_enabled:
+                hash_key_overrides_by_person_id = _get_hash_key_overrides_by_person_id(
+                    team.id, list(person_ids.values())
+                )
+        except DatabaseError as e:
+            handle_feature_flag_exception(e, "[Feature Flags] Error prefetching persons and groups for flags")
+            # Like decide when the database is down, the batch still gets the flags that don't need the database
+            prefetched_entities, person_ids, hash_key_overrides_by_person_id = None, {}, {}
+            skip_database_flags = True
+            faced_error_computing_flags = True
+
+        for distinct_id in batch:
+            property_value_overrides, group_property_value_overrides = add_local_person_and_group_properties(
+                distinct_id, groups.get(distinct_id, {}), {}, {}
+            )
+            person_id = person_ids.get(distinct_id)
+            matcher = FeatureFlagMatcher(
+                team.id,
+                team.project_id,
+                all_feature_flags,
+                distinct_id,
+                groups.get(distinct_id, {}),
+                cache,
+                hash_key_overrides_by_person_id.get(person_id, {}) if person_id is not None else {},
+                property_value_overrides,
+                group_property_value_overrides,
+                skip_database_flags,
+                cohorts_cache=cohorts_cache,
+                prefetched_entities=prefetched_entities,
+            )
+            matcher.compiled_flags = compiled_flags
+            flag_values, _, _, errors, _ = matcher.get_matches_with_details()
+            flags_by_distinct_id[distinct_id] = flag_values
+            faced_error_computing_flags = faced_error_computing_flags or errors
+
+    return flags_by_distinct_id, faced_error_computing_flags
+
+
+def _prefetch_flag_entities(
+    team: Team,
+    distinct_ids: list[str],
+    groups: dict[str, dict[GroupTypeName, str]],
+    cache: FlagsMatcherCache,
+) -> tuple[PrefetchedFlagEntities, dict[str, int]]:
+    person_properties: dict[str, dict] = {}
+    person_ids: dict[str, int] = {}
+    with start_span(op="prefetch_person_properties"):
+        for distinct_id, person_id, properties in (
+            PersonDistinctId.objects.db_manager(DATABASE_FOR_FLAG_MATCHING)
+            .filter(team_id=team.id, distinct_id__in=distinct_ids)
+            .values_list("distinct_id", "person_id", "person__properties")
+        ):
+            person_properties[distinct_id] = properties
+            person_ids[distinct_id] = person_id
+
+    group_filters = {
+        (cache.group_types_to_indexes[group_type], group_key)
+        for distinct_id in distinct_ids
+        for group_type, group_key in groups.get(distinct_id, {}).items()
+        if group_type in cache.group_types_to_indexes
+    }
+    group_properties: dict[tuple[GroupTypeIndex, str], dict] = {}
+    if group_filters:
+        with start_span(op="prefetch_group_properties"):
+            for group_type_index, group_key, properties in (
+                Group.objects.db_manager(DATABASE_FOR_FLAG_MATCHING)
+                .filter(
+                    reduce(
+                        or_,
+                        (
+                            Q(group_type_index=group_type_index, group_key=group_key)
+                            for group_type_index, group_key in group_filters
+                        ),
+                    ),
+                    team_id=team.id,
+                )
+                .values_list("group_type_index", "group_key", "group_properties")
+            ):
+                group_properties[(cast(GroupTypeIndex, group_type_index), group_key)] = properties
+
+    return PrefetchedFlagEntities(person_properties=person_properties, group_properties=group_properties), person_ids
+
+
+def _get_hash_key_overrides_by_person_id(team_id: int, person_ids: list[int]) -> dict[int, dict[str, str]]:
+    overrides: dict[int, dict[str, str]] = {}
+    if not person_ids:
+        return overrides
+    with start_span(op="prefetch_hash_key_overrides"):
+        for person_id, feature_flag_key, hash_key in (
+            FeatureFlagHashKeyOverride.objects.db_manager(DATABASE_FOR_FLAG_MATCHING)
+            .filter(team_id=team_id, person_id__in=person_ids)
+            .values_list("person_id", "feature_flag_key", "hash_key")
+        ):
+            overrides.setdefault(person_id, {})[feature_flag_key] = hash_key
+    return overrides
+
+
 def set_feature_flag_hash_key_overrides(team: Team, distinct_ids: list[str], hash_key_override: str) -> bool:
     # As a product decision, the first override wins, i.e consistency matters for the first walkthrough.
     # Thus, we don't need to do upserts here.
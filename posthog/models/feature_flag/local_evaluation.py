@@ -0,0 +1,181 @@
+import json
+import re
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+import orjson
+from cachetools import TTLCache
+from prometheus_client import Counter
+
+from posthog.models.filters import Filter
+from posthog.models.property.property import Property
+from posthog.queries.base import is_truthy_or_falsy_property_value, match_property
+from posthog.utils import is_valid_regex
+
+if TYPE_CHECKING:
+    from .feature_flag import FeatureFlag
+
+COMPILED_FLAGS_CACHE_SIZE = 10_000
+COMPILED_FLAGS_CACHE_TTL_SECONDS = 60 * 60
+
+COMPILED_FLAGS_CACHE_COUNTER = Counter(
+    "flag_compiled_cache_total",
+    "Lookups of feature flags already compiled to local predicates in this process",
+    labelnames=["result"],
+)
+
+# Postgres compares dates as JSON strings, which we can't reproduce in Python faithfully.
+# Cohorts need to be looked up (and static ones need membership checks), so they always go to the database.
+LOCALLY_UNSUPPORTED_OPERATORS = ("is_date_before", "is_date_after", "is_date_exact")
+LOCALLY_SUPPORTED_PROPERTY_TYPES = ("person", "group", "event")
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    properties: list[Property]
+    rollout_percentage: Optional[float]
+    # True if the properties of the person (or group) the flag aggregates by are enough to evaluate the condition
+    can_evaluate_locally: bool
+    # Conditions only made of `is_not_set`/`is_not` match entities that don't exist (yet)
+    is_pure_is_not: bool
+
+
+@dataclass(frozen=True)
+class CompiledFeatureFlag:
+    conditions: list[CompiledCondition]
+    super_condition: Optional[CompiledCondition]
+    super_condition_is_set: Optional[CompiledCondition]
+
+
+def compile_condition(condition: dict) -> CompiledCondition:
+    properties = Filter(data=condition).property_groups.flat if condition.get("properties") else []
+    return CompiledCondition(
+        properties=properties,
+        rollout_percentage=condition.get("rollout_percentage"),
+        can_evaluate_locally=all(
+            property.type in LOCALLY_SUPPORTED_PROPERTY_TYPES and property.operator not in LOCALLY_UNSUPPORTED_OPERATORS
+            for property in properties
+        ),
+        is_pure_is_not=bool(properties)
+        and all(property.operator in ("is_not_set", "is_not") for property in properties),
+    )
+
+
+def _compile_feature_flag(feature_flag: "FeatureFlag") -> CompiledFeatureFlag:
+    super_condition = super_condition_is_set = None
+    if feature_flag.super_conditions:
+        condition = feature_flag.super_conditions[0]
+        prop_key = (condition.get("properties") or [{}])[0].get("key")
+        if prop_key:
+            super_condition = compile_condition(condition)
+            super_condition_is_set = compile_condition({"properties": [{"key": prop_key, "operator": "is_set"}]})
+
+    return CompiledFeatureFlag(
+        conditions=[compile_condition(condition) for condition in feature_flag.conditions],
+        super_condition=super_condition,
+        super_condition_is_set=super_condition_is_set,
+    )
+
+
+class CompiledFlagsCache:
+    """
+    Per-process cache of feature flags compiled to predicates.
+
+    Flags are re-read from the flags cache on every decide request, so entries are keyed on the flag's
+    filters - a refreshed flags cache with unchanged flags keeps hitting the same compiled predicates.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache: TTLCache[tuple[int, bytes], CompiledFeatureFlag] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get_or_compile(self, feature_flag: "FeatureFlag") -> CompiledFeatureFlag:
+        key = (feature_flag.pk, orjson.dumps(feature_flag.get_filters(), option=orjson.OPT_SORT_KEYS))
+        with self._lock:
+            compiled = self._cache.get(key)
+        COMPILED_FLAGS_CACHE_COUNTER.labels(result="hit" if compiled else "miss").inc()
+        if compiled is None:
+            compiled = _compile_feature_flag(feature_flag)
+            with self._lock:
+                self._cache[key] = compiled
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+compiled_flags_cache = CompiledFlagsCache(maxsize=COMPILED_FLAGS_CACHE_SIZE, ttl=COMPILED_FLAGS_CACHE_TTL_SECONDS)
+
+
+def _json_equals(stored_value: Any, value: Any) -> bool:
+    # Unlike in Python, JSON booleans are never equal to numbers
+    if isinstance(stored_value, bool) or isinstance(value, bool):
+        return type(stored_value) is type(value) and stored_value == value
+    return stored_value == value
+
+
+def _match_exact(value: Any, stored_value: Any) -> bool:
+    """Case sensitive JSON equality, like `empty_or_null_with_value_q` with the `exact` operator."""
+    value_as_given = Property._parse_value(value)
+    if is_truthy_or_falsy_property_value(value_as_given):
+        truthy = value_as_given in (True, [True], "true", ["true"], "True", ["True"])
+        candidates = [truthy, str(truthy).lower()]
+    else:
+        candidates = [value_as_given, Property._parse_value(value, convert_to_number=True)]
+
+    return any(
+        any(_json_equals(stored_value, item) for item in candidate)
+        if isinstance(candidate, list)
+        else _json_equals(stored_value, candidate)
+        for candidate in candidates
+    )
+
+
+def _match_regex(pattern: Any, stored_value: Any) -> bool:
+    """Case sensitive search, like the `regex` lookup on the text Postgres extracts from JSON."""
+    # `->>` extracts strings unquoted, and anything else as JSON
+    text = stored_value if isinstance(stored_value, str) else json.dumps(stored_value)
+    return re.search(str(pattern), text, re.DOTALL) is not None
+
+
+def match_property_locally(
+    property: Property, entity_properties: dict[str, Any], override_property_values: dict[str, Any]
+) -> bool:
+    """
+    Match a property the same way `properties_to_Q` would against the stored properties of a person or group.
+
+    Overrides take precedence, like they do when querying the database.
+    """
+    if property.key in override_property_values:
+        is_match = match_property(property, override_property_values)
+    elif property.operator in ("is_set", "is_not_set"):
+        is_match = (property.key in entity_properties) == (property.operator == "is_set")
+    elif entity_properties.get(property.key) is None:
+        # Missing and null values only match negated operators, see `empty_or_null_with_value_q`
+        is_match = property.operator == "is_not" or (property.operator or "").startswith("not_")
+    elif property.operator in (None, "exact", "is_not"):
+        # `match_property` compares case insensitively, as overrides come from clients, but stored values don't
+        value = Property._parse_value(property.value) if property.operator == "is_not" else property.value
+        is_match = _match_exact(value, entity_properties[property.key]) != (property.operator == "is_not")
+    elif property.operator in ("regex", "not_regex"):
+        pattern = property.value if property.operator == "regex" else Property._parse_value(property.value)
+        # Invalid regexes match nothing, negated or not
+        is_match = is_valid_regex(str(pattern)) and (
+            _match_regex(pattern, entity_properties[property.key]) != (property.operator == "not_regex")
+        )
+    else:
+        is_match = match_property(property, entity_properties)
+
+    return not is_match if property.negation else is_match
+
+
+def match_condition_locally(
+    condition: CompiledCondition, entity_properties: dict[str, Any], override_property_values: dict[str, Any]
+) -> bool:
+    # Feature flags don't support OR filtering yet
+    return all(
+        match_property_locally(property, entity_properties, override_property_values)
+        for property in condition.properties
+    )
@@ -124,6 +124,7 @@ class PersonQuery:
             "AND argMax(person.created_at, version) < now() + INTERVAL 1 DAY" if filter_future_persons else ""
         )
         updated_after_condition, updated_after_params = self._get_updated_after_clause()
+        updated_after_prefiltering_condition = self._get_updated_after_prefiltering_clause()
 
         # If there are person filters or search, we do a prefiltering lookup so that the dataset is as small
         # as possible BEFORE the `HAVING` clause (but without eliminating any rows that should be matched).
@@ -150,7 +151,7 @@ class PersonQuery:
             FROM person
             {top_level_single_cohort_join}
             WHERE team_id = %(team_id)s
-            {prefiltering_lookup}
+            {prefiltering_lookup}{updated_after_prefiltering_condition}
             {multiple_cohorts_condition}
             {email_condition}
             GROUP BY id
@@ -417,3 +418,13 @@ class PersonQuery:
                 "updated_after": self._filter.updated_after
             }
         return "", {}
+
+    def _get_updated_after_prefiltering_clause(self) -> str:
+        # Only aggregate versions of persons that have been updated, instead of all persons of the team
+        if not isinstance(self._filter, Filter) or not self._filter.updated_after:
+            return ""
+
+        return """AND id IN (
+            SELECT id FROM person
+            WHERE team_id = %(team_id)s AND _timestamp > parseDateTimeBestEffort(%(updated_after)s)
+        )"""
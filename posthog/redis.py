@@ -1,11 +1,26 @@
 # flake8: noqa
+import asyncio
+import weakref
 from typing import Any, Dict, Optional
 
 import redis
+import redis.asyncio
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 
 _client_map: Dict[str, Any] = {}
+_async_client_map: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+_fake_server_map: Dict[str, Any] = {}
+
+
+def _get_fake_server(redis_url: Optional[str]) -> Any:
+    """In tests, sync and async clients of the same URL share the data of one fake server."""
+    import fakeredis
+
+    if not _fake_server_map.get(redis_url or ""):
+        _fake_server_map[redis_url or ""] = fakeredis.FakeServer()
+
+    return _fake_server_map[redis_url or ""]
 
 
 def get_client(redis_url: Optional[str] = None) -> redis.Redis:
@@ -19,7 +34,7 @@ def get_client(redis_url: Optional[str] = None) -> redis.Redis:
         if settings.TEST:
             import fakeredis
 
-            client = fakeredis.FakeRedis()
+            client = fakeredis.FakeRedis(server=_get_fake_server(redis_url))
         elif redis_url:
             client = redis.from_url(redis_url, db=0)
 
@@ -31,7 +46,35 @@ def get_client(redis_url: Optional[str] = None) -> redis.Redis:
     return _client_map[redis_url]
 
 
+def get_async_client(redis_url: Optional[str] = None) -> redis.asyncio.Redis:
+    """
+    A client for async code, shared by all callers within the running event loop, as asyncio connections are bound to
+    the event loop they were created in. Connections are pooled by the client, so don't close it.
+    """
+    redis_url = redis_url or settings.REDIS_URL
+    client_map = _async_client_map.setdefault(asyncio.get_running_loop(), {})
+
+    if not client_map.get(redis_url):
+        client: Any = None
+
+        if settings.TEST:
+            import fakeredis.aioredis
+
+            client = fakeredis.aioredis.FakeRedis(server=_get_fake_server(redis_url))
+        elif redis_url:
+            client = redis.asyncio.from_url(redis_url, db=0)
+
+        if not client:
+            raise ImproperlyConfigured("Redis not configured!")
+
+        client_map[redis_url] = client
+
+    return client_map[redis_url]
+
+
 def TEST_clear_clients():
     global _client_map
     for key in list(_client_map.keys()):
         del _client_map[key]
+    _async_client_map.clear()
+    _fake_server_map.clear()
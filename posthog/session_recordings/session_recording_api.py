@@ -9,7 +9,7 @@ from json import JSONDecodeError
 from typing import Any, Optional, cast, Literal
 
 from posthoganalytics.ai.openai import OpenAI
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse
 
 import posthoganalytics
 import requests
@@ -50,11 +50,18 @@ from posthog.session_recordings.models.session_recording_event import (
 from posthog.session_recordings.queries.session_recording_list_from_query import SessionRecordingListFromQuery
 from posthog.session_recordings.queries.session_replay_events import SessionReplayEvents
 from posthog.session_recordings.queries.session_replay_events_v2_test import SessionReplayEventsV2Test
+from posthog.session_recordings.session_recording_v2_block_cache import (
+    BlockLengthMismatchError,
+    BlockNotFoundError,
+    block_cache,
+    fetch_block,
+    parse_block_url,
+)
 from posthog.session_recordings.realtime_snapshots import (
     get_realtime_snapshots,
     publish_subscription,
 )
-from posthog.storage import object_storage, session_recording_v2_object_storage
+from posthog.storage import object_storage
 from posthog.session_recordings.ai_data.ai_filter_schema import AiFilterSchema
 from posthog.session_recordings.ai_data.ai_regex_schema import AiRegexSchema
 from posthog.session_recordings.ai_data.ai_regex_prompts import AI_REGEX_PROMPTS
@@ -67,7 +74,6 @@ from openai.types.chat import (
     ChatCompletionAssistantMessageParam,
 )
 from posthog.session_recordings.utils import clean_prompt_whitespace
-import snappy
 
 SNAPSHOTS_BY_PERSONAL_API_KEY_COUNTER = Counter(
     "snapshots_personal_api_key_counter",
@@ -933,30 +939,24 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
                 raise exceptions.NotFound("Block URL not found")
 
             # Parse URL and extract key and byte range
-            parsed_url = urlparse(block_url)
-            key = parsed_url.path.lstrip("/")
-            query_params = parse_qs(parsed_url.query)
-            byte_range = query_params.get("range", [""])[0].replace("bytes=", "")
-            start_byte, end_byte = map(int, byte_range.split("-")) if "-" in byte_range else (None, None)
-
-            # Read and return the specific byte range from the object
-            if start_byte is None or end_byte is None:
+            parsed_block_url = parse_block_url(block_url)
+            if parsed_block_url is None:
                 raise exceptions.NotFound("Invalid byte range")
 
-            expected_length = end_byte - start_byte + 1
-            compressed_block = session_recording_v2_object_storage.client().read_bytes(
-                key, first_byte=start_byte, last_byte=end_byte
-            )
-
-            if not compressed_block:
-                raise exceptions.NotFound("Block content not found")
-
-            if len(compressed_block) != expected_length:
-                raise exceptions.APIException(
-                    f"Unexpected data length. Expected {expected_length} bytes, got {len(compressed_block)} bytes."
-                )
-
-            decompressed_block = snappy.decompress(compressed_block).decode("utf-8")
+            try:
+                if settings.SESSION_RECORDING_V2_BLOCK_CACHE_ENABLED:
+                    v2_block_cache = block_cache()
+                    decompressed_block = v2_block_cache.get(*parsed_block_url)
+                    # Playback continues with the following blocks, so have them ready by the time they're requested
+                    prefetch_count = settings.SESSION_RECORDING_V2_BLOCK_PREFETCH_COUNT
+                    next_blocks = blocks[block_index + 1 : block_index + 1 + prefetch_count]
+                    v2_block_cache.prefetch([next_block[2] for next_block in next_blocks])
+                else:
+                    decompressed_block = fetch_block(*parsed_block_url)
+            except BlockNotFoundError as e:
+                raise exceptions.NotFound(str(e))
+            except BlockLengthMismatchError as e:
+                raise exceptions.APIException(str(e))
 
             response = HttpResponse(
                 content=decompressed_block,
@@ -0,0 +1,222 @@
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import snappy
+import structlog
+from cachetools import LRUCache
+from django.conf import settings
+from prometheus_client import Counter
+
+from posthog.storage import session_recording_v2_object_storage
+
+logger = structlog.get_logger(__name__)
+
+BLOCK_CACHE_COUNTER = Counter(
+    "session_recording_v2_block_cache",
+    "Requested and prefetched v2 session recording blocks, by the layer they were found in",
+    labelnames=["layer", "prefetch"],
+)
+BLOCK_CACHE_EVICTED_FROM_DISK_COUNTER = Counter(
+    "session_recording_v2_block_cache_evicted_from_disk",
+    "v2 session recording blocks evicted from the local disk cache",
+)
+
+PREFETCH_MAX_WORKERS = 4
+
+
+class BlockNotFoundError(Exception):
+    pass
+
+
+class BlockLengthMismatchError(Exception):
+    pass
+
+
+def parse_block_url(block_url: str) -> Optional[tuple[str, int, int]]:
+    """Extract the object key and the byte range of a block from its URL in the recording metadata."""
+    parsed_url = urlparse(block_url)
+    key = parsed_url.path.lstrip("/")
+    query_params = parse_qs(parsed_url.query)
+    byte_range = query_params.get("range", [""])[0].replace("bytes=", "")
+    if "-" not in byte_range:
+        return None
+
+    start_byte, end_byte = map(int, byte_range.split("-"))
+    return key, start_byte, end_byte
+
+
+def fetch_block(key: str, start_byte: int, end_byte: int) -> bytes:
+    """Read a block from object storage, and decompress it."""
+    expected_length = end_byte - start_byte + 1
+    compressed_block = session_recording_v2_object_storage.client().read_bytes(
+        key, first_byte=start_byte, last_byte=end_byte
+    )
+
+    if not compressed_block:
+        raise BlockNotFoundError("Block content not found")
+
+    if len(compressed_block) != expected_length:
+        raise BlockLengthMismatchError(
+            f"Unexpected data length. Expected {expected_length} bytes, got {len(compressed_block)} bytes."
+        )
+
+    return snappy.decompress(compressed_block)
+
+
+class BlockCache:
+    """
+    Two-level LRU cache of decompressed v2 blocks, keyed by object key and byte range.
+
+    Blocks are immutable, so entries never need invalidating. The disk level is shared by all processes
+    on the host, which is why its size is checked against the directory rather than tracked per process.
+    """
+
+    def __init__(self, *, memory_max_bytes: int, disk_path: str, disk_max_bytes: int):
+        self._memory: LRUCache[str, bytes] = LRUCache(maxsize=memory_max_bytes, getsizeof=len)
+        self._lock = threading.Lock()
+        self._disk_path = disk_path
+        self._disk_max_bytes = disk_max_bytes
+        self._disk_bytes_since_eviction = 0
+        self._in_flight_prefetches: set[str] = set()
+        self._prefetch_executor = ThreadPoolExecutor(
+            max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="replay-block-prefetch"
+        )
+        if disk_max_bytes:
+            os.makedirs(disk_path, exist_ok=True)
+
+    @staticmethod
+    def cache_key(key: str, start_byte: int, end_byte: int) -> str:
+        return f"{key}:{start_byte}-{end_byte}"
+
+    def _disk_file(self, cache_key: str) -> str:
+        return os.path.join(self._disk_path, hashlib.sha256(cache_key.encode("utf-8")).hexdigest())
+
+    def _read_from_disk(self, cache_key: str) -> Optional[bytes]:
+        if not self._disk_max_bytes:
+            return None
+
+        path = self._disk_file(cache_key)
+        try:
+            with open(path, "rb") as f:
+                block = f.read()
+            # Mark as recently used, eviction goes by modification time
+            os.utime(path)
+            return block
+        except FileNotFoundError:
+            # Not cached, or evicted by another process in the meantime
+            return None
+
+    def _write_to_disk(self, cache_key: str, block: bytes) -> None:
+        if not self._disk_max_bytes or len(block) > self._disk_max_bytes:
+            return
+
+        try:
+            # Write atomically, so that other processes never read a partially written block
+            with tempfile.NamedTemporaryFile(dir=self._disk_path, delete=False, suffix=".tmp") as f:
+                f.write(block)
+            os.replace(f.name, self._disk_file(cache_key))
+        except OSError:
+            logger.exception("session_recording_v2_block_cache.disk_write_failed")
+            return
+
+        with self._lock:
+            self._disk_bytes_since_eviction += len(block)
+            should_evict = self._disk_bytes_since_eviction > self._disk_max_bytes // 10
+            if should_evict:
+                self._disk_bytes_since_eviction = 0
+        if should_evict:
+            self._evict_from_disk()
+
+    def _evict_from_disk(self) -> None:
+        files = []
+        with os.scandir(self._disk_path) as entries:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total_bytes <= self._disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                BLOCK_CACHE_EVICTED_FROM_DISK_COUNTER.inc()
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+    def get(self, key: str, start_byte: int, end_byte: int, *, prefetch: bool = False) -> bytes:
+        cache_key = self.cache_key(key, start_byte, end_byte)
+
+        with self._lock:
+            block = self._memory.get(cache_key)
+        if block is not None:
+            BLOCK_CACHE_COUNTER.labels(layer="memory", prefetch=prefetch).inc()
+            return block
+
+        block = self._read_from_disk(cache_key)
+        if block is not None:
+            BLOCK_CACHE_COUNTER.labels(layer="disk", prefetch=prefetch).inc()
+        else:
+            BLOCK_CACHE_COUNTER.labels(layer="object_storage", prefetch=prefetch).inc()
+            block = fetch_block(key, start_byte, end_byte)
+            self._write_to_disk(cache_key, block)
+
+        if len(block) <= self._memory.maxsize:
+            with self._lock:
+                self._memory[cache_key] = block
+        return block
+
+    def _prefetch(self, key: str, start_byte: int, end_byte: int) -> None:
+        cache_key = self.cache_key(key, start_byte, end_byte)
+        try:
+            self.get(key, start_byte, end_byte, prefetch=True)
+        except Exception:
+            # Prefetching is best-effort, the block will be loaded (and fail) when requested
+            logger.warning("session_recording_v2_block_cache.prefetch_failed", key=key, exc_info=True)
+        finally:
+            with self._lock:
+                self._in_flight_prefetches.discard(cache_key)
+
+    def prefetch(self, block_urls: list[str]) -> None:
+        """Load blocks into the cache in the background, e.g. the blocks following the one being played."""
+        for block_url in block_urls:
+            parsed_block_url = parse_block_url(block_url) if block_url else None
+            if parsed_block_url is None:
+                continue
+
+            cache_key = self.cache_key(*parsed_block_url)
+            with self._lock:
+                if cache_key in self._memory or cache_key in self._in_flight_prefetches:
+                    continue
+                self._in_flight_prefetches.add(cache_key)
+            self._prefetch_executor.submit(self._prefetch, *parsed_block_url)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+
+_block_cache: Optional[BlockCache] = None
+_block_cache_lock = threading.Lock()
+
+
+def block_cache() -> BlockCache:
+    global _block_cache
+
+    with _block_cache_lock:
+        if _block_cache is None:
+            _block_cache = BlockCache(
+                memory_max_bytes=settings.SESSION_RECORDING_V2_BLOCK_CACHE_MEMORY_MAX_BYTES,
+                disk_path=settings.SESSION_RECORDING_V2_BLOCK_CACHE_DISK_PATH,
+                disk_max_bytes=settings.SESSION_RECORDING_V2_BLOCK_CACHE_DISK_MAX_BYTES,
+            )
+        return _block_cache
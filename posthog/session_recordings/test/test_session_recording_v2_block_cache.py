@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import snappy
+
+from posthog.session_recordings.session_recording_v2_block_cache import (
+    BlockCache,
+    BlockLengthMismatchError,
+    BlockNotFoundError,
+    fetch_block,
+    parse_block_url,
+)
+
+BLOCKS = {
+    "session_recordings_v2/1/a": b'{"window_id": "1", "data": [1, 2, 3]}\n' * 10,
+    "session_recordings_v2/1/b": b'{"window_id": "1", "data": [4, 5, 6]}\n' * 10,
+    "session_recordings_v2/1/c": b'{"window_id": "1", "data": [7, 8, 9]}\n' * 10,
+}
+COMPRESSED_BLOCKS = {key: snappy.compress(block) for key, block in BLOCKS.items()}
+
+
+def _block_url(key: str) -> str:
+    return f"s3://posthog/{key}?range=bytes=0-{len(COMPRESSED_BLOCKS[key]) - 1}"
+
+
+class TestSessionRecordingV2BlockCache(TestCase):
+    def setUp(self) -> None:
+        self.disk_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.disk_path)
+        self.storage = MagicMock()
+        self.storage.read_bytes.side_effect = lambda key, first_byte, last_byte: COMPRESSED_BLOCKS.get(key)
+        patcher = patch(
+            "posthog.session_recordings.session_recording_v2_block_cache.session_recording_v2_object_storage.client",
+            return_value=self.storage,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _cache(self, **kwargs) -> BlockCache:
+        return BlockCache(
+            **{"memory_max_bytes": 1024 * 1024, "disk_path": self.disk_path, "disk_max_bytes": 1024 * 1024, **kwargs}
+        )
+
+    def _get(self, cache: BlockCache, key: str) -> bytes:
+        parsed_block_url = parse_block_url(_block_url(key))
+        assert parsed_block_url is not None
+        return cache.get(*parsed_block_url)
+
+    def test_parse_block_url(self) -> None:
+        assert parse_block_url("s3://bucket/some/key?range=bytes=10-20") == ("some/key", 10, 20)
+        assert parse_block_url("s3://bucket/some/key") is None
+
+    def test_fetch_block_validates_the_block(self) -> None:
+        with self.assertRaises(BlockNotFoundError):
+            fetch_block("session_recordings_v2/1/missing", 0, 10)
+        with self.assertRaises(BlockLengthMismatchError):
+            fetch_block("session_recordings_v2/1/a", 0, len(COMPRESSED_BLOCKS["session_recordings_v2/1/a"]))
+
+    def test_blocks_are_read_from_object_storage_once(self) -> None:
+        cache = self._cache()
+
+        assert self._get(cache, "session_recordings_v2/1/a") == BLOCKS["session_recordings_v2/1/a"]
+        assert self._get(cache, "session_recordings_v2/1/a") == BLOCKS["session_recordings_v2/1/a"]
+
+        assert self.storage.read_bytes.call_count == 1
+
+    def test_blocks_are_shared_on_disk(self) -> None:
+        self._get(self._cache(), "session_recordings_v2/1/a")
+
+        # e.g. another process on the same host
+        assert self._get(self._cache(), "session_recordings_v2/1/a") == BLOCKS["session_recordings_v2/1/a"]
+        assert self.storage.read_bytes.call_count == 1
+
+    def test_memory_only(self) -> None:
+        cache = self._cache(disk_max_bytes=0)
+
+        self._get(cache, "session_recordings_v2/1/a")
+        self._get(cache, "session_recordings_v2/1/a")
+
+        assert self.storage.read_bytes.call_count == 1
+        assert os.listdir(self.disk_path) == []
+
+    def test_prefetch(self) -> None:
+        cache = self._cache()
+
+        cache.prefetch([_block_url("session_recordings_v2/1/b"), _block_url("session_recordings_v2/1/c"), ""])
+        cache._prefetch_executor.shutdown(wait=True)
+        assert self.storage.read_bytes.call_count == 2
+
+        assert self._get(cache, "session_recordings_v2/1/b") == BLOCKS["session_recordings_v2/1/b"]
+        assert self._get(cache, "session_recordings_v2/1/c") == BLOCKS["session_recordings_v2/1/c"]
+        assert self.storage.read_bytes.call_count == 2
+
+    def test_least_recently_used_blocks_are_evicted_from_disk(self) -> None:
+        block_size = len(BLOCKS["session_recordings_v2/1/a"])
+        cache = self._cache(memory_max_bytes=block_size, disk_max_bytes=2 * block_size)
+
+        for index, key in enumerate(BLOCKS):
+            self._get(cache, key)
+            parsed_block_url = parse_block_url(_block_url(key))
+            assert parsed_block_url is not None
+            os.utime(cache._disk_file(cache.cache_key(*parsed_block_url)), (index + 1, index + 1))
+
+        assert len(os.listdir(self.disk_path)) == 2
+        assert self.storage.read_bytes.call_count == 3
+        # Only the last block is still in memory, the second one is still on disk, the first one was evicted
+        self._get(cache, "session_recordings_v2/1/c")
+        self._get(cache, "session_recordings_v2/1/b")
+        assert self.storage.read_bytes.call_count == 3
+        self._get(cache, "session_recordings_v2/1/a")
+        assert self.storage.read_bytes.call_count == 4
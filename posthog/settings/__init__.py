@@ -114,6 +114,66 @@ IN_EVAL_TESTING: bool = get_from_env("DEEPEVAL", False, type_cast=str_to_bool)
 
 HOGQL_INCREASED_MAX_EXECUTION_TIME: int = get_from_env("HOGQL_INCREASED_MAX_EXECUTION_TIME", 600, type_cast=int)
 
+# Coalesce identical blocking query calculations across processes, so that only one of them hits ClickHouse
+QUERY_COALESCING_ENABLED: bool = get_from_env("QUERY_COALESCING_ENABLED", True, type_cast=str_to_bool)
+QUERY_COALESCING_LOCK_TIMEOUT_SECONDS: int = get_from_env(
+    "QUERY_COALESCING_LOCK_TIMEOUT_SECONDS", HOGQL_INCREASED_MAX_EXECUTION_TIME, type_cast=int
+)
+QUERY_COALESCING_WAIT_SECONDS: float = get_from_env("QUERY_COALESCING_WAIT_SECONDS", 60, type_cast=float)
+
+# Publish updates of async query statuses to Redis, so that awaited queries are notified instead of polling
+QUERY_STATUS_NOTIFICATIONS_ENABLED: bool = get_from_env(
+    "QUERY_STATUS_NOTIFICATIONS_ENABLED", False, type_cast=str_to_bool
+)
+
+# Refresh stale time-series trends by only recalculating the buckets after a watermark, merging them into the cache
+TRENDS_INCREMENTAL_CALCULATION_ENABLED: bool = get_from_env(
+    "TRENDS_INCREMENTAL_CALCULATION_ENABLED", False, type_cast=str_to_bool
+)
+# How far before the last refresh buckets are recalculated, to account for late-arriving events
+TRENDS_INCREMENTAL_LOOKBACK_MINUTES: int = get_from_env("TRENDS_INCREMENTAL_LOOKBACK_MINUTES", 60, type_cast=int)
+
+# Per-process cache of HogQL query strings already compiled to ClickHouse SQL
+HOGQL_COMPILED_QUERY_CACHE_ENABLED: bool = get_from_env(
+    "HOGQL_COMPILED_QUERY_CACHE_ENABLED", not TEST, type_cast=str_to_bool
+)
+HOGQL_COMPILED_QUERY_CACHE_SIZE: int = get_from_env("HOGQL_COMPILED_QUERY_CACHE_SIZE", 1000, type_cast=int)
+HOGQL_COMPILED_QUERY_CACHE_TTL_SECONDS: int = get_from_env("HOGQL_COMPILED_QUERY_CACHE_TTL_SECONDS", 300, type_cast=int)
+
+# Per-process cache of built HogQL databases (warehouse tables, joins, saved queries, ...)
+HOGQL_DATABASE_CACHE_ENABLED: bool = get_from_env("HOGQL_DATABASE_CACHE_ENABLED", not TEST, type_cast=str_to_bool)
+HOGQL_DATABASE_CACHE_SIZE: int = get_from_env("HOGQL_DATABASE_CACHE_SIZE", 200, type_cast=int)
+HOGQL_DATABASE_CACHE_TTL_SECONDS: int = get_from_env("HOGQL_DATABASE_CACHE_TTL_SECONDS", 300, type_cast=int)
+
+# Codec used to write query results to the query cache, "json" or "zstd". Both are always readable.
+QUERY_CACHE_CODEC: str = get_from_env("QUERY_CACHE_CODEC", "json")
+QUERY_CACHE_CODEC_ZSTD_LEVEL: int = get_from_env("QUERY_CACHE_CODEC_ZSTD_LEVEL", 3, type_cast=int)
+# Compress with a zstd dictionary trained on sampled query results, which helps most with smaller results
+QUERY_CACHE_CODEC_DICTIONARY_ENABLED: bool = get_from_env(
+    "QUERY_CACHE_CODEC_DICTIONARY_ENABLED", False, type_cast=str_to_bool
+)
+QUERY_CACHE_CODEC_DICTIONARY_SAMPLE_RATE: float = get_from_env(
+    "QUERY_CACHE_CODEC_DICTIONARY_SAMPLE_RATE", 0.01, type_cast=float
+)
+
+# Load dashboards with the cached results of all tiles fetched at once, calculating the missing ones concurrently
+DASHBOARD_TILES_BATCH_LOADING_ENABLED: bool = get_from_env(
+    "DASHBOARD_TILES_BATCH_LOADING_ENABLED", False, type_cast=str_to_bool
+)
+DASHBOARD_TILES_MAX_CONCURRENT_CALCULATIONS: int = get_from_env(
+    "DASHBOARD_TILES_MAX_CONCURRENT_CALCULATIONS", 4, type_cast=int
+)
+DASHBOARD_TILES_MAX_CONCURRENT_CALCULATIONS_PER_TEAM: int = get_from_env(
+    "DASHBOARD_TILES_MAX_CONCURRENT_CALCULATIONS_PER_TEAM", 10, type_cast=int
+)
+# Tiles not calculated in time are returned without results, and finish calculating in the background
+DASHBOARD_TILES_CALCULATION_TIMEOUT_SECONDS: float = get_from_env(
+    "DASHBOARD_TILES_CALCULATION_TIMEOUT_SECONDS", 60, type_cast=float
+)
+
+# Streamed queries hold a ClickHouse connection for as long as the client reads rows
+QUERY_STREAM_MAX_CONCURRENT_PER_TEAM: int = get_from_env("QUERY_STREAM_MAX_CONCURRENT_PER_TEAM", 5, type_cast=int)
+
 # Extend and override these settings with EE's ones
 if "ee.apps.EnterpriseConfig" in INSTALLED_APPS:
     from ee.settings import *  # noqa: F401, F403
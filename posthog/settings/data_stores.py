@@ -245,6 +245,15 @@ KAFKA_PRODUCER_SETTINGS = {
     }.items()
     if value is not None
 }
+# Producer of batches of internally captured events, lingering so that they're sent in fewer, larger requests
+KAFKA_BATCH_PRODUCER_SETTINGS = {
+    "linger_ms": get_from_env("KAFKA_BATCH_PRODUCER_LINGER_MS", 50, type_cast=int),
+    "batch_size": get_from_env("KAFKA_BATCH_PRODUCER_BATCH_SIZE", 1024 * 1024, type_cast=int),
+}
+# Messages of a batch left unacknowledged at a time, before waiting for the oldest ones to send more
+KAFKA_BATCH_PRODUCER_MAX_IN_FLIGHT_MESSAGES: int = get_from_env(
+    "KAFKA_BATCH_PRODUCER_MAX_IN_FLIGHT_MESSAGES", 10000, type_cast=int
+)
 
 SESSION_RECORDING_KAFKA_MAX_REQUEST_SIZE_BYTES: int = get_from_env(
     "SESSION_RECORDING_KAFKA_MAX_REQUEST_SIZE_BYTES",
@@ -332,6 +341,12 @@ CDP_API_URL = get_from_env("CDP_API_URL", "")
 if not CDP_API_URL:
     CDP_API_URL = "http://localhost:6738" if DEBUG else "http://ingestion-cdp-api.posthog.svc.cluster.local"
 
+REDIS_CACHE_OPTIONS = {
+    "CLIENT_CLASS": "django_redis.client.DefaultClient",
+    "SERIALIZER": "posthog.caching.precompressed_pickle_serializer.PrecompressedPickleSerializer",
+    "COMPRESSOR": "posthog.caching.tolerant_zlib_compressor.TolerantZlibCompressor",
+}
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
@@ -339,10 +354,7 @@ CACHES = {
         # if location is an array then the first element is the primary
         # and the rest are replicas
         "LOCATION": REDIS_URL if not REDIS_READER_URL else [REDIS_URL, REDIS_READER_URL],
-        "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
-            "COMPRESSOR": "posthog.caching.tolerant_zlib_compressor.TolerantZlibCompressor",
-        },
+        "OPTIONS": REDIS_CACHE_OPTIONS,
         "KEY_PREFIX": "posthog",
     }
 }
@@ -1,5 +1,5 @@
 from posthog.settings.base_variables import TEST
-from posthog.settings.utils import get_from_env
+from posthog.settings.utils import get_from_env, str_to_bool
 
 USE_PRECALCULATED_CH_COHORT_PEOPLE = not TEST
 
@@ -16,6 +16,27 @@ CALCULATE_COHORTS_NIGHT_SCHEDULE = get_from_env(
 )
 CALCULATE_X_PARALLEL_COHORTS_DURING_NIGHT = get_from_env("CALCULATE_X_PARALLEL_COHORTS_DURING_NIGHT", 5, type_cast=int)
 
+# Recalculate property-only cohorts by only re-evaluating persons updated since the last calculation
+COHORT_INCREMENTAL_CALCULATION_ENABLED: bool = get_from_env(
+    "COHORT_INCREMENTAL_CALCULATION_ENABLED", False, type_cast=str_to_bool
+)
+# How far before the last calculation persons are re-evaluated, to account for late-arriving person updates
+COHORT_INCREMENTAL_CALCULATION_LOOKBACK_MINUTES: int = get_from_env(
+    "COHORT_INCREMENTAL_CALCULATION_LOOKBACK_MINUTES", 60, type_cast=int
+)
+# Still fully recalculate every N versions, so that any drift is eventually corrected
+COHORT_FULL_CALCULATION_EVERY_N_VERSIONS: int = get_from_env(
+    "COHORT_FULL_CALCULATION_EVERY_N_VERSIONS", 24, type_cast=int
+)
+# Recalculate due property-only cohorts of the same project together, with a single scan of persons
+COHORT_BATCH_CALCULATION_ENABLED: bool = get_from_env("COHORT_BATCH_CALCULATION_ENABLED", False, type_cast=str_to_bool)
+COHORT_BATCH_CALCULATION_MAX_SIZE: int = get_from_env("COHORT_BATCH_CALCULATION_MAX_SIZE", 50, type_cast=int)
+
+# Check the due alerts of a team in a single task, calculating each distinct insight query only once
+ALERTS_BATCH_EVALUATION_ENABLED: bool = get_from_env("ALERTS_BATCH_EVALUATION_ENABLED", False, type_cast=str_to_bool)
+# How many teams can have their alerts checked at the same time
+ALERTS_MAX_CONCURRENT_TEAMS: int = get_from_env("ALERTS_MAX_CONCURRENT_TEAMS", 10, type_cast=int)
+
 ACTION_EVENT_MAPPING_INTERVAL_SECONDS = get_from_env("ACTION_EVENT_MAPPING_INTERVAL_SECONDS", 300, type_cast=int)
 
 # Schedule to syncronize insight cache states on. Follows crontab syntax.
@@ -37,6 +58,18 @@ COUNT_TILES_WITH_NO_FILTERS_HASH_INTERVAL_SECONDS = get_from_env(
 
 CACHED_RESULTS_TTL = 7 * 24 * 60 * 60  # how long to keep cached results for
 
+# Warm insights by priority (recent views, staleness and calculation cost) within a ClickHouse time budget per cycle
+CACHE_WARMING_PRIORITIZATION_ENABLED: bool = get_from_env(
+    "CACHE_WARMING_PRIORITIZATION_ENABLED", False, type_cast=str_to_bool
+)
+# ClickHouse seconds that warming may spend per team, and in total, every cycle
+CACHE_WARMING_TEAM_BUDGET_SECONDS: float = get_from_env("CACHE_WARMING_TEAM_BUDGET_SECONDS", 600, type_cast=float)
+CACHE_WARMING_GLOBAL_BUDGET_SECONDS: float = get_from_env(
+    "CACHE_WARMING_GLOBAL_BUDGET_SECONDS", 6 * 60 * 60, type_cast=float
+)
+# Assumed cost of insights that haven't been warmed yet
+CACHE_WARMING_DEFAULT_COST_SECONDS: float = get_from_env("CACHE_WARMING_DEFAULT_COST_SECONDS", 5, type_cast=float)
+
 # Schedule to run asynchronous data deletion on. Follows crontab syntax.
 # Use empty string to prevent this
 CLEAR_CLICKHOUSE_REMOVED_DATA_SCHEDULE_CRON = get_from_env(
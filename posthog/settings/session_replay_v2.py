@@ -1,4 +1,5 @@
 import os
+import tempfile
 from typing import Optional
 
 from posthog.settings import get_from_env
@@ -27,3 +28,21 @@ SESSION_RECORDING_V2_S3_ENABLED = get_from_env(
 SESSION_RECORDING_V2_S3_REGION = os.getenv("SESSION_RECORDING_V2_S3_REGION", "us-east-1")
 SESSION_RECORDING_V2_S3_BUCKET = os.getenv("SESSION_RECORDING_V2_S3_BUCKET", "posthog")
 SESSION_RECORDING_V2_S3_PREFIX = os.getenv("SESSION_RECORDING_V2_S3_PREFIX", "session_recordings_v2")
+
+# Cache decompressed v2 blocks in memory and on local disk, as blocks are immutable and popular recordings are replayed
+# again and again
+SESSION_RECORDING_V2_BLOCK_CACHE_ENABLED = get_from_env(
+    "SESSION_RECORDING_V2_BLOCK_CACHE_ENABLED", False, type_cast=str_to_bool
+)
+SESSION_RECORDING_V2_BLOCK_CACHE_MEMORY_MAX_BYTES = get_from_env(
+    "SESSION_RECORDING_V2_BLOCK_CACHE_MEMORY_MAX_BYTES", 64 * 1024 * 1024, type_cast=int
+)
+SESSION_RECORDING_V2_BLOCK_CACHE_DISK_PATH = os.getenv(
+    "SESSION_RECORDING_V2_BLOCK_CACHE_DISK_PATH", os.path.join(tempfile.gettempdir(), "session_recording_v2_blocks")
+)
+# Set to 0 to only cache in memory
+SESSION_RECORDING_V2_BLOCK_CACHE_DISK_MAX_BYTES = get_from_env(
+    "SESSION_RECORDING_V2_BLOCK_CACHE_DISK_MAX_BYTES", 1024 * 1024 * 1024, type_cast=int
+)
+# How many of the following blocks to load into the cache when a block is requested
+SESSION_RECORDING_V2_BLOCK_PREFETCH_COUNT = get_from_env("SESSION_RECORDING_V2_BLOCK_PREFETCH_COUNT", 2, type_cast=int)
@@ -1,6 +1,6 @@
 import os
 
-from posthog.settings.utils import get_from_env, get_list
+from posthog.settings.utils import get_from_env, get_list, str_to_bool
 
 TEMPORAL_NAMESPACE: str = os.getenv("TEMPORAL_NAMESPACE", "default")
 TEMPORAL_TASK_QUEUE: str = os.getenv("TEMPORAL_TASK_QUEUE", "no-sandbox-python-django")
@@ -19,6 +19,8 @@ BATCH_EXPORT_S3_UPLOAD_CHUNK_SIZE_BYTES: int = 1024 * 1024 * 50  # 50MB
 BATCH_EXPORT_S3_RECORD_BATCH_QUEUE_MAX_SIZE_BYTES: int = get_from_env(
     "BATCH_EXPORT_S3_RECORD_BATCH_QUEUE_MAX_SIZE_BYTES", 0, type_cast=int
 )
+# Parts uploaded concurrently by each S3 batch export, each holding a copy of an upload chunk in memory
+BATCH_EXPORT_S3_MAX_CONCURRENT_UPLOADS: int = get_from_env("BATCH_EXPORT_S3_MAX_CONCURRENT_UPLOADS", 1, type_cast=int)
 
 BATCH_EXPORT_SNOWFLAKE_UPLOAD_CHUNK_SIZE_BYTES: int = 1024 * 1024 * 100  # 100MB
 BATCH_EXPORT_SNOWFLAKE_RECORD_BATCH_QUEUE_MAX_SIZE_BYTES: int = get_from_env(
@@ -47,8 +49,38 @@ BATCH_EXPORT_HTTP_BATCH_SIZE: int = get_from_env("BATCH_EXPORT_HTTP_BATCH_SIZE",
 
 BATCH_EXPORT_BUFFER_QUEUE_MAX_SIZE_BYTES: int = 1024 * 1024 * 300  # 300MB
 
+# Rows per Parquet row group, buffering record batches until there are enough of them.
+# If 0, every record batch is written as its own row group.
+BATCH_EXPORT_PARQUET_ROW_GROUP_SIZE: int = get_from_env("BATCH_EXPORT_PARQUET_ROW_GROUP_SIZE", 0, type_cast=int)
+
+# Large ranges (e.g. backfills) are split into this many sub-ranges, queried concurrently
+BATCH_EXPORT_PRODUCER_PARTITIONS: int = get_from_env("BATCH_EXPORT_PRODUCER_PARTITIONS", 1, type_cast=int)
+BATCH_EXPORT_PRODUCER_MIN_PARTITION_SECONDS: int = get_from_env(
+    "BATCH_EXPORT_PRODUCER_MIN_PARTITION_SECONDS", 60 * 60 * 6, type_cast=int
+)
+BATCH_EXPORT_PRODUCER_PARTITION_BUFFER_MAX_SIZE_BYTES: int = get_from_env(
+    "BATCH_EXPORT_PRODUCER_PARTITION_BUFFER_MAX_SIZE_BYTES", 1024 * 1024 * 100, type_cast=int
+)
+
 BATCH_EXPORT_HEARTBEAT_TIMEOUT_SECONDS: int = get_from_env("BATCH_EXPORT_HEARTBEAT_TIMEOUT_SECONDS", 30, type_cast=int)
 
+# Read and convert chunks of data imports in their own threads, while previous chunks are written to Delta
+DATA_IMPORTS_PIPELINE_STAGES_ENABLED: bool = get_from_env(
+    "DATA_IMPORTS_PIPELINE_STAGES_ENABLED", False, type_cast=str_to_bool
+)
+DATA_IMPORTS_PIPELINE_MAX_BUFFERED_BYTES: int = get_from_env(
+    "DATA_IMPORTS_PIPELINE_MAX_BUFFERED_BYTES", 1024 * 1024 * 200, type_cast=int
+)
+# Number of concurrent cursors full refresh syncs of large Postgres and MySQL tables are split into, 1 disables it
+DATA_IMPORTS_PARALLEL_EXTRACTION_PARTITIONS: int = get_from_env(
+    "DATA_IMPORTS_PARALLEL_EXTRACTION_PARTITIONS", 1, type_cast=int
+)
+
+# Stream saved query results from ClickHouse as Arrow record batches into Delta tables, instead of running them in dlt
+DATA_MODELING_STREAMING_MATERIALIZATION_ENABLED: bool = get_from_env(
+    "DATA_MODELING_STREAMING_MATERIALIZATION_ENABLED", False, type_cast=str_to_bool
+)
+
 UNCONSTRAINED_TIMESTAMP_TEAM_IDS: list[str] = get_list(os.getenv("UNCONSTRAINED_TIMESTAMP_TEAM_IDS", ""))
 ASYNC_ARROW_STREAMING_TEAM_IDS: list[str] = get_list(os.getenv("ASYNC_ARROW_STREAMING_TEAM_IDS", ""))
 DEFAULT_TIMESTAMP_LOOKBACK_DAYS = 7
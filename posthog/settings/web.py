@@ -36,6 +36,9 @@ DECIDE_SHORT_CIRCUITED_TEAM_IDS = [0]
 
 DECIDE_SKIP_POSTGRES_FLAGS = get_from_env("DECIDE_SKIP_POSTGRES_FLAGS", False, type_cast=str_to_bool)
 
+# Evaluate flag conditions on person and group properties in Python, instead of annotating them onto a Postgres query
+DECIDE_LOCAL_FLAG_EVALUATION = get_from_env("DECIDE_LOCAL_FLAG_EVALUATION", False, type_cast=str_to_bool)
+
 # Decide billing analytics
 
 DECIDE_BILLING_SAMPLING_RATE = get_from_env("DECIDE_BILLING_SAMPLING_RATE", 0.1, type_cast=float)
@@ -1,14 +1,19 @@
 import abc
-from typing import Optional, Union
+from typing import IO, Optional, Union
 
 import structlog
 from boto3 import client
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from django.conf import settings
 from posthog.exceptions_capture import capture_exception
 
 logger = structlog.get_logger(__name__)
 
+# Files are uploaded in parts of this size, so memory use is bounded by the part size times the concurrency
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+MULTIPART_MAX_CONCURRENCY = 4
+
 
 class ObjectStorageError(Exception):
     pass
@@ -45,6 +50,10 @@ class ObjectStorageClient(metaclass=abc.ABCMeta):
     def write(self, bucket: str, key: str, content: Union[str, bytes], extras: dict | None) -> None:
         pass
 
+    @abc.abstractmethod
+    def write_fileobj(self, bucket: str, key: str, fileobj: IO[bytes], extras: dict | None) -> None:
+        pass
+
     @abc.abstractmethod
     def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
         """
@@ -75,6 +84,9 @@ class UnavailableStorage(ObjectStorageClient):
     def write(self, bucket: str, key: str, content: Union[str, bytes], extras: dict | None) -> None:
         pass
 
+    def write_fileobj(self, bucket: str, key: str, fileobj: IO[bytes], extras: dict | None) -> None:
+        pass
+
     def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
         pass
 
@@ -170,6 +182,25 @@ class ObjectStorage(ObjectStorageClient):
             capture_exception(e)
             raise ObjectStorageError("write failed") from e
 
+    def write_fileobj(self, bucket: str, key: str, fileobj: IO[bytes], extras: dict | None) -> None:
+        try:
+            # Uses a multipart upload for files larger than a part, without reading the whole file into memory
+            self.aws_client.upload_fileobj(
+                Fileobj=fileobj,
+                Bucket=bucket,
+                Key=key,
+                ExtraArgs=extras,
+                Config=TransferConfig(
+                    multipart_threshold=MULTIPART_CHUNK_SIZE,
+                    multipart_chunksize=MULTIPART_CHUNK_SIZE,
+                    max_concurrency=MULTIPART_MAX_CONCURRENCY,
+                ),
+            )
+        except Exception as e:
+            logger.exception("object_storage.write_fileobj_failed", bucket=bucket, file_name=key, error=e)
+            capture_exception(e)
+            raise ObjectStorageError("write failed") from e
+
     def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
         try:
             source_objects = self.list_objects(bucket, source_prefix) or []
@@ -227,6 +258,15 @@ def write(file_name: str, content: Union[str, bytes], extras: dict | None = None
     )
 
 
+def write_fileobj(file_name: str, fileobj: IO[bytes], extras: dict | None = None, bucket: str | None = None) -> None:
+    return object_storage_client().write_fileobj(
+        bucket=bucket or settings.OBJECT_STORAGE_BUCKET,
+        key=file_name,
+        fileobj=fileobj,
+        extras=extras,
+    )
+
+
 def tag(file_name: str, tags: dict[str, str]) -> None:
     return object_storage_client().tag(bucket=settings.OBJECT_STORAGE_BUCKET, key=file_name, tags=tags)
 
@@ -1,16 +1,19 @@
 import traceback
 
 from datetime import datetime, timedelta, UTC
-from typing import cast
+from typing import Optional, cast
 from collections.abc import Callable
 from dateutil.relativedelta import relativedelta
 
 from celery import shared_task
 from celery.canvas import chain
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
 from django.db import transaction
 import structlog
 from sentry_sdk import set_tag
 
+from posthog.clickhouse.client.limit import ConcurrencyLimitExceeded, limit_concurrency
 from posthog.errors import CHQueryErrorTooManySimultaneousQueries
 from posthog.exceptions_capture import capture_exception
 from posthog.hogql_queries.legacy_compatibility.flagged_conversion_manager import (
@@ -36,7 +39,7 @@ from posthog.tasks.alerts.utils import (
     skip_because_of_weekend,
     WRAPPER_NODE_KINDS,
 )
-from posthog.tasks.alerts.trends import check_trends_alert
+from posthog.tasks.alerts.trends import CalculationResults, check_trends_alert
 from posthog.ph_client import ph_us_client
 
 
@@ -175,8 +178,14 @@ def check_alerts_task() -> None:
         grouped_by_team[alert.team].append(alert.id)
 
     for alert_ids in grouped_by_team.values():
-        # We chain the task execution to prevent queries *for a single team* running at the same time
-        chain(*(check_alert_task.si(str(alert_id)).set(expires=expire_after) for alert_id in alert_ids))()
+        if settings.ALERTS_BATCH_EVALUATION_ENABLED:
+            # Alerts of a team are checked one after the other in a single task, sharing insight calculations
+            check_alerts_for_team_task.si([str(alert_id) for alert_id in alert_ids]).set(
+                expires=expire_after
+            ).apply_async()
+        else:
+            # We chain the task execution to prevent queries *for a single team* running at the same time
+            chain(*(check_alert_task.si(str(alert_id)).set(expires=expire_after) for alert_id in alert_ids))()
 
 
 @shared_task(
@@ -194,7 +203,78 @@ def check_alert_task(alert_id: str) -> None:
         check_alert(alert_id, capture_ph_event)
 
 
-def check_alert(alert_id: str, capture_ph_event: Callable = lambda *args, **kwargs: None) -> None:
+@shared_task(
+    bind=True,
+    ignore_result=True,
+    queue=CeleryQueue.ALERTS.value,
+    max_retries=10,
+    expires=60 * 60,
+)
+def check_alerts_for_team_task(self, alert_ids: list[str]) -> None:
+    try:
+        _check_alerts_for_team(alert_ids)
+    except ConcurrencyLimitExceeded as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(
+                exc=e,
+                countdown=get_exponential_backoff_interval(
+                    factor=1, retries=self.request.retries, maximum=30, full_jitter=True
+                ),
+            )
+
+        # Rather than dropping the checks, fall back to checking the alerts individually, one after the other
+        logger.warning(
+            "Too many teams checking alerts, checking alerts of the team individually instead",
+            alert_ids=alert_ids,
+        )
+        chain(*(check_alert_task.si(alert_id) for alert_id in alert_ids))()
+
+
+@limit_concurrency(settings.ALERTS_MAX_CONCURRENT_TEAMS, limit_name="alerts_teams")
+def _check_alerts_for_team(alert_ids: list[str]) -> None:
+    with ph_us_client() as capture_ph_event:
+        check_alerts_batch(alert_ids, capture_ph_event)
+
+
+def check_alerts_batch(alert_ids: list[str], capture_ph_event: Callable = lambda *args, **kwargs: None) -> None:
+    """
+    Checks alerts one after the other, calculating each distinct insight query only once.
+
+    Alerts on the same insight mostly differ in their thresholds, so they're checked back to back and share
+    insight results for as long as their queries (after date range overrides) are the same.
+    """
+    insight_id_by_alert_id = {
+        str(alert_id): insight_id
+        for alert_id, insight_id in AlertConfiguration.objects.filter(id__in=alert_ids).values_list("id", "insight_id")
+    }
+    # Group alerts by insight, so that the ones sharing results are checked back to back
+    sorted_alert_ids = sorted(alert_ids, key=lambda alert_id: insight_id_by_alert_id.get(alert_id) or 0)
+
+    calculation_results: CalculationResults = {}
+    current_insight_id = None
+
+    for alert_id in sorted_alert_ids:
+        insight_id = insight_id_by_alert_id.get(alert_id)
+        if insight_id != current_insight_id:
+            # Results are only shared between alerts on the same insight, no need to hold on to them any longer
+            calculation_results.clear()
+            current_insight_id = insight_id
+
+        try:
+            check_alert(alert_id, capture_ph_event, calculation_results=calculation_results)
+        except CHQueryErrorTooManySimultaneousQueries:
+            # Retry this alert on its own, like when alerts are checked individually
+            check_alert_task.delay(alert_id)
+        except Exception:
+            # Already captured by check_alert, other alerts of the team still need checking
+            pass
+
+
+def check_alert(
+    alert_id: str,
+    capture_ph_event: Callable = lambda *args, **kwargs: None,
+    calculation_results: Optional[CalculationResults] = None,
+) -> None:
     try:
         alert = AlertConfiguration.objects.get(id=alert_id, enabled=True)
     except AlertConfiguration.DoesNotExist:
@@ -248,7 +328,7 @@ def check_alert(alert_id: str, capture_ph_event: Callable = lambda *args, **kwar
     alert.save()
 
     try:
-        check_alert_and_notify_atomically(alert, capture_ph_event)
+        check_alert_and_notify_atomically(alert, capture_ph_event, calculation_results)
     except Exception as err:
         user = cast(User, alert.created_by)
 
@@ -284,7 +364,11 @@ def check_alert(alert_id: str, capture_ph_event: Callable = lambda *args, **kwar
 
 
 @transaction.atomic
-def check_alert_and_notify_atomically(alert: AlertConfiguration, capture_ph_event: Callable) -> None:
+def check_alert_and_notify_atomically(
+    alert: AlertConfiguration,
+    capture_ph_event: Callable,
+    calculation_results: Optional[CalculationResults] = None,
+) -> None:
     """
     Computes insight results, checks alert for breaches and notifies user.
     Only commits updates to alert state if all of the above complete successfully.
@@ -308,7 +392,7 @@ def check_alert_and_notify_atomically(alert: AlertConfiguration, capture_ph_even
 
     # 1. Evaluate insight and get alert value
     try:
-        alert_evaluation_result = check_alert_for_insight(alert)
+        alert_evaluation_result = check_alert_for_insight(alert, calculation_results)
         value = alert_evaluation_result.value
         breaches = alert_evaluation_result.breaches
     except CHQueryErrorTooManySimultaneousQueries:
@@ -363,7 +447,9 @@ def check_alert_and_notify_atomically(alert: AlertConfiguration, capture_ph_even
         raise
 
 
-def check_alert_for_insight(alert: AlertConfiguration) -> AlertEvaluationResult:
+def check_alert_for_insight(
+    alert: AlertConfiguration, calculation_results: Optional[CalculationResults] = None
+) -> AlertEvaluationResult:
     """
     Matches insight type with alert checking logic
     """
@@ -380,7 +466,7 @@ def check_alert_for_insight(alert: AlertConfiguration) -> AlertEvaluationResult:
         match kind:
             case "TrendsQuery":
                 query = TrendsQuery.model_validate(query)
-                return check_trends_alert(alert, insight, query)
+                return check_trends_alert(alert, insight, query, calculation_results)
             case _:
                 raise NotImplementedError(f"AlertCheckError: Alerts for {query.kind} are not supported yet")
 
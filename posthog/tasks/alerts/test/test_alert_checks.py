@@ -6,7 +6,9 @@ from freezegun import freeze_time
 from posthog.models.alert import AlertCheck
 from posthog.models.instance_setting import set_instance_setting
 from posthog.tasks.alerts.utils import send_notifications_for_breaches
-from posthog.tasks.alerts.checks import check_alert
+from posthog.clickhouse.client.limit import ConcurrencyLimitExceeded
+from posthog.tasks.alerts.checks import check_alert, check_alerts_batch, check_alerts_for_team_task
+from posthog.caching.calculate_results import calculate_for_query_based_insight
 from posthog.test.base import APIBaseTest, _create_event, flush_persons_and_events, ClickhouseDestroyTablesMixin
 from posthog.api.test.dashboards import DashboardAPI
 from posthog.schema import ChartDisplayType, EventsNode, TrendsQuery, TrendsFilter, AlertState
@@ -138,6 +140,58 @@ class TestAlertChecks(APIBaseTest, ClickhouseDestroyTablesMixin):
         anomalies = self.get_breach_description(mock_send_notifications_for_breaches, call_index=0)
         assert "The insight value ($pageview) for current interval (0) is less than lower threshold (1.0)" in anomalies
 
+    def test_alerts_on_the_same_insight_share_calculations_when_checked_in_batch(
+        self, mock_send_notifications_for_breaches: MagicMock, mock_send_errors: MagicMock
+    ) -> None:
+        self.set_thresholds(upper=0)
+        other_alert = self.client.post(
+            f"/api/projects/{self.team.id}/alerts",
+            data={
+                "name": "other alert name",
+                "insight": self.insight["id"],
+                "subscribed_users": [self.user.id],
+                "calculation_interval": "daily",
+                "config": {"type": "TrendsAlertConfig", "series_index": 0},
+                "condition": {"type": "absolute_value"},
+                "threshold": {"configuration": {"type": "absolute", "bounds": {"upper": 5}}},
+            },
+        ).json()
+
+        with freeze_time("2024-06-02T07:55:00.000Z"):
+            _create_event(team=self.team, event="$pageview", distinct_id="1")
+            flush_persons_and_events()
+
+        with patch(
+            "posthog.tasks.alerts.trends.calculate_for_query_based_insight", wraps=calculate_for_query_based_insight
+        ) as mock_calculate:
+            check_alerts_batch([self.alert["id"], other_alert["id"]])
+
+        assert mock_calculate.call_count == 1
+        assert mock_send_notifications_for_breaches.call_count == 1
+        assert str(mock_send_notifications_for_breaches.call_args_list[0].args[0].id) == self.alert["id"]
+        assert AlertCheck.objects.get(alert_configuration=self.alert["id"]).state == AlertState.FIRING
+        assert AlertCheck.objects.get(alert_configuration=other_alert["id"]).state == AlertState.NOT_FIRING
+
+    def test_team_alerts_are_checked_individually_once_out_of_retries(
+        self, mock_send_notifications_for_breaches: MagicMock, mock_send_errors: MagicMock
+    ) -> None:
+        with (
+            patch(
+                "posthog.tasks.alerts.checks._check_alerts_for_team",
+                side_effect=ConcurrencyLimitExceeded("Exceeded maximum concurrent tasks limit"),
+            ) as mock_check_alerts_for_team,
+            patch("posthog.tasks.alerts.checks.check_alert_task") as mock_check_alert_task,
+            patch("posthog.tasks.alerts.checks.chain") as mock_chain,
+        ):
+            # Retries run right away when the task is applied eagerly
+            result = check_alerts_for_team_task.apply(args=[[self.alert["id"]]])
+
+        assert result.successful()
+        assert mock_check_alerts_for_team.call_count == check_alerts_for_team_task.max_retries + 1
+        mock_check_alert_task.si.assert_called_once_with(self.alert["id"])
+        mock_chain.assert_called_once_with(mock_check_alert_task.si.return_value)
+        mock_chain.return_value.assert_called_once()
+
     def test_alert_triggers_but_does_not_send_notification_during_firing(
         self, mock_send_notifications_for_breaches: MagicMock, mock_send_errors: MagicMock
     ) -> None:
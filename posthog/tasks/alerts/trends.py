@@ -1,3 +1,4 @@
+import json
 from typing import Optional, cast
 
 from posthog.api.services.query import ExecutionMode
@@ -22,6 +23,10 @@ from posthog.tasks.alerts.utils import (
 )
 
 
+# Insight results by insight ID and filters override
+CalculationResults = dict[tuple[int, str], InsightResult]
+
+
 # TODO: move the TrendResult UI type to schema.ts and use that instead
 class TrendResult(TypedDict):
     action: dict
@@ -42,7 +47,12 @@ class TrendResult(TypedDict):
     filter: dict
 
 
-def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: TrendsQuery) -> AlertEvaluationResult:
+def check_trends_alert(
+    alert: AlertConfiguration,
+    insight: Insight,
+    query: TrendsQuery,
+    calculation_results: Optional[CalculationResults] = None,
+) -> AlertEvaluationResult:
     """
     Calculates insight value for the needed time periods and compares it with the threshold.
 
@@ -52,6 +62,9 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
 
     But in some cases (when check_current_interval = True) like value > X or value inc > X, we can check the value for the current interval and alert right away if threshold is breached.
     So then we check current interval value first and alert if threshold breached, otherwise fallback and process previous interval.
+
+    calculation_results can be shared across alerts checked together, so that alerts on the same insight
+    (which only differ in thresholds) calculate each distinct query once.
     """
 
     if "type" in alert.config and alert.config["type"] == "TrendsAlertConfig":
@@ -85,13 +98,7 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
                 # depending on the alert calculation interval
                 filters_override = _date_range_override_for_intervals(query, last_x_intervals=2)
 
-            calculation_result = calculate_for_query_based_insight(
-                insight,
-                team=alert.team,
-                execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
-                user=None,
-                filters_override=filters_override,
-            )
+            calculation_result = _calculate_insight(alert, insight, filters_override, calculation_results)
 
             if not calculation_result.result:
                 raise RuntimeError(f"No results found for insight with alert id = {alert.id}")
@@ -176,13 +183,7 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
             # so we need to compute the trend values for last 3 intervals
             # and then compare the previous interval with value for the interval before previous
             filters_overrides = _date_range_override_for_intervals(query, last_x_intervals=3)
-            calculation_result = calculate_for_query_based_insight(
-                insight,
-                team=alert.team,
-                execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
-                user=None,
-                filters_override=filters_overrides,
-            )
+            calculation_result = _calculate_insight(alert, insight, filters_overrides, calculation_results)
 
             results_to_evaluate: list[TrendResult] = []
 
@@ -283,13 +284,7 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
             # so we need to compute the trend values for last 3 intervals
             # and then compare the previous interval with value for the interval before previous
             filters_overrides = _date_range_override_for_intervals(query, last_x_intervals=3)
-            calculation_result = calculate_for_query_based_insight(
-                insight,
-                team=alert.team,
-                execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
-                user=None,
-                filters_override=filters_overrides,
-            )
+            calculation_result = _calculate_insight(alert, insight, filters_overrides, calculation_results)
 
             results_to_evaluate = []
 
@@ -346,6 +341,29 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
             raise NotImplementedError(f"Unsupported alert condition type: {condition.type}")
 
 
+def _calculate_insight(
+    alert: AlertConfiguration,
+    insight: Insight,
+    filters_override: Optional[dict],
+    calculation_results: Optional[CalculationResults],
+) -> InsightResult:
+    key = (insight.pk, json.dumps(filters_override, sort_keys=True))
+    if calculation_results is not None and key in calculation_results:
+        return calculation_results[key]
+
+    calculation_result = calculate_for_query_based_insight(
+        insight,
+        team=alert.team,
+        execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
+        user=None,
+        filters_override=filters_override,
+    )
+
+    if calculation_results is not None:
+        calculation_results[key] = calculation_result
+    return calculation_result
+
+
 def _is_non_time_series_trend(query: TrendsQuery) -> bool:
     return bool(query.trendsFilter and query.trendsFilter.display in NON_TIME_SERIES_DISPLAY_TYPES)
 
@@ -18,7 +18,12 @@ from posthog.exceptions_capture import capture_exception
 from posthog.api.monitoring import Feature
 from posthog.models import Cohort
 from posthog.models.cohort import get_and_update_pending_version
-from posthog.models.cohort.util import clear_stale_cohortpeople, get_static_cohort_size
+from posthog.models.cohort.util import (
+    can_recalculate_cohortpeople_in_batch,
+    clear_stale_cohortpeople,
+    get_static_cohort_size,
+    recalculate_cohortpeople_batch,
+)
 from posthog.models.user import User
 from posthog.tasks.utils import CeleryQueue
 
@@ -54,7 +59,7 @@ def enqueue_cohorts_to_calculate(parallel_count: int) -> None:
         output_field=DurationField(),
     )
 
-    for cohort in (
+    due_cohorts = (
         Cohort.objects.filter(
             deleted=False,
             is_calculating=False,
@@ -67,10 +72,22 @@ def enqueue_cohorts_to_calculate(parallel_count: int) -> None:
             | Q(last_error_at__isnull=True)  # backwards compatability cohorts before last_error_at was introduced
         )
         .exclude(is_static=True)
-        .order_by(F("last_calculation").asc(nulls_first=True))[0:parallel_count]
-    ):
-        cohort = Cohort.objects.filter(pk=cohort.pk).get()
-        increment_version_and_enqueue_calculate_cohort(cohort, initiating_user=None)
+        .order_by(F("last_calculation").asc(nulls_first=True))
+    )
+
+    if settings.COHORT_BATCH_CALCULATION_ENABLED:
+        batch_size = settings.COHORT_BATCH_CALCULATION_MAX_SIZE
+        for cohorts in _group_cohorts_to_calculate(
+            list(due_cohorts.select_related("team")[0 : parallel_count * batch_size]), batch_size
+        )[0:parallel_count]:
+            if len(cohorts) == 1:
+                increment_version_and_enqueue_calculate_cohort(cohorts[0], initiating_user=None)
+            else:
+                increment_version_and_enqueue_calculate_cohorts_batch(cohorts)
+    else:
+        for cohort in due_cohorts[0:parallel_count]:
+            cohort = Cohort.objects.filter(pk=cohort.pk).get()
+            increment_version_and_enqueue_calculate_cohort(cohort, initiating_user=None)
 
     # update gauge
     backlog = (
@@ -91,6 +108,34 @@ def increment_version_and_enqueue_calculate_cohort(cohort: Cohort, *, initiating
     calculate_cohort_ch.delay(cohort.id, pending_version, initiating_user.id if initiating_user else None)
 
 
+def _group_cohorts_to_calculate(cohorts: list[Cohort], batch_size: int) -> list[list[Cohort]]:
+    """
+    Group cohorts that can be calculated in a single scan of persons by project, keeping the order they're due in.
+
+    Other cohorts are calculated on their own.
+    """
+    groups: list[list[Cohort]] = []
+    open_group_by_project_id: dict[int, list[Cohort]] = {}
+
+    for cohort in cohorts:
+        if not can_recalculate_cohortpeople_in_batch(cohort):
+            groups.append([cohort])
+            continue
+
+        group = open_group_by_project_id.get(cohort.team.project_id)
+        if group is None or len(group) >= batch_size:
+            group = open_group_by_project_id[cohort.team.project_id] = []
+            groups.append(group)
+        group.append(cohort)
+
+    return groups
+
+
+def increment_version_and_enqueue_calculate_cohorts_batch(cohorts: list[Cohort]) -> None:
+    pending_versions = [get_and_update_pending_version(cohort) for cohort in cohorts]
+    calculate_cohorts_ch_batch.delay([cohort.id for cohort in cohorts], pending_versions)
+
+
 @shared_task(ignore_result=True)
 def clear_stale_cohort(cohort_id: int, before_version: int) -> None:
     cohort: Cohort = Cohort.objects.get(pk=cohort_id)
@@ -113,6 +158,36 @@ def calculate_cohort_ch(cohort_id: int, pending_version: int, initiating_user_id
     cohort.calculate_people_ch(pending_version, initiating_user_id=initiating_user_id)
 
 
+@shared_task(ignore_result=True, max_retries=2, queue=CeleryQueue.LONG_RUNNING.value)
+def calculate_cohorts_ch_batch(cohort_ids: list[int], pending_versions: list[int]) -> None:
+    cohorts = Cohort.objects.select_related("team").in_bulk(cohort_ids)
+    cohorts_with_versions = [
+        (cohorts[cohort_id], pending_version)
+        for cohort_id, pending_version in zip(cohort_ids, pending_versions)
+        if cohort_id in cohorts
+    ]
+    if not cohorts_with_versions:
+        return
+
+    set_tag("feature", Feature.COHORT.value)
+    set_tag("team_id", cohorts_with_versions[0][0].team_id)
+
+    try:
+        count_by_cohort_id = recalculate_cohortpeople_batch(cohorts_with_versions)
+    except Exception:
+        logger.warning("cohort_batch_calculation_failed", cohort_ids=cohort_ids, exc_info=True)
+        # Calculate them one by one instead, so that a single cohort can't hold back the others
+        for cohort, pending_version in cohorts_with_versions:
+            calculate_cohort_ch.delay(cohort.pk, pending_version)
+        return
+
+    for cohort, pending_version in cohorts_with_versions:
+        try:
+            cohort.calculate_people_ch(pending_version, precalculated_count=count_by_cohort_id[cohort.pk])
+        except Exception as e:
+            capture_exception(e)
+
+
 @shared_task(ignore_result=True, max_retries=1)
 def calculate_cohort_from_list(cohort_id: int, items: list[str], team_id: Optional[int] = None) -> None:
     """
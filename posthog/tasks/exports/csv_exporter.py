@@ -1,5 +1,8 @@
+import csv
 import datetime
 import io
+import pickle
+import tempfile
 from typing import Any, Optional
 from collections.abc import Generator
 from urllib.parse import parse_qsl, quote, urlencode, urlparse, urlunparse
@@ -8,6 +11,7 @@ from pydantic import BaseModel
 import requests
 import structlog
 from openpyxl import Workbook
+from django.conf import settings
 from django.http import QueryDict
 from sentry_sdk import push_scope
 from requests.exceptions import HTTPError
@@ -16,7 +20,7 @@ from posthog.exceptions_capture import capture_exception
 from posthog.api.services.query import process_query_dict
 from posthog.hogql_queries.query_runner import ExecutionMode
 from posthog.jwt import PosthogJwtAudience, encode_jwt
-from posthog.models.exported_asset import ExportedAsset, save_content
+from posthog.models.exported_asset import ExportedAsset, save_content_from_file
 from posthog.utils import absolute_uri
 from .ordered_csv_renderer import OrderedCsvRenderer
 from ..exporter import (
@@ -34,6 +38,10 @@ logger = structlog.get_logger(__name__)
 RESULT_LIMIT_KEYS = ("distinct_ids",)
 RESULT_LIMIT_LENGTH = 10
 
+# Rows and rendered exports are kept in memory up to this size, and spill over to disk beyond it
+SPOOL_MAX_MEMORY_BYTES = 8 * 1024 * 1024
+CSV_RENDER_CHUNK_SIZE = 64 * 1024
+
 
 # SUPPORTED CSV TYPES
 
@@ -55,9 +63,10 @@ RESULT_LIMIT_LENGTH = 10
 # HOW DOES THIS WORK
 # 1. We receive an export task with a given resource uri (identical to the API)
 # 2. We call the actual API to load the data with the given params so that we receive a paginateable response
-# 3. We save the response to a chunk in object storage and then load the `next` page of results
+# 3. We flatten the rows of the response into a spooled temporary file and then load the `next` page of results
 # 4. Repeat until exhausted or limit reached
-# 5. We save the final blob output and update the ExportedAsset
+# 5. We render the rows one at a time into another spooled temporary file, so memory stays bounded
+# 6. We save the final blob output (with a multipart upload if it's large) and update the ExportedAsset
 
 
 def add_query_params(url: str, params: dict[str, str]) -> str:
@@ -297,7 +306,51 @@ def get_from_hogql_query(exported_asset: ExportedAsset, limit: int, resource: di
         return
 
 
-def _export_to_dict(exported_asset: ExportedAsset, limit: int) -> Any:
+class SpooledRows:
+    """
+    Flattened rows, spooled to a temporary file as they are pulled from the API or query.
+
+    Only the unique fields of the rows are kept in memory, which is all the renderer needs to know
+    the header up front, so that rows can be rendered one at a time.
+    """
+
+    def __init__(self, renderer: OrderedCsvRenderer) -> None:
+        self.renderer = renderer
+        self._file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES)
+        self._unique_fields: dict[str, None] = {}
+        self.count = 0
+        self.first_row: Optional[dict[str, Any]] = None
+
+    @property
+    def unique_fields(self) -> list[str]:
+        return list(self._unique_fields)
+
+    def append(self, row: dict[str, Any]) -> None:
+        if self.first_row is None:
+            self.first_row = row
+
+        flat_row = self.renderer.flatten_item(row)
+        self._unique_fields.update(dict.fromkeys(flat_row))
+        # Pickle rather than JSON, so that values are rendered exactly as if they had been kept in memory
+        pickle.dump(flat_row, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+
+    def __iter__(self) -> Generator[dict[str, Any], None, None]:
+        self._file.seek(0)
+        for _ in range(self.count):
+            yield pickle.load(self._file)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "SpooledRows":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def _export_to_spooled_rows(exported_asset: ExportedAsset, limit: int) -> tuple[SpooledRows, dict[str, Any]]:
     resource = exported_asset.export_context
 
     columns: list[str] = resource.get("columns", [])
@@ -308,50 +361,68 @@ def _export_to_dict(exported_asset: ExportedAsset, limit: int) -> Any:
     else:
         returned_rows = get_from_insights_api(exported_asset, limit, resource)
 
-    all_csv_rows = list(returned_rows)
     renderer = OrderedCsvRenderer()
+    rows = SpooledRows(renderer)
+    for row in returned_rows:
+        rows.append(row)
+
     render_context = {}
     if columns:
         render_context["header"] = columns
 
-    if len(all_csv_rows):
+    if rows.first_row is not None:
         # NOTE: This is not ideal as some rows _could_ have different keys
         # Ideally we would extend the csvrenderer to supported keeping the order in place
-        is_any_col_list_or_dict = [x for x in all_csv_rows[0].values() if isinstance(x, dict) or isinstance(x, list)]
+        is_any_col_list_or_dict = [x for x in rows.first_row.values() if isinstance(x, dict) or isinstance(x, list)]
         if not is_any_col_list_or_dict:
             # If values are serialised then keep the order of the keys, else allow it to be unordered
-            renderer.header = all_csv_rows[0].keys()
+            renderer.header = list(rows.first_row.keys())
     else:
         # If we have no rows, that means we couldn't convert anything, so put something to avoid confusion
-        all_csv_rows = [{"error": "No data available or unable to format for export."}]
+        rows.append({"error": "No data available or unable to format for export."})
 
-    return renderer, all_csv_rows, render_context
+    return rows, render_context
 
 
 def _export_to_csv(exported_asset: ExportedAsset, limit: int) -> None:
-    renderer, all_csv_rows, render_context = _export_to_dict(exported_asset, limit)
+    rows, render_context = _export_to_spooled_rows(exported_asset, limit)
+    renderer = rows.renderer
 
-    rendered_csv_content = renderer.render(all_csv_rows, renderer_context=render_context)
-    save_content(exported_asset, rendered_csv_content)
+    with rows, tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES) as output:
+        # Render a chunk of rows at a time, as `CSVRenderer.render` does for all of them at once
+        csv_buffer = io.StringIO()
+        csv_writer = csv.writer(csv_buffer)
+        header = render_context.get("header", renderer.header)
+        for row in renderer.tablize_flattened(rows, rows.unique_fields, header=header):
+            csv_writer.writerow(row)
+            if csv_buffer.tell() >= CSV_RENDER_CHUNK_SIZE:
+                output.write(csv_buffer.getvalue().encode(settings.DEFAULT_CHARSET))
+                csv_buffer.seek(0)
+                csv_buffer.truncate()
+        output.write(csv_buffer.getvalue().encode(settings.DEFAULT_CHARSET))
 
+        save_content_from_file(exported_asset, output, output.tell())
 
-def _export_to_excel(exported_asset: ExportedAsset, limit: int) -> None:
-    output = io.BytesIO()
-
-    workbook = Workbook()
-    worksheet = workbook.active
-
-    renderer, all_csv_rows, render_context = _export_to_dict(exported_asset, limit)
 
-    for row_num, row_data in enumerate(renderer.tablize(all_csv_rows, header=render_context.get("header"))):
-        for col_num, value in enumerate(row_data):
-            if value is not None and not isinstance(value, str | int | float | bool):
-                value = str(value)
-            worksheet.cell(row=row_num + 1, column=col_num + 1, value=value)
+def _export_to_excel(exported_asset: ExportedAsset, limit: int) -> None:
+    rows, render_context = _export_to_spooled_rows(exported_asset, limit)
+    renderer = rows.renderer
+
+    # Write-only workbooks write rows to a temporary file as they're appended, instead of keeping cells in memory
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+
+    with rows, tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES) as output:
+        for row_data in renderer.tablize_flattened(rows, rows.unique_fields, header=render_context.get("header")):
+            worksheet.append(
+                [
+                    str(value) if value is not None and not isinstance(value, str | int | float | bool) else value
+                    for value in row_data
+                ]
+            )
 
-    workbook.save(output)
-    output.seek(0)
-    save_content(exported_asset, output.getvalue())
+        workbook.save(output)
+        save_content_from_file(exported_asset, output, output.tell())
 
 
 def get_limit_param_key(path: str) -> str:
@@ -1,7 +1,7 @@
 import itertools
 from collections import OrderedDict
 from typing import Any
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 
 from more_itertools import unique_everseen
 from rest_framework_csv.renderers import CSVRenderer
@@ -29,6 +29,16 @@ class OrderedCsvRenderer(
         # Get the set of all unique headers, and sort them.
         unique_fields = list(unique_everseen(itertools.chain(*(item.keys() for item in data))))
 
+        yield from self.tablize_flattened(data, unique_fields, header=header, labels=labels)
+
+    def tablize_flattened(
+        self, data: Iterable[dict[str, Any]], unique_fields: list[str], header: Any = None, labels: Any = None
+    ) -> Generator:
+        """
+        Convert already flattened data into a table, given the unique fields of all of its items.
+
+        The data is only iterated once, after the header is yielded, so it can be streamed.
+        """
         ordered_fields: dict[str, Any] = OrderedDict()
         for item in unique_fields:
             field = item.split(".")
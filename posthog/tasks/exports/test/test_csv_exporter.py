@@ -160,6 +160,35 @@ class TestCSVExporter(APIBaseTest):
 
             assert exported_asset.content is None
 
+    @patch("posthog.models.exported_asset.UUIDT")
+    @patch("posthog.models.exported_asset.object_storage.write")
+    def test_csv_exporter_streams_large_exports_to_object_storage(
+        self, mocked_object_storage_write, mocked_uuidt
+    ) -> None:
+        exported_asset = self._create_asset()
+        mocked_uuidt.return_value = "a-guid"
+
+        with (
+            self.settings(OBJECT_STORAGE_ENABLED=True, OBJECT_STORAGE_EXPORTS_FOLDER="Test-Exports"),
+            patch("posthog.storage.object_storage.MULTIPART_CHUNK_SIZE", 10),
+            patch("posthog.tasks.exports.csv_exporter.SPOOL_MAX_MEMORY_BYTES", 10),
+            patch("posthog.tasks.exports.csv_exporter.CSV_RENDER_CHUNK_SIZE", 10),
+        ):
+            csv_exporter.export_tabular(exported_asset)
+
+            mocked_object_storage_write.assert_not_called()
+            assert (
+                exported_asset.content_location
+                == f"{TEST_PREFIX}/csv/team-{self.team.id}/task-{exported_asset.id}/a-guid"
+            )
+            assert exported_asset.content is None
+
+            content = object_storage.read(exported_asset.content_location)
+            assert (
+                content
+                == "id,distinct_id,properties.$browser,event,timestamp,person,elements_chain\r\ne9ca132e-400f-4854-a83c-16c151b2f145,2,Safari,event_name,2022-07-06T19:37:43.095295+00:00,,\r\n1624228e-a4f1-48cd-aabc-6baa3ddb22e4,2,Safari,event_name,2022-07-06T19:37:43.095279+00:00,,\r\n66d45914-bdf5-4980-a54a-7dc699bdcce9,2,Safari,event_name,2022-07-06T19:37:43.095262+00:00,,\r\n"
+            )
+
     @patch("posthog.models.exported_asset.UUIDT")
     @patch("posthog.models.exported_asset.object_storage.write")
     def test_csv_exporter_writes_to_asset_when_object_storage_write_fails(
@@ -49,6 +49,7 @@ from posthog.tasks.tasks import (
     start_poll_query_performance,
     stop_surveys_reached_target,
     sync_all_organization_available_product_features,
+    train_query_cache_dictionary_task,
     update_event_partitions,
     run_quota_limiting,
     update_survey_adaptive_sampling,
@@ -107,6 +108,12 @@ def setup_periodic_tasks(sender: Celery, **kwargs: Any) -> None:
         name="schedule warming for largest teams",
     )
 
+    sender.add_periodic_task(
+        crontab(hour="2", minute="15"),
+        train_query_cache_dictionary_task.s(),
+        name="train query cache dictionary",
+    )
+
     # Update events table partitions twice a week
     sender.add_periodic_task(
         crontab(day_of_week="mon,fri", hour="0", minute="0"),
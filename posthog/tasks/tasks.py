@@ -694,6 +694,14 @@ def schedule_cache_updates_task() -> None:
     schedule_cache_updates()
 
 
+@shared_task(ignore_result=True)
+def train_query_cache_dictionary_task() -> None:
+    from posthog.hogql_queries.query_cache_codec import train_query_cache_dictionary
+
+    if settings.QUERY_CACHE_CODEC_DICTIONARY_ENABLED:
+        train_query_cache_dictionary()
+
+
 @shared_task(
     ignore_result=True,
     autoretry_for=(CHQueryErrorTooManySimultaneousQueries,),
@@ -45,7 +45,15 @@ from posthog.tasks.usage_report import (
     _get_team_report,
     _get_teams_for_usage_reports,
     capture_event,
+    get_all_event_metrics_in_period,
     get_instance_metadata,
+    get_teams_with_ai_event_count_in_period,
+    get_teams_with_billable_enhanced_persons_event_count_in_period,
+    get_teams_with_billable_event_count_in_period,
+    get_teams_with_event_count_with_groups_in_period,
+    get_teams_with_event_counts_in_period,
+    get_teams_with_exceptions_captured_in_period,
+    get_teams_with_survey_responses_count_in_period,
     send_all_org_usage_reports,
 )
 from posthog.test.base import (
@@ -913,6 +921,37 @@ class UsageReport(APIBaseTest, ClickhouseTestMixin, ClickhouseDestroyTablesMixin
         # assert mock_posthog.capture.call_count == 2
         # mock_posthog.capture.assert_has_calls(calls, any_order=True)
 
+    @freeze_time("2022-01-10T00:01:00Z")
+    def test_event_counts_in_a_single_scan_match_the_separate_queries(self) -> None:
+        self._create_sample_usage_data(include_mobile_replay=False)
+        period_start, period_end = get_previous_day()
+
+        event_counts = get_teams_with_event_counts_in_period(period_start, period_end)
+
+        expected_counts = {
+            "teams_with_event_count_in_period": get_teams_with_billable_event_count_in_period(
+                period_start, period_end, count_distinct=True
+            ),
+            "teams_with_enhanced_persons_event_count_in_period": get_teams_with_billable_enhanced_persons_event_count_in_period(
+                period_start, period_end, count_distinct=True
+            ),
+            "teams_with_event_count_with_groups_in_period": get_teams_with_event_count_with_groups_in_period(
+                period_start, period_end
+            ),
+            "teams_with_survey_responses_count_in_period": get_teams_with_survey_responses_count_in_period(
+                period_start, period_end
+            ),
+            "teams_with_ai_event_count_in_period": get_teams_with_ai_event_count_in_period(period_start, period_end),
+            "teams_with_exceptions_captured_in_period": get_teams_with_exceptions_captured_in_period(
+                period_start, period_end
+            ),
+            **get_all_event_metrics_in_period(period_start, period_end),
+        }
+        assert event_counts["teams_with_event_count_in_period"]
+        assert set(event_counts) == set(expected_counts)
+        for key, rows in expected_counts.items():
+            assert sorted(event_counts[key]) == sorted(rows), key
+
 
 @freeze_time("2022-01-09T00:01:00Z")
 class ReplayUsageReport(APIBaseTest, ClickhouseTestMixin, ClickhouseDestroyTablesMixin):
@@ -1111,6 +1150,8 @@ class TestFeatureFlagsUsageReport(ClickhouseDestroyTablesMixin, TestCase, Clickh
         self.org_2_team_3 = Team.objects.create(pk=5, organization=self.org_2, name="Team 3 org 2")
 
     @snapshot_clickhouse_queries
+    # Run queries one at a time, so that they're snapshotted in a stable order
+    @patch("posthog.tasks.usage_report.USAGE_REPORT_MAX_CONCURRENT_QUERIES", 1)
     @patch("posthog.tasks.usage_report.get_ph_client")
     @patch("posthog.tasks.usage_report.send_report_to_billing_service")
     def test_usage_report_decide_requests(self, billing_task_mock: MagicMock, posthog_capture_mock: MagicMock) -> None:
@@ -4,7 +4,9 @@ import json
 import base64
 import gzip
 from collections import Counter
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
 from datetime import datetime
 from typing import Any, Literal, Optional, TypedDict, Union
 
@@ -71,6 +73,9 @@ QUERY_RETRIES = 3
 QUERY_RETRY_DELAY = 1
 QUERY_RETRY_BACKOFF = 2
 
+# ClickHouse queries of the usage report that run at the same time
+USAGE_REPORT_MAX_CONCURRENT_QUERIES = 4
+
 USAGE_REPORT_TASK_KWARGS = {
     "queue": CeleryQueue.USAGE_REPORTS.value,
     "ignore_result": True,
@@ -438,36 +443,63 @@ def get_teams_with_event_count_with_groups_in_period(begin: datetime, end: datet
     return result
 
 
-@timed_log()
-@retry(tries=QUERY_RETRIES, delay=QUERY_RETRY_DELAY, backoff=QUERY_RETRY_BACKOFF)
-def get_all_event_metrics_in_period(begin: datetime, end: datetime) -> dict[str, list[tuple[int, int]]]:
+EVENT_METRICS = [
+    "helicone_events",
+    "langfuse_events",
+    "keywords_ai_events",
+    "traceloop_events",
+    "web_events",
+    "web_lite_events",
+    "node_events",
+    "android_events",
+    "flutter_events",
+    "ios_events",
+    "go_events",
+    "java_events",
+    "react_native_events",
+    "ruby_events",
+    "python_events",
+    "php_events",
+    "dotnet_events",
+]
+
+
+def _get_event_metric_expression() -> str:
     # Check if $lib is materialized
     lib_expression, _ = get_property_string_expr("events", "$lib", "'$lib'", "properties")
 
+    return f"""
+        multiIf(
+            event LIKE 'helicone%%', 'helicone_events',
+            event LIKE 'langfuse%%', 'langfuse_events',
+            event LIKE 'keywords_ai%%', 'keywords_ai_events',
+            event LIKE 'traceloop%%', 'traceloop_events',
+            {lib_expression} = 'web', 'web_events',
+            {lib_expression} = 'js', 'web_lite_events',
+            {lib_expression} = 'posthog-node', 'node_events',
+            {lib_expression} = 'posthog-android', 'android_events',
+            {lib_expression} = 'posthog-flutter', 'flutter_events',
+            {lib_expression} = 'posthog-ios', 'ios_events',
+            {lib_expression} = 'posthog-go', 'go_events',
+            {lib_expression} = 'posthog-java', 'java_events',
+            {lib_expression} = 'posthog-react-native', 'react_native_events',
+            {lib_expression} = 'posthog-ruby', 'ruby_events',
+            {lib_expression} = 'posthog-python', 'python_events',
+            {lib_expression} = 'posthog-php', 'php_events',
+            {lib_expression} = 'posthog-dotnet', 'dotnet_events',
+            'other'
+        )
+    """
+
+
+@timed_log()
+@retry(tries=QUERY_RETRIES, delay=QUERY_RETRY_DELAY, backoff=QUERY_RETRY_BACKOFF)
+def get_all_event_metrics_in_period(begin: datetime, end: datetime) -> dict[str, list[tuple[int, int]]]:
     results = sync_execute(
         f"""
         SELECT
             team_id,
-            multiIf(
-                event LIKE 'helicone%%', 'helicone_events',
-                event LIKE 'langfuse%%', 'langfuse_events',
-                event LIKE 'keywords_ai%%', 'keywords_ai_events',
-                event LIKE 'traceloop%%', 'traceloop_events',
-                {lib_expression} = 'web', 'web_events',
-                {lib_expression} = 'js', 'web_lite_events',
-                {lib_expression} = 'posthog-node', 'node_events',
-                {lib_expression} = 'posthog-android', 'android_events',
-                {lib_expression} = 'posthog-flutter', 'flutter_events',
-                {lib_expression} = 'posthog-ios', 'ios_events',
-                {lib_expression} = 'posthog-go', 'go_events',
-                {lib_expression} = 'posthog-java', 'java_events',
-                {lib_expression} = 'posthog-react-native', 'react_native_events',
-                {lib_expression} = 'posthog-ruby', 'ruby_events',
-                {lib_expression} = 'posthog-python', 'python_events',
-                {lib_expression} = 'posthog-php', 'php_events',
-                {lib_expression} = 'posthog-dotnet', 'dotnet_events',
-                'other'
-            ) AS metric,
+            {_get_event_metric_expression()} AS metric,
             count(1) as count
         FROM events
         WHERE timestamp BETWEEN %(begin)s AND %(end)s
@@ -479,25 +511,7 @@ def get_all_event_metrics_in_period(begin: datetime, end: datetime) -> dict[str,
         settings=CH_BILLING_SETTINGS,
     )
 
-    metrics: dict[str, list[tuple[int, int]]] = {
-        "helicone_events": [],
-        "langfuse_events": [],
-        "keywords_ai_events": [],
-        "traceloop_events": [],
-        "web_events": [],
-        "web_lite_events": [],
-        "node_events": [],
-        "android_events": [],
-        "flutter_events": [],
-        "ios_events": [],
-        "go_events": [],
-        "java_events": [],
-        "react_native_events": [],
-        "ruby_events": [],
-        "python_events": [],
-        "php_events": [],
-        "dotnet_events": [],
-    }
+    metrics: dict[str, list[tuple[int, int]]] = {metric: [] for metric in EVENT_METRICS}
 
     for team_id, metric, count in results:
         metrics[metric].append((team_id, count))
@@ -505,6 +519,65 @@ def get_all_event_metrics_in_period(begin: datetime, end: datetime) -> dict[str,
     return metrics
 
 
+@timed_log()
+@retry(tries=QUERY_RETRIES, delay=QUERY_RETRY_DELAY, backoff=QUERY_RETRY_BACKOFF)
+def get_teams_with_event_counts_in_period(begin: datetime, end: datetime) -> dict[str, list[tuple[int, int]]]:
+    """
+    Counts everything the usage report needs from events in a single scan, instead of one scan per count.
+
+    Returns the same rows as `get_teams_with_billable_event_count_in_period` (with `count_distinct`),
+    `get_teams_with_billable_enhanced_persons_event_count_in_period` (with `count_distinct`),
+    `get_teams_with_event_count_with_groups_in_period`, `get_teams_with_survey_responses_count_in_period`,
+    `get_teams_with_ai_event_count_in_period`, `get_teams_with_exceptions_captured_in_period` and
+    `get_all_event_metrics_in_period`, keyed by their names in the usage report.
+    """
+    billable_condition = (
+        "event NOT IN ('$feature_flag_called', 'survey sent', 'survey shown', 'survey dismissed', '$exception')"
+    )
+    # Same as `count(distinct ...)` in the billable event count queries
+    distinct_expression = "toDate(timestamp), event, cityHash64(distinct_id), cityHash64(uuid)"
+
+    aggregations = {
+        "teams_with_event_count_in_period": f"uniqExactIf({distinct_expression}, {billable_condition})",
+        "teams_with_enhanced_persons_event_count_in_period": (
+            f"uniqExactIf({distinct_expression}, {billable_condition} AND person_mode IN ('full', 'force_upgrade'))"
+        ),
+        "teams_with_event_count_with_groups_in_period": (
+            "countIf($group_0 != '' OR $group_1 != '' OR $group_2 != '' OR $group_3 != '' OR $group_4 != '')"
+        ),
+        "teams_with_survey_responses_count_in_period": "countIf(event = 'survey sent')",
+        "teams_with_ai_event_count_in_period": "countIf(event LIKE '$ai_%%')",
+        "teams_with_exceptions_captured_in_period": (
+            "countIf(event = '$exception' AND not(JSONHas(properties, '$sentry_event_id')))"
+        ),
+        **{metric: f"countIf(metric = '{metric}')" for metric in EVENT_METRICS},
+    }
+
+    results = sync_execute(
+        f"""
+        WITH {_get_event_metric_expression()} AS metric
+        SELECT
+            team_id,
+            {", ".join(aggregations.values())}
+        FROM events
+        WHERE timestamp BETWEEN %(begin)s AND %(end)s
+        GROUP BY team_id
+    """,
+        {"begin": begin, "end": end},
+        workload=Workload.OFFLINE,
+        settings=CH_BILLING_SETTINGS,
+    )
+
+    counts: dict[str, list[tuple[int, int]]] = {key: [] for key in aggregations}
+    for team_id, *team_counts in results:
+        for key, count in zip(aggregations, team_counts):
+            # The separate queries filter out events instead of counting them, so they never return zeros
+            if count:
+                counts[key].append((team_id, count))
+
+    return counts
+
+
 @timed_log()
 @retry(tries=QUERY_RETRIES, delay=QUERY_RETRY_DELAY, backoff=QUERY_RETRY_BACKOFF)
 def get_teams_with_recording_count_in_period(
@@ -908,195 +981,227 @@ def _get_all_usage_data(period_start: datetime, period_end: datetime) -> dict[st
     """
     Gets all usage data for the specified period. Clickhouse is good at counting things so
     we count across all teams rather than doing it one by one
+
+    Counts from events are merged into a single scan, and the ClickHouse queries run concurrently
+    while the Postgres queries run on this thread.
     """
 
-    all_metrics = get_all_event_metrics_in_period(period_start, period_end)
-    qaas_usage = get_teams_with_qaas_metrics(period_start, period_end)
+    with ThreadPoolExecutor(
+        max_workers=USAGE_REPORT_MAX_CONCURRENT_QUERIES, thread_name_prefix="usage_report"
+    ) as executor:
+
+        def submit(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+            # Keep the query tags of the report on the queries run by the executor
+            return executor.submit(copy_context().run, fn, *args, **kwargs)
+
+        event_counts_future = submit(get_teams_with_event_counts_in_period, period_start, period_end)
+        qaas_usage_future = submit(get_teams_with_qaas_metrics, period_start, period_end)
+        clickhouse_futures: dict[str, Future] = {
+            "teams_with_recording_count_in_period": submit(
+                get_teams_with_recording_count_in_period, period_start, period_end, snapshot_source="web"
+            ),
+            "teams_with_recording_bytes_in_period": submit(
+                get_teams_with_recording_bytes_in_period, period_start, period_end, snapshot_source="web"
+            ),
+            "teams_with_mobile_recording_count_in_period": submit(
+                get_teams_with_recording_count_in_period, period_start, period_end, snapshot_source="mobile"
+            ),
+            "teams_with_mobile_recording_bytes_in_period": submit(
+                get_teams_with_recording_bytes_in_period, period_start, period_end, snapshot_source="mobile"
+            ),
+            "teams_with_mobile_billable_recording_count_in_period": submit(
+                get_teams_with_mobile_billable_recording_count_in_period, period_start, period_end
+            ),
+            "teams_with_decide_requests_count_in_period": submit(
+                get_teams_with_feature_flag_requests_count_in_period, period_start, period_end, FlagRequestType.DECIDE
+            ),
+            "teams_with_local_evaluation_requests_count_in_period": submit(
+                get_teams_with_feature_flag_requests_count_in_period,
+                period_start,
+                period_end,
+                FlagRequestType.LOCAL_EVALUATION,
+            ),
+            "teams_with_hog_function_calls_in_period": submit(
+                get_teams_with_hog_function_calls_in_period, period_start, period_end
+            ),
+            "teams_with_hog_function_fetch_calls_in_period": submit(
+                get_teams_with_hog_function_fetch_calls_in_period, period_start, period_end
+            ),
+            "teams_with_query_app_bytes_read": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="read_bytes",
+                access_method="",
+            ),
+            "teams_with_query_app_rows_read": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="read_rows",
+                access_method="",
+            ),
+            "teams_with_query_app_duration_ms": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="query_duration_ms",
+                access_method="",
+            ),
+            "teams_with_query_api_bytes_read": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="read_bytes",
+                access_method="personal_api_key",
+            ),
+            "teams_with_query_api_rows_read": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="read_rows",
+                access_method="personal_api_key",
+            ),
+            "teams_with_query_api_duration_ms": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="query_duration_ms",
+                access_method="personal_api_key",
+            ),
+            "teams_with_event_explorer_app_bytes_read": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="read_bytes",
+                query_types=["EventsQuery"],
+                access_method="",
+            ),
+            "teams_with_event_explorer_app_rows_read": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="read_rows",
+                query_types=["EventsQuery"],
+                access_method="",
+            ),
+            "teams_with_event_explorer_app_duration_ms": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="query_duration_ms",
+                query_types=["EventsQuery"],
+                access_method="",
+            ),
+            "teams_with_event_explorer_api_bytes_read": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="read_bytes",
+                query_types=["EventsQuery"],
+                access_method="personal_api_key",
+            ),
+            "teams_with_event_explorer_api_rows_read": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="read_rows",
+                query_types=["EventsQuery"],
+                access_method="personal_api_key",
+            ),
+            "teams_with_event_explorer_api_duration_ms": submit(
+                get_teams_with_query_metric,
+                period_start,
+                period_end,
+                metric="query_duration_ms",
+                query_types=["EventsQuery"],
+                access_method="personal_api_key",
+            ),
+        }
+        # Django connections are per thread, so these stay on this one
+        postgres_data = {
+            "teams_with_group_types_total": list(
+                GroupTypeMapping.objects.values("team_id").annotate(total=Count("id")).order_by("team_id")
+            ),
+            "teams_with_dashboard_count": list(
+                Dashboard.objects.values("team_id").annotate(total=Count("id")).order_by("team_id")
+            ),
+            "teams_with_dashboard_template_count": list(
+                Dashboard.objects.filter(creation_mode="template")
+                .values("team_id")
+                .annotate(total=Count("id"))
+                .order_by("team_id")
+            ),
+            "teams_with_dashboard_shared_count": list(
+                Dashboard.objects.filter(sharingconfiguration__enabled=True)
+                .values("team_id")
+                .annotate(total=Count("id"))
+                .order_by("team_id")
+            ),
+            "teams_with_dashboard_tagged_count": list(
+                Dashboard.objects.filter(tagged_items__isnull=False)
+                .values("team_id")
+                .annotate(total=Count("id"))
+                .order_by("team_id")
+            ),
+            "teams_with_ff_count": list(
+                FeatureFlag.objects.values("team_id").annotate(total=Count("id")).order_by("team_id")
+            ),
+            "teams_with_ff_active_count": list(
+                FeatureFlag.objects.filter(active=True)
+                .values("team_id")
+                .annotate(total=Count("id"))
+                .order_by("team_id")
+            ),
+            "teams_with_issues_created_total": list(
+                ErrorTrackingIssue.objects.values("team_id").annotate(total=Count("id")).order_by("team_id")
+            ),
+            "teams_with_symbol_sets_count": list(
+                ErrorTrackingSymbolSet.objects.values("team_id").annotate(total=Count("id")).order_by("team_id")
+            ),
+            "teams_with_resolved_symbol_sets_count": list(
+                ErrorTrackingSymbolSet.objects.filter(storage_ptr__isnull=False)
+                .values("team_id")
+                .annotate(total=Count("id"))
+                .order_by("team_id")
+            ),
+            "teams_with_rows_synced_in_period": get_teams_with_rows_synced_in_period(period_start, period_end),
+        }
+
+        event_counts = event_counts_future.result()
+        qaas_usage = qaas_usage_future.result()
+        clickhouse_data = {key: future.result() for key, future in clickhouse_futures.items()}
 
     return {
-        "teams_with_event_count_in_period": get_teams_with_billable_event_count_in_period(
-            period_start, period_end, count_distinct=True
-        ),
-        "teams_with_enhanced_persons_event_count_in_period": get_teams_with_billable_enhanced_persons_event_count_in_period(
-            period_start, period_end, count_distinct=True
-        ),
-        "teams_with_event_count_with_groups_in_period": get_teams_with_event_count_with_groups_in_period(
-            period_start, period_end
-        ),
-        "teams_with_event_count_from_helicone_in_period": all_metrics["helicone_events"],
-        "teams_with_event_count_from_langfuse_in_period": all_metrics["langfuse_events"],
-        "teams_with_event_count_from_keywords_ai_in_period": all_metrics["keywords_ai_events"],
-        "teams_with_event_count_from_traceloop_in_period": all_metrics["traceloop_events"],
-        "teams_with_web_events_count_in_period": all_metrics["web_events"],
-        "teams_with_web_lite_events_count_in_period": all_metrics["web_lite_events"],
-        "teams_with_node_events_count_in_period": all_metrics["node_events"],
-        "teams_with_android_events_count_in_period": all_metrics["android_events"],
-        "teams_with_flutter_events_count_in_period": all_metrics["flutter_events"],
-        "teams_with_ios_events_count_in_period": all_metrics["ios_events"],
-        "teams_with_go_events_count_in_period": all_metrics["go_events"],
-        "teams_with_java_events_count_in_period": all_metrics["java_events"],
-        "teams_with_react_native_events_count_in_period": all_metrics["react_native_events"],
-        "teams_with_ruby_events_count_in_period": all_metrics["ruby_events"],
-        "teams_with_python_events_count_in_period": all_metrics["python_events"],
-        "teams_with_php_events_count_in_period": all_metrics["php_events"],
-        "teams_with_dotnet_events_count_in_period": all_metrics["dotnet_events"],
-        "teams_with_recording_count_in_period": get_teams_with_recording_count_in_period(
-            period_start, period_end, snapshot_source="web"
-        ),
-        "teams_with_recording_bytes_in_period": get_teams_with_recording_bytes_in_period(
-            period_start, period_end, snapshot_source="web"
-        ),
-        "teams_with_mobile_recording_count_in_period": get_teams_with_recording_count_in_period(
-            period_start, period_end, snapshot_source="mobile"
-        ),
-        "teams_with_mobile_recording_bytes_in_period": get_teams_with_recording_bytes_in_period(
-            period_start, period_end, snapshot_source="mobile"
-        ),
-        "teams_with_mobile_billable_recording_count_in_period": get_teams_with_mobile_billable_recording_count_in_period(
-            period_start, period_end
-        ),
-        "teams_with_decide_requests_count_in_period": get_teams_with_feature_flag_requests_count_in_period(
-            period_start, period_end, FlagRequestType.DECIDE
-        ),
-        "teams_with_local_evaluation_requests_count_in_period": get_teams_with_feature_flag_requests_count_in_period(
-            period_start, period_end, FlagRequestType.LOCAL_EVALUATION
-        ),
-        "teams_with_group_types_total": list(
-            GroupTypeMapping.objects.values("team_id").annotate(total=Count("id")).order_by("team_id")
-        ),
-        "teams_with_dashboard_count": list(
-            Dashboard.objects.values("team_id").annotate(total=Count("id")).order_by("team_id")
-        ),
-        "teams_with_dashboard_template_count": list(
-            Dashboard.objects.filter(creation_mode="template")
-            .values("team_id")
-            .annotate(total=Count("id"))
-            .order_by("team_id")
-        ),
-        "teams_with_dashboard_shared_count": list(
-            Dashboard.objects.filter(sharingconfiguration__enabled=True)
-            .values("team_id")
-            .annotate(total=Count("id"))
-            .order_by("team_id")
-        ),
-        "teams_with_dashboard_tagged_count": list(
-            Dashboard.objects.filter(tagged_items__isnull=False)
-            .values("team_id")
-            .annotate(total=Count("id"))
-            .order_by("team_id")
-        ),
-        "teams_with_ff_count": list(
-            FeatureFlag.objects.values("team_id").annotate(total=Count("id")).order_by("team_id")
-        ),
-        "teams_with_ff_active_count": list(
-            FeatureFlag.objects.filter(active=True).values("team_id").annotate(total=Count("id")).order_by("team_id")
-        ),
-        "teams_with_issues_created_total": list(
-            ErrorTrackingIssue.objects.values("team_id").annotate(total=Count("id")).order_by("team_id")
-        ),
-        "teams_with_symbol_sets_count": list(
-            ErrorTrackingSymbolSet.objects.values("team_id").annotate(total=Count("id")).order_by("team_id")
-        ),
-        "teams_with_resolved_symbol_sets_count": list(
-            ErrorTrackingSymbolSet.objects.filter(storage_ptr__isnull=False)
-            .values("team_id")
-            .annotate(total=Count("id"))
-            .order_by("team_id")
-        ),
-        "teams_with_query_app_bytes_read": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="read_bytes",
-            access_method="",
-        ),
-        "teams_with_query_app_rows_read": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="read_rows",
-            access_method="",
-        ),
-        "teams_with_query_app_duration_ms": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="query_duration_ms",
-            access_method="",
-        ),
-        "teams_with_query_api_bytes_read": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="read_bytes",
-            access_method="personal_api_key",
-        ),
-        "teams_with_query_api_rows_read": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="read_rows",
-            access_method="personal_api_key",
-        ),
-        "teams_with_query_api_duration_ms": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="query_duration_ms",
-            access_method="personal_api_key",
-        ),
+        "teams_with_event_count_in_period": event_counts["teams_with_event_count_in_period"],
+        "teams_with_enhanced_persons_event_count_in_period": event_counts[
+            "teams_with_enhanced_persons_event_count_in_period"
+        ],
+        "teams_with_event_count_with_groups_in_period": event_counts["teams_with_event_count_with_groups_in_period"],
+        "teams_with_event_count_from_helicone_in_period": event_counts["helicone_events"],
+        "teams_with_event_count_from_langfuse_in_period": event_counts["langfuse_events"],
+        "teams_with_event_count_from_keywords_ai_in_period": event_counts["keywords_ai_events"],
+        "teams_with_event_count_from_traceloop_in_period": event_counts["traceloop_events"],
+        "teams_with_web_events_count_in_period": event_counts["web_events"],
+        "teams_with_web_lite_events_count_in_period": event_counts["web_lite_events"],
+        "teams_with_node_events_count_in_period": event_counts["node_events"],
+        "teams_with_android_events_count_in_period": event_counts["android_events"],
+        "teams_with_flutter_events_count_in_period": event_counts["flutter_events"],
+        "teams_with_ios_events_count_in_period": event_counts["ios_events"],
+        "teams_with_go_events_count_in_period": event_counts["go_events"],
+        "teams_with_java_events_count_in_period": event_counts["java_events"],
+        "teams_with_react_native_events_count_in_period": event_counts["react_native_events"],
+        "teams_with_ruby_events_count_in_period": event_counts["ruby_events"],
+        "teams_with_python_events_count_in_period": event_counts["python_events"],
+        "teams_with_php_events_count_in_period": event_counts["php_events"],
+        "teams_with_dotnet_events_count_in_period": event_counts["dotnet_events"],
+        "teams_with_survey_responses_count_in_period": event_counts["teams_with_survey_responses_count_in_period"],
+        "teams_with_exceptions_captured_in_period": event_counts["teams_with_exceptions_captured_in_period"],
+        "teams_with_ai_event_count_in_period": event_counts["teams_with_ai_event_count_in_period"],
         "teams_with_qaas_count": qaas_usage["count"],
         "teams_with_qaas_read_bytes": qaas_usage["read_bytes"],
-        "teams_with_event_explorer_app_bytes_read": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="read_bytes",
-            query_types=["EventsQuery"],
-            access_method="",
-        ),
-        "teams_with_event_explorer_app_rows_read": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="read_rows",
-            query_types=["EventsQuery"],
-            access_method="",
-        ),
-        "teams_with_event_explorer_app_duration_ms": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="query_duration_ms",
-            query_types=["EventsQuery"],
-            access_method="",
-        ),
-        "teams_with_event_explorer_api_bytes_read": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="read_bytes",
-            query_types=["EventsQuery"],
-            access_method="personal_api_key",
-        ),
-        "teams_with_event_explorer_api_rows_read": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="read_rows",
-            query_types=["EventsQuery"],
-            access_method="personal_api_key",
-        ),
-        "teams_with_event_explorer_api_duration_ms": get_teams_with_query_metric(
-            period_start,
-            period_end,
-            metric="query_duration_ms",
-            query_types=["EventsQuery"],
-            access_method="personal_api_key",
-        ),
-        "teams_with_survey_responses_count_in_period": get_teams_with_survey_responses_count_in_period(
-            period_start, period_end
-        ),
-        "teams_with_rows_synced_in_period": get_teams_with_rows_synced_in_period(period_start, period_end),
-        "teams_with_exceptions_captured_in_period": get_teams_with_exceptions_captured_in_period(
-            period_start, period_end
-        ),
-        "teams_with_hog_function_calls_in_period": get_teams_with_hog_function_calls_in_period(
-            period_start, period_end
-        ),
-        "teams_with_hog_function_fetch_calls_in_period": get_teams_with_hog_function_fetch_calls_in_period(
-            period_start, period_end
-        ),
-        "teams_with_ai_event_count_in_period": get_teams_with_ai_event_count_in_period(period_start, period_end),
+        **clickhouse_data,
+        **postgres_data,
     }
 
 
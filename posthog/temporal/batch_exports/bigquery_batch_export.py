@@ -787,7 +787,14 @@ async def insert_into_bigquery_activity(inputs: BigQueryInsertInputs) -> Records
                             schema=record_batch_schema,
                             max_bytes=settings.BATCH_EXPORT_BIGQUERY_UPLOAD_CHUNK_SIZE_BYTES,
                             json_columns=() if can_perform_merge else json_columns,
-                            writer_file_kwargs={"compression": "zstd"} if can_perform_merge else {},
+                            writer_file_kwargs=(
+                                {
+                                    "compression": "zstd",
+                                    "row_group_size": settings.BATCH_EXPORT_PARQUET_ROW_GROUP_SIZE,
+                                }
+                                if can_perform_merge
+                                else {}
+                            ),
                             multiple_files=True,
                         )
 
@@ -364,25 +364,33 @@ class S3MultiPartUpload:
 
     async def upload_part(
         self,
-        body: BatchExportTemporaryFile,
+        body: BatchExportTemporaryFile | bytes,
         rewind: bool = True,
         max_attempts: int = 5,
         initial_retry_delay: float | int = 2,
         max_retry_delay: float | int = 32,
         exponential_backoff_coefficient: int = 2,
-    ):
-        """Upload a part of this multi-part upload."""
+    ) -> Part:
+        """Upload a part of this multi-part upload.
+
+        The part number is reserved before the first `await`, so several parts can be uploaded concurrently.
+        When doing so, `body` should be `bytes` copied out of the temporary file, as the file may be reset
+        while the part is still being uploaded.
+        """
         next_part_number = self.part_number + 1
-        part = {"PartNumber": next_part_number, "ETag": ""}
+        part: Part = {"PartNumber": next_part_number, "ETag": ""}
         self.pending_parts.append(part)
 
-        if rewind is True:
-            body.rewind()
+        if isinstance(body, bytes):
+            reader: io.BufferedReader | bytes = body
+        else:
+            if rewind is True:
+                body.rewind()
 
-        # aiohttp is not duck-type friendly and requires a io.IOBase
-        # We comply with the file-like interface of io.IOBase.
-        # So we tell mypy to be nice with us.
-        reader = io.BufferedReader(body)  # type: ignore
+            # aiohttp is not duck-type friendly and requires a io.IOBase
+            # We comply with the file-like interface of io.IOBase.
+            # So we tell mypy to be nice with us.
+            reader = io.BufferedReader(body)  # type: ignore
 
         try:
             etag = await self.upload_part_retryable(
@@ -397,15 +405,18 @@ class S3MultiPartUpload:
             raise
 
         finally:
-            reader.detach()  # BufferedReader closes the file otherwise.
+            if isinstance(reader, io.BufferedReader):
+                reader.detach()  # BufferedReader closes the file otherwise.
 
         self.pending_parts.pop(self.pending_parts.index(part))
         part["ETag"] = etag
         self.parts.append(part)
 
+        return part
+
     async def upload_part_retryable(
         self,
-        reader: io.BufferedReader,
+        reader: io.BufferedReader | bytes,
         next_part_number: int,
         max_attempts: int = 5,
         initial_retry_delay: float | int = 2,
@@ -527,7 +538,32 @@ class S3HeartbeatDetails(BatchExportRangeHeartbeatDetails):
         self.upload_state = None
 
 
+@dataclasses.dataclass
+class S3PartUpload:
+    """A part upload started by `S3Consumer`, with everything required to track it once done."""
+
+    task: asyncio.Task[Part]
+    s3_upload: S3MultiPartUpload
+    upload_id: str
+    records: int
+    date_range: DateRange
+    is_last: bool
+
+
 class S3Consumer(Consumer):
+    """A `Consumer` that uploads flushed files to S3 using multi-part uploads.
+
+    Up to `max_concurrent_uploads` parts are uploaded concurrently. Once that many parts are in
+    flight, flushing waits for one of them to finish, which stops the consumer from reading the
+    `RecordBatchQueue` and in turn blocks the producer once the queue is full.
+
+    When splitting the export into multiple files (with `max_file_size_mb`), completing a file
+    waits for its parts in the background, so the next file can start uploading in the meantime.
+
+    Parts may finish in any order, but heartbeat details are only updated with parts in the order
+    they were flushed, so that we never resume from a range with missing data.
+    """
+
     def __init__(
         self,
         heartbeater: Heartbeater,
@@ -536,6 +572,7 @@ class S3Consumer(Consumer):
         data_interval_end: dt.datetime | str,
         writer_format: WriterFormat,
         s3_inputs: S3InsertInputs,
+        max_concurrent_uploads: int = 1,
     ):
         super().__init__(
             heartbeater=heartbeater,
@@ -549,6 +586,9 @@ class S3Consumer(Consumer):
         self.s3_inputs = s3_inputs
         self.file_number = 0
         self.files_uploaded: list[str] = []
+        self.max_concurrent_uploads = max(max_concurrent_uploads, 1)
+        self.upload_semaphore = asyncio.Semaphore(self.max_concurrent_uploads)
+        self.part_uploads: collections.deque[S3PartUpload] = collections.deque()
 
     async def flush(
         self,
@@ -561,6 +601,7 @@ class S3Consumer(Consumer):
         error: Exception | None,
     ):
         if error is not None:
+            await self.cancel_part_uploads()
             if not self.s3_upload:
                 return
             await self.logger.adebug("Error while writing part %d", self.s3_upload.part_number + 1, exc_info=error)
@@ -573,38 +614,132 @@ class S3Consumer(Consumer):
         if self.s3_upload is None:
             self.s3_upload = initialize_upload(self.s3_inputs, self.file_number)
 
-        async with self.s3_upload as s3_upload:
-            await self.logger.adebug(
-                "Uploading file number %s part %s with upload id %s containing %s records with size %s bytes",
-                self.file_number,
-                s3_upload.part_number + 1,
-                s3_upload.upload_id,
-                records_since_last_flush,
-                bytes_since_last_flush,
-            )
-            await s3_upload.upload_part(batch_export_file)
+        s3_upload = self.s3_upload
+        if not s3_upload.is_upload_in_progress():
+            await s3_upload.start()
 
-            self.rows_exported_counter.add(records_since_last_flush)
-            self.bytes_exported_counter.add(bytes_since_last_flush)
+        # Backpressure: Wait for an upload slot before taking on more data
+        await self.upload_semaphore.acquire()
 
-            if is_last:
-                await self.logger.adebug(
-                    "Completing multipart upload %s for file number %s", s3_upload.upload_id, self.file_number
-                )
-                await s3_upload.complete()
+        await self.logger.adebug(
+            "Uploading file number %s part %s with upload id %s containing %s records with size %s bytes",
+            self.file_number,
+            s3_upload.part_number + 1,
+            s3_upload.upload_id,
+            records_since_last_flush,
+            bytes_since_last_flush,
+        )
+
+        try:
+            if self.max_concurrent_uploads > 1:
+                # The temporary file is reset as soon as we return, so concurrent uploads need their own copy
+                batch_export_file.rewind()
+                body: BatchExportTemporaryFile | bytes = await asyncio.to_thread(batch_export_file.read)
+            else:
+                body = batch_export_file
+        except Exception:
+            self.upload_semaphore.release()
+            raise
+
+        previous_tasks = [part_upload.task for part_upload in self.part_uploads if part_upload.s3_upload is s3_upload]
+        upload_part_coroutine = self.upload_part(
+            s3_upload, body, records_since_last_flush, bytes_since_last_flush, is_last, previous_tasks
+        )
+        part_upload = S3PartUpload(
+            task=asyncio.create_task(upload_part_coroutine),
+            s3_upload=s3_upload,
+            upload_id=typing.cast(str, s3_upload.upload_id),
+            records=records_since_last_flush,
+            date_range=last_date_range,
+            is_last=is_last,
+        )
+        self.part_uploads.append(part_upload)
 
         if is_last:
-            self.files_uploaded.append(s3_upload.key)
             self.s3_upload = None
-            self.heartbeat_details.mark_file_upload_as_complete()
             self.file_number += 1
-        else:
-            self.heartbeat_details.append_upload_state(self.s3_upload.to_state())
 
-        self.heartbeat_details.records_completed += records_since_last_flush
-        self.heartbeat_details.track_done_range(last_date_range, self.data_interval_start)
+        if self.max_concurrent_uploads == 1:
+            await asyncio.wait([part_upload.task])
+
+        try:
+            self.track_completed_part_uploads()
+        except Exception:
+            await self.cancel_part_uploads()
+            raise
+
+    async def upload_part(
+        self,
+        s3_upload: S3MultiPartUpload,
+        body: BatchExportTemporaryFile | bytes,
+        records_count: int,
+        bytes_count: int,
+        is_last: bool,
+        previous_tasks: list[asyncio.Task[Part]],
+    ) -> Part:
+        """Upload a part, completing the multi-part upload if it's the last one.
+
+        The upload slot is released as soon as the part is uploaded, so completing a file doesn't hold up
+        any other uploads.
+        """
+        try:
+            part = await s3_upload.upload_part(body)
+        finally:
+            self.upload_semaphore.release()
+
+        self.rows_exported_counter.add(records_count)
+        self.bytes_exported_counter.add(bytes_count)
+
+        if is_last:
+            await asyncio.gather(*previous_tasks)
+            await self.logger.adebug(
+                "Completing multipart upload %s for file number %s", s3_upload.upload_id, s3_upload.key
+            )
+            await s3_upload.complete()
+
+        return part
+
+    def track_completed_part_uploads(self) -> None:
+        """Update heartbeat details with part uploads done, in the order they were flushed.
+
+        Raises:
+            Any exception raised while uploading a part.
+        """
+        while self.part_uploads and self.part_uploads[0].task.done():
+            part_upload = self.part_uploads.popleft()
+            part = part_upload.task.result()
+
+            if part_upload.is_last:
+                self.files_uploaded.append(part_upload.s3_upload.key)
+                self.heartbeat_details.mark_file_upload_as_complete()
+            else:
+                self.heartbeat_details.append_upload_state(S3MultiPartUploadState(part_upload.upload_id, [part]))
+
+            self.heartbeat_details.records_completed += part_upload.records
+            self.heartbeat_details.track_done_range(part_upload.date_range, self.data_interval_start)
+
+    async def wait_for_part_uploads(self) -> None:
+        """Wait for all part uploads in flight, tracking them in order."""
+        while self.part_uploads:
+            await asyncio.wait([self.part_uploads[0].task])
+            self.track_completed_part_uploads()
+
+    async def cancel_part_uploads(self) -> None:
+        """Cancel all part uploads in flight, as none of them will be tracked anymore."""
+        tasks = [part_upload.task for part_upload in self.part_uploads]
+        self.part_uploads.clear()
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def close(self):
+        try:
+            await self.wait_for_part_uploads()
+        except Exception:
+            await self.cancel_part_uploads()
+            raise
+
         if self.s3_upload is not None:
             await self.logger.adebug(
                 "Completing multipart upload %s for file number %s", self.s3_upload.upload_id, self.file_number
@@ -774,13 +909,19 @@ async def insert_into_s3_activity(inputs: S3InsertInputs) -> RecordsCompleted:
             [field.with_nullable(True) for field in record_batch_schema]
         )
 
+        writer_format = WriterFormat.from_str(inputs.file_format, "S3")
+        writer_file_kwargs: dict[str, typing.Any] = {"compression": inputs.compression}
+        if writer_format == WriterFormat.PARQUET:
+            writer_file_kwargs["row_group_size"] = settings.BATCH_EXPORT_PARQUET_ROW_GROUP_SIZE
+
         consumer = S3Consumer(
             heartbeater=heartbeater,
             heartbeat_details=details,
             data_interval_end=data_interval_end,
             data_interval_start=data_interval_start,
-            writer_format=WriterFormat.from_str(inputs.file_format, "S3"),
+            writer_format=writer_format,
             s3_inputs=inputs,
+            max_concurrent_uploads=settings.BATCH_EXPORT_S3_MAX_CONCURRENT_UPLOADS,
         )
         _ = await run_consumer(
             consumer=consumer,
@@ -789,7 +930,7 @@ async def insert_into_s3_activity(inputs: S3InsertInputs) -> RecordsCompleted:
             schema=record_batch_schema,
             max_bytes=settings.BATCH_EXPORT_S3_UPLOAD_CHUNK_SIZE_BYTES,
             include_inserted_at=True,
-            writer_file_kwargs={"compression": inputs.compression},
+            writer_file_kwargs=writer_file_kwargs,
             max_file_size_bytes=inputs.max_file_size_mb * 1024 * 1024 if inputs.max_file_size_mb else 0,
         )
 
@@ -54,7 +54,7 @@ from posthog.temporal.batch_exports.utils import (
     cast_record_batch_json_columns,
     cast_record_batch_schema_json_columns,
 )
-from posthog.temporal.common.clickhouse import get_client
+from posthog.temporal.common.clickhouse import ClickHouseClient, get_client
 from posthog.temporal.common.heartbeat import Heartbeater
 from posthog.temporal.common.logger import get_internal_logger
 from posthog.warehouse.util import database_sync_to_async
@@ -702,11 +702,13 @@ class Producer:
 
     Attributes:
         clickhouse_client: ClickHouse client used to produce RecordBatches.
+        partitions: Max number of sub-ranges a range is split into to query concurrently.
         _task: Used to keep track of producer background task.
     """
 
-    def __init__(self, model: RecordBatchModel | None = None):
+    def __init__(self, model: RecordBatchModel | None = None, partitions: int | None = None):
         self.model = model
+        self.partitions = partitions or settings.BATCH_EXPORT_PRODUCER_PARTITIONS
         self.logger = get_internal_logger()
         self._task: asyncio.Task | None = None
 
@@ -928,31 +930,134 @@ class Producer:
             if not await client.is_alive():
                 raise ConnectionError("Cannot establish connection to ClickHouse")
 
-            for interval_start, interval_end in generate_query_ranges(full_range, done_ranges):
-                if interval_start is not None:
-                    query_parameters["interval_start"] = interval_start.strftime("%Y-%m-%d %H:%M:%S.%f")
-                query_parameters["interval_end"] = interval_end.strftime("%Y-%m-%d %H:%M:%S.%f")
-                query_id = uuid.uuid4()
+            for query_range in generate_query_ranges(full_range, done_ranges):
+                sub_ranges = split_query_range(
+                    query_range,
+                    partitions=self.partitions,
+                    min_partition_size=dt.timedelta(seconds=settings.BATCH_EXPORT_PRODUCER_MIN_PARTITION_SECONDS),
+                )
 
-                if isinstance(query_or_model, RecordBatchModel):
-                    query, query_parameters = await query_or_model.as_query_with_parameters(
-                        interval_start, interval_end
+                if len(sub_ranges) == 1:
+                    await self.produce_record_batches_from_query_range(
+                        client,
+                        query_or_model=query_or_model,
+                        query_range=query_range,
+                        queue=queue,
+                        query_parameters=query_parameters,
+                        max_record_batch_size_bytes=max_record_batch_size_bytes,
+                        min_records_per_batch=min_records_per_batch,
                     )
                 else:
-                    query = query_or_model
+                    await self.logger.adebug("Producing record batches from %s sub-ranges", len(sub_ranges))
+                    await self.produce_record_batches_from_query_sub_ranges(
+                        client,
+                        query_or_model=query_or_model,
+                        sub_ranges=sub_ranges,
+                        queue=queue,
+                        query_parameters=query_parameters,
+                        max_record_batch_size_bytes=max_record_batch_size_bytes,
+                        min_records_per_batch=min_records_per_batch,
+                    )
 
-                try:
-                    async for record_batch in client.astream_query_as_arrow(
-                        query, query_parameters=query_parameters, query_id=str(query_id)
-                    ):
-                        for record_batch_slice in slice_record_batch(
-                            record_batch, max_record_batch_size_bytes, min_records_per_batch
-                        ):
-                            await queue.put(record_batch_slice)
+    async def produce_record_batches_from_query_range(
+        self,
+        client: ClickHouseClient,
+        query_or_model: str | RecordBatchModel,
+        query_range: tuple[dt.datetime | None, dt.datetime],
+        queue: RecordBatchQueue,
+        query_parameters: dict[str, typing.Any],
+        max_record_batch_size_bytes: int = 0,
+        min_records_per_batch: int = 100,
+    ):
+        """Produce Arrow record batches of a single query over `query_range` into `queue`."""
+        interval_start, interval_end = query_range
+        if interval_start is not None:
+            query_parameters["interval_start"] = interval_start.strftime("%Y-%m-%d %H:%M:%S.%f")
+        query_parameters["interval_end"] = interval_end.strftime("%Y-%m-%d %H:%M:%S.%f")
+        query_id = uuid.uuid4()
+
+        if isinstance(query_or_model, RecordBatchModel):
+            query, query_parameters = await query_or_model.as_query_with_parameters(interval_start, interval_end)
+        else:
+            query = query_or_model
 
-                except Exception as e:
-                    await self.logger.aexception("Unexpected error occurred while producing record batches", exc_info=e)
-                    raise
+        try:
+            async for record_batch in client.astream_query_as_arrow(
+                query, query_parameters=query_parameters, query_id=str(query_id)
+            ):
+                for record_batch_slice in slice_record_batch(
+                    record_batch, max_record_batch_size_bytes, min_records_per_batch
+                ):
+                    await queue.put(record_batch_slice)
+
+        except Exception as e:
+            await self.logger.aexception("Unexpected error occurred while producing record batches", exc_info=e)
+            raise
+
+    async def produce_record_batches_from_query_sub_ranges(
+        self,
+        client: ClickHouseClient,
+        query_or_model: str | RecordBatchModel,
+        sub_ranges: list[tuple[dt.datetime | None, dt.datetime]],
+        queue: RecordBatchQueue,
+        query_parameters: dict[str, typing.Any],
+        max_record_batch_size_bytes: int = 0,
+        min_records_per_batch: int = 100,
+    ):
+        """Query consecutive `sub_ranges` concurrently, while still producing into `queue` in order.
+
+        Consumers track exported ranges by `_inserted_at`, so record batches of a sub-range must not
+        be produced before all record batches of the sub-ranges preceding it. Each sub-range is
+        buffered in its own queue, bounded by `BATCH_EXPORT_PRODUCER_PARTITION_BUFFER_MAX_SIZE_BYTES`,
+        and buffers are drained into `queue` one after the other. Once a buffer is full, querying
+        that sub-range waits until we get to drain it.
+        """
+        buffers = [
+            RecordBatchQueue(max_size_bytes=settings.BATCH_EXPORT_PRODUCER_PARTITION_BUFFER_MAX_SIZE_BYTES)
+            for _ in sub_ranges
+        ]
+
+        tasks = [
+            asyncio.create_task(
+                self.produce_record_batches_from_query_range(
+                    client,
+                    query_or_model=query_or_model,
+                    query_range=sub_range,
+                    queue=buffer,
+                    query_parameters={**query_parameters},
+                    max_record_batch_size_bytes=max_record_batch_size_bytes,
+                    min_records_per_batch=min_records_per_batch,
+                ),
+                name=f"record_batch_producer_partition_{index}",
+            )
+            for index, (sub_range, buffer) in enumerate(zip(sub_ranges, buffers))
+        ]
+
+        try:
+            for buffer, task in zip(buffers, tasks):
+                while True:
+                    try:
+                        record_batch = buffer.get_nowait()
+                    except asyncio.QueueEmpty:
+                        if task.done():
+                            break
+
+                        get_task = asyncio.create_task(buffer.get())
+                        await asyncio.wait([get_task, task], return_when=asyncio.FIRST_COMPLETED)
+                        if not get_task.done():
+                            get_task.cancel()
+                            continue
+                        record_batch = get_task.result()
+
+                    await queue.put(record_batch)
+
+                # Re-raise any failure of this sub-range, before producing the next one
+                task.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
 
 def slice_record_batch(
@@ -996,6 +1101,30 @@ def slice_record_batch(
         length = total_rows - yielded_rows
 
 
+def split_query_range(
+    query_range: tuple[dt.datetime | None, dt.datetime],
+    partitions: int,
+    min_partition_size: dt.timedelta,
+) -> list[tuple[dt.datetime | None, dt.datetime]]:
+    """Split a range into up to `partitions` consecutive sub-ranges of equal length.
+
+    Sub-ranges are never shorter than `min_partition_size`, so short ranges (like the ones
+    of regularly scheduled batch exports) are returned as they are. Ranges with no start
+    can't be split either, as we don't know where the data begins.
+    """
+    start_at, end_at = query_range
+    if start_at is None or partitions <= 1:
+        return [query_range]
+
+    partitions = min(partitions, int((end_at - start_at) / min_partition_size))
+    if partitions <= 1:
+        return [query_range]
+
+    step = (end_at - start_at) / partitions
+    boundaries = [start_at + step * index for index in range(partitions)] + [end_at]
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
 def generate_query_ranges(
     remaining_range: tuple[dt.datetime | None, dt.datetime],
     done_ranges: collections.abc.Sequence[tuple[dt.datetime, dt.datetime]],
@@ -16,6 +16,7 @@ import brotli
 import orjson
 import psycopg
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 import structlog
 from psycopg import sql
@@ -420,7 +421,8 @@ class BatchExportWriter(abc.ABC):
         self, record_batch: pa.RecordBatch, flush: bool = True, include_inserted_at: bool = False
     ) -> None:
         """Issue a record batch write tracking progress and flushing if required."""
-        record_batch = record_batch.sort_by("_inserted_at")
+        if not is_sorted(record_batch.column("_inserted_at")):
+            record_batch = record_batch.sort_by("_inserted_at")
 
         if self.start_at_since_last_flush is None:
             raw_start_at = record_batch.column("_inserted_at")[0].as_py()
@@ -496,6 +498,18 @@ class BatchExportWriter(abc.ABC):
         self._batch_export_file = await asyncio.to_thread(self.create_temporary_file)
 
 
+def is_sorted(array: pa.Array) -> bool:
+    """Check if an array is sorted in ascending order without converting it to Python objects.
+
+    Batches from ClickHouse usually already come sorted, so this lets us skip copying them to sort them.
+    Arrays with nulls are considered not sorted, as sorting moves nulls to the end.
+    """
+    if len(array) < 2:
+        return array.null_count == 0
+
+    return pc.all(pc.less_equal(array[:-1], array[1:]), skip_nulls=False).as_py() is True
+
+
 class WriterFormat(enum.StrEnum):
     JSONL = enum.auto()
     PARQUET = enum.auto()
@@ -716,9 +730,18 @@ class ParquetBatchExportWriter(BatchExportWriter):
     In contrast to other writers, instead of us handling compression we let `pyarrow.parquet.ParquetWriter`
     handle it, so `BatchExportTemporaryFile` is always initialized with `compression=None`.
 
+    Record batches are handed over to `pyarrow.parquet.ParquetWriter` as they are, so no Python objects are
+    ever created for the records being written. By default, each record batch is written as its own row group.
+    As record batches coming from ClickHouse can be small, setting `row_group_size` will buffer record batches
+    until there are enough rows for a row group. Larger row groups compress and dictionary-encode better, and
+    are faster to read.
+
     Attributes:
         schema: The schema used by the Parquet file. Should match the schema of written RecordBatches.
         compression: Compression codec passed to underlying `pyarrow.parquet.ParquetWriter`.
+        row_group_size: Number of rows to buffer before writing a row group. If set to 0, every record
+            batch is written as a row group as soon as it's written.
+        use_dictionary: Whether to dictionary-encode all columns, or a list of the columns to dictionary-encode.
     """
 
     def __init__(
@@ -729,6 +752,8 @@ class ParquetBatchExportWriter(BatchExportWriter):
         compression: str | None = "snappy",
         compression_level: int | None = None,
         max_file_size_bytes: int = 0,
+        row_group_size: int = 0,
+        use_dictionary: bool | list[str] = True,
     ):
         super().__init__(
             max_bytes=max_bytes,
@@ -739,7 +764,11 @@ class ParquetBatchExportWriter(BatchExportWriter):
         self.schema = schema
         self.compression = compression
         self.compression_level = compression_level
+        self.row_group_size = row_group_size
+        self.use_dictionary = use_dictionary
         self._parquet_writer: pq.ParquetWriter | None = None
+        self._pending_record_batches: list[pa.RecordBatch] = []
+        self._pending_rows = 0
 
     @property
     def parquet_writer(self) -> pq.ParquetWriter:
@@ -749,11 +778,23 @@ class ParquetBatchExportWriter(BatchExportWriter):
                 schema=self.schema,
                 compression="none" if self.compression is None else self.compression,
                 compression_level=self.compression_level,
+                use_dictionary=self.use_dictionary,
             )
         return self._parquet_writer
 
+    async def flush(self, is_last: bool = False) -> None:
+        """Write any pending rows before flushing, so that they are included in the flush."""
+        if self._pending_record_batches:
+            await asyncio.to_thread(self._write_pending_record_batches, True)
+            self.track_bytes_written(self.batch_export_file)
+
+        await super().flush(is_last=is_last)
+
     async def close_temporary_file(self):
         """Ensure underlying Parquet writer is closed before flushing and closing temporary file."""
+        if self._pending_record_batches:
+            await asyncio.to_thread(self._write_pending_record_batches, True)
+
         if self._parquet_writer is not None:
             self._parquet_writer.writer.close()
             self._parquet_writer = None
@@ -762,8 +803,36 @@ class ParquetBatchExportWriter(BatchExportWriter):
 
     def _write_record_batch(self, record_batch: pa.RecordBatch) -> None:
         """Write records to a temporary file as Parquet."""
+        record_batch = record_batch.select(self.parquet_writer.schema.names)
+
+        if self.row_group_size <= 0:
+            self.parquet_writer.write_batch(record_batch)
+            return
+
+        self._pending_record_batches.append(record_batch)
+        self._pending_rows += record_batch.num_rows
+
+        if self._pending_rows >= self.row_group_size:
+            self._write_pending_record_batches()
+
+    def _write_pending_record_batches(self, include_partial_row_group: bool = False) -> None:
+        """Write pending record batches as row groups of `row_group_size` rows.
+
+        Unless `include_partial_row_group` is set, any rows left over that don't fill a row group
+        remain pending. Building tables and slicing them doesn't copy any of the underlying buffers.
+        """
+        table = pa.Table.from_batches(self._pending_record_batches)
+
+        if include_partial_row_group:
+            rows_to_write = table.num_rows
+        else:
+            rows_to_write = table.num_rows - table.num_rows % self.row_group_size
+
+        self.parquet_writer.write_table(table.slice(0, rows_to_write), row_group_size=self.row_group_size)
 
-        self.parquet_writer.write_batch(record_batch.select(self.parquet_writer.schema.names))
+        remaining = table.slice(rows_to_write)
+        self._pending_record_batches = [batch for batch in remaining.to_batches() if batch.num_rows > 0]
+        self._pending_rows = remaining.num_rows
 
 
 def remove_escaped_whitespace_recursive(value):
@@ -118,7 +118,6 @@ class AsyncRecordBatchReader:
     async def read_next_record_batch(self) -> pa.RecordBatch:
         if self._schema is None:
             schema = await self.read_schema()
-            self._schema = schema
         else:
             schema = self._schema
 
@@ -133,7 +132,8 @@ class AsyncRecordBatchReader:
         if message.type != "schema":
             raise TypeError(f"Expected message of type 'schema' got '{message.type}'")
 
-        return pa.ipc.read_schema(message)
+        self._schema = pa.ipc.read_schema(message)
+        return self._schema
 
 
 class AsyncRecordBatchProducer(AsyncRecordBatchReader):
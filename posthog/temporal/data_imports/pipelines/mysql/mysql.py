@@ -1,4 +1,6 @@
 import dataclasses
+import functools
+import math
 import re
 from typing import Any, Optional
 from collections.abc import Iterator
@@ -9,6 +11,7 @@ from pymysql.cursors import SSCursor, Cursor
 
 from posthog.temporal.common.logger import FilteringBoundLogger
 from posthog.temporal.data_imports.pipelines.helpers import incremental_type_to_initial_value
+from posthog.temporal.data_imports.pipelines.pipeline.stages import read_concurrently
 from posthog.temporal.data_imports.pipelines.pipeline.typings import SourceResponse
 from posthog.temporal.data_imports.pipelines.pipeline.utils import (
     DEFAULT_NUMERIC_PRECISION,
@@ -21,6 +24,10 @@ from posthog.warehouse.models import IncrementalFieldType
 
 from dlt.common.normalizers.naming.snake_case import NamingConvention
 
+INTEGER_TYPES = ("bigint", "int", "integer", "mediumint", "smallint", "tinyint")
+# Tables with a smaller primary key range than this per partition are read with a single cursor
+MIN_PRIMARY_KEY_RANGE_PER_PARTITION = 100_000
+
 
 def _sanitize_identifier(identifier: str) -> str:
     if not identifier.isidentifier():
@@ -64,6 +71,63 @@ def _build_query(
     }
 
 
+def _build_primary_key_partition_query(
+    schema: str, table_name: str, primary_key: str, start: Optional[int], end: Optional[int]
+) -> tuple[str, dict[str, Any]]:
+    conditions = []
+    if start is not None:
+        conditions.append(f"{_sanitize_identifier(primary_key)} >= %(start)s")
+    if end is not None:
+        conditions.append(f"{_sanitize_identifier(primary_key)} < %(end)s")
+
+    query = f"SELECT * FROM {_sanitize_identifier(schema)}.{_sanitize_identifier(table_name)}"
+    if conditions:
+        query += f" WHERE {' AND '.join(conditions)}"
+
+    return query, {"start": start, "end": end}
+
+
+def _get_primary_key_partitions(
+    cursor: Cursor,
+    schema: str,
+    table_name: str,
+    primary_keys: list[str] | None,
+    table_structure: list["TableStructureRow"],
+    partition_count: int,
+) -> list[tuple[Optional[int], Optional[int]]] | None:
+    """Split a table into ranges of its primary key, to be read concurrently.
+
+    Only tables with a single integer primary key column are split. The first and last ranges are open-ended,
+    so that rows inserted outside of the measured range are read too.
+    """
+    if partition_count < 2 or primary_keys is None or len(primary_keys) != 1:
+        return None
+
+    primary_key = primary_keys[0]
+    if not any(col.column_name == primary_key and col.data_type in INTEGER_TYPES for col in table_structure):
+        return None
+
+    cursor.execute(
+        f"SELECT MIN({_sanitize_identifier(primary_key)}), MAX({_sanitize_identifier(primary_key)}) "
+        f"FROM {_sanitize_identifier(schema)}.{_sanitize_identifier(table_name)}"
+    )
+    result = cursor.fetchone()
+
+    if result is None or result[0] is None or result[1] is None:
+        return None
+
+    min_value = int(result[0])
+    max_value = int(result[1])
+
+    if max_value - min_value < partition_count * MIN_PRIMARY_KEY_RANGE_PER_PARTITION:
+        return None
+
+    step = math.ceil((max_value - min_value + 1) / partition_count)
+    boundaries = list(range(min_value + step, max_value + 1, step))
+
+    return list(zip([None, *boundaries], [*boundaries, None]))
+
+
 def _get_primary_keys(cursor: Cursor, schema: str, table_name: str) -> list[str] | None:
     query = """
         SELECT COLUMN_NAME
@@ -215,6 +279,20 @@ def mysql_source(
         with connection.cursor() as cursor:
             primary_keys = _get_primary_keys(cursor, schema, table_name)
             table_structure = _get_table_structure(cursor, schema, table_name)
+            # Incremental syncs are read with a single cursor, as their last synced value is updated after each
+            # chunk, which must come in order of the incremental field
+            primary_key_partitions = (
+                None
+                if is_incremental
+                else _get_primary_key_partitions(
+                    cursor,
+                    schema,
+                    table_name,
+                    primary_keys,
+                    table_structure,
+                    settings.DATA_IMPORTS_PARALLEL_EXTRACTION_PARTITIONS,
+                )
+            )
 
             # Falback on checking for an `id` field on the table
             if primary_keys is None:
@@ -224,36 +302,51 @@ def mysql_source(
     def get_rows() -> Iterator[Any]:
         arrow_schema = _get_arrow_schema_from_type_name(table_structure)
 
-        with pymysql.connect(
-            host=host,
-            port=port,
-            database=database,
-            user=user,
-            password=password,
-            connect_timeout=5,
-            ssl_ca=ssl_ca,
-        ) as connection:
-            with connection.cursor(SSCursor) as cursor:
-                query, args = _build_query(
-                    schema,
-                    table_name,
-                    is_incremental,
-                    incremental_field,
-                    incremental_field_type,
-                    db_incremental_field_last_value,
-                )
-                logger.debug(f"MySQL query: {query.format(args)}")
-
-                cursor.execute(query, args)
-
-                column_names = [column[0] for column in cursor.description or []]
-
-                while True:
-                    rows = cursor.fetchmany(DEFAULT_CHUNK_SIZE)
-                    if not rows:
-                        break
-
-                    yield table_from_iterator((dict(zip(column_names, row)) for row in rows), arrow_schema)
+        def read_rows(query: str, args: dict[str, Any]) -> Iterator[pa.Table]:
+            with pymysql.connect(
+                host=host,
+                port=port,
+                database=database,
+                user=user,
+                password=password,
+                connect_timeout=5,
+                ssl_ca=ssl_ca,
+            ) as connection:
+                with connection.cursor(SSCursor) as cursor:
+                    logger.debug(f"MySQL query: {query.format(args)}")
+
+                    cursor.execute(query, args)
+
+                    column_names = [column[0] for column in cursor.description or []]
+
+                    while True:
+                        rows = cursor.fetchmany(DEFAULT_CHUNK_SIZE)
+                        if not rows:
+                            break
+
+                        yield table_from_iterator((dict(zip(column_names, row)) for row in rows), arrow_schema)
+
+        if primary_key_partitions is None or primary_keys is None:
+            query, args = _build_query(
+                schema,
+                table_name,
+                is_incremental,
+                incremental_field,
+                incremental_field_type,
+                db_incremental_field_last_value,
+            )
+            yield from read_rows(query, args)
+            return
+
+        logger.debug(f"Reading {schema}.{table_name} in {len(primary_key_partitions)} partitions concurrently")
+
+        readers = [
+            functools.partial(
+                read_rows, *_build_primary_key_partition_query(schema, table_name, primary_keys[0], start, end)
+            )
+            for start, end in primary_key_partitions
+        ]
+        yield from read_concurrently(readers, settings.DATA_IMPORTS_PIPELINE_MAX_BUFFERED_BYTES)
 
     name = NamingConvention().normalize_identifier(table_name)
 
@@ -1,6 +1,52 @@
-from posthog.temporal.data_imports.pipelines.mysql.mysql import _sanitize_identifier
+from unittest.mock import MagicMock
+
+from posthog.temporal.data_imports.pipelines.mysql.mysql import (
+    TableStructureRow,
+    _build_primary_key_partition_query,
+    _get_primary_key_partitions,
+    _sanitize_identifier,
+)
 
 
 def test_sanitize_identifier_with_digits():
     res = _sanitize_identifier("851")
     assert res == "`851`"
+
+
+def _table_structure(data_type: str) -> list[TableStructureRow]:
+    return [
+        TableStructureRow(
+            column_name="id", data_type=data_type, is_nullable=False, numeric_precision=None, numeric_scale=None
+        )
+    ]
+
+
+def test_get_primary_key_partitions():
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (1, 1_000_000)
+
+    partitions = _get_primary_key_partitions(cursor, "schema", "table", ["id"], _table_structure("bigint"), 4)
+
+    assert partitions == [(None, 250_001), (250_001, 500_001), (500_001, 750_001), (750_001, None)]
+
+
+def test_get_primary_key_partitions_only_splits_large_integer_primary_keys():
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (1, 1_000)
+
+    assert _get_primary_key_partitions(cursor, "schema", "table", ["id"], _table_structure("bigint"), 4) is None
+    assert _get_primary_key_partitions(cursor, "schema", "table", ["id"], _table_structure("varchar"), 4) is None
+    assert _get_primary_key_partitions(cursor, "schema", "table", ["id", "name"], _table_structure("int"), 4) is None
+    assert _get_primary_key_partitions(cursor, "schema", "table", ["id"], _table_structure("int"), 1) is None
+    cursor.execute.assert_called_once()
+
+
+def test_build_primary_key_partition_query():
+    assert _build_primary_key_partition_query("schema", "table", "id", None, 10) == (
+        "SELECT * FROM `schema`.`table` WHERE `id` < %(end)s",
+        {"start": None, "end": 10},
+    )
+    assert _build_primary_key_partition_query("schema", "table", "id", 10, 20) == (
+        "SELECT * FROM `schema`.`table` WHERE `id` >= %(start)s AND `id` < %(end)s",
+        {"start": 10, "end": 20},
+    )
@@ -1,9 +1,10 @@
 import gc
 import time
-from typing import Any
+from collections.abc import Iterable
 
 import deltalake as deltalake
 import pyarrow as pa
+from django.conf import settings
 from dlt.sources import DltSource
 
 from posthog.temporal.common.logger import FilteringBoundLogger
@@ -11,6 +12,7 @@ from posthog.temporal.common.shutdown import ShutdownMonitor
 from posthog.temporal.data_imports.deltalake_compaction_job import trigger_compaction_job
 from posthog.temporal.data_imports.pipelines.pipeline.delta_table_helper import DeltaTableHelper
 from posthog.temporal.data_imports.pipelines.pipeline.hogql_schema import HogQLSchema
+from posthog.temporal.data_imports.pipelines.pipeline.stages import PipelineStages, chunk_items
 from posthog.temporal.data_imports.pipelines.pipeline.typings import SourceResponse
 from posthog.temporal.data_imports.pipelines.pipeline.utils import (
     _append_debug_column_to_pyarrows_table,
@@ -85,6 +87,7 @@ class PipelineNonDLT:
 
     def run(self):
         pa_memory_pool = pa.default_memory_pool()
+        stages: PipelineStages | None = None
 
         try:
             # Reset the rows_synced count - this may not be 0 if the job restarted due to a heartbeat timeout
@@ -92,9 +95,7 @@ class PipelineNonDLT:
                 self._job.rows_synced = 0
                 self._job.save()
 
-            buffer: list[Any] = []
             py_table = None
-            chunk_size = 5000
             row_count = 0
             chunk_index = 0
 
@@ -108,35 +109,20 @@ class PipelineNonDLT:
                 self._delta_table_helper.reset_table()
                 self._schema.update_sync_type_config_for_reset_pipeline()
 
-            for item in self._resource.items:
-                py_table = None
-
-                if isinstance(item, list):
-                    if len(buffer) > 0:
-                        buffer.extend(item)
-                        if len(buffer) >= chunk_size:
-                            py_table = table_from_py_list(buffer)
-                            buffer = []
-                    else:
-                        if len(item) >= chunk_size:
-                            py_table = table_from_py_list(item)
-                        else:
-                            buffer.extend(item)
-                            continue
-                elif isinstance(item, dict):
-                    buffer.append(item)
-                    if len(buffer) < chunk_size:
-                        continue
-
-                    py_table = table_from_py_list(buffer)
-                    buffer = []
-                elif isinstance(item, pa.Table):
-                    py_table = item
-                else:
-                    raise Exception(f"Unhandled item type: {item.__class__.__name__}")
-
-                assert py_table is not None
+            tables: Iterable[pa.Table]
+            if settings.DATA_IMPORTS_PIPELINE_STAGES_ENABLED:
+                # Read and convert the next chunks while the current one is written
+                stages = PipelineStages(
+                    self._resource.items, max_buffered_bytes=settings.DATA_IMPORTS_PIPELINE_MAX_BUFFERED_BYTES
+                )
+                tables = stages
+            else:
+                tables = (
+                    chunk if isinstance(chunk, pa.Table) else table_from_py_list(chunk)
+                    for chunk in chunk_items(self._resource.items)
+                )
 
+            for py_table in tables:
                 self._process_pa_table(pa_table=py_table, index=chunk_index)
 
                 row_count += py_table.num_rows
@@ -150,13 +136,11 @@ class PipelineNonDLT:
 
                 self._shutdown_monitor.raise_if_is_worker_shutdown()
 
-            if len(buffer) > 0:
-                py_table = table_from_py_list(buffer)
-                self._process_pa_table(pa_table=py_table, index=chunk_index)
-                row_count += py_table.num_rows
-
             self._post_run_operations(row_count=row_count)
         finally:
+            if stages is not None:
+                stages.stop()
+
             # Help reduce the memory footprint of each job
             delta_table = self._delta_table_helper.get_delta_table()
             self._delta_table_helper.get_delta_table.cache_clear()
@@ -166,8 +150,6 @@ class PipelineNonDLT:
             del self._resource
             del self._delta_table_helper
 
-            if "buffer" in locals() and buffer is not None:
-                del buffer
             if "py_table" in locals() and py_table is not None:
                 del py_table
 
@@ -0,0 +1,218 @@
+import collections
+import contextvars
+import threading
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any
+
+import pyarrow as pa
+
+from posthog.temporal.data_imports.pipelines.pipeline.utils import table_from_py_list
+
+CHUNK_SIZE = 5000
+
+
+class StageStoppedError(Exception):
+    """Raised in a stage when the pipeline was stopped, e.g. because another stage failed."""
+
+
+class _End:
+    pass
+
+
+class _StageError:
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+class BoundedQueue:
+    """A queue between two pipeline stages, bounded by the total size of its items.
+
+    An item is always accepted by an empty queue, even when it's larger than the bound,
+    so that a single large chunk can't block the pipeline forever.
+    """
+
+    def __init__(self, max_size: int, stop_event: threading.Event):
+        self._items: collections.deque[tuple[Any, int]] = collections.deque()
+        self._size = 0
+        self._max_size = max_size
+        self._stop_event = stop_event
+        self._condition = threading.Condition()
+
+    def _wait(self) -> None:
+        if self._stop_event.is_set():
+            raise StageStoppedError()
+        # Wake up regularly, as stopping the pipeline doesn't notify the condition
+        self._condition.wait(timeout=0.1)
+
+    def put(self, item: Any, size: int) -> None:
+        with self._condition:
+            while self._items and self._size + size > self._max_size:
+                self._wait()
+            if self._stop_event.is_set():
+                raise StageStoppedError()
+
+            self._items.append((item, size))
+            self._size += size
+            self._condition.notify_all()
+
+    def put_error(self, exception: BaseException) -> None:
+        """Hand an error over to the next stage, regardless of the bound."""
+        with self._condition:
+            self._items.append((_StageError(exception), 0))
+            self._condition.notify_all()
+
+    def get(self) -> Any:
+        with self._condition:
+            while not self._items:
+                self._wait()
+
+            item, size = self._items.popleft()
+            self._size -= size
+            self._condition.notify_all()
+
+        if isinstance(item, _StageError):
+            raise item.exception
+        return item
+
+
+def chunk_items(items: Iterable[Any], chunk_size: int = CHUNK_SIZE) -> Iterator[list[Any] | pa.Table]:
+    """Group rows yielded by a source into chunks of at least `chunk_size` rows, passing Arrow tables through."""
+    buffer: list[Any] = []
+
+    for item in items:
+        if isinstance(item, list):
+            if len(buffer) > 0:
+                buffer.extend(item)
+                if len(buffer) >= chunk_size:
+                    yield buffer
+                    buffer = []
+            elif len(item) >= chunk_size:
+                yield item
+            else:
+                buffer.extend(item)
+        elif isinstance(item, dict):
+            buffer.append(item)
+            if len(buffer) >= chunk_size:
+                yield buffer
+                buffer = []
+        elif isinstance(item, pa.Table):
+            yield item
+        else:
+            raise Exception(f"Unhandled item type: {item.__class__.__name__}")
+
+    if len(buffer) > 0:
+        yield buffer
+
+
+class PipelineStages:
+    """Read, convert and hand over chunks of a source as Arrow tables, with each stage running in its own thread.
+
+    Chunks are read from the source while previous ones are converted to Arrow, and converted tables
+    are buffered up to `max_buffered_bytes` while previous ones are written by the consumer. The
+    consumer iterates over the tables, and errors of any stage are raised from that iteration.
+    """
+
+    def __init__(self, items: Iterable[Any], max_buffered_bytes: int, max_buffered_chunks: int = 2):
+        self._items = items
+        self._stop_event = threading.Event()
+        self._chunks = BoundedQueue(max_buffered_chunks, self._stop_event)
+        self._tables = BoundedQueue(max_buffered_bytes, self._stop_event)
+        self._threads: list[threading.Thread] = []
+
+    def _run_stage(self, name: str, stage: Callable[[], None], output: BoundedQueue) -> None:
+        def run() -> None:
+            try:
+                stage()
+            except StageStoppedError:
+                pass
+            except BaseException as e:
+                output.put_error(e)
+
+        # Copy the context, so that stages keep the activity context of the caller, e.g. for logging
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run, args=(run,), name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _read(self) -> None:
+        for chunk in chunk_items(self._items):
+            if self._stop_event.is_set():
+                return
+            self._chunks.put(chunk, 1)
+        self._chunks.put(_End(), 1)
+
+    def _convert(self) -> None:
+        while True:
+            chunk = self._chunks.get()
+            if isinstance(chunk, _End):
+                self._tables.put(chunk, 0)
+                return
+
+            table = chunk if isinstance(chunk, pa.Table) else table_from_py_list(chunk)
+            del chunk
+            self._tables.put(table, table.nbytes)
+
+    def __iter__(self) -> Iterator[pa.Table]:
+        self._run_stage("data-import-reader", self._read, self._chunks)
+        self._run_stage("data-import-converter", self._convert, self._tables)
+
+        try:
+            while True:
+                table = self._tables.get()
+                if isinstance(table, _End):
+                    return
+                yield table
+        finally:
+            self.stop()
+
+    def stop(self, timeout: float = 5) -> None:
+        """Stop all stages. A stage blocked on reading from the source is left to finish in the background."""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+
+def read_concurrently(
+    readers: Sequence[Callable[[], Iterable[pa.Table]]], max_buffered_bytes: int
+) -> Iterator[pa.Table]:
+    """Run each of `readers` in its own thread, and yield their tables in the order they're read.
+
+    Used to read independent partitions of a table, e.g. ranges of its primary key, over several
+    connections at once. Tables are buffered up to `max_buffered_bytes`, and the first error of any
+    reader is raised to the consumer, stopping all other readers.
+    """
+    stop_event = threading.Event()
+    tables = BoundedQueue(max_buffered_bytes, stop_event)
+    threads: list[threading.Thread] = []
+
+    def run(reader: Callable[[], Iterable[pa.Table]]) -> None:
+        try:
+            for table in reader():
+                tables.put(table, table.nbytes)
+            tables.put(_End(), 0)
+        except StageStoppedError:
+            pass
+        except BaseException as e:
+            tables.put_error(e)
+
+    for index, reader in enumerate(readers):
+        context = contextvars.copy_context()
+        thread = threading.Thread(
+            target=context.run, args=(run, reader), name=f"data-import-partition-reader-{index}", daemon=True
+        )
+        thread.start()
+        threads.append(thread)
+
+    try:
+        remaining = len(threads)
+        while remaining > 0:
+            table = tables.get()
+            if isinstance(table, _End):
+                remaining -= 1
+                continue
+            yield table
+    finally:
+        stop_event.set()
+        for thread in threads:
+            thread.join(timeout=5)
@@ -0,0 +1,98 @@
+import functools
+import threading
+
+import pyarrow as pa
+import pytest
+
+from posthog.temporal.data_imports.pipelines.pipeline.stages import (
+    BoundedQueue,
+    PipelineStages,
+    StageStoppedError,
+    chunk_items,
+    read_concurrently,
+)
+
+
+def _rows(start: int, count: int) -> list[dict]:
+    return [{"id": i, "name": f"row {i}"} for i in range(start, start + count)]
+
+
+def test_chunk_items():
+    table = pa.table({"id": [1]})
+    chunks = list(chunk_items([_rows(0, 3), {"id": 3, "name": "row 3"}, table, _rows(4, 2), _rows(6, 5)], chunk_size=5))
+
+    assert chunks == [table, _rows(0, 6), _rows(6, 5)]
+
+
+def test_pipeline_stages_yield_all_rows_in_order():
+    items = (_rows(i * 1000, 1000) for i in range(20))
+
+    tables = list(PipelineStages(items, max_buffered_bytes=1024))
+
+    assert [table.num_rows for table in tables] == [5000, 5000, 5000, 5000]
+    assert pa.concat_tables(tables).column("id").to_pylist() == list(range(20000))
+
+
+def test_pipeline_stages_raise_errors_of_the_source():
+    def items():
+        yield _rows(0, 5000)
+        raise ValueError("Source failed")
+
+    tables = iter(PipelineStages(items(), max_buffered_bytes=1024 * 1024))
+
+    assert next(tables).num_rows == 5000
+    with pytest.raises(ValueError, match="Source failed"):
+        next(tables)
+
+
+def test_pipeline_stages_stop_reading_when_the_consumer_stops():
+    read_chunks = 0
+
+    def items():
+        nonlocal read_chunks
+        for i in range(100):
+            read_chunks += 1
+            yield _rows(i * 5000, 5000)
+
+    stages = PipelineStages(items(), max_buffered_bytes=1)
+    for _ in stages:
+        break
+
+    assert not any(thread.is_alive() for thread in threading.enumerate() if thread.name.startswith("data-import-"))
+    # Only as many chunks as fit into the buffers between stages were read ahead
+    assert read_chunks < 10
+
+
+def test_bounded_queue_accepts_an_item_larger_than_its_bound_when_empty():
+    stop_event = threading.Event()
+    queue = BoundedQueue(max_size=10, stop_event=stop_event)
+
+    queue.put("large", 100)
+    stop_event.set()
+
+    with pytest.raises(StageStoppedError):
+        queue.put("small", 1)
+    assert queue.get() == "large"
+
+
+def test_read_concurrently_yields_tables_of_all_readers():
+    def reader(start: int):
+        for i in range(start, start + 3000, 1000):
+            yield pa.table({"id": list(range(i, i + 1000))})
+
+    tables = list(read_concurrently([functools.partial(reader, start) for start in (0, 3000, 6000)], 1024))
+
+    assert sorted(pa.concat_tables(tables).column("id").to_pylist()) == list(range(9000))
+
+
+def test_read_concurrently_raises_errors_of_any_reader():
+    def reader():
+        yield pa.table({"id": [1]})
+
+    def failing_reader():
+        raise ValueError("Partition failed")
+        yield
+
+    with pytest.raises(ValueError, match="Partition failed"):
+        list(read_concurrently([reader, failing_reader], 1024))
+    assert not any(thread.is_alive() for thread in threading.enumerate() if thread.name.startswith("data-import-"))
@@ -1,4 +1,5 @@
 import dataclasses
+import functools
 import math
 from typing import Any, Optional
 from collections.abc import Iterator
@@ -7,10 +8,12 @@ import pyarrow as pa
 import psycopg
 from psycopg import sql
 from psycopg.adapt import Loader
+from django.conf import settings
 
 from posthog.exceptions_capture import capture_exception
 from posthog.temporal.common.logger import FilteringBoundLogger
 from posthog.temporal.data_imports.pipelines.helpers import incremental_type_to_initial_value
+from posthog.temporal.data_imports.pipelines.pipeline.stages import read_concurrently
 from posthog.temporal.data_imports.pipelines.pipeline.typings import SourceResponse
 from posthog.temporal.data_imports.pipelines.pipeline.utils import (
     DEFAULT_NUMERIC_PRECISION,
@@ -24,6 +27,11 @@ from posthog.warehouse.models import IncrementalFieldType
 
 from dlt.common.normalizers.naming.snake_case import NamingConvention
 
+# Tables with fewer pages than this per partition are read with a single cursor, ~8MB with the default block size
+MIN_PAGES_PER_PARTITION = 1000
+# TID range scans were added in Postgres 14, on older versions every partition would scan the whole table
+MIN_SERVER_VERSION_NUM_FOR_PARTITIONS = 140000
+
 
 class JsonAsStringLoader(Loader):
     def load(self, data):
@@ -63,6 +71,56 @@ def _build_query(
     return query
 
 
+def _build_ctid_partition_query(schema: str, table_name: str, start_page: int, end_page: Optional[int]) -> sql.Composed:
+    query = sql.SQL("SELECT * FROM {table} WHERE ctid >= {start}::tid").format(
+        table=sql.Identifier(schema, table_name), start=sql.Literal(f"({start_page},0)")
+    )
+
+    if end_page is None:
+        return query
+
+    return sql.SQL("{query} AND ctid < {end}::tid").format(query=query, end=sql.Literal(f"({end_page},0)"))
+
+
+def _get_ctid_partitions(
+    cursor: psycopg.Cursor, schema: str, table_name: str, partition_count: int
+) -> list[tuple[int, Optional[int]]] | None:
+    """Split a table into ranges of its pages, to be read concurrently with TID range scans.
+
+    TID range scans need Postgres 14 or later, on older versions every partition would scan the whole table.
+    The last range is open-ended, so that rows written to pages added after the table was measured are read too.
+    """
+    if partition_count < 2:
+        return None
+
+    query = sql.SQL(
+        "SELECT current_setting('server_version_num')::int, "
+        "pg_relation_size({}::regclass) / current_setting('block_size')::int"
+    ).format(sql.Literal(sql.Identifier(schema, table_name).as_string(cursor)))
+
+    try:
+        cursor.execute(query)
+    except Exception as e:
+        capture_exception(e)
+        return None
+
+    result = cursor.fetchone()
+
+    if result is None:
+        return None
+
+    server_version = int(result[0])
+    page_count = int(result[1])
+
+    if server_version < MIN_SERVER_VERSION_NUM_FOR_PARTITIONS or page_count < partition_count * MIN_PAGES_PER_PARTITION:
+        return None
+
+    pages_per_partition = math.ceil(page_count / partition_count)
+    start_pages = list(range(0, page_count, pages_per_partition))
+
+    return list(zip(start_pages, [*start_pages[1:], None]))
+
+
 def _get_primary_keys(cursor: psycopg.Cursor, schema: str, table_name: str) -> list[str] | None:
     query = sql.SQL("""
         SELECT
@@ -279,6 +337,15 @@ def postgres_source(
             table_structure = _get_table_structure(cursor, schema, table_name)
             chunk_size = _get_table_chunk_size(cursor, schema, table_name, logger)
             partition_settings = _get_partition_settings(cursor, schema, table_name) if is_incremental else None
+            # Incremental syncs are read with a single cursor, as their last synced value is updated after each
+            # chunk, which must come in order of the incremental field
+            ctid_partitions = (
+                None
+                if is_incremental
+                else _get_ctid_partitions(
+                    cursor, schema, table_name, settings.DATA_IMPORTS_PARALLEL_EXTRACTION_PARTITIONS
+                )
+            )
 
             # Falback on checking for an `id` field on the table
             if primary_keys is None:
@@ -288,43 +355,81 @@ def postgres_source(
     def get_rows(chunk_size: int) -> Iterator[Any]:
         arrow_schema = _get_arrow_schema_from_type_name(table_structure)
 
-        with psycopg.connect(
-            host=host,
-            port=port,
-            dbname=database,
-            user=user,
-            password=password,
-            sslmode=sslmode,
-            connect_timeout=5,
-            sslrootcert="/tmp/no.txt",
-            sslcert="/tmp/no.txt",
-            sslkey="/tmp/no.txt",
-            cursor_factory=psycopg.ServerCursor,
-        ) as connection:
+        def connect() -> psycopg.Connection:
+            connection = psycopg.connect(
+                host=host,
+                port=port,
+                dbname=database,
+                user=user,
+                password=password,
+                sslmode=sslmode,
+                connect_timeout=5,
+                sslrootcert="/tmp/no.txt",
+                sslcert="/tmp/no.txt",
+                sslkey="/tmp/no.txt",
+                cursor_factory=psycopg.ServerCursor,
+            )
             connection.adapters.register_loader("json", JsonAsStringLoader)
             connection.adapters.register_loader("jsonb", JsonAsStringLoader)
-
-            with connection.cursor(name=f"posthog_{team_id}_{schema}.{table_name}") as cursor:
-                query = _build_query(
-                    schema,
-                    table_name,
-                    is_incremental,
-                    incremental_field,
-                    incremental_field_type,
-                    db_incremental_field_last_value,
+            return connection
+
+        def read_rows(query: sql.Composed, cursor_name: str, snapshot: Optional[str] = None) -> Iterator[pa.Table]:
+            with connect() as connection:
+                if snapshot is not None:
+                    # All partitions are read from the same snapshot, so that rows moving between pages while
+                    # the table is read are neither missed nor read twice
+                    connection.isolation_level = psycopg.IsolationLevel.REPEATABLE_READ
+                    with psycopg.Cursor(connection) as cursor:
+                        cursor.execute(sql.SQL("SET TRANSACTION SNAPSHOT {}").format(sql.Literal(snapshot)))
+
+                with connection.cursor(name=cursor_name) as cursor:
+                    logger.debug(f"Postgres query: {query.as_string()}")
+
+                    cursor.execute(query)
+
+                    column_names = [column.name for column in cursor.description or []]
+
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+
+                        yield table_from_iterator((dict(zip(column_names, row)) for row in rows), arrow_schema)
+
+        if ctid_partitions is None:
+            query = _build_query(
+                schema,
+                table_name,
+                is_incremental,
+                incremental_field,
+                incremental_field_type,
+                db_incremental_field_last_value,
+            )
+            yield from read_rows(query, f"posthog_{team_id}_{schema}.{table_name}")
+            return
+
+        logger.debug(f"Reading {schema}.{table_name} in {len(ctid_partitions)} partitions concurrently")
+
+        # The transaction exporting the snapshot has to stay open while partitions are read
+        with connect() as connection:
+            connection.isolation_level = psycopg.IsolationLevel.REPEATABLE_READ
+            with psycopg.Cursor(connection) as cursor:
+                cursor.execute("SELECT pg_export_snapshot()")
+                result = cursor.fetchone()
+
+            if result is None:
+                raise ValueError("Could not export a snapshot of the table")
+
+            readers = [
+                functools.partial(
+                    read_rows,
+                    _build_ctid_partition_query(schema, table_name, start_page, end_page),
+                    f"posthog_{team_id}_{schema}.{table_name}_{index}",
+                    result[0],
                 )
-                logger.debug(f"Postgres query: {query.as_string()}")
-
-                cursor.execute(query)
-
-                column_names = [column.name for column in cursor.description or []]
-
-                while True:
-                    rows = cursor.fetchmany(chunk_size)
-                    if not rows:
-                        break
-
-                    yield table_from_iterator((dict(zip(column_names, row)) for row in rows), arrow_schema)
+                for index, (start_page, end_page) in enumerate(ctid_partitions)
+            ]
+            yield from read_concurrently(readers, settings.DATA_IMPORTS_PIPELINE_MAX_BUFFERED_BYTES)
 
     name = NamingConvention().normalize_identifier(table_name)
 
@@ -14,22 +14,30 @@ import dlt
 import dlt.common.data_types as dlt_data_types
 import dlt.common.schema.typing as dlt_typing
 import dlt.extract
+import pyarrow as pa
+import pyarrow.compute as pc
 import structlog
 import temporalio.activity
 import temporalio.common
 import temporalio.exceptions
 import temporalio.workflow
-from deltalake import DeltaTable
+from deltalake import DeltaTable, write_deltalake
 from django.conf import settings
-from dlt.common.libs.deltalake import get_delta_tables
+from dlt.common.libs.deltalake import ensure_delta_compatible_arrow_schema, get_delta_tables
+from dlt.common.normalizers.naming.snake_case import NamingConvention
 
+from posthog.clickhouse.client.escape import substitute_params
+from posthog.hogql import ast
 from posthog.hogql.constants import HogQLGlobalSettings, LimitContext
 from posthog.hogql.database.database import create_hogql_database
 from posthog.hogql.modifiers import create_default_modifiers_for_team
-from posthog.hogql.query import execute_hogql_query
+from posthog.hogql.parser import parse_select
+from posthog.hogql.query import HogQLQueryExecutor, execute_hogql_query
 from posthog.models import Team
 from posthog.settings.base_variables import TEST
+from posthog.temporal.common import asyncpa
 from posthog.temporal.common.base import PostHogWorkflow
+from posthog.temporal.common.clickhouse import ChunkBytesAsyncStreamIterator, get_client
 from posthog.temporal.common.heartbeat import Heartbeater
 from posthog.temporal.data_imports.util import prepare_s3_files_for_querying
 from posthog.temporal.data_modeling.metrics import get_data_modeling_finished_metric
@@ -303,6 +311,11 @@ async def handle_model_ready(model: ModelNode, team_id: int, queue: asyncio.Queu
 async def materialize_model(model_label: str, team: Team) -> tuple[str, DeltaTable]:
     """Materialize a given model by running its query in a dlt pipeline.
 
+    With `DATA_MODELING_STREAMING_MATERIALIZATION_ENABLED`, the query results are instead streamed
+    straight into the model's Delta table, see `stream_hogql_table_to_delta`. So are the results of
+    incremental models, which after their first run only select rows with a value of their incremental
+    field greater than the last one materialized, and append them to the table.
+
     Arguments:
         model_label: A label representing the ID or the name of the model to materialize.
             If it's a valid UUID, then we will assume it's the ID, otherwise we'll assume
@@ -329,6 +342,7 @@ async def materialize_model(model_label: str, team: Team) -> tuple[str, DeltaTab
         query_columns = await database_sync_to_async(saved_query.get_columns)()
 
     table_columns: dlt_typing.TTableSchemaColumns = {}
+    clickhouse_types: dict[str, str] = {}
     for column_name, column_info in query_columns.items():
         clickhouse_type = column_info["clickhouse"]
         nullable = False
@@ -345,33 +359,61 @@ async def materialize_model(model_label: str, team: Team) -> tuple[str, DeltaTab
             "nullable": nullable,
         }
         table_columns[column_name] = column_schema
+        clickhouse_types[column_name] = clickhouse_type
 
     hogql_query = saved_query.query["query"]
+    dataset_name = f"team_{team.pk}_model_{model_label}"
+
+    if saved_query.is_incremental or settings.DATA_MODELING_STREAMING_MATERIALIZATION_ENABLED:
+        # The same location dlt uses for the table, given the layout of `get_dlt_destination`
+        table_name = NamingConvention().normalize_identifier(saved_query.name)
+        delta_table_uri = f"{settings.BUCKET_URL}/{dataset_name}/modeling/{table_name}"
+        storage_options = get_delta_storage_options()
+
+        incremental_field = saved_query.incremental_field if saved_query.is_incremental else None
+        incremental_field_last_value = None
+        if incremental_field is not None and await asyncio.to_thread(
+            DeltaTable.is_deltatable, delta_table_uri, storage_options
+        ):
+            incremental_field_last_value = saved_query.incremental_field_last_value
+
+        try:
+            last_value = await stream_hogql_table_to_delta(
+                hogql_query,
+                team,
+                clickhouse_types,
+                delta_table_uri,
+                storage_options,
+                incremental_field=incremental_field,
+                incremental_field_last_value=incremental_field_last_value,
+            )
+        except Exception as e:
+            await handle_materialization_error(e, model_label, saved_query)
+            raise
+
+        if incremental_field is not None:
+            # Saved right away, as rows are already appended: running them again would duplicate them
+            updated = await database_sync_to_async(saved_query.update_incremental_field_last_value)(last_value)
+            if not updated and last_value is not None:
+                await logger.awarning(
+                    "Sync config of model %s changed while materializing, not updating its last value", model_label
+                )
 
-    destination = get_dlt_destination()
-    pipeline = dlt.pipeline(
-        pipeline_name=f"materialize_model_{model_label}",
-        destination=destination,
-        dataset_name=f"team_{team.pk}_model_{model_label}",
-    )
+        tables = {table_name: DeltaTable(delta_table_uri, storage_options=storage_options)}
+    else:
+        destination = get_dlt_destination()
+        pipeline = dlt.pipeline(
+            pipeline_name=f"materialize_model_{model_label}",
+            destination=destination,
+            dataset_name=dataset_name,
+        )
 
-    try:
-        _ = await asyncio.to_thread(pipeline.run, hogql_table(hogql_query, team, saved_query.name, table_columns))
-    except Exception as e:
-        error_message = str(e)
-        if "Query exceeds memory limits" in error_message:
-            saved_query.latest_error = error_message
-            await database_sync_to_async(saved_query.save)()
-            raise CHQueryErrorMemoryLimitExceeded(
-                f"Query for model {model_label} exceeds memory limits. Try reducing its scope by changing the time range."
-            ) from e
-
-        elif "Cannot coerce type" in error_message:
-            saved_query.latest_error = error_message
-            await database_sync_to_async(saved_query.save)()
-            raise CannotCoerceColumnException(f"Type coercion error in model {model_label}: {error_message}") from e
-
-    tables = get_delta_tables(pipeline)
+        try:
+            _ = await asyncio.to_thread(pipeline.run, hogql_table(hogql_query, team, saved_query.name, table_columns))
+        except Exception as e:
+            await handle_materialization_error(e, model_label, saved_query)
+
+        tables = get_delta_tables(pipeline)
 
     for table in tables.values():
         table.optimize.compact()
@@ -385,6 +427,188 @@ async def materialize_model(model_label: str, team: Team) -> tuple[str, DeltaTab
     return (key, delta_table)
 
 
+async def handle_materialization_error(
+    error: Exception, model_label: str, saved_query: DataWarehouseSavedQuery
+) -> None:
+    """Record known errors of materializing a model on its saved query, and raise them as our own exceptions."""
+    error_message = str(error)
+    if "Query exceeds memory limits" in error_message or "MEMORY_LIMIT_EXCEEDED" in error_message:
+        saved_query.latest_error = error_message
+        await database_sync_to_async(saved_query.save)()
+        raise CHQueryErrorMemoryLimitExceeded(
+            f"Query for model {model_label} exceeds memory limits. Try reducing its scope by changing the time range."
+        ) from error
+
+    elif "Cannot coerce type" in error_message:
+        saved_query.latest_error = error_message
+        await database_sync_to_async(saved_query.save)()
+        raise CannotCoerceColumnException(f"Type coercion error in model {model_label}: {error_message}") from error
+
+
+def get_hogql_query_settings() -> HogQLGlobalSettings:
+    return HogQLGlobalSettings(
+        max_execution_time=60 * 20, max_memory_usage=180 * 1000 * 1000 * 1000
+    )  # 20 mins, 180gb, 2x execution_time, 4x max_memory_usage as the /query endpoint async workers
+
+
+def convert_column_for_delta(column_name: str, clickhouse_type: str) -> ast.Expr:
+    """Select a column of a saved query as a string when Arrow can't represent it as the dlt pipeline writes it.
+
+    UUIDs are written as strings and complex types as JSON strings. Columns are aliased with the names
+    the dlt pipeline normalizes them to.
+    """
+    field = ast.Field(chain=[column_name])
+    alias = NamingConvention().normalize_identifier(column_name)
+
+    if clickhouse_type == "UUID":
+        return ast.Alias(alias=alias, expr=ast.Call(name="toString", args=[field]))
+    elif clickhouse_type in ("Array", "Map", "Tuple"):
+        return ast.Alias(alias=alias, expr=ast.Call(name="toJSONString", args=[field]))
+
+    return ast.Alias(alias=alias, expr=field)
+
+
+def cast_record_batch_for_delta(record_batch: pa.RecordBatch, clickhouse_types: dict[str, str]) -> pa.RecordBatch:
+    """Cast columns of a record batch in the ArrowStream format to the types Delta supports.
+
+    ClickHouse sends `DateTime` and `Date` columns as the unsigned integers they're stored as, which
+    we cast to timestamps and dates. Delta doesn't support unsigned integers at all, so the others
+    are cast to signed ones.
+
+    `clickhouse_types` is keyed by the normalized column names the record batch has.
+    """
+    arrays = []
+    for field, array in zip(record_batch.schema, record_batch.columns):
+        clickhouse_type = clickhouse_types.get(field.name)
+
+        if pa.types.is_unsigned_integer(field.type):
+            array = array.cast(pa.int64())
+
+            if clickhouse_type in ("DateTime", "DateTime32"):
+                array = array.cast(pa.timestamp("s", tz="UTC")).cast(pa.timestamp("us", tz="UTC"))
+            elif clickhouse_type == "Date":
+                array = array.cast(pa.int32()).cast(pa.date32())
+
+        arrays.append(array)
+
+    return pa.RecordBatch.from_arrays(arrays, names=record_batch.schema.names)
+
+
+def get_hogql_table_clickhouse_sql(
+    query: str,
+    team: Team,
+    clickhouse_types: dict[str, str],
+    incremental_field: str | None = None,
+    incremental_field_last_value: typing.Any = None,
+) -> str:
+    """Print the ClickHouse SQL of a saved query, selecting its columns as they are written to Delta.
+
+    If an incremental field and its last value are given, only rows with a greater value are selected.
+    """
+    modifiers = create_default_modifiers_for_team(team)
+    modifiers.useMaterializedViews = True
+
+    select_query = ast.SelectQuery(
+        select=[convert_column_for_delta(name, clickhouse_type) for name, clickhouse_type in clickhouse_types.items()],
+        select_from=ast.JoinExpr(table=parse_select(query)),
+    )
+    if incremental_field is not None and incremental_field_last_value is not None:
+        select_query.where = ast.CompareOperation(
+            op=ast.CompareOperationOp.Gt,
+            left=ast.Field(chain=[incremental_field]),
+            right=ast.Constant(value=incremental_field_last_value),
+        )
+    executor = HogQLQueryExecutor(
+        query=select_query,
+        team=team,
+        modifiers=modifiers,
+        settings=get_hogql_query_settings(),
+        limit_context=LimitContext.SAVED_QUERY,
+    )
+    clickhouse_sql, clickhouse_context = executor.generate_clickhouse_sql()
+
+    return substitute_params(clickhouse_sql, clickhouse_context.values)
+
+
+def iter_record_batches(
+    reader: asyncpa.AsyncRecordBatchReader,
+    clickhouse_types: dict[str, str],
+    schema: pa.Schema,
+    loop: asyncio.AbstractEventLoop,
+) -> collections.abc.Iterator[pa.RecordBatch]:
+    """Read record batches from an async reader running in `loop`, from a thread outside of it."""
+    while True:
+        try:
+            record_batch = asyncio.run_coroutine_threadsafe(reader.read_next_record_batch(), loop).result()
+        except StopAsyncIteration:
+            return
+
+        yield cast_record_batch_for_delta(record_batch, clickhouse_types).cast(schema)
+
+
+async def stream_hogql_table_to_delta(
+    query: str,
+    team: Team,
+    clickhouse_types: dict[str, str],
+    delta_table_uri: str,
+    storage_options: dict[str, str],
+    incremental_field: str | None = None,
+    incremental_field_last_value: typing.Any = None,
+) -> typing.Any:
+    """Materialize a saved query by streaming its results as Arrow record batches into a Delta table.
+
+    Unlike `hogql_table`, results are never held in memory in full nor converted to rows: ClickHouse
+    responds in the ArrowStream format, and each record batch is written to Delta as it's read.
+
+    The table is overwritten, unless an incremental field and its last value are given: then only
+    newer rows are selected and appended to the table.
+
+    Returns:
+        The greatest value of the incremental field written, if any.
+    """
+    clickhouse_sql = await database_sync_to_async(get_hogql_table_clickhouse_sql)(
+        query, team, clickhouse_types, incremental_field, incremental_field_last_value
+    )
+    loop = asyncio.get_running_loop()
+    last_values: list[typing.Any] = []
+
+    # Columns are written to Delta with normalized names, see `convert_column_for_delta`
+    naming = NamingConvention()
+    delta_clickhouse_types = {
+        naming.normalize_identifier(column_name): clickhouse_type
+        for column_name, clickhouse_type in clickhouse_types.items()
+    }
+    incremental_column = naming.normalize_identifier(incremental_field) if incremental_field is not None else None
+
+    async with get_client(team_id=team.pk) as client:
+        async with client.apost_query(
+            f"{clickhouse_sql} FORMAT ArrowStream", query_parameters=None, query_id=None
+        ) as response:
+            reader = asyncpa.AsyncRecordBatchReader(ChunkBytesAsyncStreamIterator(response.content))
+            empty_record_batch = pa.RecordBatch.from_pylist([], schema=await reader.read_schema())
+            schema = ensure_delta_compatible_arrow_schema(
+                cast_record_batch_for_delta(empty_record_batch, delta_clickhouse_types).schema
+            )
+
+            def record_batches() -> collections.abc.Iterator[pa.RecordBatch]:
+                for record_batch in iter_record_batches(reader, delta_clickhouse_types, schema, loop):
+                    if incremental_column is not None and record_batch.num_rows > 0:
+                        last_values.append(pc.max(record_batch.column(incremental_column)).as_py())
+                    yield record_batch
+
+            is_incremental_run = incremental_field is not None and incremental_field_last_value is not None
+            await asyncio.to_thread(
+                write_deltalake,
+                delta_table_uri,
+                pa.RecordBatchReader.from_batches(schema, record_batches()),
+                mode="append" if is_incremental_run else "overwrite",
+                schema_mode="merge" if is_incremental_run else "overwrite",
+                storage_options=storage_options,
+            )
+
+    return max((value for value in last_values if value is not None), default=None)
+
+
 @dlt.source(max_table_nesting=0)
 def hogql_table(query: str, team: Team, table_name: str, table_columns: dlt_typing.TTableSchemaColumns):
     """A dlt source representing a HogQL table given by a HogQL query."""
@@ -394,16 +618,12 @@ def hogql_table(query: str, team: Team, table_name: str, table_columns: dlt_typi
         modifiers = create_default_modifiers_for_team(team)
         modifiers.useMaterializedViews = True
 
-        settings = HogQLGlobalSettings(
-            max_execution_time=60 * 20, max_memory_usage=180 * 1000 * 1000 * 1000
-        )  # 20 mins, 180gb, 2x execution_time, 4x max_memory_usage as the /query endpoint async workers
-
         response = await asyncio.to_thread(
             execute_hogql_query,
             query,
             team,
             modifiers=modifiers,
-            settings=settings,
+            settings=get_hogql_query_settings(),
             limit_context=LimitContext.SAVED_QUERY,
         )
 
@@ -425,9 +645,9 @@ def hogql_table(query: str, team: Team, table_name: str, table_columns: dlt_typi
     )
 
 
-def get_dlt_destination():
+def get_storage_credentials() -> dict[str, str]:
     if TEST:
-        credentials = {
+        return {
             "aws_access_key_id": settings.AIRBYTE_BUCKET_KEY,
             "aws_secret_access_key": settings.AIRBYTE_BUCKET_SECRET,
             "endpoint_url": settings.OBJECT_STORAGE_ENDPOINT,
@@ -435,16 +655,22 @@ def get_dlt_destination():
             "AWS_ALLOW_HTTP": "true",
             "AWS_S3_ALLOW_UNSAFE_RENAME": "true",
         }
-    else:
-        credentials = {
-            "aws_access_key_id": settings.AIRBYTE_BUCKET_KEY,
-            "aws_secret_access_key": settings.AIRBYTE_BUCKET_SECRET,
-            "region_name": settings.AIRBYTE_BUCKET_REGION,
-            "AWS_S3_ALLOW_UNSAFE_RENAME": "true",
-        }
 
+    return {
+        "aws_access_key_id": settings.AIRBYTE_BUCKET_KEY,
+        "aws_secret_access_key": settings.AIRBYTE_BUCKET_SECRET,
+        "region_name": settings.AIRBYTE_BUCKET_REGION,
+        "AWS_S3_ALLOW_UNSAFE_RENAME": "true",
+    }
+
+
+def get_delta_storage_options() -> dict[str, str]:
+    return {**get_storage_credentials(), "AWS_DEFAULT_REGION": settings.AIRBYTE_BUCKET_REGION}
+
+
+def get_dlt_destination():
     return dlt.destinations.filesystem(
-        credentials=credentials,
+        credentials=get_storage_credentials(),
         bucket_url=settings.BUCKET_URL,  # type: ignore
         layout="modeling/{table_name}/{load_id}.{file_id}.{ext}",
     )
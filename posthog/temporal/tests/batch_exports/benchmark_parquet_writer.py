@@ -0,0 +1,96 @@
+"""Benchmark rows per second written by `ParquetBatchExportWriter`.
+
+Compares writing every record batch as its own row group with buffering record batches into
+larger row groups. Record batches are generated to look like events coming from ClickHouse.
+
+Usage:
+    python -m posthog.temporal.tests.batch_exports.benchmark_parquet_writer --batches 1000 --rows-per-batch 1000
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import random
+import time
+
+import pyarrow as pa
+
+from posthog.temporal.batch_exports.temporary_file import ParquetBatchExportWriter
+
+
+def generate_record_batches(batches: int, rows_per_batch: int) -> list[pa.RecordBatch]:
+    events = ["$pageview", "$autocapture", "$identify", "$pageleave", "custom-event"]
+    start = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+    record_batches = []
+
+    for batch in range(batches):
+        offset = batch * rows_per_batch
+        record_batches.append(
+            pa.RecordBatch.from_pydict(
+                {
+                    "uuid": pa.array([f"018d1a6c-0000-0000-0000-{offset + i:012d}" for i in range(rows_per_batch)]),
+                    "event": pa.array([random.choice(events) for _ in range(rows_per_batch)]),
+                    "distinct_id": pa.array([f"user-{random.randint(0, 10_000)}" for _ in range(rows_per_batch)]),
+                    "properties": pa.array(
+                        [
+                            f'{{"$current_url": "https://posthog.com/{i % 50}", "$browser": "Chrome"}}'
+                            for i in range(rows_per_batch)
+                        ]
+                    ),
+                    "timestamp": pa.array(
+                        [start + dt.timedelta(milliseconds=offset + i) for i in range(rows_per_batch)],
+                        type=pa.timestamp("us", tz="UTC"),
+                    ),
+                    "_inserted_at": pa.array(
+                        [start + dt.timedelta(milliseconds=offset + i) for i in range(rows_per_batch)],
+                        type=pa.timestamp("us", tz="UTC"),
+                    ),
+                }
+            )
+        )
+
+    return record_batches
+
+
+async def benchmark(record_batches: list[pa.RecordBatch], row_group_size: int, max_bytes: int) -> tuple[float, int]:
+    """Write all record batches and return rows per second and the number of bytes flushed."""
+    bytes_flushed = 0
+
+    async def count_bytes_on_flush(batch_export_file, records_since_last_flush, bytes_since_last_flush, *args):
+        nonlocal bytes_flushed
+        bytes_flushed += bytes_since_last_flush
+
+    writer = ParquetBatchExportWriter(
+        max_bytes=max_bytes,
+        flush_callable=count_bytes_on_flush,
+        schema=record_batches[0].drop_columns(["_inserted_at"]).schema,
+        row_group_size=row_group_size,
+    )
+
+    start = time.perf_counter()
+    async with writer.open_temporary_file():
+        for record_batch in record_batches:
+            await writer.write_record_batch(record_batch)
+    elapsed = time.perf_counter() - start
+
+    return writer.records_total / elapsed, bytes_flushed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", type=int, default=500)
+    parser.add_argument("--rows-per-batch", type=int, default=1000)
+    parser.add_argument("--row-group-sizes", type=int, nargs="+", default=[0, 100_000, 1_000_000])
+    parser.add_argument("--max-bytes", type=int, default=1024 * 1024 * 50)
+    args = parser.parse_args()
+
+    record_batches = generate_record_batches(args.batches, args.rows_per_batch)
+
+    for row_group_size in args.row_group_sizes:
+        rows_per_second, bytes_flushed = asyncio.run(benchmark(record_batches, row_group_size, args.max_bytes))
+        label = "per record batch" if row_group_size == 0 else f"{row_group_size} rows"
+        print(f"row groups of {label}: {rows_per_second:,.0f} rows/s, {bytes_flushed:,} bytes")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -658,6 +658,111 @@ async def test_insert_into_s3_activity_puts_splitted_files_into_s3(
     assert detail.upload_state is None
 
 
+@pytest.mark.parametrize("model", [BatchExportModel(name="events", schema=None)])
+@pytest.mark.parametrize("file_format", FILE_FORMAT_EXTENSIONS.keys())
+@pytest.mark.parametrize("max_file_size_mb", [None, 6])
+async def test_insert_into_s3_activity_uploads_parts_concurrently(
+    clickhouse_client,
+    bucket_name,
+    minio_client,
+    activity_environment,
+    max_file_size_mb,
+    exclude_events,
+    file_format,
+    data_interval_start,
+    data_interval_end,
+    model: BatchExportModel,
+    ateam,
+):
+    """Test that the insert_into_s3_activity function uploads all data when uploading parts concurrently.
+
+    Parts may finish uploading in any order, so we check files are still valid, listed in order in the
+    manifest, and that heartbeat details track all of them.
+    """
+    prefix = str(uuid.uuid4())
+
+    events_to_export_created, _, _ = await generate_test_events_in_clickhouse(
+        client=clickhouse_client,
+        team_id=ateam.pk,
+        start_time=data_interval_start,
+        end_time=data_interval_end,
+        count=100000,
+        count_outside_range=0,
+        count_other_team=0,
+        duplicate=False,
+        properties={"$prop1": 123},
+    )
+
+    heartbeat_details: list[S3HeartbeatDetails] = []
+
+    def track_hearbeat_details(*details):
+        """Record heartbeat details received."""
+        nonlocal heartbeat_details
+
+        s3_details = S3HeartbeatDetails.from_activity_details(details)
+        heartbeat_details.append(s3_details)
+
+    activity_environment.on_heartbeat = track_hearbeat_details
+
+    insert_inputs = S3InsertInputs(
+        bucket_name=bucket_name,
+        region="us-east-1",
+        prefix=prefix,
+        team_id=ateam.pk,
+        data_interval_start=data_interval_start.isoformat(),
+        data_interval_end=data_interval_end.isoformat(),
+        aws_access_key_id="object_storage_root_user",
+        aws_secret_access_key="object_storage_root_password",
+        endpoint_url=settings.OBJECT_STORAGE_ENDPOINT,
+        exclude_events=exclude_events,
+        file_format=file_format,
+        max_file_size_mb=max_file_size_mb,
+        batch_export_schema=None,
+        batch_export_model=model,
+    )
+
+    with override_settings(
+        # 5MB, the minimum for Multipart uploads
+        BATCH_EXPORT_S3_UPLOAD_CHUNK_SIZE_BYTES=5 * 1024**2,
+        BATCH_EXPORT_S3_MAX_CONCURRENT_UPLOADS=4,
+    ):
+        records_exported = await activity_environment.run(insert_into_s3_activity, insert_inputs)
+
+    assert records_exported == len(events_to_export_created)
+
+    s3_data, s3_keys = await assert_files_in_s3(
+        s3_compatible_client=minio_client,
+        bucket_name=bucket_name,
+        key_prefix=prefix,
+        file_format=file_format,
+        compression=None,
+        json_columns=("properties", "person_properties", "set", "set_once"),
+    )
+
+    assert len(s3_data) == len(events_to_export_created)
+    assert {event["uuid"] for event in s3_data} == {event["uuid"] for event in events_to_export_created}
+
+    if max_file_size_mb is None:
+        assert len(s3_keys) == 1
+    else:
+        assert len(s3_keys) > 1
+
+        manifest_key = f"{prefix}/{data_interval_start.isoformat()}-{data_interval_end.isoformat()}_manifest.json"
+        manifest_data: dict | list = await read_json_file_from_s3(minio_client, bucket_name, manifest_key)
+        assert isinstance(manifest_data, dict)
+        file_extension = FILE_FORMAT_EXTENSIONS[file_format]
+        assert manifest_data["files"] == [
+            f"{prefix}/{data_interval_start.isoformat()}-{data_interval_end.isoformat()}-{i}.{file_extension}"
+            for i in range(len(s3_keys))
+        ]
+
+    detail = heartbeat_details[-1]
+    assert detail.files_uploaded == len(s3_keys)
+    assert detail.upload_state is None
+    assert detail.records_completed == len(events_to_export_created)
+    assert detail.done_ranges == [(data_interval_start, data_interval_end)]
+
+
 @pytest.mark.parametrize("compression", [None, "gzip"], indirect=True)
 @pytest.mark.parametrize("model", [BatchExportModel(name="events", schema=None)])
 @pytest.mark.parametrize("file_format", ["Parquet"])
@@ -5,6 +5,7 @@ import typing
 
 import pyarrow as pa
 import pytest
+from django.test import override_settings
 
 from posthog.batch_exports.service import BackfillDetails
 from posthog.hogql.hogql import ast
@@ -14,6 +15,7 @@ from posthog.temporal.batch_exports.spmc import (
     SessionsRecordBatchModel,
     compose_filters_clause,
     slice_record_batch,
+    split_query_range,
     use_distributed_events_recent_table,
 )
 from posthog.temporal.tests.utils.events import generate_test_events_in_clickhouse
@@ -142,6 +144,85 @@ async def test_record_batch_producer_uses_extra_query_parameters(clickhouse_clie
         assert record["custom_prop"] == expected["properties"]["custom"]
 
 
+async def test_record_batch_producer_with_partitions_produces_in_order(clickhouse_client):
+    """Test RecordBatch Producer produces sub-ranges queried concurrently in order."""
+    team_id = random.randint(1, 1000000)
+    data_interval_end = dt.datetime.fromisoformat("2023-04-25T14:31:00.000000+00:00")
+    data_interval_start = dt.datetime.fromisoformat("2023-04-25T14:30:00.000000+00:00")
+
+    (events, _, _) = await generate_test_events_in_clickhouse(
+        client=clickhouse_client,
+        team_id=team_id,
+        start_time=data_interval_start,
+        end_time=data_interval_end,
+        count=100,
+        count_outside_range=0,
+        count_other_team=0,
+        duplicate=False,
+    )
+
+    queue = RecordBatchQueue()
+    producer = Producer(partitions=4)
+    with override_settings(BATCH_EXPORT_PRODUCER_MIN_PARTITION_SECONDS=1):
+        producer_task = await producer.start(
+            queue=queue,
+            team_id=team_id,
+            is_backfill=False,
+            backfill_details=None,
+            model_name="events",
+            full_range=(data_interval_start, data_interval_end),
+            done_ranges=[],
+        )
+        records = await get_all_record_batches_from_queue(queue, producer_task)
+
+    assert producer_task.exception() is None
+    assert sorted(record["uuid"] for record in records) == sorted(event["uuid"] for event in events)
+    inserted_ats = [record["_inserted_at"] for record in records]
+    assert inserted_ats == sorted(inserted_ats)
+
+
+@pytest.mark.parametrize(
+    "query_range,partitions,min_partition_size,expected",
+    [
+        (
+            (dt.datetime(2024, 1, 1, tzinfo=dt.UTC), dt.datetime(2024, 1, 1, 1, tzinfo=dt.UTC)),
+            4,
+            dt.timedelta(hours=6),
+            [(dt.datetime(2024, 1, 1, tzinfo=dt.UTC), dt.datetime(2024, 1, 1, 1, tzinfo=dt.UTC))],
+        ),
+        (
+            (None, dt.datetime(2024, 1, 2, tzinfo=dt.UTC)),
+            4,
+            dt.timedelta(hours=1),
+            [(None, dt.datetime(2024, 1, 2, tzinfo=dt.UTC))],
+        ),
+        (
+            (dt.datetime(2024, 1, 1, tzinfo=dt.UTC), dt.datetime(2024, 1, 2, tzinfo=dt.UTC)),
+            4,
+            dt.timedelta(hours=1),
+            [
+                (dt.datetime(2024, 1, 1, 0, tzinfo=dt.UTC), dt.datetime(2024, 1, 1, 6, tzinfo=dt.UTC)),
+                (dt.datetime(2024, 1, 1, 6, tzinfo=dt.UTC), dt.datetime(2024, 1, 1, 12, tzinfo=dt.UTC)),
+                (dt.datetime(2024, 1, 1, 12, tzinfo=dt.UTC), dt.datetime(2024, 1, 1, 18, tzinfo=dt.UTC)),
+                (dt.datetime(2024, 1, 1, 18, tzinfo=dt.UTC), dt.datetime(2024, 1, 2, 0, tzinfo=dt.UTC)),
+            ],
+        ),
+        (
+            (dt.datetime(2024, 1, 1, tzinfo=dt.UTC), dt.datetime(2024, 1, 2, tzinfo=dt.UTC)),
+            4,
+            dt.timedelta(hours=12),
+            [
+                (dt.datetime(2024, 1, 1, 0, tzinfo=dt.UTC), dt.datetime(2024, 1, 1, 12, tzinfo=dt.UTC)),
+                (dt.datetime(2024, 1, 1, 12, tzinfo=dt.UTC), dt.datetime(2024, 1, 2, 0, tzinfo=dt.UTC)),
+            ],
+        ),
+    ],
+)
+def test_split_query_range(query_range, partitions, min_partition_size, expected):
+    """Test ranges are only split into sub-ranges that are long enough."""
+    assert split_query_range(query_range, partitions=partitions, min_partition_size=min_partition_size) == expected
+
+
 def test_slice_record_batch_into_single_record_slices():
     """Test we slice a record batch into slices with a single record."""
     n_legs = pa.array([2, 2, 4, 4, 5, 100])
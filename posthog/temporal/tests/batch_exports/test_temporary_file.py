@@ -429,6 +429,85 @@ async def test_flushing_parquet_writer_resets_underlying_file(record_batch):
     assert flush_counter == 2
 
 
+@pytest.mark.parametrize(
+    "row_group_size,expected_row_groups",
+    [(0, 10), (4, 8), (10, 3), (100, 1)],
+)
+@pytest.mark.asyncio
+async def test_parquet_writer_buffers_record_batches_into_row_groups(row_group_size, expected_row_groups):
+    """Test record batches are buffered into row groups of `row_group_size` rows."""
+    in_memory_file_obj = io.BytesIO()
+
+    async def store_in_memory_on_flush(batch_export_file, *args, **kwargs):
+        in_memory_file_obj.write(batch_export_file.read())
+
+    record_batches = [
+        pa.RecordBatch.from_pydict(
+            {
+                "event": pa.array([f"test-event-{batch * 3 + i}" for i in range(3)]),
+                "_inserted_at": pa.array([dt.datetime.fromtimestamp(batch * 3 + i) for i in range(3)]),
+            }
+        )
+        for batch in range(10)
+    ]
+
+    writer = ParquetBatchExportWriter(
+        max_bytes=10000000,
+        flush_callable=store_in_memory_on_flush,
+        schema=record_batches[0].select(["event"]).schema,
+        row_group_size=row_group_size,
+    )
+
+    async with writer.open_temporary_file():
+        for record_batch in record_batches:
+            await writer.write_record_batch(record_batch)
+
+        assert writer.records_since_last_flush == 30
+
+    in_memory_file_obj.seek(0)
+    parquet_file = pq.ParquetFile(in_memory_file_obj)
+
+    assert parquet_file.metadata.num_row_groups == expected_row_groups
+    assert parquet_file.read().column("event").to_pylist() == [f"test-event-{i}" for i in range(30)]
+    assert writer.flushed_date_ranges == [(dt.datetime.fromtimestamp(0), dt.datetime.fromtimestamp(29))]
+
+
+@pytest.mark.asyncio
+async def test_parquet_writer_sorts_record_batches_by_inserted_at():
+    """Test unsorted record batches are still written in `_inserted_at` order."""
+    in_memory_file_obj = io.BytesIO()
+
+    async def store_in_memory_on_flush(batch_export_file, *args, **kwargs):
+        in_memory_file_obj.write(batch_export_file.read())
+
+    record_batch = pa.RecordBatch.from_pydict(
+        {
+            "event": pa.array(["test-event-2", "test-event-0", "test-event-1"]),
+            "_inserted_at": pa.array(
+                [dt.datetime.fromtimestamp(2), dt.datetime.fromtimestamp(0), dt.datetime.fromtimestamp(1)]
+            ),
+        }
+    )
+
+    writer = ParquetBatchExportWriter(
+        max_bytes=10000000,
+        flush_callable=store_in_memory_on_flush,
+        schema=record_batch.select(["event"]).schema,
+    )
+
+    async with writer.open_temporary_file():
+        await writer.write_record_batch(record_batch)
+
+    in_memory_file_obj.seek(0)
+
+    assert pq.read_table(in_memory_file_obj).column("event").to_pylist() == [
+        "test-event-0",
+        "test-event-1",
+        "test-event-2",
+    ]
+    assert writer.flushed_date_ranges == [(dt.datetime.fromtimestamp(0), dt.datetime.fromtimestamp(2))]
+
+
 @pytest.mark.asyncio
 async def test_jsonl_writer_deals_with_web_vitals():
     """Test old $web_vitals record batches are written as valid JSONL."""
@@ -41,6 +41,7 @@ from posthog.temporal.data_imports.pipelines.pipeline.consts import PARTITION_KE
 from posthog.temporal.data_imports.settings import ACTIVITIES
 from posthog.temporal.data_imports.external_data_job import ExternalDataJobWorkflow
 from posthog.temporal.data_imports.pipelines.pipeline.pipeline import PipelineNonDLT
+from posthog.temporal.data_imports.pipelines.postgres.postgres import _get_ctid_partitions
 from posthog.temporal.utils import ExternalDataWorkflowInputs
 from posthog.warehouse.models import (
     ExternalDataJob,
@@ -774,6 +775,70 @@ async def test_sql_database_incremental_initial_value(team, postgres_config, pos
     assert len(res.results) == 1
 
 
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_postgres_ctid_partitions(team, postgres_config, postgres_connection):
+    await postgres_connection.execute(
+        "CREATE TABLE IF NOT EXISTS {schema}.partitioned_table (id integer, payload text)".format(
+            schema=postgres_config["schema"]
+        )
+    )
+    await postgres_connection.execute(
+        "INSERT INTO {schema}.partitioned_table (id, payload) "
+        "SELECT i, repeat('x', 200) FROM generate_series(1, 5000) i".format(schema=postgres_config["schema"])
+    )
+    await postgres_connection.commit()
+
+    ctid_partitions = []
+
+    def get_ctid_partitions(*args, **kwargs):
+        partitions = _get_ctid_partitions(*args, **kwargs)
+        ctid_partitions.append(partitions)
+        return partitions
+
+    with (
+        override_settings(DATA_IMPORTS_PARALLEL_EXTRACTION_PARTITIONS=4),
+        # Partition the small test table, also on Postgres versions without TID range scans
+        mock.patch("posthog.temporal.data_imports.pipelines.postgres.postgres.MIN_PAGES_PER_PARTITION", 1),
+        mock.patch(
+            "posthog.temporal.data_imports.pipelines.postgres.postgres.MIN_SERVER_VERSION_NUM_FOR_PARTITIONS", 0
+        ),
+        mock.patch(
+            "posthog.temporal.data_imports.pipelines.postgres.postgres._get_ctid_partitions",
+            side_effect=get_ctid_partitions,
+        ),
+    ):
+        await _run(
+            team=team,
+            schema_name="partitioned_table",
+            table_name="postgres_partitioned_table",
+            source_type="Postgres",
+            job_inputs={
+                "host": postgres_config["host"],
+                "port": postgres_config["port"],
+                "database": postgres_config["database"],
+                "user": postgres_config["user"],
+                "password": postgres_config["password"],
+                "schema": postgres_config["schema"],
+                "ssh_tunnel_enabled": "False",
+            },
+            mock_data_response=[],
+            sync_type=ExternalDataSchema.SyncType.FULL_REFRESH,
+            ignore_assertions=True,
+        )
+
+    assert len(ctid_partitions) == 1
+    assert ctid_partitions[0] is not None
+    assert len(ctid_partitions[0]) == 4
+
+    res = await sync_to_async(execute_hogql_query)(
+        "SELECT count(), count(DISTINCT id), min(id), max(id) FROM postgres_partitioned_table", team
+    )
+
+    # Every row is read by exactly one partition, from the same snapshot
+    assert res.results == [(5000, 5000, 1, 5000)]
+
+
 @pytest.mark.django_db(transaction=True)
 @pytest.mark.asyncio
 async def test_billing_limits(team, stripe_customer):
@@ -291,7 +291,8 @@ async def pageview_events(clickhouse_client, ateam):
     return (events, events_from_other_team)
 
 
-async def test_materialize_model(ateam, bucket_name, minio_client, pageview_events):
+@pytest.mark.parametrize("streaming", [False, True])
+async def test_materialize_model(ateam, bucket_name, minio_client, pageview_events, streaming):
     query = """\
     select
       event as event,
@@ -313,6 +314,7 @@ async def test_materialize_model(ateam, bucket_name, minio_client, pageview_even
             AIRBYTE_BUCKET_SECRET=settings.OBJECT_STORAGE_SECRET_ACCESS_KEY,
             AIRBYTE_BUCKET_REGION="us-east-1",
             AIRBYTE_BUCKET_DOMAIN="objectstorage:19000",
+            DATA_MODELING_STREAMING_MATERIALIZATION_ENABLED=streaming,
         ),
         unittest.mock.patch.object(AwsCredentials, "to_session_credentials", mock_to_session_credentials),
         unittest.mock.patch.object(
@@ -347,6 +349,83 @@ async def test_materialize_model(ateam, bucket_name, minio_client, pageview_even
     assert sorted(table.to_pylist(), key=lambda d: (d["distinct_id"], d["timestamp"])) == expected_events
 
 
+@pytest.mark.parametrize("streaming", [False, True])
+async def test_materialize_model_normalizes_column_names(ateam, bucket_name, minio_client, pageview_events, streaming):
+    query = """\
+    select
+      event as myEvent,
+      timestamp as eventTimestamp
+    from events
+    where event = '$pageview'
+    """
+    saved_query = await DataWarehouseSavedQuery.objects.acreate(
+        team=ateam,
+        name="my_model",
+        query={"query": query, "kind": "HogQLQuery"},
+    )
+
+    with (
+        override_settings(
+            BUCKET_URL=f"s3://{bucket_name}",
+            AIRBYTE_BUCKET_KEY=settings.OBJECT_STORAGE_ACCESS_KEY_ID,
+            AIRBYTE_BUCKET_SECRET=settings.OBJECT_STORAGE_SECRET_ACCESS_KEY,
+            AIRBYTE_BUCKET_REGION="us-east-1",
+            AIRBYTE_BUCKET_DOMAIN="objectstorage:19000",
+            DATA_MODELING_STREAMING_MATERIALIZATION_ENABLED=streaming,
+        ),
+        unittest.mock.patch.object(AwsCredentials, "to_session_credentials", mock_to_session_credentials),
+        unittest.mock.patch.object(
+            AwsCredentials, "to_object_store_rs_credentials", mock_to_object_store_rs_credentials
+        ),
+    ):
+        _, delta_table = await materialize_model(saved_query.id.hex, ateam)
+
+    table = delta_table.to_pyarrow_table()
+    events, _ = pageview_events
+
+    # Both the dlt pipeline and streaming name columns in snake_case
+    assert table.column_names == ["my_event", "event_timestamp"]
+    assert table.num_rows == len(events)
+    assert {row["my_event"] for row in table.to_pylist()} == {"$pageview"}
+
+
+async def test_materialize_model_incremental(ateam, bucket_name, minio_client, pageview_events):
+    query = """\
+    select
+      event as event,
+      distinct_id as distinct_id,
+      timestamp as timestamp
+    from events
+    where event = '$pageview'
+    """
+    saved_query = await DataWarehouseSavedQuery.objects.acreate(
+        team=ateam,
+        name="my_model",
+        query={"query": query, "kind": "HogQLQuery"},
+        sync_type=DataWarehouseSavedQuery.SyncType.INCREMENTAL,
+        sync_type_config={"incremental_field": "timestamp", "incremental_field_type": "datetime"},
+    )
+
+    with override_settings(
+        BUCKET_URL=f"s3://{bucket_name}",
+        AIRBYTE_BUCKET_KEY=settings.OBJECT_STORAGE_ACCESS_KEY_ID,
+        AIRBYTE_BUCKET_SECRET=settings.OBJECT_STORAGE_SECRET_ACCESS_KEY,
+        AIRBYTE_BUCKET_REGION="us-east-1",
+        AIRBYTE_BUCKET_DOMAIN="objectstorage:19000",
+    ):
+        _, delta_table = await materialize_model(saved_query.id.hex, ateam)
+        # No new events since the first run, so nothing is appended
+        _, delta_table = await materialize_model(saved_query.id.hex, ateam)
+
+    events, _ = pageview_events
+    await saved_query.arefresh_from_db()
+
+    assert delta_table.to_pyarrow_table().num_rows == len(events)
+    assert saved_query.incremental_field_last_value == max(
+        dt.datetime.fromisoformat(event["timestamp"]).replace(tzinfo=dt.UTC) for event in events
+    )
+
+
 @pytest_asyncio.fixture
 async def saved_queries(ateam):
     parent_query = """\
@@ -1,16 +1,18 @@
 import concurrent.futures
 from datetime import datetime
 from typing import cast
+from unittest.mock import patch
 
 from django.core.cache import cache
-from django.db import IntegrityError, connection
-from django.test import TransactionTestCase
+from django.db import DatabaseError, IntegrityError, connection
+from django.test import TransactionTestCase, override_settings
 from django.utils import timezone
 from freezegun import freeze_time
 import pytest
 
 from posthog.models import Cohort, FeatureFlag, GroupTypeMapping, Person
 from posthog.models.feature_flag import get_feature_flags_for_team_in_cache
+from posthog.models.feature_flag import flag_matching
 from posthog.models.feature_flag.flag_matching import (
     FeatureFlagHashKeyOverride,
     FeatureFlagMatch,
@@ -19,6 +21,7 @@ from posthog.models.feature_flag.flag_matching import (
     FlagsMatcherCache,
     get_all_feature_flags,
     get_feature_flag_hash_key_overrides,
+    get_feature_flags_for_distinct_ids,
     set_feature_flag_hash_key_overrides,
 )
 from posthog.models.group import Group
@@ -4936,6 +4939,240 @@ class TestFeatureFlagMatcher(BaseTest, QueryMatchingTest):
     def create_feature_flag(self, key="beta-feature", **kwargs):
         return FeatureFlag.objects.create(team=self.team, name="Beta feature", key=key, created_by=self.user, **kwargs)
 
+    def test_local_evaluation_matches_database_evaluation(self):
+        Person.objects.create(
+            team=self.team,
+            distinct_ids=["test_id"],
+            properties={"email": "test@posthog.com", "age": 30, "plan": None, "is_enabled": True},
+        )
+        Person.objects.create(team=self.team, distinct_ids=["other_id"], properties={"email": "other@example.com"})
+        GroupTypeMapping.objects.create(
+            team=self.team, project_id=self.team.project_id, group_type="organization", group_type_index=0
+        )
+        Group.objects.create(
+            team=self.team,
+            group_type_index=0,
+            group_key="foo",
+            group_properties={"name": "foo.inc"},
+            version=1,
+        )
+
+        properties_to_match = [
+            {"key": "email", "type": "person", "value": "test@posthog.com", "operator": "exact"},
+            {"key": "email", "type": "person", "value": "posthog", "operator": "icontains"},
+            {"key": "email", "type": "person", "value": "posthog", "operator": "not_icontains"},
+            {"key": "email", "type": "person", "value": ".*@posthog.com$", "operator": "regex"},
+            {"key": "age", "type": "person", "value": "25", "operator": "gt"},
+            {"key": "age", "type": "person", "value": "25", "operator": "lte"},
+            {"key": "plan", "type": "person", "value": "free", "operator": "is_not"},
+            {"key": "plan", "type": "person", "value": "free", "operator": "exact"},
+            {"key": "plan", "type": "person", "operator": "is_set"},
+            {"key": "is_enabled", "type": "person", "value": ["true"], "operator": "exact"},
+            {"key": "missing", "type": "person", "operator": "is_not_set"},
+            {"key": "missing", "type": "person", "value": "x", "operator": "is_not"},
+        ]
+        feature_flags = [
+            self.create_feature_flag(
+                key=f"flag-{index}",
+                filters={"groups": [{"properties": [property], "rollout_percentage": 100}]},
+            )
+            for index, property in enumerate(properties_to_match)
+        ]
+        feature_flags.append(
+            self.create_feature_flag(
+                key="group-flag",
+                filters={
+                    "aggregation_group_type_index": 0,
+                    "groups": [
+                        {
+                            "properties": [{"key": "name", "type": "group", "value": "foo", "operator": "icontains"}],
+                            "rollout_percentage": 100,
+                        }
+                    ],
+                },
+            )
+        )
+
+        for distinct_id in ["test_id", "other_id", "not_ingested_id"]:
+            with self.subTest(distinct_id=distinct_id):
+                with override_settings(DECIDE_LOCAL_FLAG_EVALUATION=False):
+                    expected = FeatureFlagMatcher(
+                        self.team.id, self.project.id, feature_flags, distinct_id, {"organization": "foo"}
+                    ).get_matches_with_details()[0]
+                with override_settings(DECIDE_LOCAL_FLAG_EVALUATION=True):
+                    local = FeatureFlagMatcher(
+                        self.team.id, self.project.id, feature_flags, distinct_id, {"organization": "foo"}
+                    ).get_matches_with_details()[0]
+                self.assertEqual(local, expected)
+
+    def test_local_evaluation_matches_database_evaluation_case_sensitively(self):
+        Person.objects.create(
+            team=self.team, distinct_ids=["test_id"], properties={"email": "Test@PostHog.com", "age": 30}
+        )
+
+        properties_to_match = [
+            ({"key": "email", "type": "person", "value": "test@posthog.com", "operator": "exact"}, False),
+            ({"key": "email", "type": "person", "value": ["TEST@POSTHOG.COM", "Test@PostHog.com"]}, True),
+            ({"key": "email", "type": "person", "value": "test@posthog.com", "operator": "is_not"}, True),
+            ({"key": "email", "type": "person", "value": "Test@PostHog.com", "operator": "is_not"}, False),
+            ({"key": "email", "type": "person", "value": "posthog", "operator": "regex"}, False),
+            ({"key": "email", "type": "person", "value": "PostHog", "operator": "regex"}, True),
+            ({"key": "email", "type": "person", "value": "posthog", "operator": "not_regex"}, True),
+            ({"key": "email", "type": "person", "value": "POSTHOG", "operator": "icontains"}, True),
+            ({"key": "age", "type": "person", "value": "30", "operator": "exact"}, True),
+        ]
+        feature_flags = [
+            self.create_feature_flag(
+                key=f"flag-{index}",
+                filters={"groups": [{"properties": [property], "rollout_percentage": 100}]},
+            )
+            for index, (property, _) in enumerate(properties_to_match)
+        ]
+        expected = {f"flag-{index}": is_match for index, (_, is_match) in enumerate(properties_to_match)}
+
+        for local_evaluation in [False, True]:
+            with self.subTest(local_evaluation=local_evaluation):
+                with override_settings(DECIDE_LOCAL_FLAG_EVALUATION=local_evaluation):
+                    flags, _, _, _, _ = FeatureFlagMatcher(
+                        self.team.id, self.project.id, feature_flags, "test_id"
+                    ).get_matches_with_details()
+                self.assertEqual(flags, expected)
+
+    @override_settings(DECIDE_LOCAL_FLAG_EVALUATION=True)
+    def test_local_evaluation_fetches_person_once(self):
+        Person.objects.create(team=self.team, distinct_ids=["test_id"], properties={"email": "test@posthog.com"})
+        feature_flags = [
+            self.create_feature_flag(
+                key=f"flag-{index}",
+                filters={
+                    "groups": [
+                        {
+                            "properties": [
+                                {"key": "email", "type": "person", "value": f"{index}", "operator": "icontains"}
+                            ],
+                            "rollout_percentage": 100,
+                        }
+                    ]
+                },
+            )
+            for index in range(5)
+        ]
+
+        # 1 to fetch the person, nothing is annotated onto a flag matching query
+        with self.assertNumQueries(1):
+            flags, _, _, errors, _ = FeatureFlagMatcher(
+                self.team.id, self.project.id, feature_flags, "test_id"
+            ).get_matches_with_details()
+        self.assertFalse(errors)
+        self.assertEqual(flags, {f"flag-{index}": False for index in range(5)})
+
+        # Overrides alone are enough, so no queries at all
+        with self.assertNumQueries(0):
+            flags, _, _, _, _ = FeatureFlagMatcher(
+                self.team.id,
+                self.project.id,
+                feature_flags,
+                "test_id",
+                property_value_overrides={"email": "3@posthog.com"},
+            ).get_matches_with_details()
+        self.assertEqual(flags["flag-3"], True)
+
+    def test_get_feature_flags_for_distinct_ids(self):
+        Person.objects.create(team=self.team, distinct_ids=["test_id"], properties={"email": "test@posthog.com"})
+        Person.objects.create(team=self.team, distinct_ids=["other_id"], properties={"email": "other@example.com"})
+        GroupTypeMapping.objects.create(
+            team=self.team, project_id=self.team.project_id, group_type="organization", group_type_index=0
+        )
+        Group.objects.create(
+            team=self.team,
+            group_type_index=0,
+            group_key="foo",
+            group_properties={"name": "foo.inc"},
+            version=1,
+        )
+        self.create_feature_flag(
+            key="email-flag",
+            filters={
+                "groups": [
+                    {
+                        "properties": [{"key": "email", "type": "person", "value": "posthog", "operator": "icontains"}],
+                        "rollout_percentage": 100,
+                    }
+                ]
+            },
+        )
+        self.create_feature_flag(
+            key="group-flag",
+            filters={
+                "aggregation_group_type_index": 0,
+                "groups": [
+                    {
+                        "properties": [{"key": "name", "type": "group", "value": "foo", "operator": "icontains"}],
+                        "rollout_percentage": 100,
+                    }
+                ],
+            },
+        )
+        distinct_ids = ["test_id", "other_id", "not_ingested_id"]
+        groups = {"test_id": {"organization": "foo"}, "other_id": {"organization": "bar"}}
+
+        # group type mapping, persons, groups - regardless of how many distinct IDs there are
+        with self.assertNumQueries(3):
+            flags, errors = get_feature_flags_for_distinct_ids(self.team, distinct_ids, groups)
+
+        self.assertFalse(errors)
+        self.assertEqual(
+            flags,
+            {
+                "test_id": {"email-flag": True, "group-flag": True},
+                "other_id": {"email-flag": False, "group-flag": False},
+                "not_ingested_id": {"email-flag": False, "group-flag": False},
+            },
+        )
+        for distinct_id in distinct_ids:
+            self.assertEqual(
+                flags[distinct_id], get_all_feature_flags(self.team, distinct_id, groups.get(distinct_id))[0]
+            )
+
+    def test_get_feature_flags_for_distinct_ids_when_a_batch_fails(self):
+        Person.objects.create(team=self.team, distinct_ids=["test_id"], properties={"email": "test@posthog.com"})
+        Person.objects.create(team=self.team, distinct_ids=["other_id"], properties={"email": "other@posthog.com"})
+        self.create_feature_flag(key="everyone-flag", filters={"groups": [{"rollout_percentage": 100}]})
+        self.create_feature_flag(
+            key="email-flag",
+            filters={
+                "groups": [
+                    {
+                        "properties": [{"key": "email", "type": "person", "value": "posthog", "operator": "icontains"}],
+                        "rollout_percentage": 100,
+                    }
+                ]
+            },
+        )
+
+        prefetch_flag_entities = flag_matching._prefetch_flag_entities
+
+        def fail_first_batch(team, distinct_ids, *args):
+            if distinct_ids == ["test_id"]:
+                raise DatabaseError("connection lost")
+            return prefetch_flag_entities(team, distinct_ids, *args)
+
+        with (
+            patch("posthog.models.feature_flag.flag_matching.BULK_FLAG_EVALUATION_BATCH_SIZE", 1),
+            patch("posthog.models.feature_flag.flag_matching._prefetch_flag_entities", side_effect=fail_first_batch),
+        ):
+            flags, errors = get_feature_flags_for_distinct_ids(self.team, ["test_id", "other_id"])
+
+        # Distinct IDs of the failed batch still get the flags that don't need the database
+        self.assertTrue(errors)
+        self.assertEqual(
+            flags,
+            {
+                "test_id": {"everyone-flag": True},
+                "other_id": {"everyone-flag": True, "email-flag": True},
+            },
+        )
+
     @pytest.mark.skip("This case doesn't work yet, which is a bit problematic")
     @snapshot_postgres_queries
     def test_property_with_double_underscores(self):
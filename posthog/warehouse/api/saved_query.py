@@ -3,6 +3,7 @@ from django.conf import settings
 
 import structlog
 from asgiref.sync import async_to_sync
+from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.db.models import Q
 from rest_framework import exceptions, filters, request, response, serializers, status, viewsets
@@ -45,6 +46,7 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
     created_by = UserBasicSerializer(read_only=True)
     columns = serializers.SerializerMethodField(read_only=True)
     sync_frequency = serializers.SerializerMethodField()
+    incremental_field = serializers.SerializerMethodField()
 
     class Meta:
         model = DataWarehouseSavedQuery
@@ -56,6 +58,8 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
             "created_by",
             "created_at",
             "sync_frequency",
+            "sync_type",
+            "incremental_field",
             "columns",
             "status",
             "last_run_at",
@@ -88,6 +92,24 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
     def get_sync_frequency(self, schema: DataWarehouseSavedQuery):
         return sync_frequency_interval_to_sync_frequency(schema.sync_frequency_interval)
 
+    def get_incremental_field(self, view: DataWarehouseSavedQuery) -> str | None:
+        return view.incremental_field
+
+    def _update_incremental_field(self, view: DataWarehouseSavedQuery) -> None:
+        """Set the incremental field from the request, which also resets incremental runs to start from scratch."""
+        if not view.is_incremental:
+            view.set_incremental_field(None)
+            return
+
+        incremental_field = self.context["request"].data.get("incremental_field", view.incremental_field)
+        if not incremental_field:
+            raise serializers.ValidationError("An incremental field is required for incremental views")
+
+        try:
+            view.set_incremental_field(incremental_field)
+        except ValidationError as err:
+            raise serializers.ValidationError(err.message)
+
     def create(self, validated_data):
         validated_data["team_id"] = self.context["team_id"]
         validated_data["created_by"] = self.context["request"].user
@@ -114,6 +136,8 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
         except Exception as err:
             raise serializers.ValidationError(str(err))
 
+        self._update_incremental_field(view)
+
         with transaction.atomic():
             view.save()
             try:
@@ -154,6 +178,10 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
                 except Exception as err:
                     raise serializers.ValidationError(str(err))
 
+            # A changed query or incremental field invalidates what was materialized so far
+            request_data = self.context["request"].data
+            if "query" in validated_data or "sync_type" in validated_data or "incremental_field" in request_data:
+                self._update_incremental_field(view)
                 view.save()
 
             try:
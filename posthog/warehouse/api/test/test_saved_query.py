@@ -1,4 +1,5 @@
 from unittest.mock import patch
+import datetime
 import uuid
 
 from posthog.test.base import APIBaseTest
@@ -588,3 +589,103 @@ class TestSavedQuery(APIBaseTest):
 
             # Verify get_columns was called
             mock_get_columns.assert_called_once()
+
+    def test_create_incremental(self):
+        response = self.client.post(
+            f"/api/projects/{self.team.id}/warehouse_saved_queries/",
+            {
+                "name": "event_view",
+                "query": {
+                    "kind": "HogQLQuery",
+                    "query": "select event as event, timestamp as timestamp from events",
+                },
+                "sync_type": "incremental",
+                "incremental_field": "timestamp",
+            },
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["sync_type"], "incremental")
+        self.assertEqual(response.json()["incremental_field"], "timestamp")
+
+        saved_query = DataWarehouseSavedQuery.objects.get(id=response.json()["id"])
+        self.assertEqual(
+            saved_query.sync_type_config, {"incremental_field": "timestamp", "incremental_field_type": "datetime"}
+        )
+
+    def test_create_incremental_with_invalid_field(self):
+        for incremental_field in (None, "event", "unknown"):
+            response = self.client.post(
+                f"/api/projects/{self.team.id}/warehouse_saved_queries/",
+                {
+                    "name": "event_view",
+                    "query": {
+                        "kind": "HogQLQuery",
+                        "query": "select event as event, timestamp as timestamp from events",
+                    },
+                    "sync_type": "incremental",
+                    "incremental_field": incremental_field,
+                },
+            )
+            self.assertEqual(response.status_code, 400, response.content)
+
+    def test_update_query_resets_incremental_field_last_value(self):
+        response = self.client.post(
+            f"/api/projects/{self.team.id}/warehouse_saved_queries/",
+            {
+                "name": "event_view",
+                "query": {
+                    "kind": "HogQLQuery",
+                    "query": "select event as event, timestamp as timestamp from events",
+                },
+                "sync_type": "incremental",
+                "incremental_field": "timestamp",
+            },
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        saved_query = DataWarehouseSavedQuery.objects.get(id=response.json()["id"])
+        saved_query.update_incremental_field_last_value(datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC))
+        self.assertEqual(saved_query.incremental_field_last_value, datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC))
+
+        response = self.client.patch(
+            f"/api/projects/{self.team.id}/warehouse_saved_queries/{saved_query.id}",
+            {
+                "query": {
+                    "kind": "HogQLQuery",
+                    "query": "select event as event, timestamp as timestamp from events where event = '$pageview'",
+                },
+            },
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        saved_query.refresh_from_db()
+        self.assertEqual(saved_query.incremental_field, "timestamp")
+        self.assertIsNone(saved_query.incremental_field_last_value)
+
+    def test_update_incremental_field_last_value_of_stale_saved_query(self):
+        saved_query = DataWarehouseSavedQuery.objects.create(
+            team=self.team,
+            name="event_view",
+            query={"kind": "HogQLQuery", "query": "select event as event, timestamp as timestamp from events"},
+            sync_type=DataWarehouseSavedQuery.SyncType.INCREMENTAL,
+            sync_type_config={"incremental_field": "timestamp", "incremental_field_type": "datetime"},
+        )
+        stale_saved_query = DataWarehouseSavedQuery.objects.get(id=saved_query.id)
+
+        # Other fields updated while materializing aren't written back
+        DataWarehouseSavedQuery.objects.filter(id=saved_query.id).update(name="renamed_view")
+        self.assertTrue(
+            stale_saved_query.update_incremental_field_last_value(datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC))
+        )
+        saved_query.refresh_from_db()
+        self.assertEqual(saved_query.name, "renamed_view")
+        self.assertEqual(saved_query.incremental_field_last_value, datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC))
+
+        # Neither is the last value once the sync config changed, e.g. after the query was updated
+        DataWarehouseSavedQuery.objects.filter(id=saved_query.id).update(
+            sync_type_config={"incremental_field": "timestamp", "incremental_field_type": "datetime"}
+        )
+        self.assertFalse(
+            stale_saved_query.update_incremental_field_last_value(datetime.datetime(2025, 1, 2, tzinfo=datetime.UTC))
+        )
+        saved_query.refresh_from_db()
+        self.assertIsNone(saved_query.incremental_field_last_value)
@@ -1,10 +1,10 @@
-from datetime import datetime
+from datetime import date, datetime
 import re
 from typing import Any, Optional, Union
 import uuid
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 
 from posthog.hogql import ast
@@ -19,6 +19,7 @@ from posthog.warehouse.models.util import (
     clean_type,
     remove_named_tuples,
 )
+from posthog.warehouse.types import IncrementalFieldType
 from posthog.hogql.database.s3_table import S3Table
 from posthog.warehouse.util import database_sync_to_async
 from dlt.common.normalizers.naming.snake_case import NamingConvention
@@ -53,6 +54,10 @@ class DataWarehouseSavedQuery(CreatedMetaFields, UUIDModel, DeletedMetaFields):
         FAILED = "Failed"
         RUNNING = "Running"
 
+    class SyncType(models.TextChoices):
+        FULL_REFRESH = "full_refresh", "full_refresh"
+        INCREMENTAL = "incremental", "incremental"
+
     name = models.CharField(max_length=128, validators=[validate_saved_query_name])
     team = models.ForeignKey(Team, on_delete=models.CASCADE)
     latest_error = models.TextField(default=None, null=True, blank=True)
@@ -72,6 +77,12 @@ class DataWarehouseSavedQuery(CreatedMetaFields, UUIDModel, DeletedMetaFields):
         help_text="The timestamp of this SavedQuery's last run (if any).",
     )
     sync_frequency_interval = models.DurationField(default=None, null=True, blank=True)
+    sync_type = models.CharField(max_length=128, choices=SyncType.choices, null=True, blank=True)
+    # { "incremental_field": string, "incremental_field_type": string, "incremental_field_last_value": any }
+    sync_type_config = models.JSONField(
+        default=dict,
+        blank=True,
+    )
 
     table = models.ForeignKey("posthog.DataWarehouseTable", on_delete=models.SET_NULL, null=True, blank=True)
     # The name of the view at the time of soft deletion
@@ -93,6 +104,103 @@ class DataWarehouseSavedQuery(CreatedMetaFields, UUIDModel, DeletedMetaFields):
 
         self.save()
 
+    @property
+    def is_incremental(self) -> bool:
+        return self.sync_type == self.SyncType.INCREMENTAL
+
+    @property
+    def incremental_field(self) -> str | None:
+        if self.sync_type_config:
+            return self.sync_type_config.get("incremental_field", None)
+
+        return None
+
+    @property
+    def incremental_field_type(self) -> IncrementalFieldType | None:
+        if self.sync_type_config and self.sync_type_config.get("incremental_field_type", None):
+            return IncrementalFieldType(self.sync_type_config["incremental_field_type"])
+
+        return None
+
+    @property
+    def incremental_field_last_value(self) -> Any:
+        """The last materialized value of the incremental field, parsed back from its JSON representation."""
+        if not self.sync_type_config:
+            return None
+
+        last_value = self.sync_type_config.get("incremental_field_last_value", None)
+        if last_value is None:
+            return None
+
+        if self.incremental_field_type == IncrementalFieldType.DateTime:
+            return datetime.fromisoformat(last_value)
+        elif self.incremental_field_type == IncrementalFieldType.Date:
+            return date.fromisoformat(last_value)
+
+        return last_value
+
+    def update_incremental_field_last_value(self, last_value: Any, save: bool = True) -> bool:
+        """Set the last materialized value of the incremental field.
+
+        When saving, the row is re-read first and left alone if its sync config changed in the meantime, e.g. when
+        the query or incremental field were updated while materializing. Returns whether the value was set.
+        """
+        if last_value is None:
+            return False
+
+        if isinstance(last_value, date):
+            last_value = last_value.isoformat()
+
+        if not save:
+            self.sync_type_config["incremental_field_last_value"] = last_value
+            return True
+
+        with transaction.atomic():
+            current_sync_type_config = (
+                DataWarehouseSavedQuery.objects.select_for_update()
+                .values_list("sync_type_config", flat=True)
+                .get(pk=self.pk)
+            )
+            if current_sync_type_config != self.sync_type_config:
+                return False
+
+            self.sync_type_config = {**current_sync_type_config, "incremental_field_last_value": last_value}
+            self.save(update_fields=["sync_type_config"])
+
+        return True
+
+    def set_incremental_field(self, incremental_field: str | None) -> None:
+        """Set the field incremental runs are filtered on, resetting the last materialized value.
+
+        Raises:
+            ValidationError: If the field isn't a date, datetime or integer column of the query.
+        """
+        if incremental_field is None:
+            self.sync_type_config = {}
+            return
+
+        clickhouse_type = self.get_clickhouse_column_type(incremental_field)
+        if not isinstance(clickhouse_type, str):
+            raise ValidationError(f"{incremental_field} is not a column of the view")
+
+        clickhouse_type = clean_type(clickhouse_type)
+        if clickhouse_type.startswith("DateTime"):
+            incremental_field_type = IncrementalFieldType.DateTime
+        elif clickhouse_type.startswith("Date"):
+            incremental_field_type = IncrementalFieldType.Date
+        elif clickhouse_type.startswith(("Int", "UInt")):
+            incremental_field_type = IncrementalFieldType.Integer
+        else:
+            raise ValidationError(
+                f"{incremental_field} can't be used as an incremental field, "
+                "only date, datetime and integer columns can"
+            )
+
+        self.sync_type_config = {
+            "incremental_field": incremental_field,
+            "incremental_field_type": incremental_field_type,
+        }
+
     def get_columns(self) -> dict[str, dict[str, Any]]:
         from posthog.api.services.query import process_query_dict
         from posthog.hogql_queries.query_runner import ExecutionMode